@@ -0,0 +1,50 @@
+"""
+Benchmark of the N0 grid search of CalculateN0.
+
+Times find_optimal_N0_old for both conversion methods, evaluating every
+N0 candidate and with a coarse-to-fine search, on synthetic calibration
+days. No data is read.
+
+Usage:
+
+    python benchmarks/benchmark_calculate_n0.py [--days 3] [--coarse-step 25]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from neptoon.calibration.station_calibration import CalculateN0
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--coarse-step", type=int, default=25)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    for conversion_method in ["desilets_etal_2010", "koehli_etal_2021"]:
+        calculator = CalculateN0()
+        calculator.set_values(
+            soil_moisture=list(rng.uniform(0.1, 0.35, args.days)),
+            corrected_neutron_counts=list(rng.uniform(800, 1200, args.days)),
+            conversion_method=conversion_method,
+            lattice_water=0.02,
+            absolute_humidity=list(rng.uniform(4, 10, args.days)),
+        )
+        n0, seconds = timed(calculator.find_optimal_N0_old)
+        n0_coarse, seconds_coarse = timed(
+            calculator.find_optimal_N0_old, coarse_step=args.coarse_step
+        )
+        assert n0 == n0_coarse
+        print(f"{conversion_method}: N0 = {n0}")
+        print(f"    all candidates: {seconds:8.4f} s")
+        print(f"    coarse-to-fine: {seconds_coarse:8.4f} s")
@@ -0,0 +1,142 @@
+"""
+Benchmark of the neutron correction classes.
+
+Compares the column-wise correction classes with the row-wise
+evaluation (``DataFrame.apply(..., axis=1)``) they used before, on one
+year of 1-minute data by default.
+
+Usage:
+
+    python benchmarks/benchmark_corrections.py [--rows 525600]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from neptoon.columns import ColumnInfo
+from neptoon.corrections import (
+    incoming_intensity_correction,
+    rc_correction_hawdon,
+    humidity_correction_rosolem2013,
+    calc_pressure_correction_factor,
+    calc_beta_coefficient_desilets_2021,
+    IncomingIntensityCorrectionHawdon2014,
+    HumidityCorrectionRosolem2013,
+    PressureCorrectionDesilets2021,
+)
+
+
+def make_data(rows: int):
+    """One station with `rows` minutes of synthetic data."""
+    rng = np.random.default_rng(42)
+    return pd.DataFrame(
+        {
+            str(ColumnInfo.Name.INCOMING_NEUTRON_INTENSITY): rng.normal(
+                160, 3, rows
+            ),
+            str(ColumnInfo.Name.REFERENCE_INCOMING_NEUTRON_VALUE): 159.0,
+            str(ColumnInfo.Name.SITE_CUTOFF_RIGIDITY): 2.94,
+            str(ColumnInfo.Name.REFERENCE_MONITOR_CUTOFF_RIGIDITY): 4.49,
+            str(ColumnInfo.Name.ABSOLUTE_HUMIDITY): rng.uniform(2, 20, rows),
+            str(ColumnInfo.Name.AIR_PRESSURE): rng.normal(990, 8, rows),
+            str(ColumnInfo.Name.LATITUDE): 51.37,
+            str(ColumnInfo.Name.ELEVATION): 140.0,
+        },
+        index=pd.date_range("2023-01-01", periods=rows, freq="min", tz="UTC"),
+    )
+
+
+def row_wise(data_frame):
+    """The previous row-by-row evaluation, kept as reference."""
+    df = data_frame.copy()
+    df[str(ColumnInfo.Name.RC_CORRECTION_FACTOR)] = df.apply(
+        lambda row: rc_correction_hawdon(
+            site_cutoff_rigidity=row[
+                str(ColumnInfo.Name.SITE_CUTOFF_RIGIDITY)
+            ],
+            ref_monitor_cutoff_rigidity=row[
+                str(ColumnInfo.Name.REFERENCE_MONITOR_CUTOFF_RIGIDITY)
+            ],
+        ),
+        axis=1,
+    )
+    df[str(ColumnInfo.Name.INTENSITY_CORRECTION)] = df.apply(
+        lambda row: incoming_intensity_correction(
+            incoming_intensity=row[
+                str(ColumnInfo.Name.INCOMING_NEUTRON_INTENSITY)
+            ],
+            ref_incoming_intensity=row[
+                str(ColumnInfo.Name.REFERENCE_INCOMING_NEUTRON_VALUE)
+            ],
+            rc_scaling=row[str(ColumnInfo.Name.RC_CORRECTION_FACTOR)],
+        ),
+        axis=1,
+    )
+    df[str(ColumnInfo.Name.HUMIDITY_CORRECTION)] = df.apply(
+        lambda row: humidity_correction_rosolem2013(
+            row[str(ColumnInfo.Name.ABSOLUTE_HUMIDITY)], 0
+        ),
+        axis=1,
+    )
+    df[str(ColumnInfo.Name.BETA_COEFFICIENT)] = df.apply(
+        lambda row: calc_beta_coefficient_desilets_2021(
+            latitude=row[str(ColumnInfo.Name.LATITUDE)],
+            elevation=row[str(ColumnInfo.Name.ELEVATION)],
+            cutoff_rigidity=row[str(ColumnInfo.Name.SITE_CUTOFF_RIGIDITY)],
+        ),
+        axis=1,
+    )
+    df[str(ColumnInfo.Name.PRESSURE_CORRECTION)] = df.apply(
+        lambda row: calc_pressure_correction_factor(
+            row[str(ColumnInfo.Name.AIR_PRESSURE)],
+            1013.25,
+            row[str(ColumnInfo.Name.BETA_COEFFICIENT)],
+        ),
+        axis=1,
+    )
+    return df
+
+
+def column_wise(data_frame):
+    """The correction classes as used by CorrectNeutrons."""
+    df = data_frame.copy()
+    for correction in [
+        IncomingIntensityCorrectionHawdon2014(),
+        HumidityCorrectionRosolem2013(),
+        PressureCorrectionDesilets2021(),
+    ]:
+        df = correction.apply(df)
+    return df
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=365 * 24 * 60)
+    args = parser.parse_args()
+
+    data = make_data(args.rows)
+    expected, time_row_wise = timed(row_wise, data)
+    result, time_column_wise = timed(column_wise, data)
+
+    for column in [
+        ColumnInfo.Name.INTENSITY_CORRECTION,
+        ColumnInfo.Name.HUMIDITY_CORRECTION,
+        ColumnInfo.Name.PRESSURE_CORRECTION,
+    ]:
+        np.testing.assert_allclose(
+            result[str(column)], expected[str(column)], rtol=1e-12
+        )
+
+    print(f"rows:        {args.rows}")
+    print(f"row-wise:    {time_row_wise:8.3f} s")
+    print(f"column-wise: {time_column_wise:8.3f} s")
+    print(f"speedup:     {time_row_wise / time_column_wise:8.1f} x")
@@ -0,0 +1,58 @@
+"""
+Benchmark of calibrating a network of stations with find_n0.
+
+Compares one find_n0 call per station with one call on stacked
+(stations x calibration days) input, for both conversion theories. No
+data is read.
+
+Usage:
+
+    python benchmarks/benchmark_find_n0.py [--stations 1000] [--days 5] [--metric rmse]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from neptoon.corrections import find_n0
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stations", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--metric", default="rmse")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    shape = (args.stations, args.days)
+    gravimetric_sm = rng.uniform(0.05, 0.35, shape)
+    neutron_count = rng.uniform(800, 1800, shape)
+    abs_air_humidity = rng.uniform(3, 12, shape)
+
+    for conversion_theory in ["desilets_etal_2010", "koehli_etal_2021"]:
+        kwargs = dict(conversion_theory=conversion_theory, metric=args.metric)
+        per_station, seconds = timed(
+            lambda: np.array(
+                [
+                    find_n0(sm, n, h, **kwargs)
+                    for sm, n, h in zip(
+                        gravimetric_sm, neutron_count, abs_air_humidity
+                    )
+                ]
+            )
+        )
+        stacked, seconds_stacked = timed(
+            find_n0, gravimetric_sm, neutron_count, abs_air_humidity, **kwargs
+        )
+        np.testing.assert_allclose(stacked, per_station)
+        print(f"{conversion_theory} ({args.metric}), {args.stations} stations")
+        print(f"    one call per station: {seconds:8.4f} s")
+        print(f"    stacked:              {seconds_stacked:8.4f} s")
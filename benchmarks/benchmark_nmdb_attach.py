@@ -0,0 +1,70 @@
+"""
+Benchmark of attaching NMDB counts to CRNS data.
+
+Compares align_series_to_index, used by NMDBDataAttacher.attach_data,
+with the ``Series.reindex(..., method="nearest")`` it used before, on
+5 years of 1-minute CRNS data and 1-minute NMDB data by default. No
+data is downloaded.
+
+Usage:
+
+    python benchmarks/benchmark_nmdb_attach.py [--years 5] [--nmdb-minutes 1]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from neptoon.external.nmdb_data_collection import (
+    INTERPOLATION_METHODS,
+    align_series_to_index,
+)
+
+
+def make_data(years: int, nmdb_minutes: int):
+    """CRNS timestamps with jitter and a regular NMDB series."""
+    rng = np.random.default_rng(42)
+    rows = years * 365 * 24 * 60
+    crns_index = pd.date_range(
+        "2019-01-01", periods=rows, freq="min", tz="UTC"
+    ) + pd.to_timedelta(rng.integers(0, 30, rows), unit="s")
+    nmdb_index = pd.date_range(
+        pd.Timestamp("2019-01-01", tz="UTC"),
+        crns_index[-1] + pd.Timedelta(hours=1),
+        freq=f"{nmdb_minutes}min",
+    )
+    counts = pd.Series(rng.normal(160, 3, len(nmdb_index)), index=nmdb_index)
+    return crns_index, counts
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--nmdb-minutes", type=int, default=1)
+    args = parser.parse_args()
+
+    crns_index, counts = make_data(args.years, args.nmdb_minutes)
+    expected, time_reindex = timed(
+        lambda: counts.reindex(crns_index, method="nearest").to_numpy()
+    )
+    print(f"CRNS rows:      {len(crns_index)}")
+    print(f"NMDB rows:      {len(counts)}")
+    print(f"reindex:        {time_reindex:8.3f} s")
+    for interpolation in INTERPOLATION_METHODS:
+        result, seconds = timed(
+            align_series_to_index,
+            counts,
+            crns_index,
+            interpolation=interpolation,
+        )
+        if interpolation == "nearest":
+            np.testing.assert_array_equal(result, expected)
+        print(f"{interpolation + ':':<15} {seconds:8.3f} s")
@@ -11,7 +11,7 @@ from neptoon.columns import ColumnInfo
 from neptoon.corrections import (
     Schroen2017,
     neutrons_to_grav_soil_moisture_desilets_etal_2010,
-    neutrons_to_grav_soil_moisture_koehli_etal_2021,
+    neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized,
     find_n0,
 )
 
@@ -1896,25 +1896,17 @@ class CalculateN0:
         #     + water_equiv_soil_organic_carbon
         # )
 
-        def calculate_sm_and_error_desilets(n0):
+        n0 = n0_range.to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
             sm_prediction = neutrons_to_grav_soil_moisture_desilets_etal_2010(
                 neutron_count=neutron_mean,
                 n0=n0,
             )
-            rel_error = (
-                abs(sm_prediction - gravimetric_sm_on_day_total)
-            ) / gravimetric_sm_on_day_total
-
-            return pd.Series(
-                {
-                    "N0": n0,
-                    "soil_moisture_prediction": sm_prediction,
-                    "relative_error": rel_error,
-                }
-            )
-
-        results_df = n0_range.apply(calculate_sm_and_error_desilets)
-        return results_df
+        return self._n0_results_data_frame(
+            n0_range=n0_range,
+            sm_prediction=sm_prediction,
+            gravimetric_sm_on_day_total=gravimetric_sm_on_day_total,
+        )
 
     def _find_optimal_n0_single_day_koehli_etal_2021(
         self,
@@ -1957,32 +1949,59 @@ class CalculateN0:
         #     + water_equiv_soil_organic_carbon
         # )
 
-        def calculate_sm_and_error_koehli(n0):
-
-            sm_prediction = neutrons_to_grav_soil_moisture_koehli_etal_2021(
+        sm_prediction = (
+            neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized(
                 neutron_count=neutron_mean,
-                n0=n0,
+                n0=n0_range.to_numpy(dtype=float),
                 abs_air_humidity=abs_air_humidity,
                 additional_gravimetric_water=lattice_water
                 + water_equiv_soil_organic_carbon,
-                # lattice_water=lattice_water,
-                # water_equiv_soil_organic_carbon=water_equiv_soil_organic_carbon,
                 koehli_parameters=koehli_parameters,
             )
-            rel_error = (
-                abs(sm_prediction - gravimetric_sm_on_day_total)
-            ) / gravimetric_sm_on_day_total
-
-            return pd.Series(
-                {
-                    "N0": n0,
-                    "soil_moisture_prediction": sm_prediction,
-                    "relative_error": rel_error,
-                }
-            )
+        )
+        return self._n0_results_data_frame(
+            n0_range=n0_range,
+            sm_prediction=sm_prediction,
+            gravimetric_sm_on_day_total=gravimetric_sm_on_day_total,
+        )
+
+    @staticmethod
+    def _n0_results_data_frame(
+        n0_range: pd.Series,
+        sm_prediction: np.ndarray,
+        gravimetric_sm_on_day_total: float,
+    ):
+        """
+        Collects the soil moisture predicted with each N0 candidate and
+        its relative error into a DataFrame.
 
-        results_df = n0_range.apply(calculate_sm_and_error_koehli)
-        return results_df
+        Parameters
+        ----------
+        n0_range : pd.Series
+            The N0 candidates
+        sm_prediction : np.ndarray
+            Soil moisture predicted with each candidate
+        gravimetric_sm_on_day_total : float
+            Observed soil moisture
+
+        Returns
+        -------
+        pd.DataFrame
+            N0, soil_moisture_prediction and relative_error, with the
+            index of n0_range
+        """
+        rel_error = (
+            np.abs(sm_prediction - gravimetric_sm_on_day_total)
+            / gravimetric_sm_on_day_total
+        )
+        return pd.DataFrame(
+            {
+                "N0": n0_range.to_numpy(dtype=float),
+                "soil_moisture_prediction": sm_prediction,
+                "relative_error": rel_error,
+            },
+            index=n0_range.index,
+        )
 
     def _create_n0_range(
         self,
@@ -2042,11 +2061,35 @@ class CalculateN0:
         )
         return n0_optimal
 
-    def find_optimal_N0_old(self):
+    def find_optimal_N0_old(
+        self,
+        coarse_step: int | None = None,
+        coarse_candidates: int = 3,
+    ):
         """
         Finds the optimal N0 number for the site using the weighted
         field average soil mositure.
 
+        All N0 candidates are evaluated at once for each calibration
+        day. With coarse_step, every coarse_step-th candidate is
+        evaluated first, and the search is then refined to all
+        candidates within coarse_step of the coarse_candidates best
+        ones. A minimum which is narrower than coarse_step can still be
+        missed, so leave coarse_step as None when the exact optimum of
+        the N0 range is needed.
+
+        CalibrationStation uses find_optimal_N0, so coarse_step only
+        applies when this method is called directly.
+
+        Parameters
+        ----------
+        coarse_step : int | None, optional
+            Step of the coarse search, by default None (evaluate every
+            candidate)
+        coarse_candidates : int, optional
+            Number of the best coarse candidates around which the
+            search is refined, by default 3
+
         Returns
         -------
         average_n0
@@ -2064,7 +2107,41 @@ class CalculateN0:
             )
         else:
             n0_range = self._create_n0_range(context=context)
-        # print(np.min(n0_range), np.max(n0_range))
+
+        if coarse_step is not None and coarse_step > 1:
+            coarse_error = self._total_error_by_n0(
+                n0_range.iloc[::coarse_step]
+            )
+            best_coarse_n0 = coarse_error.nsmallest(
+                coarse_candidates, coarse_error.columns[-1]
+            )["N0"].to_numpy()
+            distance = np.abs(
+                n0_range.to_numpy()[:, np.newaxis]
+                - best_coarse_n0[np.newaxis, :]
+            ).min(axis=1)
+            n0_range = n0_range[distance <= coarse_step]
+        total_error_df = self._total_error_by_n0(n0_range)
+        min_error_idx = total_error_df[total_error_df.columns[-1]].idxmin()
+        return total_error_df.loc[min_error_idx, "N0"]
+
+    def _total_error_by_n0(self, n0_range: pd.Series):
+        """
+        Evaluates the N0 candidates on each calibration day, stores the
+        results in context.calibration_results_by_day and returns the
+        relative error of each candidate summed over all days.
+
+        Parameters
+        ----------
+        n0_range : pd.Series
+            The N0 candidates
+
+        Returns
+        -------
+        pd.DataFrame
+            N0 and total_error_from_<n>_calib_days, with the index of
+            n0_range
+        """
+        context = self.context
         lattice_water = context.value_avg_lattice_water
         water_equiv_soil_organic_carbon = (
             context.value_avg_soil_organic_carbon_water_equiv
@@ -2086,7 +2163,6 @@ class CalculateN0:
                 )
 
             elif context.neutron_conversion_method == "koehli_etal_2021":
-                # print(grav_sm, neutron_mean, metrics["absolute_air_humidity"], lattice_water, water_equiv_soil_organic_carbon,context.koehli_parameters)
                 df_calib = self._find_optimal_n0_single_day_koehli_etal_2021(
                     gravimetric_sm_on_day=grav_sm,
                     neutron_mean=neutron_mean,
@@ -2114,6 +2190,4 @@ class CalculateN0:
             axis=1,
             inplace=True,
         )
-        min_error_idx = total_error_df[new_total_error_col_name].idxmin()
-        n0_optimal = total_error_df.loc[min_error_idx, "N0"]
-        return n0_optimal
+        return total_error_df
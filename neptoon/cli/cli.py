@@ -1,7 +1,7 @@
 from pathlib import Path
 import typer
 
-from neptoon.workflow import ProcessWithConfig
+from neptoon.workflow import ProcessWithConfig, prefetch_nmdb_for_sensors
 from neptoon.config import ConfigurationManager
 from neptoon.utils.docker_utils import is_running_in_docker
 
@@ -10,6 +10,7 @@ app = typer.Typer()
 
 @app.callback(invoke_without_command=True)
 def main(
+    ctx: typer.Context,
     processing_config: str = typer.Option(
         None,
         "--processing",
@@ -22,6 +23,25 @@ def main(
         "-s",
         help="Path to the sensor configuration YAML file",
     ),
+    workers: int = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        min=1,
+        help=(
+            "Number of worker processes used to parse raw data files"
+            " (overrides parse_workers in the sensor configuration)"
+        ),
+    ),
+    offline: bool = typer.Option(
+        False,
+        "--offline",
+        help=(
+            "Only use cached NMDB.eu data, never connect to NMDB.eu"
+            " (overrides reference_neutron_monitor.offline in the"
+            " processing configuration)"
+        ),
+    ),
 ):
     """
     Process CRNS data using configuration files.
@@ -31,13 +51,20 @@ def main(
 
     -------
 
-    neptoon -p /path/to/process.yaml -s /path/to/sensor.yaml
+    neptoon -p /path/to/process.yaml -s /path/to/sensor.yaml -w 4
     """
+    if ctx.invoked_subcommand is not None:
+        return
     if processing_config and sensor_config:
         typer.secho(
             "Processing the sensor data...", fg=typer.colors.GREEN, bold=True
         )
-        process_data(processing_config, sensor_config)
+        process_data(
+            processing_config,
+            sensor_config,
+            workers=workers,
+            offline=offline,
+        )
     elif processing_config or sensor_config:
         typer.echo(
             typer.style("Error:", fg=typer.colors.RED, bold=True)
@@ -52,9 +79,18 @@ def main(
         )
 
 
-def process_data(processing_config: str, sensor_config: str):
+def process_data(
+    processing_config: str,
+    sensor_config: str,
+    workers: int | None = None,
+    offline: bool = False,
+):
     """
     Process the data using the supplied config file locations.
+
+    If workers is given it overrides the number of workers used to parse
+    raw data files set in the sensor config. If offline is True, NMDB
+    data is only taken from the cache.
     """
     processing_config_path = Path(processing_config)
     sensor_config_path = Path(sensor_config)
@@ -78,6 +114,14 @@ def process_data(processing_config: str, sensor_config: str):
     try:
         config.load_configuration(file_path=sensor_config_path)
         config.load_configuration(file_path=processing_config_path)
+        sensor = config.get_config("sensor")
+        if workers is not None and sensor.raw_data_parse_options is not None:
+            sensor.raw_data_parse_options.parse_workers = workers
+        if offline:
+            incoming_radiation = config.get_config(
+                "process"
+            ).correction_steps.incoming_radiation
+            incoming_radiation.reference_neutron_monitor.offline = True
 
         config_processor = ProcessWithConfig(configuration_object=config)
         config_processor.run_full_process()  # Add verbose into run full process later TODO
@@ -90,5 +134,74 @@ def process_data(processing_config: str, sensor_config: str):
         raise typer.Exit(code=1)
 
 
+@app.command("prefetch-nmdb")
+def prefetch_nmdb(
+    processing_config: str = typer.Option(
+        ...,
+        "--processing",
+        "-p",
+        help="Path to the processing configuration YAML file",
+    ),
+    sensor_configs: list[str] = typer.Option(
+        ...,
+        "--sensor",
+        "-s",
+        help="Path to a sensor configuration YAML file (repeatable)",
+    ),
+    download_workers: int = typer.Option(
+        4,
+        "--download-workers",
+        min=1,
+        help="Number of NMDB chunks downloaded at the same time",
+    ),
+):
+    """
+    Download the NMDB.eu data needed by many sensors into the cache, so
+    that processing them afterwards only reads from the cache.
+
+
+    Example
+
+    -------
+
+    neptoon prefetch-nmdb -p /path/to/process.yaml -s A101.yaml -s A102.yaml
+    """
+    config_paths = [Path(processing_config)] + [
+        Path(sensor_config) for sensor_config in sensor_configs
+    ]
+    for config_path in config_paths:
+        if not config_path.exists():
+            typer.echo(f"Error: Configuration file not found: {config_path}")
+            raise typer.Exit(code=1)
+
+    try:
+        report = prefetch_nmdb_for_sensors(
+            sensor_configs=config_paths[1:],
+            process_configs=config_paths[0],
+            download_workers=download_workers,
+        )
+    except Exception as e:
+        typer.echo(f"Error during NMDB prefetch: {str(e)}")
+        raise typer.Exit(code=1)
+
+    failed = False
+    for group in report:
+        name = (
+            f"{group['station']} ({group['resolution']} min, "
+            f"{group['nmdb_table']})"
+        )
+        if group["error"] is not None:
+            failed = True
+            typer.echo(f"{name}: download failed: {group['error']}")
+        else:
+            typer.echo(
+                f"{name}: {len(group['downloaded'])} missing date ranges "
+                f"downloaded, cache covers {group['date_ranges']}"
+            )
+    if failed:
+        raise typer.Exit(code=1)
+    typer.echo("NMDB prefetch completed successfully.")
+
+
 if __name__ == "__main__":
     app()
@@ -109,7 +109,13 @@ class TimeSeriesColumns(BaseConfig):
         Literal["priority", "average"]
     ] = "priority"
     date_time_columns: List[str]
-    date_time_format: str
+    date_time_format: Optional[str] = Field(
+        default=None,
+        description=(
+            "Format of the date time values. Detected from a sample of "
+            "the data when not given"
+        ),
+    )
 
 
 class TimeSeriesData(BaseConfig):
@@ -156,6 +162,60 @@ class RawDataParseConfig(BaseModel):
         description="Suffix of file name used for file filtering",
     )
 
+    cache_formatted_data: Optional[bool] = Field(
+        default=False,
+        description=(
+            "Store the formatted time series data as Parquet and load it "
+            "on later runs while the raw files and the configuration are "
+            "unchanged"
+        ),
+    )
+
+    file_pattern: Optional[str] = Field(
+        default=None,
+        description=(
+            "Regular expression which must be found in the raw file names "
+            "(relative to data_location)"
+        ),
+    )
+
+    cache_file_listing: Optional[bool] = Field(
+        default=False,
+        description=(
+            "Cache the listing of each raw data folder, so that unchanged "
+            "folders are not listed again"
+        ),
+    )
+
+    start_date: Optional[datetime.datetime] = Field(
+        default=None,
+        description=(
+            "Start of the time window to process. Raw files which only "
+            "hold data before this date are not parsed"
+        ),
+    )
+
+    end_date: Optional[datetime.datetime] = Field(
+        default=None,
+        description=(
+            "End of the time window to process. Raw files which only "
+            "hold data after this date are not parsed"
+        ),
+    )
+
+    file_date_pattern: Optional[str] = Field(
+        default=None,
+        description=(
+            "Regular expression finding the start date of each raw file "
+            "in its name (the group named 'date', or the first group)"
+        ),
+    )
+
+    file_date_format: Optional[str] = Field(
+        default=None,
+        description="Format of the date found with file_date_pattern",
+    )
+
     encoding: Optional[str] = Field(
         default="cp850",
         description="File encoding format",
@@ -206,6 +266,64 @@ class RawDataParseConfig(BaseModel):
         description="Prefix to remove from column names",
     )
 
+    parse_workers: Optional[int] = Field(
+        default=1,
+        ge=1,
+        description=(
+            "Number of worker processes used to read raw files in parallel"
+        ),
+    )
+
+    incremental_ingest: Optional[bool] = Field(
+        default=False,
+        description=(
+            "Only parse new or changed raw files, re-using the parsed data "
+            "of unchanged files from the ingest cache"
+        ),
+    )
+
+    ingest_cache_location: Optional[Path] = Field(
+        default=None,
+        description=(
+            "Folder for the ingest cache. Defaults to a folder in the "
+            "neptoon cache directory"
+        ),
+    )
+
+    parse_engine: Optional[Literal["pandas", "arrow"]] = Field(
+        default="pandas",
+        description=(
+            "Engine used to parse raw files. 'arrow' reads only the "
+            "columns named in time_series_data, with numeric and date "
+            "time types, instead of reading all columns as strings"
+        ),
+    )
+
+    memory_limit_mb: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Approximate memory (MB) used to parse one chunk of raw "
+            "files. When given, files are parsed in chunks which are "
+            "converted to numbers and date times before being combined "
+            "at the end. None parses all files in one go"
+        ),
+    )
+
+    @model_validator(mode="after")
+    def validate_time_window(self):
+        """Validate start_date is before end_date."""
+        if (
+            self.start_date is not None
+            and self.end_date is not None
+            and self.start_date > self.end_date
+        ):
+            raise ValueError(
+                f"start_date ({self.start_date}) must be before end_date "
+                f"({self.end_date})"
+            )
+        return self
+
 
 # QA Validation
 
@@ -408,6 +526,32 @@ class ReferenceNeutronMonitor(BaseModel):
     nmdb_table: Optional[str] = Field(
         default="revori", description="NMDB table name to query"
     )
+    interpolation: Optional[Literal["nearest", "linear", "previous"]] = Field(
+        default="nearest",
+        description=(
+            "How NMDB counts are mapped onto the timestamps of the "
+            "sensor data"
+        ),
+    )
+    offline: Optional[bool] = Field(
+        default=False,
+        description="Only use the NMDB cache and never connect to NMDB.eu",
+    )
+    max_staleness: Optional[str] = Field(
+        default=None,
+        description=(
+            "How far the NMDB cache may lag behind today before recent "
+            "data is downloaded, e.g., '7D'. None always downloads."
+        ),
+        examples=["1D", "7D"],
+    )
+    missing_data_policy: Optional[Literal["error", "fill_edges"]] = Field(
+        default="error",
+        description=(
+            "What to do with days missing from the NMDB cache in offline "
+            "mode: raise an error, or hold the first/last cached values"
+        ),
+    )
 
 
 class AirHumidityCorrection(BaseModel):
@@ -475,6 +619,15 @@ class SoilMoistureEstimation(BaseModel):
         description="Koehli specific method for converting neutrons",
         default="Mar21_mcnp_drf",
     )
+    koehli_etal_2021_inversion: Optional[
+        Literal["bisection", "lookup_table"]
+    ] = Field(
+        description=(
+            "How the UTS function is inverted: exact bisection or a "
+            "precomputed, error-bounded lookup table"
+        ),
+        default="bisection",
+    )
 
 
 class IncomingRadiationCorrection(BaseModel):
@@ -25,10 +25,16 @@ from .theory.incoming_intensity_corrections import (
 from .theory.neutrons_to_soil_moisture import (
     neutrons_to_grav_soil_moisture_desilets_etal_2010,
     neutrons_to_grav_soil_moisture_koehli_etal_2021,
+    neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized,
     neutrons_to_grav_soil_moisture_desilets_etal_2010_reformulated,
     find_n0,
 )
 
+from .theory.koehli_lookup_table import (
+    KoehliLookupTable,
+    neutrons_to_grav_soil_moisture_koehli_etal_2021_lookup,
+)
+
 from .theory.pressure_corrections import (
     calc_atmos_depth_mean_press,
     calc_beta_ceofficient_tirado_bueno_etal_2021,
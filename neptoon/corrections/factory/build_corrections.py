@@ -105,6 +105,8 @@ class CorrectNeutrons:
         self,
         crns_data_frame: pd.DataFrame,
         correction_builder: CorrectionBuilder,
+        static_values: dict | None = None,
+        keep_factor_columns: bool = True,
     ):
         """
         Attributes for using the CorrectNeutrons class
@@ -117,10 +119,24 @@ class CorrectNeutrons:
         correction_builder : CorrectionBuilder
             Staging area for corrections. Can be built or supplied
             completed.
+        static_values : dict | None, optional
+            Site constants (e.g., from SensorInfo) as scalars, keyed by
+            column name. These are used by the corrections in place of
+            columns. Values calculated during correction (e.g., a beta
+            coefficient) are added to this dictionary, by default None
+        keep_factor_columns : bool, optional
+            Whether to keep the individual correction factor columns in
+            the returned DataFrame (these are used in figures and
+            audits), by default True. If False, each factor is moved
+            into a 2D array as soon as it is calculated (the humidity
+            correction column is always kept).
         """
         self._crns_data_frame = crns_data_frame
         self._correction_builder = correction_builder
         self._correction_columns = []
+        self.static_values = static_values if static_values is not None else {}
+        self.keep_factor_columns = keep_factor_columns
+        self._correction_factors = None
 
     @property
     def crns_data_frame(self):
@@ -179,6 +195,12 @@ class CorrectNeutrons:
         applies them to the DataFrame. Returns the DataFrame with additional
         columns.
 
+        If keep_factor_columns is False, the correction factor column
+        written by each correction is removed straight away and its
+        values are held in a 2D array (one column per correction, in
+        the order of correction_columns) instead. The humidity
+        correction column is always kept.
+
         Parameters
         ----------
         df : pd.DataFrame
@@ -189,13 +211,86 @@ class CorrectNeutrons:
         pd.DataFrame
             DataFrame with additional columns applied during correction.
         """
-        for correction in self.correction_builder.get_corrections():
+        corrections = list(self.correction_builder.get_corrections())
+        factors = None
+        if not self.keep_factor_columns:
+            factors = np.empty((len(df), len(corrections)))
+        for i, correction in enumerate(corrections):
+            correction.static_values = self.static_values
             df = correction.apply(df)
             correction_column_name = (
                 correction.get_correction_factor_column_name()
             )
-            self.correction_columns.append(correction_column_name)
+            if correction_column_name not in self.correction_columns:
+                self.correction_columns.append(correction_column_name)
+            if factors is None:
+                continue
+            if correction_column_name == str(
+                ColumnInfo.Name.HUMIDITY_CORRECTION
+            ):
+                # kept, as it is used to remove the humidity correction
+                # again (e.g., for the koehli_etal_2021 conversion)
+                factors[:, i] = df[correction_column_name].to_numpy(
+                    dtype=float
+                )
+            else:
+                factors[:, i] = df.pop(correction_column_name).to_numpy(
+                    dtype=float
+                )
+        self._correction_factors = factors
+        return df
+
+    def calculate_total_correction_factor(self, df: pd.DataFrame):
+        """
+        Gathers all the correction factor columns into a single 2D array
+        and returns their product for each row. When the factor columns
+        were not kept, the factors held from create_correction_factors
+        are used.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            DataFrame with the corrections applied and recorded in the
+            columns
+
+        Returns
+        -------
+        np.ndarray
+            The combined correction factor (1 if no corrections were
+            applied)
+        """
+        if self._correction_factors is not None and not all(
+            column in df.columns for column in self.correction_columns
+        ):
+            factors = self._correction_factors
+        else:
+            factors = np.ascontiguousarray(
+                df[self.correction_columns].to_numpy(dtype=float)
+            )
+        return factors.prod(axis=1)
+
+    def _create_corrected_columns(self, df: pd.DataFrame, columns: dict):
+        """
+        Multiplies columns by the combined correction factor, which is
+        calculated once for all columns.
 
+        Parameters
+        ----------
+        df : pd.DataFrame
+            DataFrame with the corrections applied
+        columns : dict
+            name of the column to correct: name of the corrected column
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with the corrected columns
+        """
+        total_factor = self.calculate_total_correction_factor(df)
+        values = df[list(columns)].to_numpy(dtype=float)
+        corrected = values * total_factor[:, np.newaxis]
+        for i, corrected_column in enumerate(columns.values()):
+            df[corrected_column] = corrected[:, i]
         return df
 
     def create_corrected_neutron_column(self, df):
@@ -203,8 +298,6 @@ class CorrectNeutrons:
         Calculates the corrected neutron count rate after applying all
         the corrections.
 
-        NOTE:
-
         Parameters
         ----------
         df : pd.DataFrame
@@ -217,15 +310,14 @@ class CorrectNeutrons:
             DataFrame with the corrected epithermal neutron count
             recorded in a column
         """
-        df[str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT)] = df[
-            str(ColumnInfo.Name.EPI_NEUTRON_COUNT_FINAL)
-        ]
-        for column_name in self.correction_columns:
-            df[str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT)] = (
-                df[str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT)]
-                * df[column_name]
-            )
-        return df
+        return self._create_corrected_columns(
+            df,
+            {
+                str(ColumnInfo.Name.EPI_NEUTRON_COUNT_FINAL): str(
+                    ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT
+                ),
+            },
+        )
 
     def create_corrected_neutron_uncertainty_column(self, df: pd.DataFrame):
         """
@@ -236,21 +328,44 @@ class CorrectNeutrons:
         df : pd.DataFrame
             DataFrame
         """
-        df[str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UNCERTAINTY)] = df[
-            str(ColumnInfo.Name.RAW_EPI_NEUTRON_COUNT_UNCERTAINTY)
-        ]
-        for column_name in self.correction_columns:
-            df[
-                str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UNCERTAINTY)
-            ] = (
-                df[
-                    str(
-                        ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UNCERTAINTY
-                    )
-                ]
-                * df[column_name]
-            )
-        return df
+        return self._create_corrected_columns(
+            df,
+            {
+                str(ColumnInfo.Name.RAW_EPI_NEUTRON_COUNT_UNCERTAINTY): str(
+                    ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UNCERTAINTY
+                ),
+            },
+        )
+
+    def create_corrected_neutron_columns(self, df: pd.DataFrame):
+        """
+        Creates the corrected epithermal neutron count and its
+        uncertainty in one pass. The combined correction factor is
+        calculated once and applied to both columns.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            DataFrame with the corrections applied and recorded in the
+            columns
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with the corrected epithermal neutron count and
+            its uncertainty recorded in columns
+        """
+        return self._create_corrected_columns(
+            df,
+            {
+                str(ColumnInfo.Name.EPI_NEUTRON_COUNT_FINAL): str(
+                    ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT
+                ),
+                str(ColumnInfo.Name.RAW_EPI_NEUTRON_COUNT_UNCERTAINTY): str(
+                    ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UNCERTAINTY
+                ),
+            },
+        )
 
     def correct_neutrons(self):
         """
@@ -263,8 +378,7 @@ class CorrectNeutrons:
             DataFrame returned with additional columns.
         """
         df = self.create_correction_factors(self.crns_data_frame)
-        df = self.create_corrected_neutron_column(df)
-        df = self.create_corrected_neutron_uncertainty_column(df)
+        df = self.create_corrected_neutron_columns(df)
 
         return df
 
@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 from enum import Enum
 from abc import ABC, abstractmethod
 from neptoon.logging import get_logger
@@ -95,8 +96,16 @@ class Correction(ABC):
     correction factors are stored (when multiple corrections are
     undertaken). This enables the creation of the overall corrected
     neutron count column.
+
+    Site constants (e.g., latitude, elevation or cutoff rigidity) can
+    be supplied as scalars through the static_values dictionary rather
+    than as full columns. Corrections should read inputs with
+    get_value() so that either form is accepted, and constant terms
+    are then only evaluated once.
     """
 
+    _static_values = None
+
     def __init__(
         self, correction_type: str, correction_factor_column_name: str
     ):
@@ -133,6 +142,83 @@ class Correction(ABC):
         """
         return self.correction_factor_column_name
 
+    @property
+    def static_values(self) -> dict:
+        if self._static_values is None:
+            self._static_values = {}
+        return self._static_values
+
+    @static_values.setter
+    def static_values(self, value: dict | None):
+        self._static_values = value if value is not None else {}
+
+    def get_value(self, data_frame: pd.DataFrame, name: str):
+        """
+        Returns the values stored under name. A column in the
+        data_frame takes precedence, otherwise the scalar from
+        static_values is returned (None when neither is available).
+
+        Parameters
+        ----------
+        data_frame : pd.DataFrame
+            The crns_data_frame
+        name : str
+            Name of the column or static value
+
+        Returns
+        -------
+        pd.Series | float | None
+            The column or the static value
+        """
+        if not is_column_missing_or_empty(data_frame, name):
+            return data_frame[name]
+        return self.static_values.get(name)
+
+    def is_value_missing(self, data_frame: pd.DataFrame, name: str):
+        """
+        Find whether a value is neither available as a column in the
+        data_frame nor as a static value.
+
+        Parameters
+        ----------
+        data_frame : pd.DataFrame
+            The crns_data_frame
+        name : str
+            Name of the column or static value
+
+        Returns
+        -------
+        bool
+            True if the value is missing
+        """
+        return self.get_value(data_frame, name) is None
+
+    def store_value(self, data_frame: pd.DataFrame, name: str, value):
+        """
+        Stores a calculated value. Scalars are kept in static_values
+        (unless a column of that name already exists), anything else
+        is written to the data_frame as a column.
+
+        Parameters
+        ----------
+        data_frame : pd.DataFrame
+            The crns_data_frame
+        name : str
+            Name to store the value under
+        value : float | pd.Series
+            The calculated value
+
+        Returns
+        -------
+        pd.DataFrame
+            The crns_data_frame
+        """
+        if np.ndim(value) == 0 and name not in data_frame.columns:
+            self.static_values[name] = value
+        else:
+            data_frame[name] = value
+        return data_frame
+
 
 class IncomingIntensityCorrectionZreda2012(Correction):
     """
@@ -197,15 +283,16 @@ class IncomingIntensityCorrectionZreda2012(Correction):
             DataFrame now corrected
         """
 
-        data_frame[self.correction_factor_column_name] = data_frame.apply(
-            lambda row: incoming_intensity_correction(
-                incoming_intensity=row[self.incoming_neutron_column_name],
-                ref_incoming_intensity=row[
-                    self.reference_incoming_neutron_value
+        data_frame[self.correction_factor_column_name] = (
+            incoming_intensity_correction(
+                incoming_intensity=data_frame[
+                    self.incoming_neutron_column_name
                 ],
+                ref_incoming_intensity=self.get_value(
+                    data_frame, self.reference_incoming_neutron_value
+                ),
                 rc_scaling=1,
-            ),
-            axis=1,
+            )
         )
 
         return data_frame
@@ -298,7 +385,7 @@ class IncomingIntensityCorrectionHawdon2014(Correction):
         missing_columns = [
             col
             for col in required_columns
-            if is_column_missing_or_empty(data_frame, col)
+            if self.is_value_missing(data_frame, col)
         ]
         if missing_columns:
             raise ValueError(
@@ -315,16 +402,17 @@ class IncomingIntensityCorrectionHawdon2014(Correction):
         data_frame : pd.DataFrame
             The DataFrame with the data
         """
-        data_frame[self.rc_correction_factor] = data_frame.apply(
-            lambda row: rc_correction_hawdon(
-                site_cutoff_rigidity=row[self.site_cutoff_rigidity],
-                ref_monitor_cutoff_rigidity=row[
-                    self.ref_monitor_cutoff_rigidity
-                ],
+        rc_correction = rc_correction_hawdon(
+            site_cutoff_rigidity=self.get_value(
+                data_frame, self.site_cutoff_rigidity
+            ),
+            ref_monitor_cutoff_rigidity=self.get_value(
+                data_frame, self.ref_monitor_cutoff_rigidity
             ),
-            axis=1,
         )
-        return data_frame
+        return self.store_value(
+            data_frame, self.rc_correction_factor, rc_correction
+        )
 
     def apply(self, data_frame):
         """
@@ -344,13 +432,18 @@ class IncomingIntensityCorrectionHawdon2014(Correction):
         self._check_required_columns(data_frame=data_frame)
         data_frame = self._calc_rc_scale_param(data_frame=data_frame)
 
-        data_frame[self.correction_factor_column_name] = data_frame.apply(
-            lambda row: incoming_intensity_correction(
-                incoming_intensity=row[self.incoming_neutron_column_name],
-                ref_incoming_intensity=row[self.ref_incoming_neutron_value],
-                rc_scaling=row[self.rc_correction_factor],
-            ),
-            axis=1,
+        data_frame[self.correction_factor_column_name] = (
+            incoming_intensity_correction(
+                incoming_intensity=data_frame[
+                    self.incoming_neutron_column_name
+                ],
+                ref_incoming_intensity=self.get_value(
+                    data_frame, self.ref_incoming_neutron_value
+                ),
+                rc_scaling=self.get_value(
+                    data_frame, self.rc_correction_factor
+                ),
+            )
         )
         return data_frame
 
@@ -447,7 +540,7 @@ class IncomingIntensityCorrectionMcJannetDesilets2023(Correction):
         missing_columns = [
             col
             for col in required_columns
-            if is_column_missing_or_empty(data_frame, col)
+            if self.is_value_missing(data_frame, col)
         ]
         if missing_columns:
             raise ValueError(
@@ -487,28 +580,32 @@ class IncomingIntensityCorrectionMcJannetDesilets2023(Correction):
         data_frame : pd.DataFrame
             The DataFrame with the data
         """
-        data_frame[self.rc_correction_factor] = data_frame.apply(
-            lambda row: McjannetDesilets2023.tau(
-                latitude=row[self.latitude],
-                elevation=row[self.elevation],
-                cut_off_rigidity=row[self.site_cutoff_rigidity],
+        tau = McjannetDesilets2023.tau(
+            latitude=self.get_value(data_frame, self.latitude),
+            elevation=self.get_value(data_frame, self.elevation),
+            cut_off_rigidity=self.get_value(
+                data_frame, self.site_cutoff_rigidity
             ),
-            axis=1,
         )
-        return data_frame
+        return self.store_value(data_frame, self.rc_correction_factor, tau)
 
     def apply(self, data_frame):
         self._check_required_columns(data_frame=data_frame)
         self._check_reference_monitor_is_jung(data_frame=data_frame)
         data_frame = self._calc_rc_scale_param(data_frame=data_frame)
 
-        data_frame[self.correction_factor_column_name] = data_frame.apply(
-            lambda row: incoming_intensity_correction(
-                incoming_intensity=row[self.incoming_neutron_column_name],
-                ref_incoming_intensity=row[self.ref_incoming_neutron_value],
-                rc_scaling=row[self.rc_correction_factor],
-            ),
-            axis=1,
+        data_frame[self.correction_factor_column_name] = (
+            incoming_intensity_correction(
+                incoming_intensity=data_frame[
+                    self.incoming_neutron_column_name
+                ],
+                ref_incoming_intensity=self.get_value(
+                    data_frame, self.ref_incoming_neutron_value
+                ),
+                rc_scaling=self.get_value(
+                    data_frame, self.rc_correction_factor
+                ),
+            )
         )
         return data_frame
 
@@ -633,12 +730,11 @@ class HumidityCorrectionRosolem2013(Correction):
         if not abs_hum_exists:
             data_frame = self._create_abs_hum_data(data_frame=data_frame)
 
-        data_frame[self.correction_factor_column_name] = data_frame.apply(
-            lambda row: humidity_correction_rosolem2013(
-                row[self.absolute_humidity_column_name],
+        data_frame[self.correction_factor_column_name] = (
+            humidity_correction_rosolem2013(
+                data_frame[self.absolute_humidity_column_name],
                 self.reference_absolute_humidity_value,
-            ),
-            axis=1,
+            )
         )
 
         return data_frame
@@ -746,13 +842,12 @@ class PressureCorrection(Correction):
             return data_frame
         else:
             self._prepare_for_correction(data_frame)
-            data_frame[self.correction_factor_column_name] = data_frame.apply(
-                lambda row: calc_pressure_correction_factor(
-                    row[str(ColumnInfo.Name.AIR_PRESSURE)],
+            data_frame[self.correction_factor_column_name] = (
+                calc_pressure_correction_factor(
+                    data_frame[str(ColumnInfo.Name.AIR_PRESSURE)],
                     self.reference_pressure_value,
-                    row[self.beta_coefficient_col_name],
-                ),
-                axis=1,
+                    self.get_value(data_frame, self.beta_coefficient_col_name),
+                )
             )
             return data_frame
 
@@ -830,19 +925,23 @@ class PressureCorrectionDesiletsZreda2003(PressureCorrection):
         """
         column_name_beta = self.beta_coefficient_col_name
 
-        if is_column_missing_or_empty(data_frame, column_name_beta):
+        if self.is_value_missing(data_frame, column_name_beta):
             message = (
                 "No coefficient given for pressure correction. "
                 "Calculating beta coefficient."
             )
             core_logger.info(message)
-            data_frame[self.beta_coefficient_col_name] = data_frame.apply(
-                lambda row: calc_beta_coefficient_desilets_zreda_2003(
-                    latitude=row[self.latitude_col_name],
-                    elevation=row[self.site_elevation_col_name],
-                    cutoff_rigidity=row[self.site_cutoff_rigidity_col_name],
+            beta_coefficient = calc_beta_coefficient_desilets_zreda_2003(
+                latitude=self.get_value(data_frame, self.latitude_col_name),
+                elevation=self.get_value(
+                    data_frame, self.site_elevation_col_name
                 ),
-                axis=1,
+                cutoff_rigidity=self.get_value(
+                    data_frame, self.site_cutoff_rigidity_col_name
+                ),
+            )
+            self.store_value(
+                data_frame, self.beta_coefficient_col_name, beta_coefficient
             )
 
 
@@ -919,19 +1018,23 @@ class PressureCorrectionDesilets2021(PressureCorrection):
         """
         column_name_beta = self.beta_coefficient_col_name
 
-        if is_column_missing_or_empty(data_frame, column_name_beta):
+        if self.is_value_missing(data_frame, column_name_beta):
             message = (
                 "No coefficient given for pressure correction. "
                 "Calculating beta coefficient."
             )
             core_logger.info(message)
-            data_frame[self.beta_coefficient_col_name] = data_frame.apply(
-                lambda row: calc_beta_coefficient_desilets_2021(
-                    latitude=row[self.latitude_col_name],
-                    elevation=row[self.site_elevation_col_name],
-                    cutoff_rigidity=row[self.site_cutoff_rigidity_col_name],
+            beta_coefficient = calc_beta_coefficient_desilets_2021(
+                latitude=self.get_value(data_frame, self.latitude_col_name),
+                elevation=self.get_value(
+                    data_frame, self.site_elevation_col_name
+                ),
+                cutoff_rigidity=self.get_value(
+                    data_frame, self.site_cutoff_rigidity_col_name
                 ),
-                axis=1,
+            )
+            self.store_value(
+                data_frame, self.beta_coefficient_col_name, beta_coefficient
             )
 
 
@@ -989,17 +1092,19 @@ class PressureCorrectionTiradoBueno2021(PressureCorrection):
         """
         column_name_beta = self.beta_coefficient_col_name
 
-        if is_column_missing_or_empty(data_frame, column_name_beta):
+        if self.is_value_missing(data_frame, column_name_beta):
             message = (
                 "No coefficient given for pressure correction. "
                 "Calculating beta coefficient."
             )
             core_logger.info(message)
-            data_frame[self.beta_coefficient_col_name] = data_frame.apply(
-                lambda row: calc_beta_ceofficient_tirado_bueno_etal_2021(
-                    cutoff_rigidity=row[self.site_cutoff_rigidity_col_name],
+            beta_coefficient = calc_beta_ceofficient_tirado_bueno_etal_2021(
+                cutoff_rigidity=self.get_value(
+                    data_frame, self.site_cutoff_rigidity_col_name
                 ),
-                axis=1,
+            )
+            self.store_value(
+                data_frame, self.beta_coefficient_col_name, beta_coefficient
             )
 
 
@@ -1041,11 +1146,12 @@ class AboveGroundBiomassCorrectionBaatz2015(Correction):
             f"{self.above_ground_biomass_column_name} needs to be in units of "
             "kg m^2."
         )
-        data_frame[self.correction_factor_column_name] = data_frame.apply(
-            lambda row: above_ground_biomass_correction_baatz2015(
-                above_ground_biomass=row[self.above_ground_biomass_column_name]
-            ),
-            axis=1,
+        data_frame[self.correction_factor_column_name] = (
+            above_ground_biomass_correction_baatz2015(
+                above_ground_biomass=data_frame[
+                    self.above_ground_biomass_column_name
+                ]
+            )
         )
 
         return data_frame
@@ -1078,11 +1184,12 @@ class AboveGroundBiomassCorrectionMorris2024(Correction):
             f"{self.above_ground_biomass_column_name} needs to be in units of "
             "mm (i.e., Biomass Water Equivalant)."
         )
-        data_frame[self.correction_factor_column_name] = data_frame.apply(
-            lambda row: above_ground_biomass_correction_morris2024(
-                above_ground_biomass=row[self.above_ground_biomass_column_name]
-            ),
-            axis=1,
+        data_frame[self.correction_factor_column_name] = (
+            above_ground_biomass_correction_morris2024(
+                biomass_water_equivalent=data_frame[
+                    self.above_ground_biomass_column_name
+                ]
+            )
         )
 
         return data_frame
@@ -0,0 +1,542 @@
+"""
+Lookup table backend for the inversion of the UTS function of Köhli et
+al. (2021).
+
+The inverse of the UTS function is tabulated once per parameter set on
+a 2D grid of relative neutron counts (N/N0) and absolute air humidity
+and afterwards interpolated bilinearly. When the table is built, the
+interpolation error of every cell is checked against the exact
+(bisection) inversion on a 5x5 grid of points, including the cell
+edges. Cells with a checked error above half of the maximum absolute
+error, and input values outside of the table, are converted with the
+exact inversion instead. The error bound is therefore a checked bound
+(with a margin for the points between the checked ones), not a
+mathematical guarantee.
+
+Tables are written to disk next to the package assets (or the user
+cache directory when the package folder is read only) and reused
+afterwards.
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Literal
+
+from neptoon.corrections.theory.neutrons_to_soil_moisture import (
+    ArrayLike,
+    grav_soil_moisture_to_neutrons_koehli_etal_2021,
+    neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized,
+    _get_koehli_parameters,
+)
+from neptoon.config.global_configuration import GlobalConfig
+from neptoon.logging import get_logger
+
+core_logger = get_logger()
+
+
+def _default_table_directories():
+    """
+    Directories where lookup tables are searched for (in order). The
+    first writable one is used to store new tables.
+    """
+    this_path = Path(__file__).absolute().parent.parent
+    return [
+        this_path / "assets" / "koehli_lookup_tables",
+        GlobalConfig.get_cache_dir() / "koehli_lookup_tables",
+    ]
+
+
+class KoehliLookupTable:
+    """
+    Error-bounded lookup table of the inverse UTS function.
+
+    The relative neutron count x = N/N0 is normalised for each
+    humidity between the count of dry soil and the count at
+    `max_soil_moisture`,
+
+        u = (x - x_wet(h)) / (x_dry(h) - x_wet(h)),
+
+    and the total gravimetric water content is tabulated against
+    u**(1/warp) and h. The warp refines the grid towards wet soils,
+    where the inverse UTS function is steepest.
+
+    Examples
+    --------
+    >>> table = KoehliLookupTable.load_or_build("Mar21_mcnp_drf")
+    >>> table.neutrons_to_grav_soil_moisture(
+    ...     neutron_count=[1600, 1400, 1200, 1000],
+    ...     n0=3000,
+    ...     abs_air_humidity=[2, 3, 4, 5],
+    ...     additional_gravimetric_water=0.05,
+    ... )
+    """
+
+    # Bump when the layout or construction of the tables changes
+    TABLE_VERSION = 2
+
+    # Positions (relative to the cell size) used to check each cell,
+    # along both axes. The corners are grid nodes and are skipped.
+    _CHECK_POSITIONS = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+    _loaded_tables = {}
+
+    def __init__(
+        self,
+        koehli_parameters: str = "Mar21_mcnp_drf",
+        max_abs_error: float = 0.0001,
+        max_soil_moisture: float = 1.0,
+        max_abs_air_humidity: float = 50.0,
+        n_neutron_steps: int = 1000,
+        n_humidity_steps: int = 101,
+        warp: float = 2.0,
+    ):
+        """
+        Creates an empty table. Use `build()` or `load_or_build()` to
+        fill it.
+
+        Parameters
+        ----------
+        koehli_parameters : str
+            Parameter set of the UTS function
+        max_abs_error : float
+            Checked maximum absolute error of the gravimetric soil
+            moisture (g/g) compared to the exact inversion, by default
+            0.0001
+        max_soil_moisture : float
+            Largest total gravimetric water content (g/g) covered by
+            the table, by default 1.0
+        max_abs_air_humidity : float
+            Largest absolute air humidity (g/m³) covered by the table,
+            by default 50
+        n_neutron_steps : int
+            Number of grid nodes along N/N0, by default 1000
+        n_humidity_steps : int
+            Number of grid nodes along humidity, by default 101
+        warp : float
+            Grid refinement towards wet soils, by default 2
+        """
+        _get_koehli_parameters(koehli_parameters)
+        self.koehli_parameters = koehli_parameters
+        self.max_abs_error = max_abs_error
+        self.max_soil_moisture = max_soil_moisture
+        self.max_abs_air_humidity = max_abs_air_humidity
+        self.n_neutron_steps = n_neutron_steps
+        self.n_humidity_steps = n_humidity_steps
+        self.warp = warp
+
+        self.soil_moisture_grid = None
+        self.valid_cells = None
+        self.achieved_max_abs_error = None
+
+    @property
+    def file_name(self):
+        return f"uts_inverse_{self.koehli_parameters}.npz"
+
+    def _settings(self):
+        """
+        Settings (and UTS parameters) stored with a table, used to
+        decide whether a stored table can be reused.
+        """
+        return np.array(
+            [
+                self.TABLE_VERSION,
+                self.max_abs_error,
+                self.max_soil_moisture,
+                self.max_abs_air_humidity,
+                self.n_neutron_steps,
+                self.n_humidity_steps,
+                self.warp,
+                *_get_koehli_parameters(self.koehli_parameters),
+            ],
+            dtype=float,
+        )
+
+    def _relative_count_bounds(self, abs_air_humidity):
+        """
+        Relative neutron counts of dry soil and of the wettest soil in
+        the table, for the given humidity.
+        """
+        x_dry = grav_soil_moisture_to_neutrons_koehli_etal_2021(
+            gravimetric_sm=0.0,
+            abs_air_humidity=abs_air_humidity,
+            n0=1.0,
+            koehli_parameters=self.koehli_parameters,
+        )
+        x_wet = grav_soil_moisture_to_neutrons_koehli_etal_2021(
+            gravimetric_sm=self.max_soil_moisture,
+            abs_air_humidity=abs_air_humidity,
+            n0=1.0,
+            koehli_parameters=self.koehli_parameters,
+        )
+        return x_dry, x_wet
+
+    def _exact_total_water(self, relative_count, abs_air_humidity):
+        """
+        Total gravimetric water from the (fine tolerance) bisection.
+        """
+        return neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized(
+            neutron_count=relative_count,
+            n0=1.0,
+            abs_air_humidity=abs_air_humidity,
+            koehli_parameters=self.koehli_parameters,
+            tolerance=1e-10,
+        )
+
+    def _grid_coordinates(self, relative_count, abs_air_humidity):
+        """
+        Fractional grid coordinates of the input values. Values outside
+        of the table are returned as NaN.
+        """
+        x_dry, x_wet = self._relative_count_bounds(abs_air_humidity)
+        u = (relative_count - x_wet) / (x_dry - x_wet)
+        inside = (
+            (u >= 0)
+            & (u <= 1)
+            & (abs_air_humidity >= 0)
+            & (abs_air_humidity <= self.max_abs_air_humidity)
+        )
+        u = np.where(inside, u, np.nan)
+        i = u ** (1 / self.warp) * (self.n_neutron_steps - 1)
+        j = (
+            abs_air_humidity
+            / self.max_abs_air_humidity
+            * (self.n_humidity_steps - 1)
+        )
+        return i, np.where(inside, j, np.nan)
+
+    def _interpolate(self, i, j):
+        """
+        Bilinear interpolation at fractional grid coordinates (i, j),
+        which must not be NaN. Returns the values and the cell indices.
+        """
+        i0 = np.clip(np.floor(i).astype(int), 0, self.n_neutron_steps - 2)
+        j0 = np.clip(np.floor(j).astype(int), 0, self.n_humidity_steps - 2)
+        a = i - i0
+        b = j - j0
+        grid = self.soil_moisture_grid
+        values = (
+            grid[i0, j0] * (1 - a) * (1 - b)
+            + grid[i0 + 1, j0] * a * (1 - b)
+            + grid[i0, j0 + 1] * (1 - a) * b
+            + grid[i0 + 1, j0 + 1] * a * b
+        )
+        return values, i0, j0
+
+    def _coordinates_to_values(self, i, j):
+        """
+        Inverse of `_grid_coordinates`.
+        """
+        humidity = j / (self.n_humidity_steps - 1) * self.max_abs_air_humidity
+        x_dry, x_wet = self._relative_count_bounds(humidity)
+        u = (i / (self.n_neutron_steps - 1)) ** self.warp
+        return x_wet + u * (x_dry - x_wet), humidity
+
+    def build(self):
+        """
+        Tabulates the inverse UTS function and checks the interpolation
+        error of every cell against the exact inversion at the
+        _CHECK_POSITIONS. Cells are valid when the largest checked error
+        is at most half of max_abs_error, the margin covers the error
+        between the checked points.
+
+        Returns
+        -------
+        KoehliLookupTable
+            self
+        """
+        core_logger.info(
+            f"Building UTS lookup table for {self.koehli_parameters}"
+        )
+        i, j = np.meshgrid(
+            np.arange(self.n_neutron_steps, dtype=float),
+            np.arange(self.n_humidity_steps, dtype=float),
+            indexing="ij",
+        )
+        relative_count, humidity = self._coordinates_to_values(i, j)
+        self.soil_moisture_grid = self._exact_total_water(
+            relative_count, humidity
+        )
+
+        cell_error = np.zeros(
+            (self.n_neutron_steps - 1, self.n_humidity_steps - 1)
+        )
+        for offset_i in self._CHECK_POSITIONS:
+            for offset_j in self._CHECK_POSITIONS:
+                if offset_i in (0.0, 1.0) and offset_j in (0.0, 1.0):
+                    continue
+                check_i = i[:-1, :-1] + offset_i
+                check_j = j[:-1, :-1] + offset_j
+                relative_count, humidity = self._coordinates_to_values(
+                    check_i, check_j
+                )
+                exact = self._exact_total_water(relative_count, humidity)
+                estimate, _, _ = self._interpolate(check_i, check_j)
+                cell_error = np.fmax(cell_error, np.abs(estimate - exact))
+
+        # Cells are only checked at a few positions, so keep a margin
+        self.valid_cells = cell_error <= 0.5 * self.max_abs_error
+        self.achieved_max_abs_error = float(
+            cell_error[self.valid_cells].max(initial=0.0)
+        )
+        share_invalid = 1 - self.valid_cells.mean()
+        if share_invalid > 0:
+            core_logger.info(
+                f"{share_invalid:.2%} of the UTS lookup table cells for "
+                f"{self.koehli_parameters} exceed the error bound and use "
+                "the exact inversion."
+            )
+        return self
+
+    def save(self, directory: str | Path):
+        """
+        Saves the table as a .npz file in the given directory.
+
+        Parameters
+        ----------
+        directory : str | Path
+            Folder to save the table in
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            directory / self.file_name,
+            settings=self._settings(),
+            soil_moisture_grid=self.soil_moisture_grid,
+            valid_cells=self.valid_cells,
+            achieved_max_abs_error=self.achieved_max_abs_error,
+        )
+
+    def load(self, directory: str | Path):
+        """
+        Loads a table from the given directory.
+
+        Parameters
+        ----------
+        directory : str | Path
+            Folder to look for the table in
+
+        Returns
+        -------
+        bool
+            True if a table with matching settings was loaded
+        """
+        path = Path(directory) / self.file_name
+        if not path.exists():
+            return False
+        try:
+            with np.load(path) as stored:
+                if not np.array_equal(stored["settings"], self._settings()):
+                    return False
+                self.soil_moisture_grid = stored["soil_moisture_grid"]
+                self.valid_cells = stored["valid_cells"]
+                self.achieved_max_abs_error = float(
+                    stored["achieved_max_abs_error"]
+                )
+        except (OSError, ValueError, KeyError) as error:
+            core_logger.warning(f"Could not read lookup table {path}: {error}")
+            return False
+        return True
+
+    @classmethod
+    def load_or_build(
+        cls,
+        koehli_parameters: str = "Mar21_mcnp_drf",
+        directory: str | Path | None = None,
+        **kwargs,
+    ):
+        """
+        Returns the lookup table of a parameter set. Tables are kept in
+        memory once loaded, read from disk when available and otherwise
+        built and saved.
+
+        Parameters
+        ----------
+        koehli_parameters : str
+            Parameter set of the UTS function
+        directory : str | Path | None, optional
+            Folder where tables are stored, by default next to the
+            package assets (or the user cache directory if the package
+            folder is not writable)
+        **kwargs
+            Further settings passed to KoehliLookupTable
+
+        Returns
+        -------
+        KoehliLookupTable
+            The ready to use lookup table
+        """
+        table = cls(koehli_parameters=koehli_parameters, **kwargs)
+        directories = (
+            _default_table_directories()
+            if directory is None
+            else [Path(directory)]
+        )
+        key = (str(directories[0]), tuple(table._settings()))
+        if key in cls._loaded_tables:
+            return cls._loaded_tables[key]
+
+        if not any(table.load(folder) for folder in directories):
+            table.build()
+            for folder in directories:
+                try:
+                    table.save(folder)
+                    break
+                except OSError as error:
+                    core_logger.info(
+                        f"Cannot save lookup table to {folder}: {error}"
+                    )
+        cls._loaded_tables[key] = table
+        return table
+
+    def neutrons_to_grav_soil_moisture(
+        self,
+        neutron_count: ArrayLike,
+        n0: ArrayLike,
+        abs_air_humidity: ArrayLike,
+        additional_gravimetric_water: ArrayLike = 0.0,
+    ):
+        """
+        Converts neutrons to gravimetric soil moisture with the lookup
+        table. Values outside of the table, or in cells where the
+        checked error exceeds the bound, are converted with the exact
+        inversion.
+
+        Parameters
+        ----------
+        neutron_count : ArrayLike
+            Neutron count $N$ (cph)
+        n0 : ArrayLike
+            Neutron scaling parameter ($N_0$ or $N_\\mathrm{D}$)
+        abs_air_humidity : ArrayLike
+            Absolute air humidity, $h$ (g/m³)
+        additional_gravimetric_water : ArrayLike
+            Gravimetric water equivalent of additional hydrogen pools
+            (g/g)
+
+        Returns
+        -------
+        gravimetric_sm : np.ndarray or pd.Series
+            Gravimetric soil moisture (g/g). A pd.Series (with the same
+            index) is returned when neutron_count is a pd.Series.
+        """
+        if self.soil_moisture_grid is None:
+            self.build()
+
+        n_array, n0_array, h_array, a_array = np.broadcast_arrays(
+            np.asarray(neutron_count, dtype=float),
+            np.asarray(n0, dtype=float),
+            np.asarray(abs_air_humidity, dtype=float),
+            np.asarray(additional_gravimetric_water, dtype=float),
+        )
+        gravimetric_sm = np.full(n_array.shape, np.nan)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            i, j = self._grid_coordinates(n_array / n0_array, h_array)
+        in_table = ~(np.isnan(i) | np.isnan(j) | np.isnan(a_array))
+        total_water, i0, j0 = self._interpolate(i[in_table], j[in_table])
+        use_table = np.zeros(n_array.shape, dtype=bool)
+        use_table[in_table] = self.valid_cells[i0, j0]
+
+        # The exact inversion searches between 0 and 2 g/g
+        gravimetric_sm[use_table] = np.clip(
+            total_water[self.valid_cells[i0, j0]] - a_array[use_table],
+            0.0,
+            2.0,
+        )
+
+        use_exact = ~use_table
+        gravimetric_sm[use_exact] = (
+            neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized(
+                neutron_count=n_array[use_exact],
+                n0=n0_array[use_exact],
+                abs_air_humidity=h_array[use_exact],
+                additional_gravimetric_water=a_array[use_exact],
+                koehli_parameters=self.koehli_parameters,
+                tolerance=self.max_abs_error,
+            )
+        )
+
+        if isinstance(neutron_count, pd.Series):
+            return pd.Series(
+                gravimetric_sm,
+                index=neutron_count.index,
+                name=neutron_count.name,
+            )
+        if gravimetric_sm.ndim == 0:
+            return float(gravimetric_sm)
+        return gravimetric_sm
+
+
+def neutrons_to_grav_soil_moisture_koehli_etal_2021_lookup(
+    neutron_count: ArrayLike,
+    n0: ArrayLike,
+    abs_air_humidity: ArrayLike,
+    additional_gravimetric_water: ArrayLike = 0.0,
+    koehli_parameters: Literal[
+        "Jan23_uranos",
+        "Jan23_mcnpfull",
+        "Mar12_atmprof",
+        "Mar21_mcnp_drf",
+        "Mar21_mcnp_ewin",
+        "Mar21_uranos_drf",
+        "Mar21_uranos_ewin",
+        "Mar22_mcnp_drf_Jan",
+        "Mar22_mcnp_ewin_gd",
+        "Mar22_uranos_drf_gd",
+        "Mar22_uranos_ewin_chi2",
+        "Mar22_uranos_drf_h200m",
+        "Aug08_mcnp_drf",
+        "Aug08_mcnp_ewin",
+        "Aug12_uranos_drf",
+        "Aug12_uranos_ewin",
+        "Aug13_uranos_atmprof",
+        "Aug13_uranos_atmprof2",
+    ] = "Mar21_mcnp_drf",
+    max_abs_error: float = 0.0001,
+):
+    """
+    Convert corrected neutron counts and air humidity to gravimetric
+    soil moisture using a precomputed lookup table of the inverse UTS
+    function, Eq. (15) in Köhli et al. (2021). The interpolation error
+    of each table cell is checked against the exact inversion when the
+    table is built, cells with a checked error above half of
+    `max_abs_error` use the exact inversion, so results stay within
+    `max_abs_error` (a checked, not a guaranteed bound). The table is
+    built on first use and cached on disk.
+
+    References
+    ----------
+    * Köhli et al. (2021), Frontiers in Water, doi:[10.3389/frwa.2020.544847](https://doi.org/10.3389/frwa.2020.544847)
+
+    Parameters
+    ----------
+    neutron_count : ArrayLike
+        Neutron count $N$ (cph)
+    n0 : ArrayLike
+        Neutron scaling parameter ($N_0$ or $N_\\mathrm{D}$)
+    abs_air_humidity : ArrayLike
+        Absolute air humidity, $h$ (g/m³)
+    additional_gravimetric_water : ArrayLike
+        Gravimetric water equivalent of additional hydrogen pools, $\\theta_\\mathrm{add}$ (g/g),
+        from lattice water or soil organic carbon, for instance.
+    koehli_parameters : str
+        Parameter set to use.
+    max_abs_error : float
+        Checked maximum absolute error (g/g), by default 0.0001
+
+    Returns
+    -------
+    gravimetric_sm : np.ndarray or pd.Series
+        Gravimetric soil moisture, $\\theta_\\mathrm{grv}$ (g/g)
+    """
+    table = KoehliLookupTable.load_or_build(
+        koehli_parameters=koehli_parameters,
+        max_abs_error=max_abs_error,
+    )
+    return table.neutrons_to_grav_soil_moisture(
+        neutron_count=neutron_count,
+        n0=n0,
+        abs_air_humidity=abs_air_humidity,
+        additional_gravimetric_water=additional_gravimetric_water,
+    )
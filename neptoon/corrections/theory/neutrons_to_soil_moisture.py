@@ -11,6 +11,236 @@ ArrayLike = Union[
     pd.Series,  # pandas series
 ]
 
+# Parameters p0 to p8 of the UTS function, Köhli et al. (2021)
+KOEHLI_PARAMETERS = {
+    "Jan23_uranos": [
+        4.2580,
+        0.0212,
+        0.206,
+        1.776,
+        0.241,
+        -0.00058,
+        -0.02800,
+        0.0003200,
+        -0.0000000180,
+    ],
+    "Jan23_mcnpfull": [
+        7.0000,
+        0.0250,
+        0.233,
+        4.325,
+        0.156,
+        -0.00066,
+        -0.01200,
+        0.0004100,
+        -0.0000000410,
+    ],
+    "Mar12_atmprof": [
+        4.4775,
+        0.0230,
+        0.217,
+        1.540,
+        0.213,
+        -0.00022,
+        -0.03800,
+        0.0003100,
+        -0.0000000003,
+    ],
+    "Mar21_mcnp_drf": [
+        1.0940,
+        0.0280,
+        0.254,
+        3.537,
+        0.139,
+        -0.00140,
+        -0.00880,
+        0.0001150,
+        0.0000000000,
+    ],
+    "Mar21_mcnp_ewin": [
+        1.2650,
+        0.0259,
+        0.135,
+        1.237,
+        0.063,
+        -0.00021,
+        -0.01170,
+        0.0001200,
+        0.0000000000,
+    ],
+    "Mar21_uranos_drf": [
+        1.0240,
+        0.0226,
+        0.207,
+        1.625,
+        0.235,
+        -0.00290,
+        -0.00930,
+        0.0000740,
+        0.0000000000,
+    ],
+    "Mar21_uranos_ewin": [
+        1.2230,
+        0.0185,
+        0.142,
+        2.568,
+        0.155,
+        -0.00047,
+        -0.01190,
+        0.0000920,
+        0.0000000000,
+    ],
+    "Mar22_mcnp_drf_Jan": [
+        1.0820,
+        0.0250,
+        0.235,
+        4.360,
+        0.156,
+        -0.00071,
+        -0.00610,
+        0.0000500,
+        0.0000000000,
+    ],
+    "Mar22_mcnp_ewin_gd": [
+        1.1630,
+        0.0244,
+        0.182,
+        4.358,
+        0.118,
+        -0.00046,
+        -0.00747,
+        0.0000580,
+        0.0000000000,
+    ],
+    "Mar22_uranos_drf_gd": [
+        1.1180,
+        0.0221,
+        0.173,
+        2.300,
+        0.184,
+        -0.00064,
+        -0.01000,
+        0.0000810,
+        0.0000000000,
+    ],
+    "Mar22_uranos_ewin_chi2": [
+        1.0220,
+        0.0218,
+        0.199,
+        1.647,
+        0.243,
+        -0.00029,
+        -0.00960,
+        0.0000780,
+        0.0000000000,
+    ],
+    "Mar22_uranos_drf_h200m": [
+        1.0210,
+        0.0222,
+        0.203,
+        1.600,
+        0.244,
+        -0.00061,
+        -0.00930,
+        0.0000740,
+        0.0000000000,
+    ],
+    "Aug08_mcnp_drf": [
+        1.110773444917129,
+        0.034319446894963,
+        0.180046592985848,
+        1.211393214064259,
+        0.093433803170610,
+        -1.877788035e-005,
+        -0.00698637546803,
+        5.0316941885e-005,
+        0.0000000000,
+    ],
+    "Aug08_mcnp_ewin": [
+        1.271225645585415,
+        0.024790265564895,
+        0.107603498535911,
+        1.243101823658557,
+        0.057146624195463,
+        -1.93729201894976,
+        -0.00866217333051,
+        6.198559205414182,
+        0.0000000000,
+    ],
+    "Aug12_uranos_drf": [
+        1.042588152355816,
+        0.024362250648228,
+        0.222359434641456,
+        1.791314246517330,
+        0.197766380530824,
+        -0.00053814104957,
+        -0.00820189794785,
+        6.6412111902e-005,
+        0.0000000000,
+    ],
+    "Aug12_uranos_ewin": [
+        1.209060105287452,
+        0.021546879683024,
+        0.129925023764294,
+        1.872444149093526,
+        0.128883139550384,
+        -0.00047134595878,
+        -0.01080226893400,
+        8.8939419535e-005,
+        0.0000000000,
+    ],
+    "Aug13_uranos_atmprof": [
+        1.044276170094123,
+        0.024099232055379,
+        0.227317847739138,
+        1.782905159416135,
+        0.198949609723093,
+        -0.00059182327737,
+        -0.00897372356601,
+        7.3282344356e-005,
+        0.0000000000,
+    ],
+    "Aug13_uranos_atmprof2": [
+        4.31237,
+        0.020765,
+        0.21020,
+        1.87120,
+        0.16341,
+        -0.00052,
+        -0.00225,
+        0.000308,
+        -1.9639e-8,
+    ],
+}
+
+
+def _get_koehli_parameters(koehli_parameters: str):
+    """
+    Returns the UTS parameters of a named parameter set.
+
+    Parameters
+    ----------
+    koehli_parameters : str
+        Name of the parameter set, see KOEHLI_PARAMETERS
+
+    Returns
+    -------
+    list
+        The nine parameters p0 to p8 of the UTS function
+
+    Raises
+    ------
+    ValueError
+        When the parameter set is unknown
+    """
+    try:
+        return KOEHLI_PARAMETERS[koehli_parameters]
+    except KeyError:
+        raise ValueError(
+            f"Unknown koehli_parameters: {koehli_parameters}. "
+            f"Choose one of {list(KOEHLI_PARAMETERS)}"
+        )
+
 
 def grav_soil_moisture_to_neutrons_desilets_etal_2010(
     gravimetric_sm: float,
@@ -203,7 +433,7 @@ def neutrons_to_grav_soil_moisture_koehli_etal_2021(
     n0 : float
         Neutron scaling parameter ($N_0$ or $N_\\mathrm{D}$)
     abs_air_humidity : float
-        Absolute air humidity, $h$ (g/cm³)
+        Absolute air humidity, $h$ (g/m³)
     additional_gravimetric_water : float
         Gravimetric water equivalent of additional hydrogen pools, $\\theta_\\mathrm{add}$ (g/g),
         from lattice water or soil organic carbon, for instance.
@@ -265,6 +495,155 @@ def neutrons_to_grav_soil_moisture_koehli_etal_2021(
     return gravimetric_soil_moisture_2
 
 
+def neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized(
+    neutron_count: ArrayLike,
+    n0: ArrayLike,
+    abs_air_humidity: ArrayLike,
+    additional_gravimetric_water: ArrayLike = 0.0,
+    koehli_parameters: Literal[
+        "Jan23_uranos",
+        "Jan23_mcnpfull",
+        "Mar12_atmprof",
+        "Mar21_mcnp_drf",
+        "Mar21_mcnp_ewin",
+        "Mar21_uranos_drf",
+        "Mar21_uranos_ewin",
+        "Mar22_mcnp_drf_Jan",
+        "Mar22_mcnp_ewin_gd",
+        "Mar22_uranos_drf_gd",
+        "Mar22_uranos_ewin_chi2",
+        "Mar22_uranos_drf_h200m",
+        "Aug08_mcnp_drf",
+        "Aug08_mcnp_ewin",
+        "Aug12_uranos_drf",
+        "Aug12_uranos_ewin",
+        "Aug13_uranos_atmprof",
+        "Aug13_uranos_atmprof2",
+    ] = "Mar21_mcnp_drf",
+    tolerance: ArrayLike = 0.0001,
+    max_iterations: int = 100,
+):
+    """
+    Array-native version of
+    `neutrons_to_grav_soil_moisture_koehli_etal_2021`. The UTS function
+    is inverted with a bisection that runs in lockstep over all
+    elements, so that whole time series are converted at once instead
+    of value by value. Results are identical to the scalar version.
+
+    All inputs are broadcast against each other. Elements where the
+    neutron count, the air humidity, the additional water or N0 is NaN
+    are returned as NaN.
+
+    References
+    ----------
+    * Köhli et al. (2021), Frontiers in Water, doi:[10.3389/frwa.2020.544847](https://doi.org/10.3389/frwa.2020.544847)
+
+    Parameters
+    ----------
+    neutron_count : ArrayLike
+        Neutron count $N$ (cph)
+    n0 : ArrayLike
+        Neutron scaling parameter ($N_0$ or $N_\\mathrm{D}$)
+    abs_air_humidity : ArrayLike
+        Absolute air humidity, $h$ (g/m³)
+    additional_gravimetric_water : ArrayLike
+        Gravimetric water equivalent of additional hydrogen pools, $\\theta_\\mathrm{add}$ (g/g),
+        from lattice water or soil organic carbon, for instance.
+    koehli_parameters : str
+        Parameter set to use.
+    tolerance : ArrayLike
+        Width of the bisection interval (g/g) at which an element is
+        considered converged, by default 0.0001 (as in the scalar
+        version). Can be given per element.
+    max_iterations : int
+        Upper limit of bisection steps, by default 100
+
+    Returns
+    -------
+    gravimetric_sm : np.ndarray or pd.Series
+        Gravimetric soil moisture, $\\theta_\\mathrm{grv}$ (g/g). A
+        pd.Series (with the same index) is returned when neutron_count
+        is a pd.Series.
+
+    Examples
+    --------
+    >>> data = pandas.DataFrame()
+    >>> data["N"] = [1600, 1400, 1200, 1000]
+    >>> data["h"] = [2, 3, 4, 5]
+    >>> data["sm_grv"] = neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized(
+    ...     neutron_count=data["N"],
+    ...     n0=3000,
+    ...     abs_air_humidity=data["h"],
+    ...     additional_gravimetric_water=0.05,
+    ... )
+    """
+    _get_koehli_parameters(koehli_parameters)
+
+    n_array, n0_array, h_array, a_array, tol_array = np.broadcast_arrays(
+        np.asarray(neutron_count, dtype=float),
+        np.asarray(n0, dtype=float),
+        np.asarray(abs_air_humidity, dtype=float),
+        np.asarray(additional_gravimetric_water, dtype=float),
+        np.asarray(tolerance, dtype=float),
+    )
+
+    valid = ~(
+        np.isnan(n_array)
+        | np.isnan(n0_array)
+        | np.isnan(h_array)
+        | np.isnan(a_array)
+    )
+    n_array = n_array[valid]
+    n0_array = n0_array[valid]
+    h_array = h_array[valid]
+    a_array = a_array[valid]
+    tol_array = tol_array[valid]
+
+    gravimetric_soil_moisture_0 = np.zeros_like(n_array)
+    gravimetric_soil_moisture_1 = np.full_like(n_array, 2.0)
+    gravimetric_soil_moisture_2 = np.full_like(n_array, np.nan)
+
+    # Only elements that have not yet converged are updated per step
+    active = np.arange(n_array.size)
+    for _ in range(max_iterations):
+        active = active[
+            gravimetric_soil_moisture_1[active]
+            - gravimetric_soil_moisture_0[active]
+            > tol_array[active]
+        ]
+        if active.size == 0:
+            break
+        lower = gravimetric_soil_moisture_0[active]
+        upper = gravimetric_soil_moisture_1[active]
+        middle = (0.5 * lower) + (0.5 * upper)
+        n2 = grav_soil_moisture_to_neutrons_koehli_etal_2021(
+            gravimetric_sm=middle,
+            abs_air_humidity=h_array[active],
+            n0=n0_array[active],
+            koehli_parameters=koehli_parameters,
+            additional_gravimetric_water=a_array[active],
+        )
+        move_lower = n_array[active] < n2
+        gravimetric_soil_moisture_0[active] = np.where(
+            move_lower, middle, lower
+        )
+        gravimetric_soil_moisture_1[active] = np.where(
+            move_lower, upper, middle
+        )
+        gravimetric_soil_moisture_2[active] = middle
+
+    gravimetric_sm = np.full(valid.shape, np.nan)
+    gravimetric_sm[valid] = gravimetric_soil_moisture_2
+
+    if isinstance(neutron_count, pd.Series):
+        return pd.Series(
+            gravimetric_sm, index=neutron_count.index, name=neutron_count.name
+        )
+    if gravimetric_sm.ndim == 0:
+        return float(gravimetric_sm)
+    return gravimetric_sm
+
+
 def grav_soil_moisture_to_neutrons_koehli_etal_2021(
     gravimetric_sm: float,
     abs_air_humidity: float,
@@ -308,7 +687,7 @@ def grav_soil_moisture_to_neutrons_koehli_etal_2021(
     gravimetric_sm : float
         Gravimetric soil moisture, $\\theta_\\mathrm{grv}$ (g/g)
     abs_air_humidity : float
-        Aabsolute air humidity at the site, $h$ (g/cm³)
+        Aabsolute air humidity at the site, $h$ (g/m³)
     n0 : float
         Neutron scaling parameter ($N_0$ or $N_\\mathrm{D}$)
     additional_gravimetric_water : float
@@ -339,227 +718,13 @@ def grav_soil_moisture_to_neutrons_koehli_etal_2021(
     # Rescale to simulated bulk density according to Köhli et al. (2021), Appendix
     soil_moisture_total *= 1.43
 
-    # Numerical check to keep soil moisture above zero
-    if soil_moisture_total == 0.0:
-        soil_moisture_total = 0.001
-    p = []
-
-    if koehli_parameters == "Jan23_uranos":
-        p = [
-            4.2580,
-            0.0212,
-            0.206,
-            1.776,
-            0.241,
-            -0.00058,
-            -0.02800,
-            0.0003200,
-            -0.0000000180,
-        ]
-    elif koehli_parameters == "Jan23_mcnpfull":
-        p = [
-            7.0000,
-            0.0250,
-            0.233,
-            4.325,
-            0.156,
-            -0.00066,
-            -0.01200,
-            0.0004100,
-            -0.0000000410,
-        ]
-    elif koehli_parameters == "Mar12_atmprof":
-        p = [
-            4.4775,
-            0.0230,
-            0.217,
-            1.540,
-            0.213,
-            -0.00022,
-            -0.03800,
-            0.0003100,
-            -0.0000000003,
-        ]
-    elif koehli_parameters == "Mar21_mcnp_drf":
-        p = [
-            1.0940,
-            0.0280,
-            0.254,
-            3.537,
-            0.139,
-            -0.00140,
-            -0.00880,
-            0.0001150,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Mar21_mcnp_ewin":
-        p = [
-            1.2650,
-            0.0259,
-            0.135,
-            1.237,
-            0.063,
-            -0.00021,
-            -0.01170,
-            0.0001200,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Mar21_uranos_drf":
-        p = [
-            1.0240,
-            0.0226,
-            0.207,
-            1.625,
-            0.235,
-            -0.00290,
-            -0.00930,
-            0.0000740,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Mar21_uranos_ewin":
-        p = [
-            1.2230,
-            0.0185,
-            0.142,
-            2.568,
-            0.155,
-            -0.00047,
-            -0.01190,
-            0.0000920,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Mar22_mcnp_drf_Jan":
-        p = [
-            1.0820,
-            0.0250,
-            0.235,
-            4.360,
-            0.156,
-            -0.00071,
-            -0.00610,
-            0.0000500,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Mar22_mcnp_ewin_gd":
-        p = [
-            1.1630,
-            0.0244,
-            0.182,
-            4.358,
-            0.118,
-            -0.00046,
-            -0.00747,
-            0.0000580,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Mar22_uranos_drf_gd":
-        p = [
-            1.1180,
-            0.0221,
-            0.173,
-            2.300,
-            0.184,
-            -0.00064,
-            -0.01000,
-            0.0000810,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Mar22_uranos_ewin_chi2":
-        p = [
-            1.0220,
-            0.0218,
-            0.199,
-            1.647,
-            0.243,
-            -0.00029,
-            -0.00960,
-            0.0000780,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Mar22_uranos_drf_h200m":
-        p = [
-            1.0210,
-            0.0222,
-            0.203,
-            1.600,
-            0.244,
-            -0.00061,
-            -0.00930,
-            0.0000740,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Aug08_mcnp_drf":
-        p = [
-            1.110773444917129,
-            0.034319446894963,
-            0.180046592985848,
-            1.211393214064259,
-            0.093433803170610,
-            -1.877788035e-005,
-            -0.00698637546803,
-            5.0316941885e-005,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Aug08_mcnp_ewin":
-        p = [
-            1.271225645585415,
-            0.024790265564895,
-            0.107603498535911,
-            1.243101823658557,
-            0.057146624195463,
-            -1.93729201894976,
-            -0.00866217333051,
-            6.198559205414182,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Aug12_uranos_drf":
-        p = [
-            1.042588152355816,
-            0.024362250648228,
-            0.222359434641456,
-            1.791314246517330,
-            0.197766380530824,
-            -0.00053814104957,
-            -0.00820189794785,
-            6.6412111902e-005,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Aug12_uranos_ewin":
-        p = [
-            1.209060105287452,
-            0.021546879683024,
-            0.129925023764294,
-            1.872444149093526,
-            0.128883139550384,
-            -0.00047134595878,
-            -0.01080226893400,
-            8.8939419535e-005,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Aug13_uranos_atmprof":
-        p = [
-            1.044276170094123,
-            0.024099232055379,
-            0.227317847739138,
-            1.782905159416135,
-            0.198949609723093,
-            -0.00059182327737,
-            -0.00897372356601,
-            7.3282344356e-005,
-            0.0000000000,
-        ]
-    elif koehli_parameters == "Aug13_uranos_atmprof2":
-        p = [
-            4.31237,
-            0.020765,
-            0.21020,
-            1.87120,
-            0.16341,
-            -0.00052,
-            -0.00225,
-            0.000308,
-            -1.9639e-8,
-        ]
+    # Numerical check to keep soil moisture above zero (written so that
+    # it works elementwise for scalars, arrays and pandas objects alike)
+    soil_moisture_total = soil_moisture_total + 0.001 * (
+        soil_moisture_total == 0.0
+    )
+
+    p = _get_koehli_parameters(koehli_parameters)
 
     N = (p[1] + p[2] * soil_moisture_total) / (soil_moisture_total + p[1]) * (
         p[0]
@@ -571,6 +736,110 @@ def grav_soil_moisture_to_neutrons_koehli_etal_2021(
     return N * n0
 
 
+# Error metrics available in find_n0
+N0_METRICS = (
+    "rmse",
+    "mae",
+    "mse",
+    "mape",
+    "rmspe",
+    "log_mse",
+    "relative_rmse",
+)
+
+
+def _n0_calibration_error(
+    n0: ArrayLike,
+    neutron_count: np.ndarray,
+    neutrons_per_n0: np.ndarray,
+    metric: str,
+):
+    """
+    Error between measured neutron counts and the counts estimated with
+    N0, along the last axis. NaN samples are ignored.
+
+    Parameters
+    ----------
+    n0 : ArrayLike
+        N0, a scalar or one value per row of neutron_count
+    neutron_count : np.ndarray
+        Measured neutron counts (cph)
+    neutrons_per_n0 : np.ndarray
+        Neutron counts estimated with N0 = 1
+    metric : str
+        One of N0_METRICS
+
+    Returns
+    -------
+    np.ndarray
+        The error of each row
+    """
+    neutron_estimates = np.asarray(n0, dtype=float)[..., np.newaxis] * (
+        neutrons_per_n0
+    )
+    errors = neutron_count - neutron_estimates
+    if metric == "rmse":
+        return np.sqrt(np.nanmean(errors**2, axis=-1))
+    elif metric == "mae":
+        return np.nanmean(np.abs(errors), axis=-1)
+    elif metric == "mse":
+        return np.nanmean(errors**2, axis=-1)
+    elif metric == "mape":
+        # Mean Absolute Percentage Error - good for non-linear functions
+        return np.nanmean(np.abs(errors / neutron_count), axis=-1) * 100
+    elif metric == "rmspe":
+        # Root Mean Square Percentage Error
+        return (
+            np.sqrt(np.nanmean((errors / neutron_count) ** 2, axis=-1)) * 100
+        )
+    elif metric == "log_mse":
+        # Log-scale MSE - reduces impact of large values
+        log_n = np.log(np.maximum(neutron_count, 1e-10))  # Avoid log(0)
+        log_estimates = np.log(np.maximum(neutron_estimates, 1e-10))
+        return np.nanmean((log_n - log_estimates) ** 2, axis=-1)
+    elif metric == "relative_rmse":
+        # Relative RMSE - normalized by target values
+        relative_errors = errors / np.maximum(np.abs(neutron_count), 1e-10)
+        return np.sqrt(np.nanmean(relative_errors**2, axis=-1))
+
+
+def _closed_form_n0(
+    neutron_count: np.ndarray,
+    neutrons_per_n0: np.ndarray,
+    metric: str,
+):
+    """
+    Least-squares N0 along the last axis. Both conversion theories are
+    linear in N0 (N = N0 * f), so the N0 minimising the (weighted) sum
+    of squared errors is sum(w * N * f) / sum(w * f**2). NaN samples
+    are ignored.
+
+    Parameters
+    ----------
+    neutron_count : np.ndarray
+        Measured neutron counts (cph)
+    neutrons_per_n0 : np.ndarray
+        Neutron counts estimated with N0 = 1
+    metric : str
+        "mse" or "rmse" (w = 1), "rmspe" or "relative_rmse"
+        (w = 1 / N**2)
+
+    Returns
+    -------
+    np.ndarray
+        N0 of each row
+    """
+    if metric in ("mse", "rmse"):
+        weights = 1.0
+    elif metric == "rmspe":
+        weights = 1 / neutron_count**2
+    elif metric == "relative_rmse":
+        weights = 1 / np.maximum(np.abs(neutron_count), 1e-10) ** 2
+    return np.nansum(
+        weights * neutron_count * neutrons_per_n0, axis=-1
+    ) / np.nansum(weights * neutrons_per_n0**2, axis=-1)
+
+
 def find_n0(
     gravimetric_sm: ArrayLike,
     neutron_count: ArrayLike,
@@ -607,7 +876,6 @@ def find_n0(
         "mape",
         "rmspe",
         "log_mse",
-        "log_mse",
         "relative_rmse",
     ] = "rmse",
     return_error: bool = False,
@@ -615,7 +883,14 @@ def find_n0(
     """
     Finds the neutron scaling parameter, $N_0$ for Desilets et al. (2010)
     or $N_\\mathrm{D}$ for Köhli et al. (2021). The function works with scalar
-    input (single calibration day) or vectorized input (multiple days).
+    input (single calibration day), vectorized input (multiple days) or
+    stacked 2-D input (one row of calibration days per site).
+
+    Both theories are linear in $N_0$, so the neutron counts per unit
+    $N_0$ are computed once for all samples. For the metrics 'mse',
+    'rmse', 'rmspe' and 'relative_rmse' the optimal $N_0$ is the
+    closed-form (weighted) least-squares solution; the other metrics are
+    minimised numerically.
 
     References
     ----------
@@ -629,7 +904,7 @@ def find_n0(
     neutron_count : float
         Neutron count in counts per hour (cph)
     abs_air_humidity : float
-        absolute air humidity (g/cm³)
+        absolute air humidity (g/m³)
     additional_gravimetric_water : float
         Gravimetric water equivalent of additional hydrogen pools (g/g),
         from lattice water or soil organic carbon, for instance.
@@ -638,9 +913,16 @@ def find_n0(
     koehli_parameters: str
         Parameter set for the Köhli Eq.
     metric:
-        Error metric to optimize, one of: 'rmse',  'mae',  'mse',  'mape',  'rmspe',  'log_mse',  'log_mse', 'relative_rmse'
+        Error metric to optimize, one of: 'rmse',  'mae',  'mse',  'mape',  'rmspe',  'log_mse', 'relative_rmse'
     return_error: bool
-        If true, return a second value representing the RMSE
+        If true, return a second value representing the error metric
+
+    Returns
+    -------
+    n0 : float or np.ndarray
+        $N_0$, or one $N_0$ per site (row) for 2-D input. Samples where
+        any input is NaN are ignored, so sites with fewer calibration
+        days can be padded with NaN.
 
     Examples
     --------
@@ -654,78 +936,76 @@ def find_n0(
     ... )
     >>> print(f"N0 = {N0:.0f} ± {rmse:.0f}")
     3165 ± 46
+
+    Two sites in one call, the second with a single calibration day:
+
+    >>> N0 = find_n0(
+    ...    gravimetric_sm=[[0.292, 0.032], [0.15, np.nan]],
+    ...    neutron_count=[[1000, 1650], [1200, np.nan]],
+    ... )
+    >>> print(N0.round())
+    [1780. 1773.]
     """
     from scipy.optimize import minimize_scalar
 
-    # Broadcast ArrayLike input to same-lengths arrays
+    if metric not in N0_METRICS:
+        raise ValueError(f"Error: Invalid metric selected: {metric}")
+
+    # Broadcast ArrayLike input to same-shape arrays
     n_array, sm_array, h_array, a_array = np.broadcast_arrays(
-        np.atleast_1d(neutron_count),
-        np.atleast_1d(gravimetric_sm),
-        np.atleast_1d(abs_air_humidity),
-        np.atleast_1d(additional_gravimetric_water),
+        np.atleast_1d(np.asarray(neutron_count, dtype=float)),
+        np.atleast_1d(np.asarray(gravimetric_sm, dtype=float)),
+        np.atleast_1d(np.asarray(abs_air_humidity, dtype=float)),
+        np.atleast_1d(np.asarray(additional_gravimetric_water, dtype=float)),
     )
+    if n_array.ndim > 2:
+        raise ValueError(
+            "Inputs must be 1-D (calibration days) or 2-D "
+            f"(sites x calibration days), got {n_array.ndim} dimensions"
+        )
 
-    def _obj_n0(n0_try):
-        if conversion_theory == "koehli_etal_2021":
-            neutron_estimates = np.array(
-                [
-                    grav_soil_moisture_to_neutrons_koehli_etal_2021(
-                        gravimetric_sm=sm_i,
-                        abs_air_humidity=h_i,
-                        n0=n0_try,
-                        additional_gravimetric_water=a_i,
-                        koehli_parameters=koehli_parameters,
-                    )
-                    for sm_i, h_i, a_i in zip(sm_array, h_array, a_array)
-                ]
-            )
-        elif conversion_theory == "desilets_etal_2010":
-            neutron_estimates = np.array(
-                [
-                    grav_soil_moisture_to_neutrons_desilets_etal_2010(
-                        gravimetric_sm=sm_i,
-                        n0=n0_try,
-                        additional_gravimetric_water=a_i,
-                        a0=desilets_parameters[0],
-                        a1=desilets_parameters[1],
-                        a2=desilets_parameters[2],
-                    )
-                    for sm_i, a_i in zip(sm_array, a_array)
-                ]
-            )
-
-        errors = n_array - neutron_estimates
-        if metric == "rmse":
-            return np.sqrt(np.mean(errors**2))
-        elif metric == "mae":
-            return np.mean(np.abs(errors))
-        elif metric == "mse":
-            return np.mean(errors**2)
-        elif metric == "mape":
-            # Mean Absolute Percentage Error - good for non-linear functions
-            return np.mean(np.abs(errors / n_array)) * 100
-        elif metric == "rmspe":
-            # Root Mean Square Percentage Error
-            return np.sqrt(np.mean((errors / n_array) ** 2)) * 100
-        elif metric == "log_mse":
-            # Log-scale MSE - reduces impact of large values
-            log_n = np.log(np.maximum(n_array, 1e-10))  # Avoid log(0)
-            log_estimates = np.log(np.maximum(neutron_estimates, 1e-10))
-            return np.mean((log_n - log_estimates) ** 2)
-        elif metric == "log_mse":
-            # Relative RMSE - normalized by target values
-            relative_errors = errors / np.maximum(np.abs(n_array), 1e-10)
-            return np.sqrt(np.mean(relative_errors**2))
-        elif metric == "relative_rmse":
-            # Relative RMSE - normalized by target values
-            relative_errors = errors / np.maximum(np.abs(n_array), 1e-10)
-            return np.sqrt(np.mean(relative_errors**2))
-        else:
-            raise ValueError(f"Error: Invalid metric selected: {metric}")
+    if conversion_theory == "koehli_etal_2021":
+        neutrons_per_n0 = grav_soil_moisture_to_neutrons_koehli_etal_2021(
+            gravimetric_sm=sm_array,
+            abs_air_humidity=h_array,
+            n0=1.0,
+            additional_gravimetric_water=a_array,
+            koehli_parameters=koehli_parameters,
+        )
+    elif conversion_theory == "desilets_etal_2010":
+        neutrons_per_n0 = grav_soil_moisture_to_neutrons_desilets_etal_2010(
+            gravimetric_sm=sm_array,
+            n0=1.0,
+            additional_gravimetric_water=a_array,
+            a0=desilets_parameters[0],
+            a1=desilets_parameters[1],
+            a2=desilets_parameters[2],
+        )
+    missing = np.isnan(n_array) | np.isnan(neutrons_per_n0)
+    n_array = np.where(missing, np.nan, n_array)
+    neutrons_per_n0 = np.where(missing, np.nan, neutrons_per_n0)
 
-    n0 = minimize_scalar(_obj_n0).x
+    if metric in ("mse", "rmse", "rmspe", "relative_rmse"):
+        n0 = _closed_form_n0(n_array, neutrons_per_n0, metric)
+    else:
+        n0 = np.array(
+            [
+                minimize_scalar(
+                    _n0_calibration_error,
+                    args=(n_site, per_n0_site, metric),
+                ).x
+                for n_site, per_n0_site in zip(
+                    n_array.reshape(-1, n_array.shape[-1]),
+                    neutrons_per_n0.reshape(-1, n_array.shape[-1]),
+                )
+            ]
+        ).reshape(n_array.shape[:-1])
+
+    error = _n0_calibration_error(n0, n_array, neutrons_per_n0, metric)
+    if n_array.ndim == 1:
+        n0, error = float(n0), float(error)
 
     if return_error:
-        return n0, _obj_n0(n0)
+        return n0, error
     else:
         return n0
@@ -205,7 +205,7 @@ def calc_beta_coefficient_desilets_2021(latitude, elevation, cutoff_rigidity):
         * (atmospheric_depth**4 - mean_pressure**4)
     )
 
-    beta_ceoff = abs(
+    beta_ceoff = np.abs(
         (term1 + term2 + term3 + term4) / (mean_pressure - atmospheric_depth)
     )
 
@@ -1 +1 @@
-from .nmdb_data_collection import fetch_nmdb_data
+from .nmdb_data_collection import fetch_nmdb_data, prefetch_nmdb_data
@@ -1,17 +1,34 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import json
 import logging
+import os
+import numpy as np
 import pandas as pd
+import shutil
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 from io import StringIO
 from dateutil import parser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from neptoon.columns import ColumnInfo
 from neptoon.config.global_configuration import GlobalConfig
 from neptoon.logging import get_logger
+from neptoon.utils.file_lock import FileLock, call_with_retries
 
 core_logger = get_logger()
 
+NMDB_BASE_URL = "https://www.nmdb.eu/nest/draw_graph.php"
+# HTTP status codes after which a request is retried
+_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Days before today which NMDB stations may not have published yet
+_NMDB_PUBLICATION_LAG = pd.Timedelta(days=7)
+
 NMDB_REFERENCES = {
     "AATB": 157,
     "INVK": 111,
@@ -42,6 +59,122 @@ NMDB_CUTOFF_RIGIDITIES = {
     "THUL": 0,
 }
 
+# How NMDB counts are mapped onto the timestamps of the CRNS data
+INTERPOLATION_METHODS = ("nearest", "linear", "previous")
+# What to do with days missing from the cache which are not downloaded
+MISSING_DATA_POLICIES = ("error", "fill_edges")
+
+
+def _epoch_ns(index):
+    """
+    Nanoseconds since the epoch (UTC) of a DatetimeIndex. Time zone
+    naive timestamps are presumed to be UTC.
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+def align_series_to_index(
+    series,
+    index,
+    interpolation="nearest",
+    tolerance=None,
+):
+    """
+    Maps the values of a time series onto other timestamps.
+
+    Both time axes are converted to int64 epochs and the source is
+    sorted once, after which every timestamp is located with a binary
+    search (O((n + m) log m)). The target is never reordered or copied.
+
+    Parameters
+    ----------
+    series : pd.Series
+        The values to map, with a DatetimeIndex
+    index : pd.DatetimeIndex
+        The timestamps to map onto
+    interpolation : {"nearest", "linear", "previous"}, optional
+        - "nearest": value of the closest timestamp (the later one when
+          both are equally close)
+        - "linear": linear interpolation between the surrounding
+          values, ignoring missing values. Outside of the series the
+          first or last value is used.
+        - "previous": value of the last timestamp at or before,
+          missing before the start of the series
+        by default "nearest"
+    tolerance : str | pd.Timedelta | None, optional
+        Timestamps further than this from the timestamp(s) their value
+        comes from are left missing, by default None (no limit)
+
+    Returns
+    -------
+    np.ndarray
+        The mapped values (float), one per timestamp in index
+    """
+    if interpolation not in INTERPOLATION_METHODS:
+        message = (
+            f"Unknown interpolation '{interpolation}', choose one of "
+            f"{INTERPOLATION_METHODS}"
+        )
+        core_logger.error(message)
+        raise ValueError(message)
+    source_times = _epoch_ns(series.index)
+    source_values = series.to_numpy(dtype=float)
+    if not np.all(source_times[1:] >= source_times[:-1]):
+        order = np.argsort(source_times, kind="stable")
+        source_times = source_times[order]
+        source_values = source_values[order]
+    if interpolation == "linear":
+        valid = ~np.isnan(source_values)
+        source_times = source_times[valid]
+        source_values = source_values[valid]
+    target_times = _epoch_ns(index)
+    result = np.full(len(target_times), np.nan)
+    if len(source_times) == 0 or len(target_times) == 0:
+        return result
+
+    after = np.searchsorted(source_times, target_times, side="right")
+    before = after - 1
+    has_before = before >= 0
+    has_after = after < len(source_times)
+    before = np.clip(before, 0, len(source_times) - 1)
+    after = np.clip(after, 0, len(source_times) - 1)
+    distance_before = np.where(
+        has_before, target_times - source_times[before], np.inf
+    )
+    distance_after = np.where(
+        has_after, source_times[after] - target_times, np.inf
+    )
+
+    if interpolation == "previous":
+        result[has_before] = source_values[before][has_before]
+        distance = distance_before
+    elif interpolation == "nearest":
+        # ties go to the later timestamp, as in pd.Series.reindex
+        use_before = distance_before < distance_after
+        result = np.where(
+            use_before, source_values[before], source_values[after]
+        )
+        distance = np.minimum(distance_before, distance_after)
+    else:
+        result = np.interp(target_times, source_times, source_values)
+        exact = distance_before == 0
+        distance = np.where(
+            exact,
+            0,
+            np.where(
+                has_before & has_after,
+                np.maximum(distance_before, distance_after),
+                np.minimum(distance_before, distance_after),
+            ),
+        )
+
+    if tolerance is not None:
+        result[distance > pd.Timedelta(tolerance).value] = np.nan
+    return result
+
 
 class NMDBDataAttacher:
     """
@@ -72,6 +205,8 @@ class NMDBDataAttacher:
         """
         self.data_frame = data_frame
         self._new_column_name = new_column_name
+        self.interpolation = "nearest"
+        self.tolerance = None
 
     @property
     def new_column_name(self):
@@ -83,9 +218,55 @@ class NMDBDataAttacher:
         reference_value: int | None = None,
         resolution="60",
         nmdb_table="revori",
+        base_url=None,
+        interpolation="nearest",
+        tolerance=None,
+        offline=False,
+        max_staleness=None,
+        missing_data_policy="error",
     ):
-        start_date_from_data = self.data_frame.index[0]
-        end_date_from_data = self.data_frame.index[-1]
+        """
+        Configures the NMDB data to attach.
+
+        Parameters
+        ----------
+        station : str
+            The NMDB station, e.g., "JUNG"
+        reference_value : int | None, optional
+            Reference value of the monitor, by default None (taken from
+            NMDB_REFERENCES)
+        resolution : str, optional
+            Resolution in minutes, by default "60"
+        nmdb_table : str, optional
+            The NMDB table, by default "revori"
+        base_url : str, optional
+            URL of the NMDB.eu data service, by default None
+        interpolation : {"nearest", "linear", "previous"}, optional
+            How NMDB counts are mapped onto the timestamps of the data,
+            by default "nearest" (see align_series_to_index)
+        tolerance : str | pd.Timedelta | None, optional
+            Timestamps further than this from the NMDB data they are
+            mapped from are left empty, by default None (no limit)
+        offline : bool, optional
+            Only use the cache, never download, by default False
+        max_staleness : str | pd.Timedelta | None, optional
+            How far the cache may lag behind today before recent data is
+            downloaded, by default None (always download)
+        missing_data_policy : {"error", "fill_edges"}, optional
+            What to do with days missing from the cache which are not
+            downloaded, by default "error" (see NMDBConfig)
+        """
+        if interpolation not in INTERPOLATION_METHODS:
+            message = (
+                f"Unknown interpolation '{interpolation}', choose one of "
+                f"{INTERPOLATION_METHODS}"
+            )
+            core_logger.error(message)
+            raise ValueError(message)
+        self.interpolation = interpolation
+        self.tolerance = tolerance
+        start_date_from_data = self.data_frame.index.min()
+        end_date_from_data = self.data_frame.index.max()
         self.config = NMDBConfig(
             start_date_wanted=start_date_from_data,
             end_date_wanted=end_date_from_data,
@@ -93,6 +274,10 @@ class NMDBDataAttacher:
             reference_value=reference_value,
             resolution=resolution,
             nmdb_table=nmdb_table,
+            base_url=base_url,
+            offline=offline,
+            max_staleness=max_staleness,
+            missing_data_policy=missing_data_policy,
         )
 
     def fetch_data(self):
@@ -130,10 +315,12 @@ class NMDBDataAttacher:
         if not isinstance(self.tmp_data.index, pd.DatetimeIndex):
             raise ValueError("DataFrame source must have a DatetimeIndex.")
 
-        mapped_data = self.tmp_data["count"].reindex(
-            self.data_frame.index, method="nearest"
+        self.data_frame[self.new_column_name] = align_series_to_index(
+            self.tmp_data["count"],
+            self.data_frame.index,
+            interpolation=self.interpolation,
+            tolerance=self.tolerance,
         )
-        self.data_frame[self.new_column_name] = mapped_data
         self.data_frame[
             str(ColumnInfo.Name.REFERENCE_INCOMING_NEUTRON_VALUE)
         ] = self.config.reference_value
@@ -294,9 +481,52 @@ class NMDBConfig:
     end_date_needed : str or None, optional
         End date for which data needs to be fetched, considering cached
         data. None if all data is cached.
+    cache_date_ranges : list
+        The [start, end] date ranges covered by the cache, set when the
+        cache range is checked.
     use_cache : bool, optional
         whether to use cached data, ignore the cache entirely, defaults
         to True
+    use_memory_cache : bool, optional
+        Whether data read from the cache is kept in memory (see
+        CacheHandler.memory_cache) for later calls in the same process.
+        Defaults to True.
+    base_url : str or None, optional
+        URL of the NMDB.eu data service (e.g., a mirror or a local test
+        server). If None, NMDB_BASE_URL is used.
+    download_workers : int, optional
+        Number of chunks downloaded at the same time. Defaults to 4.
+    chunk_months : int, optional
+        Number of months requested per download chunk. Defaults to 1.
+    max_retries : int, optional
+        Number of times a failed request is retried, with exponential
+        backoff. Defaults to 3.
+    request_timeout : float, optional
+        Timeout in seconds for a single request. Defaults to 60.
+    offline : bool, optional
+        Only serve data from the cache and never connect to NMDB.eu
+        (e.g., on machines without internet access). Days missing from
+        the cache are handled with missing_data_policy. Defaults to
+        False.
+    max_staleness : str or pd.Timedelta or None, optional
+        How far the end of the cache may lag behind today before recent
+        data is downloaded, e.g., "7D". Days after the end of a cache
+        which is fresher than this are not downloaded, and the last
+        cached value is used for them (as with "fill_edges"). None
+        always downloads missing days. Defaults to None.
+    missing_data_policy : str, optional
+        What to do when days in the wanted range are missing from the
+        cache in offline mode:
+
+        - "error": raise a ValueError listing the missing days before
+          any data is used.
+        - "fill_edges": use the cached data, and hold the first
+          (last) cached value from the start (until the end) of the
+          wanted range. Gaps inside the range are bridged when the data
+          is attached. An error is still raised if no data in the
+          wanted range is cached.
+
+        Defaults to "error".
 
     """
 
@@ -315,7 +545,23 @@ class NMDBConfig:
         start_date_needed=None,
         end_date_needed=None,
         use_cache=True,
+        use_memory_cache=True,
+        base_url=None,
+        download_workers=4,
+        chunk_months=1,
+        max_retries=3,
+        request_timeout=60,
+        offline=False,
+        max_staleness=None,
+        missing_data_policy="error",
     ):
+        if missing_data_policy not in MISSING_DATA_POLICIES:
+            message = (
+                f"Unknown missing_data_policy '{missing_data_policy}', "
+                f"choose one of {MISSING_DATA_POLICIES}"
+            )
+            core_logger.error(message)
+            raise ValueError(message)
         self._start_date_wanted = start_date_wanted
         self._end_date_wanted = end_date_wanted
         self._cache_dir = cache_dir
@@ -328,7 +574,19 @@ class NMDBConfig:
         self.cache_end_date = cache_end_date
         self.start_date_needed = start_date_needed
         self.end_date_needed = end_date_needed
+        self.cache_date_ranges = []
         self.use_cache = use_cache
+        self.use_memory_cache = use_memory_cache
+        self.base_url = base_url if base_url is not None else NMDB_BASE_URL
+        self.download_workers = download_workers
+        self.chunk_months = chunk_months
+        self.max_retries = max_retries
+        self.request_timeout = request_timeout
+        self.offline = offline
+        self.max_staleness = (
+            pd.Timedelta(max_staleness) if max_staleness is not None else None
+        )
+        self.missing_data_policy = missing_data_policy
 
     @property
     def start_date_wanted(self):
@@ -380,6 +638,290 @@ class TermsDisplayManager:
         cls._displayed_stations.add(station)
 
 
+def merge_date_ranges(date_ranges):
+    """
+    Merges overlapping and adjacent date ranges.
+
+    Parameters
+    ----------
+    date_ranges : list
+        List of [start, end] dates ("YYYY-mm-dd", inclusive)
+
+    Returns
+    -------
+    list
+        Sorted list of disjoint [start, end] dates
+    """
+    merged = []
+    for start, end in sorted(
+        (pd.Timestamp(str(start)), pd.Timestamp(str(end)))
+        for start, end in date_ranges
+    ):
+        if merged and start <= merged[-1][1] + pd.Timedelta(days=1):
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [
+        [start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")]
+        for start, end in merged
+    ]
+
+
+def find_missing_date_ranges(start_date, end_date, covered_ranges):
+    """
+    Finds the smallest set of date ranges between start_date and
+    end_date which are not covered.
+
+    Parameters
+    ----------
+    start_date : str or datetime
+        First day wanted
+    end_date : str or datetime
+        Last day wanted (inclusive)
+    covered_ranges : list
+        List of [start, end] dates already available
+
+    Returns
+    -------
+    list
+        List of (start, end) dates ("YYYY-mm-dd", inclusive) to download
+    """
+    one_day = pd.Timedelta(days=1)
+    start = pd.Timestamp(str(start_date)).normalize()
+    end = pd.Timestamp(str(end_date)).normalize()
+    missing = []
+    for covered_start, covered_end in merge_date_ranges(covered_ranges):
+        covered_start = pd.Timestamp(covered_start)
+        covered_end = pd.Timestamp(covered_end)
+        if covered_end < start:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > start:
+            missing.append((start, covered_start - one_day))
+        start = covered_end + one_day
+    if start <= end:
+        missing.append((start, end))
+    return [
+        (start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+        for start, end in missing
+    ]
+
+
+def date_ranges_from_index(index):
+    """
+    Date ranges of consecutive days which hold data.
+
+    Parameters
+    ----------
+    index : pd.DatetimeIndex
+        Index of the data
+
+    Returns
+    -------
+    list
+        List of [start, end] dates
+    """
+    days = pd.DatetimeIndex(index).normalize().unique().sort_values()
+    if days.empty:
+        return []
+    new_range = days[1:] - days[:-1] > pd.Timedelta(days=1)
+    starts = [days[0], *days[1:][new_range]]
+    ends = [*days[:-1][new_range], days[-1]]
+    return [
+        [start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")]
+        for start, end in zip(starts, ends)
+    ]
+
+
+class NMDBFrameCache:
+    """
+    In memory least recently used cache of NMDB data frames.
+
+    Each entry holds the cached data of one year of a station,
+    resolution and table (and cache directory), together with the
+    modification time and size of its Parquet file when it was read. An
+    entry is only used while the file is unchanged, so data added by
+    another process is picked up. When the frames held are larger than
+    max_bytes, the least recently used frames are dropped.
+
+    The sidecar of each cache (covered ranges and years) is held as
+    well, with the signatures of the yearly files, so that reads of an
+    unchanged cache only need to check the sidecar (see
+    CacheHandler.read_cache).
+
+    Example
+    -------
+    >>> CacheHandler.memory_cache.max_bytes = 512 * 1024**2
+    >>> CacheHandler.memory_cache.stats()
+    {'hits': 3, 'misses': 1, 'evictions': 0, 'entries': 1, 'bytes': ...}
+    """
+
+    def __init__(self, max_bytes=256 * 1024**2):
+        """
+        Parameters
+        ----------
+        max_bytes : int, optional
+            Maximum memory used by the frames held, by default 256 MiB.
+            Frames larger than this are not held.
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._sidecars = {}
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        """Memory used by the frames held."""
+        return sum(entry["nbytes"] for entry in self._entries.values())
+
+    def get(self, key, signature):
+        """
+        Returns the frame stored under key, or None if there is none or
+        it was stored with a different signature.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the frame
+        signature : tuple or None
+            The current state of the cache on disk
+
+        Returns
+        -------
+        pd.DataFrame or None
+            The frame
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["signature"] != signature:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["frame"]
+
+    def put(self, key, signature, frame):
+        """
+        Stores a frame, dropping the least recently used frames to stay
+        within max_bytes.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the frame
+        signature : tuple or None
+            The state of the cache on disk the frame was read from
+        frame : pd.DataFrame
+            The frame
+        """
+        nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            self._entries.pop(key, None)
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = {
+                "signature": signature,
+                "frame": frame,
+                "nbytes": nbytes,
+            }
+            while self.nbytes > self.max_bytes:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_sidecar(self, key, signature):
+        """
+        Returns the sidecar stored under key, or None if there is none
+        or it was stored with a different signature.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the cache
+        signature : tuple or None
+            The current state of the sidecar file
+
+        Returns
+        -------
+        tuple or None
+            (sidecar, signatures of the yearly files)
+        """
+        with self._lock:
+            entry = self._sidecars.get(key)
+            if entry is None or entry["signature"] != signature:
+                return None
+            return entry["sidecar"], entry["partition_signatures"]
+
+    def put_sidecar(self, key, signature, sidecar, partition_signatures):
+        """
+        Stores the sidecar of a cache.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the cache
+        signature : tuple
+            The state of the sidecar file it was read from
+        sidecar : dict
+            The sidecar (see CacheHandler.read_sidecar)
+        partition_signatures : dict
+            year: signature of the file of the year
+        """
+        with self._lock:
+            self._sidecars[key] = {
+                "signature": signature,
+                "sidecar": sidecar,
+                "partition_signatures": partition_signatures,
+            }
+
+    def invalidate(self, key):
+        """
+        Drops the frame (and sidecar) stored under key, and those
+        stored under keys which start with key (e.g., all years of a
+        station).
+
+        Parameters
+        ----------
+        key : tuple
+            The key, or the start of the keys, of the frames
+        """
+        with self._lock:
+            for entries in (self._entries, self._sidecars):
+                for entry_key in list(entries):
+                    if entry_key[: len(key)] == key:
+                        del entries[entry_key]
+
+    def clear(self):
+        """Drops all frames and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._sidecars.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """
+        Returns the counters of the cache.
+
+        Returns
+        -------
+        dict
+            hits, misses, evictions, entries and bytes held
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+            }
+
+
 class CacheHandler:
     """
     Class to handle cache management using downloaded NMDB data
@@ -388,6 +930,24 @@ class CacheHandler:
     deletion of the cache. As default it will be stored in the usual
     operating system cache location.
 
+    The cache of each station, resolution and table is a folder with
+    one Parquet file per year of data, and a small JSON sidecar holding
+    the exact date ranges covered by the cache (there can be gaps).
+    Range checks only read the sidecar, and new data only rewrites the
+    years it falls in. Caches stored as a single CSV file (older
+    versions of neptoon) are migrated automatically.
+
+    Data read from disk is kept in `memory_cache`, an NMDBFrameCache
+    shared by all instances, one frame per year, so later reads in the
+    same process are served from memory. While the sidecar is unchanged
+    (every write replaces it), such reads only check the sidecar.
+
+    Several processes can share the cache: files are written to a
+    temporary file and renamed, writes hold an exclusive lock on a lock
+    file next to the cache folder (one per station, resolution and
+    table), reads hold a shared lock, and reads are retried when a file
+    changes underneath them.
+
     Parameters
     ----------
     config : NMDBConfig
@@ -398,25 +958,33 @@ class CacheHandler:
     ----------
     config : NMDBConfig
         Stores the configuration settings for NMDB data retrieval.
+    memory_cache : NMDBFrameCache
+        In memory cache of the data, shared by all instances.
     _cache_file_path : Path or None
-        The file path to the cache file, dynamically determined based on
-        the NMDBConfig settings.
+        The file path to the (legacy) CSV cache file, dynamically
+        determined based on the NMDBConfig settings.
+    _cache_directory : Path or None
+        The folder of the partitioned cache, dynamically determined
+        based on the NMDBConfig settings.
 
     Methods
     -------
     update_cache_file_path()
-        Updates the cache file path based on the current NMDBConfig
+        Updates the cache paths based on the current NMDBConfig
         settings.
     check_cache_file_exists()
-        Checks for the existence of the cache file and updates the
-        configuration accordingly.
-    read_cache()
-        Reads the cached NMDB data from the file and returns it as a
-        DataFrame.
+        Checks for the existence of the cache (migrating a CSV cache)
+        and updates the configuration accordingly.
+    read_cache(start_date, end_date)
+        Reads the cached NMDB data of the years in the date range and
+        returns it as a DataFrame.
     write_cache(cache_df)
-        Writes a DataFrame to the cache file location.
+        Replaces the cache with a DataFrame.
+    append_cache(new_df, covered_ranges)
+        Adds data to the cache, rewriting only the affected years, and
+        records the date ranges it covers.
     delete_cache()
-        Deletes the cache file associated with the current NMDBConfig
+        Deletes the cache associated with the current NMDBConfig
         settings.
     check_cache_range()
         Determines the range of dates available in the cache and updates
@@ -428,65 +996,366 @@ class CacheHandler:
     >>>             end_date_wanted='2023-01-31', station='JUNG')
     >>> cache_handler = CacheHandler(config)
     >>> cache_handler.update_cache_file_path()
-    >>> print(cache_handler.cache_file_path)
+    >>> print(cache_handler.cache_directory)
     """
 
+    CACHE_VERSION = 1
+    SIDECAR_FILE_NAME = "ranges.json"
+    # seconds to wait for the lock held by another process
+    LOCK_TIMEOUT = 600
+    memory_cache = NMDBFrameCache()
+
     def __init__(self, config):
         self.config = config
         self._cache_file_path = None
+        self._cache_directory = None
+        self._lock = None
+        self._lock_depth = 0
         self.update_cache_file_path()
 
     def update_cache_file_path(self):
-        """Update the cache file path based on the current configuration."""
+        """Update the cache paths based on the current configuration."""
+        cache_name = (
+            f"nmdb_{self.config.station}_resolution_{self.config.resolution}"
+            f"_nmdbtable_{self.config.nmdb_table}"
+        )
         self._cache_file_path = (
-            Path(self.config.cache_dir)
-            / f"nmdb_{self.config.station}_resolution_{self.config.resolution}"
-            f"_nmdbtable_{self.config.nmdb_table}.csv"
+            Path(self.config.cache_dir) / f"{cache_name}.csv"
         )
+        self._cache_directory = Path(self.config.cache_dir) / cache_name
 
     @property
     def cache_file_path(self):
+        """Path of the CSV cache file used by older versions."""
         return self._cache_file_path
 
     @cache_file_path.setter
     def cache_file_path(self, value):
         self._cache_file_path = value
 
+    @property
+    def cache_directory(self):
+        return self._cache_directory
+
+    @cache_directory.setter
+    def cache_directory(self, value):
+        self._cache_directory = Path(value)
+
+    @property
+    def sidecar_path(self):
+        return self.cache_directory / self.SIDECAR_FILE_NAME
+
+    @property
+    def lock_path(self):
+        """Lock file of the cache, next to the cache folder."""
+        return self.cache_directory.with_name(
+            self.cache_directory.name + ".lock"
+        )
+
+    @contextmanager
+    def locked(self, shared=False):
+        """
+        Holds the lock of the cache. Nested calls reuse the lock which
+        is already held.
+
+        Parameters
+        ----------
+        shared : bool, optional
+            Take a shared (read) lock, by default False (exclusive)
+        """
+        if self._lock_depth > 0:
+            if not shared and self._lock.shared:
+                message = "Cannot upgrade a shared cache lock to exclusive"
+                core_logger.error(message)
+                raise RuntimeError(message)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        self._lock = FileLock(
+            self.lock_path, shared=shared, timeout=self.LOCK_TIMEOUT
+        )
+        with self._lock:
+            self._lock_depth = 1
+            try:
+                yield
+            finally:
+                self._lock_depth = 0
+                self._lock = None
+
+    @property
+    def memory_cache_key(self):
+        return (
+            self.config.station,
+            str(self.config.resolution),
+            self.config.nmdb_table,
+            str(self.cache_directory),
+        )
+
+    def _sidecar_signature(self):
+        """
+        Inode, modification time and size of the sidecar, None if
+        absent. The sidecar is replaced by every write, so an unchanged
+        signature means the cache is unchanged.
+        """
+        try:
+            stat = os.stat(self.sidecar_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _partition_signature(self, year):
+        """
+        Modification time and size of the file of a year, None if
+        absent.
+        """
+        try:
+            stat = os.stat(self.partition_path(year))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def partition_path(self, year):
+        """Path of the Parquet file holding the data of a year."""
+        return self.cache_directory / f"{year}.parquet"
+
     def check_cache_file_exists(self):
         """
-        Checks the existence of the cache file and sets the property in
-        config
+        Checks the existence of the cache and sets the property in
+        config. A CSV cache from an older version is migrated first.
 
         Returns
         -------
         None
         """
-        if self.cache_file_path.exists():
+        if self.cache_file_path is not None and self.cache_file_path.exists():
+            with self.locked():
+                # another process may have migrated it in the meantime
+                if self.cache_file_path.exists():
+                    self.migrate_csv_cache()
+        if self.sidecar_path.exists():
             self.config.cache_exists = True
 
-    def read_cache(self):
+    def migrate_csv_cache(self):
+        """
+        Converts a CSV cache file into the partitioned cache and deletes
+        the CSV file.
+
+        Returns
+        -------
+        None
         """
-        Reads cache nmdb file and formats index
+        df = pd.read_csv(self.cache_file_path)
+        df["datetime"] = pd.to_datetime(df["datetime"])
+        df.set_index("datetime", inplace=True)
+        df.index = self._to_utc(df.index)
+        # days without data (e.g., failed downloads) are not covered
+        self.append_cache(df)
+        self.cache_file_path.unlink(missing_ok=True)
+        core_logger.info(
+            f"Migrated NMDB cache {self.cache_file_path} to "
+            f"{self.cache_directory}"
+        )
+
+    @staticmethod
+    def _to_utc(index):
+        """Localises or converts a DatetimeIndex to UTC."""
+        if index.tz is None:
+            return index.tz_localize("UTC")
+        return index.tz_convert("UTC")
+
+    def read_sidecar(self):
+        """
+        Reads the covered date ranges and cached years from the sidecar.
+
+        Returns
+        -------
+        dict
+            {"ranges": [[start, end], ...], "years": [...]}, with dates
+            as "YYYY-mm-dd" strings. Empty lists if there is no cache.
+        """
+
+        def read():
+            try:
+                with open(self.sidecar_path) as file:
+                    return json.load(file)
+            except FileNotFoundError:
+                return {}
+
+        sidecar = call_with_retries(read)
+        return {
+            "ranges": sidecar.get("ranges", []),
+            "years": sidecar.get("years", []),
+        }
+
+    def _write_sidecar(self, ranges, years):
+        """Writes the sidecar, replacing the existing one."""
+        self._write_atomic(
+            self.sidecar_path,
+            lambda path: path.write_text(
+                json.dumps(
+                    {
+                        "version": self.CACHE_VERSION,
+                        "ranges": ranges,
+                        "years": sorted(years),
+                    }
+                )
+            ),
+        )
+
+    @staticmethod
+    def _write_atomic(path, write):
+        """
+        Writes a file to a temporary path and renames it, so that
+        readers never see a partly written file.
+        """
+        temp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            write(temp_path)
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def _write_partition(self, year, df):
+        """Writes the data of a single year."""
+        self._write_atomic(
+            self.partition_path(year),
+            lambda path: df.to_parquet(path),
+        )
+
+    def _read_partition(self, year):
+        """
+        Reads the data of a single year, retrying when the file is
+        replaced while it is read.
+        """
+        df = call_with_retries(
+            lambda: pd.read_parquet(self.partition_path(year))
+        )
+        df.index = self._to_utc(df.index)
+        df.index.name = "datetime"
+        return df
+
+    def read_cache(self, start_date=None, end_date=None):
+        """
+        Reads cache nmdb file and formats index. Only the years in the
+        date range are read. The data of each year is served from the
+        memory cache when its file is unchanged, otherwise it is read
+        from disk (and kept in memory when config.use_memory_cache).
+
+        With the memory cache, the sidecar and the signatures of the
+        yearly files are held in memory as well. While the sidecar is
+        unchanged, a read only checks the sidecar signature (one
+        os.stat), without taking the lock. Otherwise the sidecar is read
+        and the yearly files are checked under the shared lock.
+
+        Parameters
+        ----------
+        start_date : str or datetime, optional
+            First day of data to return, by default None (all data)
+        end_date : str or datetime, optional
+            Last day of data to return (inclusive), by default None (all
+            data)
 
         Returns
         -------
         df : pd.DataFrame
             DataFrame from the cache file
         """
-        if self.config.cache_exists:
-            df = pd.read_csv(self.cache_file_path)
-            df["datetime"] = pd.to_datetime(df["datetime"])
-            df.set_index("datetime", inplace=True)
-            if df.index.tzinfo is None:
-                df.index = df.index.tz_localize("UTC")
-            else:
-                df.index = df.index.tz_convert("UTC")
-            return df
+        if not self.config.cache_exists:
+            return None
+        start = end = None
+        if start_date is not None:
+            start = pd.Timestamp(str(start_date)).tz_localize("UTC")
+        if end_date is not None:
+            end = pd.Timestamp(str(end_date)).tz_localize(
+                "UTC"
+            ) + pd.Timedelta(days=1)
+
+        df = None
+        if self.config.use_memory_cache:
+            held = self.memory_cache.get_sidecar(
+                self.memory_cache_key, self._sidecar_signature()
+            )
+            if held is not None:
+                sidecar, partition_signatures = held
+                try:
+                    df = self._read_years(
+                        self._years_in_range(sidecar["years"], start, end),
+                        partition_signatures,
+                    )
+                except FileNotFoundError:
+                    # deleted since the sidecar was checked
+                    df = None
+        if df is None:
+            with self.locked(shared=True):
+                signature = self._sidecar_signature()
+                sidecar = self.read_sidecar()
+                partition_signatures = None
+                if self.config.use_memory_cache:
+                    partition_signatures = {
+                        year: self._partition_signature(year)
+                        for year in sidecar["years"]
+                    }
+                    if signature is not None:
+                        self.memory_cache.put_sidecar(
+                            self.memory_cache_key,
+                            signature,
+                            sidecar,
+                            partition_signatures,
+                        )
+                df = self._read_years(
+                    self._years_in_range(sidecar["years"], start, end),
+                    partition_signatures,
+                )
+        first = 0 if start is None else df.index.searchsorted(start)
+        last = (
+            len(df) if end is None else df.index.searchsorted(end, side="left")
+        )
+        return df.iloc[first:last].copy()
+
+    @staticmethod
+    def _years_in_range(years, start, end):
+        """The cached years between the start and end timestamps."""
+        if start is not None:
+            years = [year for year in years if year >= start.year]
+        if end is not None:
+            years = [year for year in years if year <= end.year]
+        return years
+
+    def _read_years(self, years, partition_signatures=None):
+        """
+        Reads the data of the given years, sorted by date. With
+        partition_signatures (year: signature of the file), years held
+        in the memory cache are not read from disk.
+        """
+        frames = []
+        for year in sorted(years):
+            if partition_signatures is None:
+                frames.append(self._read_partition(year))
+                continue
+            key = self.memory_cache_key + (year,)
+            signature = partition_signatures.get(year)
+            frame = self.memory_cache.get(key, signature)
+            if frame is None:
+                frame = self._read_partition(year)
+                self.memory_cache.put(key, signature, frame)
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(
+                {"count": pd.Series(dtype=float)},
+                index=pd.DatetimeIndex([], tz="UTC", name="datetime"),
+            )
+        return pd.concat(frames)
 
     def write_cache(self, cache_df):
         """
-        Write NMDB data to the cache location using the cache_file_path
-        attribute as a name.
+        Write NMDB data to the cache location, replacing the existing
+        cache. The data is stored in one file per year, and the days
+        holding data are recorded as covered.
 
         Parameters
         ----------
@@ -499,22 +1368,82 @@ class CacheHandler:
         if cache_df.empty:
             logging.warning("Attempting to write an empty DataFrame to cache.")
             return
-        cache_df.to_csv(self.cache_file_path)
+        with self.locked():
+            self.delete_cache()
+            self.append_cache(cache_df)
+
+    def append_cache(self, new_df, covered_ranges=None):
+        """
+        Adds data to the cache. Only the years in which the new data
+        falls are rewritten, and data already in the cache is kept.
+
+        Parameters
+        ----------
+        new_df : pd.DataFrame
+            The data to add
+        covered_ranges : list, optional
+            List of [start, end] dates covered by the new data, e.g.,
+            the dates requested from NMDB.eu (which may include days
+            without data at the station). If None, the days holding
+            data are used, by default None
+
+        Returns
+        -------
+        None
+        """
+        with self.locked():
+            if covered_ranges is None:
+                covered_ranges = date_ranges_from_index(new_df.index)
+            if new_df.empty and not covered_ranges:
+                logging.warning(
+                    "Attempting to write an empty DataFrame to cache."
+                )
+                return
+            self.cache_directory.mkdir(parents=True, exist_ok=True)
+            new_df = new_df.copy()
+            new_df.index = self._to_utc(pd.DatetimeIndex(new_df.index))
+            new_df.index.name = "datetime"
+            sidecar = self.read_sidecar()
+            years = set(sidecar["years"])
+            for year, df_year in new_df.groupby(new_df.index.year):
+                if year in years:
+                    df_year = pd.concat([self._read_partition(year), df_year])
+                    df_year = df_year[~df_year.index.duplicated(keep="first")]
+                self._write_partition(year, df_year.sort_index())
+                self.memory_cache.invalidate(
+                    self.memory_cache_key + (int(year),)
+                )
+                years.add(int(year))
+
+            self._write_sidecar(
+                ranges=merge_date_ranges(
+                    sidecar["ranges"] + list(covered_ranges)
+                ),
+                years=years,
+            )
+            self.config.cache_exists = True
 
     def delete_cache(self):
         """
-        Delete the cache file related to the current instance. E.g. if
-        downloading hourly data for JUNG it will delete the file
+        Delete the cache related to the current instance. E.g. if
+        downloading hourly data for JUNG it will delete the files
         associated with hourly JUNG from the cache.
 
         Return
         ------
         None
         """
-        if self.cache_file_path.exists():
-            self.cache_file_path.unlink(missing_ok=True)
-        logging.info("Cache file deleted")
-        self.config.cache_exists = False
+        with self.locked():
+            if (
+                self.cache_file_path is not None
+                and self.cache_file_path.exists()
+            ):
+                self.cache_file_path.unlink(missing_ok=True)
+            if self.cache_directory.exists():
+                shutil.rmtree(self.cache_directory)
+            self.memory_cache.invalidate(self.memory_cache_key)
+            logging.info("Cache file deleted")
+            self.config.cache_exists = False
 
     def check_cache_range(self):
         """
@@ -523,15 +1452,20 @@ class CacheHandler:
         will either declare none existance of the cache, or update the
         start and end date of the cache.
 
+        Only the sidecar is read.
+
         Returns
         -------
         None
         """
         self.check_cache_file_exists()
-        if self.config.cache_exists:
-            df_cache = self.read_cache()
-            self.config.cache_start_date = df_cache.index.min().date()
-            self.config.cache_end_date = df_cache.index.max().date()
+        ranges = (
+            self.read_sidecar()["ranges"] if self.config.cache_exists else []
+        )
+        if ranges:
+            self.config.cache_start_date = pd.to_datetime(ranges[0][0]).date()
+            self.config.cache_end_date = pd.to_datetime(ranges[-1][1]).date()
+            self.config.cache_date_ranges = ranges
         else:
             logging.info("There is no Cache file")
             self.config.cache_exists = False
@@ -551,10 +1485,13 @@ class DataFetcher:
     get_ymd_from_date(date)
         static method which parses the date into seperate values to
         represent year, month and day
-    create_nmdb_url()
+    split_date_range(start_date, end_date, chunk_months)
+        static method which splits a date range into chunks of whole
+        months
+    create_nmdb_url(start_date, end_date)
         creates the url to request data from NMDB.eu, based on values in
         the configuration file
-    fetch_data_http()
+    fetch_data_http(start_date, end_date)
         uses the created url to request data from NMDB.eu and returns
         the text from the response
     parse_http_date(raw_data)
@@ -566,6 +1503,73 @@ class DataFetcher:
 
     def __init__(self, config):
         self.config = config
+        self._session = None
+
+    @property
+    def session(self):
+        """
+        requests.Session shared by all downloads of the DataFetcher.
+        Connections are pooled, and failed requests (connection errors
+        and the status codes in _RETRY_STATUS_CODES) are retried with
+        exponential backoff.
+        """
+        if self._session is None:
+            retry = Retry(
+                total=self.config.max_retries,
+                backoff_factor=0.5,
+                status_forcelist=_RETRY_STATUS_CODES,
+                allowed_methods=["GET"],
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=max(1, self.config.download_workers),
+                max_retries=retry,
+            )
+            self._session = requests.Session()
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        return self._session
+
+    @staticmethod
+    def split_date_range(start_date, end_date, chunk_months=1):
+        """
+        Splits a date range into chunks of whole calendar months. The
+        first and last chunk may be shorter.
+
+        Parameters
+        ----------
+        start_date : str or datetime
+            First day of the range
+        end_date : str or datetime
+            Last day of the range (inclusive)
+        chunk_months : int, optional
+            Number of months per chunk, by default 1
+
+        Returns
+        -------
+        list
+            List of (start, end) dates as "YYYY-mm-dd" strings
+        """
+        start = pd.Timestamp(str(start_date)).normalize()
+        end = pd.Timestamp(str(end_date)).normalize()
+        if end < start:
+            return [(start.strftime("%Y-%m-%d"), start.strftime("%Y-%m-%d"))]
+        chunk_starts = [start] + [
+            month_start
+            for month_start in pd.date_range(
+                start, end, freq=f"{chunk_months}MS"
+            )
+            if month_start > start
+        ]
+        chunk_ends = [
+            chunk_start - pd.Timedelta(days=1)
+            for chunk_start in chunk_starts[1:]
+        ] + [end]
+        return [
+            (chunk_start.strftime("%Y-%m-%d"), chunk_end.strftime("%Y-%m-%d"))
+            for chunk_start, chunk_end in zip(chunk_starts, chunk_ends)
+        ]
 
     @staticmethod
     def get_ymd_from_date(date):
@@ -588,25 +1592,45 @@ class DataFetcher:
         year, month, day = standardized_date.split("-")
         return year, month, day
 
-    def create_nmdb_url(self):
+    def _set_dates_needed(self):
+        """
+        Uses the wanted dates as the dates to download if these have not
+        been set from the cache.
+        """
+        if self.config.start_date_needed is None:
+            self.config.start_date_needed = self.config.start_date_wanted
+        if self.config.end_date_needed is None:
+            self.config.end_date_needed = self.config.end_date_wanted
+
+    def create_nmdb_url(self, start_date=None, end_date=None):
         """
         Creates the URL for obtaining the data using HTTP
 
+        Parameters
+        ----------
+        start_date : str or None, optional
+            First day to request, by default the start_date_needed of
+            the config
+        end_date : str or None, optional
+            Last day to request, by default the end_date_needed of the
+            config
+
         Returns
         -------
         url : str
             URL as a string
         """
-        if self.config.start_date_needed is None:
-            self.config.start_date_needed = self.config.start_date_wanted
-        if self.config.end_date_needed is None:
-            self.config.end_date_needed = self.config.end_date_wanted
-        sy, sm, sd = self.get_ymd_from_date(self.config.start_date_needed)
-        ey, em, ed = self.get_ymd_from_date(self.config.end_date_needed)
+        self._set_dates_needed()
+        if start_date is None:
+            start_date = self.config.start_date_needed
+        if end_date is None:
+            end_date = self.config.end_date_needed
+        sy, sm, sd = self.get_ymd_from_date(start_date)
+        ey, em, ed = self.get_ymd_from_date(end_date)
 
         nmdb_form = "wget"
         url = (
-            f"https://www.nmdb.eu/nest/draw_graph.php?{nmdb_form}=1"
+            f"{self.config.base_url}?{nmdb_form}=1"
             f"&stations[]={self.config.station}"
             f"&tabchoice={self.config.nmdb_table}"
             f"&dtype=corr_for_efficiency"
@@ -618,21 +1642,38 @@ class DataFetcher:
         )
         return url
 
-    def fetch_data_http(self):
+    def fetch_data_http(self, start_date=None, end_date=None):
         """
         Fetches the data using http from NMDB.eu and processes it
 
+        Parameters
+        ----------
+        start_date : str or None, optional
+            First day to request, by default the start_date_needed of
+            the config
+        end_date : str or None, optional
+            Last day to request, by default the end_date_needed of the
+            config
+
         Returns
         -------
         Text : str
             Returns the text from the http site
         """
-        url = self.create_nmdb_url()
-        response = requests.get(url)
+        url = self.create_nmdb_url(start_date=start_date, end_date=end_date)
+        response = self.session.get(url, timeout=self.config.request_timeout)
         response.raise_for_status()
 
         return response.text
 
+    @staticmethod
+    def is_date_unavailable(raw_data):
+        """
+        Whether NMDB.eu responded that the requested dates are not
+        available at the station.
+        """
+        return str(raw_data)[4:9] == "Sorry"
+
     def parse_http_data(self, raw_data):
         """
         Parse the HTTP response data into a dataframe
@@ -668,12 +1709,8 @@ class DataFetcher:
 
         """
         # if date has not been covered we raise an error
-        if str(raw_data)[4:9] == "Sorry":
-            raise ValueError(
-                "Request date is not avalaible at ",
-                self.config.station,
-                " station, try other Neutron Monitoring station",
-            )
+        if self.is_date_unavailable(raw_data):
+            self.raise_date_unavailable()
         data = StringIO(raw_data)
         try:
             data = pd.read_csv(data, delimiter=";", comment="#")
@@ -698,6 +1735,11 @@ class DataFetcher:
         `fetch_data_http` to retrieve the data and `parse_http_data` to
         transform it into a usable format.
 
+        The date range is split into chunks of `chunk_months` months,
+        which are downloaded concurrently (`download_workers` at a time)
+        and assembled in order. Chunks for which the station has no data
+        are skipped.
+
         Returns
         -------
         pd.DataFrame
@@ -717,8 +1759,103 @@ class DataFetcher:
         >>> df = nmdb_data_handler.fetch_and_parse_http_data()
         >>> print(df.head())
         """
-        raw_data = self.fetch_data_http()
-        return self.parse_http_data(raw_data)
+        self._set_dates_needed()
+        results = self.fetch_chunks(
+            [(self.config.start_date_needed, self.config.end_date_needed)]
+        )
+        for _, _, error in results:
+            if error is not None:
+                raise error
+        return self.combine_chunks(results)
+
+    def _fetch_chunk(self, chunk):
+        """
+        Downloads and parses a single chunk.
+
+        Returns
+        -------
+        tuple
+            (chunk, data or None when unavailable, error or None)
+        """
+        try:
+            raw_data = self.fetch_data_http(*chunk)
+        except requests.exceptions.RequestException as error:
+            core_logger.warning(
+                f"Download of NMDB data from {chunk[0]} to {chunk[1]} "
+                f"failed: {error}"
+            )
+            return chunk, None, error
+        if self.is_date_unavailable(raw_data):
+            return chunk, None, None
+        return chunk, self.parse_http_data(raw_data), None
+
+    def fetch_chunks(self, date_ranges):
+        """
+        Downloads date ranges in chunks of `chunk_months` months, with
+        `download_workers` chunks at the same time. A failed chunk does
+        not stop the other chunks.
+
+        Parameters
+        ----------
+        date_ranges : list
+            List of (start, end) dates to download
+
+        Returns
+        -------
+        list
+            (chunk, data, error) for each chunk, in order. chunk is the
+            (start, end) of the chunk, data is None if the station has
+            no data in the chunk or the download failed, error is the
+            exception of a failed download
+        """
+        chunks = [
+            chunk
+            for start_date, end_date in date_ranges
+            for chunk in self.split_date_range(
+                start_date, end_date, chunk_months=self.config.chunk_months
+            )
+        ]
+        workers = max(1, min(self.config.download_workers, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._fetch_chunk, chunks))
+
+    def combine_chunks(self, results):
+        """
+        Assembles the data of downloaded chunks in order.
+
+        Parameters
+        ----------
+        results : list
+            The results of fetch_chunks
+
+        Returns
+        -------
+        pd.DataFrame
+            The data of all chunks
+
+        Raises
+        ------
+        ValueError
+            If no chunk holds data
+        """
+        frames = [data for _, data, _ in results if data is not None]
+        if not frames:
+            self.raise_date_unavailable()
+        if len(frames) < len(results):
+            core_logger.warning(
+                f"{len(results) - len(frames)} of {len(results)} "
+                f"months are not available at {self.config.station}."
+            )
+        data = pd.concat(frames)
+        return data[~data.index.duplicated(keep="first")]
+
+    def raise_date_unavailable(self):
+        """Raises the error for dates not available at the station."""
+        raise ValueError(
+            "Request date is not avalaible at ",
+            self.config.station,
+            " station, try other Neutron Monitoring station",
+        )
 
 
 class DataManager:
@@ -745,9 +1882,16 @@ class DataManager:
         Indicates if data before the cached range is needed.
     need_data_after_cache : bool or None
         Indicates if data after the cached range is needed.
+    missing_date_ranges : list
+        The (start, end) date ranges not covered by the cache.
 
     Methods
     -------
+    find_missing_date_ranges()
+        Finds the date ranges wanted which are not covered by the
+        cache, including gaps inside the cached period.
+    download_missing_data()
+        Downloads the missing date ranges into the cache.
     check_if_need_extra_data()
         Evaluates the need for fetching data outside the current cache
         range.
@@ -780,6 +1924,124 @@ class DataManager:
         self.data_fetcher = data_fetcher
         self.need_data_before_cache = None
         self.need_data_after_cache = None
+        self.missing_date_ranges = []
+
+    def find_missing_date_ranges(self):
+        """
+        Finds the smallest set of date ranges between the wanted dates
+        which are not covered by the cache. Gaps inside the cached
+        period (e.g., left by a failed download) are included.
+
+        Returns
+        -------
+        list
+            List of (start, end) dates to download
+        """
+        self.cache_handler.check_cache_range()
+        covered_ranges = (
+            self.config.cache_date_ranges if self.config.cache_exists else []
+        )
+        self.missing_date_ranges = find_missing_date_ranges(
+            self.config.start_date_wanted,
+            self.config.end_date_wanted,
+            covered_ranges,
+        )
+        return self.missing_date_ranges
+
+    @staticmethod
+    def _covered_range(chunk, data=None):
+        """
+        The range covered by a downloaded chunk. Today is not covered,
+        as its data is not complete yet.
+
+        Stations may publish the data of the last days
+        (_NMDB_PUBLICATION_LAG) later. A chunk which ends in this period
+        is only covered up to the last complete day of the data
+        returned, and not at all when no data was returned, so that the
+        missing days are requested again.
+
+        Parameters
+        ----------
+        chunk : tuple
+            (start, end) dates of the chunk
+        data : pd.DataFrame | None, optional
+            The data returned for the chunk, by default None
+
+        Returns
+        -------
+        list | None
+            [start, end] dates covered, or None
+        """
+        start, end = (pd.Timestamp(date) for date in chunk)
+        today = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+        end = min(end, today - pd.Timedelta(days=1))
+        if end >= today - _NMDB_PUBLICATION_LAG:
+            times = (
+                data.dropna().index.tz_convert(None)
+                if data is not None
+                else pd.DatetimeIndex([])
+            )
+            if times.empty:
+                return None
+            last_time = times.max()
+            step = (
+                pd.Series(times).diff().median()
+                if len(times) > 1
+                else pd.Timedelta(days=1)
+            )
+            last_complete_day = last_time.normalize()
+            if (last_time + step).normalize() == last_complete_day:
+                # the last day returned is not complete
+                last_complete_day -= pd.Timedelta(days=1)
+            end = min(end, last_complete_day)
+        if end < start:
+            return None
+        return [start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")]
+
+    def download_missing_data(self):
+        """
+        Downloads the missing date ranges and adds them to the cache.
+        Chunks which were downloaded are stored even if other chunks
+        failed, so that a later call only downloads what is still
+        missing.
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            The error of the first failed chunk, after the other chunks
+            were stored
+        """
+        results = self.data_fetcher.fetch_chunks(self.missing_date_ranges)
+        frames = [data for _, data, _ in results if data is not None]
+        covered_ranges = [
+            self._covered_range(chunk, data)
+            for chunk, data, error in results
+            if error is None
+        ]
+        new_df = (
+            pd.concat(frames)
+            if frames
+            else pd.DataFrame(
+                {"count": pd.Series(dtype=float)},
+                index=pd.DatetimeIndex([], tz="UTC", name="datetime"),
+            )
+        )
+        self.cache_handler.append_cache(
+            new_df,
+            covered_ranges=[
+                date_range
+                for date_range in covered_ranges
+                if date_range is not None
+            ],
+        )
+        errors = [error for _, _, error in results if error is not None]
+        if errors:
+            message = (
+                f"Download of {len(errors)} of {len(results)} NMDB chunks "
+                f"failed. The other chunks were added to the cache."
+            )
+            core_logger.error(message)
+            raise errors[0]
 
     def check_if_need_extra_data(self):
         """
@@ -931,6 +2193,8 @@ class NMDBDataHandler:
         """
         Collects NMDB data based on the specified configuration, using
         cached data when available and fetching new data as necessary.
+        In offline mode only the cache is used, and days missing from it
+        are handled with config.missing_data_policy.
 
         Returns
         -------
@@ -939,6 +2203,13 @@ class NMDBDataHandler:
             This may be a combination of cached and newly fetched data,
             or solely from one source, depending on availability.
 
+        Raises
+        ------
+        ValueError
+            In offline mode, when days are missing from the cache and
+            missing_data_policy is "error", or when no data in the
+            wanted range is cached.
+
         Examples
         --------
         Assuming `config` has been defined and passed to
@@ -951,38 +2222,160 @@ class NMDBDataHandler:
         instantiated with a valid `NMDBConfig`.
         """
 
-        self.cache_handler.check_cache_file_exists()
-        if self.config.cache_exists and self.config.use_cache:
-            self.cache_handler.check_cache_range()
-            self.data_manager.check_if_need_extra_data()
-            if (
-                self.data_manager.need_data_before_cache is False
-                and self.data_manager.need_data_after_cache is False
-            ):
-                core_logger.info("All data is present in the cache.")
-                df_cache = self.cache_handler.read_cache()
-                return df_cache
-
-            else:
-                self.data_manager.set_dates_for_nmdb_download()
-                df_cache = self.cache_handler.read_cache()
-                df_download = self.data_fetcher.fetch_and_parse_http_data()
-                df_combined = self.data_manager.combine_cache_and_new_data(
-                    df_cache, df_download
+        if not self.config.use_cache:
+            if self.config.offline:
+                message = (
+                    "NMDB data cannot be collected offline without the cache."
                 )
-                self.cache_handler.write_cache(df_combined)
-                return df_combined
-        else:
+                core_logger.error(message)
+                raise ValueError(message)
+            return self.data_fetcher.fetch_and_parse_http_data()
+
+        self.cache_handler.check_cache_file_exists()
+        if not self.config.cache_exists:
             core_logger.info(
                 f"No cache file found at"
-                f" {self.cache_handler.cache_file_path}."
+                f" {self.cache_handler.cache_directory}."
+            )
+        missing_date_ranges = self.data_manager.find_missing_date_ranges()
+        not_downloaded = []
+        recent = None
+        if self.config.offline:
+            not_downloaded = missing_date_ranges
+        elif missing_date_ranges:
+            missing_date_ranges, recent = self._split_recent_date_ranges(
+                missing_date_ranges
+            )
+            self.data_manager.missing_date_ranges = missing_date_ranges
+            if recent:
+                core_logger.info(
+                    f"The cache ends on {self.config.cache_end_date}, "
+                    f"within max_staleness ({self.config.max_staleness}). "
+                    f"{recent} is not downloaded."
+                )
+        if not_downloaded and self.config.missing_data_policy == "error":
+            message = (
+                f"NMDB data of {self.config.station} for {not_downloaded} "
+                "is not in the cache and offline mode is on. Fill the "
+                "cache with prefetch_nmdb_data on a machine with internet "
+                "access, or use missing_data_policy 'fill_edges'."
             )
-            df_download = self.data_fetcher.fetch_and_parse_http_data()
-            if self.config.use_cache:
-                self.cache_handler.write_cache(df_download)
-                self.config.cache_exists = True
-                self.cache_handler.cache_file = df_download
-            return df_download
+            core_logger.error(message)
+            raise ValueError(message)
+        if not_downloaded:
+            core_logger.warning(
+                f"NMDB data of {self.config.station} for {not_downloaded} "
+                "is not in the cache, the edges are filled with the "
+                "nearest cached values."
+            )
+
+        if not self.config.offline and missing_date_ranges:
+            core_logger.info(
+                f"Downloading {len(missing_date_ranges)} date ranges "
+                f"missing from the cache: {missing_date_ranges}"
+            )
+            self.data_manager.download_missing_data()
+        elif not missing_date_ranges:
+            core_logger.info("All data is present in the cache.")
+        df = self.cache_handler.read_cache(
+            start_date=self.config.start_date_wanted,
+            end_date=self.config.end_date_wanted,
+        )
+        if (df is None or df.empty) and recent is not None:
+            # the wanted range starts after the end of a fresh cache
+            df = self._last_cached_row()
+        if df is None or df.empty:
+            if self.config.offline:
+                message = (
+                    f"No NMDB data of {self.config.station} between "
+                    f"{self.config.start_date_wanted} and "
+                    f"{self.config.end_date_wanted} is in the cache."
+                )
+                core_logger.error(message)
+                raise ValueError(message)
+            self.data_fetcher.raise_date_unavailable()
+        if not_downloaded or recent is not None:
+            df = self.fill_edges(df)
+        return df
+
+    def _split_recent_date_ranges(self, missing_date_ranges):
+        """
+        Splits off the missing days after the end of the cache when the
+        cache is fresher than max_staleness.
+
+        Returns
+        -------
+        tuple
+            (date ranges to download, date range not downloaded or None)
+        """
+        if (
+            self.config.max_staleness is None
+            or self.config.cache_end_date is None
+        ):
+            return missing_date_ranges, None
+        cache_end = pd.Timestamp(self.config.cache_end_date)
+        today = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+        if today - cache_end > self.config.max_staleness:
+            return missing_date_ranges, None
+        last_start, last_end = missing_date_ranges[-1]
+        if pd.Timestamp(last_start) <= cache_end:
+            return missing_date_ranges, None
+        return missing_date_ranges[:-1], (last_start, last_end)
+
+    def _last_cached_row(self):
+        """
+        Reads the last cached row, placed at the start of the wanted
+        range so that fill_edges holds it until the end of the range.
+
+        Returns
+        -------
+        pd.DataFrame | None
+            The row, or None when the cache is empty
+        """
+        df = self.cache_handler.read_cache(
+            start_date=self.config.cache_end_date,
+            end_date=self.config.cache_end_date,
+        )
+        if df is None or df.empty:
+            return None
+        start = pd.Timestamp(self.config.start_date_wanted, tz="UTC")
+        core_logger.info(
+            f"No NMDB data of {self.config.station} is cached after "
+            f"{df.index[-1]}, this value is used for the wanted range."
+        )
+        return df.iloc[[-1]].set_axis(pd.Index([start], name=df.index.name))
+
+    def fill_edges(self, df):
+        """
+        Holds the first and last values of the data from the start and
+        until the end of the wanted range.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Data read from the cache, sorted by date
+
+        Returns
+        -------
+        pd.DataFrame
+            The data, with a row added at the start (end) of the wanted
+            range if the data starts later (ends earlier)
+        """
+        start = pd.Timestamp(self.config.start_date_wanted, tz="UTC")
+        end = pd.Timestamp(self.config.end_date_wanted, tz="UTC") + (
+            pd.Timedelta(days=1) - pd.Timedelta(minutes=1)
+        )
+        edges = []
+        if df.index[0] > start:
+            edges.append(df.iloc[[0]].set_axis([start]))
+        edges.append(df)
+        if df.index[-1] < end:
+            edges.append(df.iloc[[-1]].set_axis([end]))
+        if len(edges) == 1:
+            return df
+        df = pd.concat(edges)
+        df.index.name = "datetime"
+        return df
 
 
 def fetch_nmdb_data(
@@ -991,6 +2384,7 @@ def fetch_nmdb_data(
     station,
     resolution,
     nmdb_table="revori",
+    base_url=None,
 ):
     """
     Returns a dataframe of data from nmdb.eu
@@ -1010,6 +2404,8 @@ def fetch_nmdb_data(
         The desired resolution in minutes
     nmdb_table : str, optional
         The table to collect from nmdb.eu, by default "revori"
+    base_url : str, optional
+        URL of the NMDB.eu data service, by default None (NMDB_BASE_URL)
 
     Returns
     -------
@@ -1023,7 +2419,122 @@ def fetch_nmdb_data(
         resolution=resolution,
         nmdb_table=nmdb_table,
         use_cache=False,
+        base_url=base_url,
     )
     handler = NMDBDataHandler(config=config)
     df = handler.collect_nmdb_data()
     return df
+
+
+def prefetch_nmdb_data(
+    nmdb_requests,
+    cache_dir=None,
+    base_url=None,
+    download_workers=4,
+    chunk_months=1,
+    max_retries=3,
+):
+    """
+    Fills the NMDB cache for many sites in one call.
+
+    The requests are grouped by station, resolution and table, and the
+    date ranges of each group are merged, so that every day is
+    downloaded at most once and only days missing from the shared cache
+    are requested. Later calls of NMDBDataHandler.collect_nmdb_data
+    within these ranges are then served from the cache.
+
+    Parameters
+    ----------
+    nmdb_requests : list
+        List of dicts with the keys "start_date" and "end_date", and
+        optionally "station" (default "JUNG"), "resolution" (default
+        60) and "nmdb_table" (default "revori")
+    cache_dir : str or None, optional
+        The cache directory, by default None (the neptoon cache)
+    base_url : str or None, optional
+        URL of the NMDB.eu data service, by default None (NMDB_BASE_URL)
+    download_workers : int, optional
+        Number of chunks downloaded at the same time, by default 4
+    chunk_months : int, optional
+        Number of months requested per chunk, by default 1
+    max_retries : int, optional
+        Number of times a failed request is retried, by default 3
+
+    Returns
+    -------
+    list
+        One dict per group with the "station", "resolution",
+        "nmdb_table", the merged "date_ranges", the "downloaded" date
+        ranges and the "error" (None if all downloads succeeded). A
+        failed group does not stop the other groups.
+    """
+    groups = {}
+    for nmdb_request in nmdb_requests:
+        key = (
+            nmdb_request.get("station") or "JUNG",
+            str(nmdb_request.get("resolution") or 60),
+            nmdb_request.get("nmdb_table") or "revori",
+        )
+        start = DateTimeHandler.standardize_date_input(
+            nmdb_request["start_date"]
+        )
+        end = DateTimeHandler.standardize_date_input(nmdb_request["end_date"])
+        groups.setdefault(key, []).append([start, end])
+
+    report = []
+    for (station, resolution, nmdb_table), date_ranges in groups.items():
+        date_ranges = merge_date_ranges(date_ranges)
+        config = NMDBConfig(
+            start_date_wanted=date_ranges[0][0],
+            end_date_wanted=date_ranges[-1][1],
+            station=station,
+            cache_dir=cache_dir,
+            nmdb_table=nmdb_table,
+            resolution=resolution,
+            base_url=base_url,
+            download_workers=download_workers,
+            chunk_months=chunk_months,
+            max_retries=max_retries,
+        )
+        handler = NMDBDataHandler(config)
+        handler.cache_handler.check_cache_file_exists()
+        handler.cache_handler.check_cache_range()
+        covered_ranges = (
+            config.cache_date_ranges if config.cache_exists else []
+        )
+        missing_date_ranges = [
+            missing_range
+            for start, end in date_ranges
+            for missing_range in find_missing_date_ranges(
+                start, end, covered_ranges
+            )
+        ]
+        group_report = {
+            "station": station,
+            "resolution": resolution,
+            "nmdb_table": nmdb_table,
+            "date_ranges": date_ranges,
+            "downloaded": missing_date_ranges,
+            "error": None,
+        }
+        report.append(group_report)
+        if not missing_date_ranges:
+            core_logger.info(
+                f"NMDB cache for {station} ({resolution} min, "
+                f"{nmdb_table}) already covers {date_ranges}."
+            )
+            continue
+        core_logger.info(
+            f"Prefetching {len(missing_date_ranges)} date ranges of "
+            f"{station} ({resolution} min, {nmdb_table}): "
+            f"{missing_date_ranges}"
+        )
+        handler.data_manager.missing_date_ranges = missing_date_ranges
+        try:
+            handler.data_manager.download_missing_data()
+        except requests.exceptions.RequestException as err:
+            core_logger.error(
+                f"Prefetching NMDB data of {station} failed: {err}"
+            )
+            group_report["error"] = err
+    return report
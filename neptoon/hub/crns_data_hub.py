@@ -97,6 +97,7 @@ class CRNSDataHub:
         self._correction_builder = CorrectionBuilder()
         self.calibrator = None
         self.figure_creator = None
+        self.static_values = {}
         self.magazine_active = [Magazine.active if Magazine.active else False]
 
     @property
@@ -204,6 +205,10 @@ class CRNSDataHub:
         resolution="60",
         nmdb_table="revori",
         reference_value: int | None = None,
+        interpolation: Literal["nearest", "linear", "previous"] = "nearest",
+        offline: bool = False,
+        max_staleness: str | None = None,
+        missing_data_policy: Literal["error", "fill_edges"] = "error",
     ):
         """
         Utilises the NMDBDataAttacher class to attach NMDB incoming
@@ -227,6 +232,17 @@ class CRNSDataHub:
             The reference value of the neutron monitor, if left as None
             it will use the value from the first data point in the time
             series.
+        interpolation : {"nearest", "linear", "previous"}, optional
+            How the NMDB counts are mapped onto the timestamps of the
+            crns_data_frame, by default "nearest"
+        offline : bool, optional
+            Only use the NMDB cache, never download, by default False
+        max_staleness : str | None, optional
+            How far the cache may lag behind today before recent data
+            is downloaded (e.g., "7D"), by default None
+        missing_data_policy : {"error", "fill_edges"}, optional
+            What to do with days missing from the cache in offline mode,
+            by default "error". See NMDBConfig.
         Report
         ------
         Neutron monitoring data was attached from NMDB.eu. The station
@@ -241,6 +257,10 @@ class CRNSDataHub:
             reference_value=reference_value,
             resolution=resolution,
             nmdb_table=nmdb_table,
+            interpolation=interpolation,
+            offline=offline,
+            max_staleness=max_staleness,
+            missing_data_policy=missing_data_policy,
         )
         attacher.fetch_data()
         attacher.attach_data()
@@ -339,14 +359,24 @@ class CRNSDataHub:
 
     def correct_neutrons(
         self,
+        keep_factor_columns: bool = True,
     ):
         """
         Create correction factors as well as the corrected epithermal
         neutrons column.
+
+        Parameters
+        ----------
+        keep_factor_columns : bool, optional
+            Whether to keep the individual correction factor columns in
+            the crns_data_frame. These are needed for figures and the
+            data audit, by default True
         """
         corrector = CorrectNeutrons(
             crns_data_frame=self.crns_data_frame,
             correction_builder=self.correction_builder,
+            static_values=self.static_values,
+            keep_factor_columns=keep_factor_columns,
         )
         self.crns_data_frame = corrector.correct_neutrons()
 
@@ -542,6 +572,7 @@ class CRNSDataHub:
             "Aug13_uranos_atmprof",
             "Aug13_uranos_atmprof2",
         ] = "Mar21_mcnp_drf",
+        koehli_inversion: Literal["bisection", "lookup_table"] = "bisection",
     ):
         """
         Produces SM estimates with the NeutronsToSM class. If values for
@@ -559,6 +590,9 @@ class CRNSDataHub:
             given as decimal percent e.g., 0.01, by default None
         soil_organic_carbon : float, optional
             Given as decimal percent, e.g., 0.001, by default None
+        koehli_inversion : str, optional
+            "bisection" or "lookup_table" inversion of the UTS function
+            when using koehli_etal_2021, by default "bisection"
 
         Report
         ------
@@ -583,6 +617,7 @@ class CRNSDataHub:
             "soil_organic_carbon": soil_organic_carbon,
             "conversion_theory": conversion_theory,
             "koehli_parameters": koehli_parameters,
+            "koehli_inversion": koehli_inversion,
         }
         params = {k: v for k, v in provided_params.items() if v is not None}
         default_params.update(params)
@@ -602,19 +637,28 @@ class CRNSDataHub:
         data_frame[~mask] = np.nan
         return data_frame
 
-    def prepare_static_values(self):
+    def prepare_static_values(self, as_columns: bool = False):
         """
-        Attaches the static values from the SensorInfo Pydantic model as
-        columns of values in the crns_data_frame.
+        Collects the static values from the SensorInfo Pydantic model
+        so they can be used during processing.
 
         This method:
         1. Converts the Pydantic model to a dictionary
         2. Checks if each key already exists in the DataFrame
-        3. Skips None values
-        4. Adds the remaining values as new columns
+        3. Skips None, datetime and non-numeric values
+        4. Stores the remaining values as scalars in static_values
+
+        Site constants are kept as scalars and are only broadcast where
+        they are used (e.g., in the corrections), rather than being
+        stored as full columns in the crns_data_frame. The method
+        preserves existing column values if they are already present in
+        the DataFrame to avoid accidental overwrites.
 
-        The method preserves existing column values if they are already
-        present in the DataFrame to avoid accidental overwrites.
+        Parameters
+        ----------
+        as_columns : bool, optional
+            Additionally write the static values as columns of values
+            in the crns_data_frame, by default False
         """
 
         sensor_info_dict = self.sensor_info.model_dump()
@@ -638,13 +682,15 @@ class CRNSDataHub:
             else:
                 try:
                     numeric_value = pd.to_numeric(value)
-                    self.crns_data_frame[key] = numeric_value
                 except (ValueError, TypeError):
                     # Skip non-numeric values
                     core_logger.debug(
                         f"Skipping non-numeric value for {key}: {value}"
                     )
                     continue
+                self.static_values[key] = numeric_value
+                if as_columns:
+                    self.crns_data_frame[key] = numeric_value
 
     def prepare_additional_columns(self):
         """
@@ -735,5 +781,6 @@ class CRNSDataHub:
             figure_handler=self.figure_creator,
             calib_df=calib_df,
             magazine_active=self.magazine_active,
+            static_values=self.static_values,
         )
         self.saver.save_outputs()
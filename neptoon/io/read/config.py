@@ -10,11 +10,26 @@ from neptoon.io.read.data_ingest import (
     FormatDataForCRNSDataHub,
     validate_and_convert_file_path,
 )
+from neptoon.io.read.formatted_cache import (
+    FormattedDataCache,
+    create_file_manifest,
+)
+from neptoon.io.read.ingest_manifest import default_ingest_cache_directory
 from neptoon.config.configuration_input import ConfigurationManager, BaseConfig
 from neptoon.logging import get_logger
 
 core_logger = get_logger()
 
+# Parse options which do not change the formatted data
+_OPTIONS_NOT_AFFECTING_FORMATTED_DATA = {
+    "parse_workers",
+    "memory_limit_mb",
+    "incremental_ingest",
+    "ingest_cache_location",
+    "cache_file_listing",
+    "cache_formatted_data",
+}
+
 
 def _get_config_section(
     configuration_object: ConfigurationManager,
@@ -182,16 +197,15 @@ class DataHubFromConfig:
         core_logger.error(message)
         raise ValueError(message)
 
-    def _parse_raw_data(
-        self,
-    ):
+    def _create_file_manager(self) -> ManageFileCollection:
         """
-        Parses raw data files.
+        Creates the ManageFileCollection of the raw data files and lists
+        the files matching the prefix, suffix and file_pattern.
 
         Returns
         -------
-        pd.DataFrame
-            DataFrame from raw files.
+        ManageFileCollection
+            The file manager with the list of files
         """
         # create tmp object for more readable code
         tmp = self.sensor_config.raw_data_parse_options
@@ -212,20 +226,116 @@ class DataHubFromConfig:
             multi_header=tmp.multi_header,
             strip_names=tmp.strip_names,
             remove_prefix=tmp.remove_prefix,
+            memory_limit_mb=tmp.memory_limit_mb,
+            parse_workers=tmp.parse_workers,
+            incremental_ingest=tmp.incremental_ingest,
+            ingest_cache_location=tmp.ingest_cache_location,
+            parse_engine=tmp.parse_engine,
+            start_date=tmp.start_date,
+            end_date=tmp.end_date,
+            file_date_pattern=tmp.file_date_pattern,
+            file_date_format=tmp.file_date_format,
+            file_pattern=tmp.file_pattern,
+            cache_file_listing=tmp.cache_file_listing,
+            date_time_columns=(
+                self.sensor_config.time_series_data.key_column_info.date_time_columns
+            ),
+            date_time_format=(
+                self.sensor_config.time_series_data.key_column_info.date_time_format
+            ),
         )
         file_manager = ManageFileCollection(config=file_collection_config)
         file_manager.get_list_of_files()
         file_manager.filter_files()
+        return file_manager
+
+    def _parse_raw_data(
+        self,
+        file_manager: ManageFileCollection = None,
+    ):
+        """
+        Parses raw data files.
+
+        Parameters
+        ----------
+        file_manager : ManageFileCollection, optional
+            File manager with the list of files, created from the config
+            if None, by default None
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame from raw files.
+        """
+        if file_manager is None:
+            file_manager = self._create_file_manager()
+        file_manager.filter_files_by_date()
         # echo how many files have been found
         print(f"Found {len(file_manager.files)} files to parse.")  # rr
         core_logger.info(f"Found {len(file_manager.files)} files to parse.")
+        input_formatter_config = self._create_input_formatter_config()
         file_parser = ParseFilesIntoDataFrame(
-            file_manager=file_manager, config=file_collection_config
+            file_manager=file_manager,
+            config=file_manager.config,
+            column_types=input_formatter_config.get_arrow_column_types(),
+            timestamp_format=input_formatter_config.date_time_format,
         )
         parsed_data = file_parser.make_dataframe()
 
         return parsed_data
 
+    def _create_formatted_data_cache(
+        self,
+        file_manager: ManageFileCollection = None,
+    ) -> FormattedDataCache:
+        """
+        Creates the FormattedDataCache, keyed by the raw files and the
+        configuration sections used to parse and format them.
+
+        Parameters
+        ----------
+        file_manager : ManageFileCollection, optional
+            File manager with the list of raw files. If None, the data
+            is read from time_series_data.path_to_data, by default None
+
+        Returns
+        -------
+        FormattedDataCache
+            The cache
+        """
+        raw_data_parse_options = self.sensor_config.raw_data_parse_options
+        if file_manager is not None:
+            data_location = file_manager.config.data_location
+            files = file_manager.files
+        else:
+            data_location = validate_and_convert_file_path(
+                file_path=self.sensor_config.time_series_data.path_to_data,
+            )
+            files = []
+        config_sections = {
+            "raw_data_parse_options": raw_data_parse_options.model_dump(
+                mode="json",
+                exclude=_OPTIONS_NOT_AFFECTING_FORMATTED_DATA,
+            ),
+            "time_series_data": (
+                self.sensor_config.time_series_data.model_dump(mode="json")
+            ),
+            "install_date": self.sensor_config.sensor_info.install_date,
+        }
+        return FormattedDataCache(
+            cache_directory=(
+                raw_data_parse_options.ingest_cache_location
+                if raw_data_parse_options.ingest_cache_location is not None
+                else default_ingest_cache_directory(data_location)
+            ),
+            key=FormattedDataCache.create_key(
+                config_sections=config_sections,
+                file_manifest=create_file_manifest(
+                    data_location=data_location, files=files
+                ),
+            ),
+        )
+
     def _import_data(
         self,
     ):
@@ -236,13 +346,31 @@ class DataHubFromConfig:
         supplied information in the YAML files to prepare this for use
         in neptoon.
 
+        When cache_formatted_data is set in raw_data_parse_options, the
+        prepared DataFrame is stored in a FormattedDataCache and loaded
+        from it as long as the raw files and the configuration are
+        unchanged.
+
         Returns
         -------
         pd.DataFrame
             Prepared DataFrame
         """
-        if self.sensor_config.raw_data_parse_options.parse_raw_data:
-            raw_data_parsed = self._parse_raw_data()
+        parse_raw_data = (
+            self.sensor_config.raw_data_parse_options.parse_raw_data
+        )
+        file_manager = self._create_file_manager() if parse_raw_data else None
+        cache = None
+        if self.sensor_config.raw_data_parse_options.cache_formatted_data:
+            cache = self._create_formatted_data_cache(
+                file_manager=file_manager
+            )
+            df = cache.load()
+            if df is not None:
+                return df
+
+        if parse_raw_data:
+            raw_data_parsed = self._parse_raw_data(file_manager=file_manager)
         else:
             raw_data_parsed = pd.read_csv(
                 validate_and_convert_file_path(
@@ -250,6 +378,8 @@ class DataHubFromConfig:
                 )
             )
         df = self._prepare_time_series(raw_data_parsed=raw_data_parsed)
+        if cache is not None:
+            cache.write(df)
         return df
 
     def _prepare_time_series(
@@ -264,9 +394,7 @@ class DataHubFromConfig:
         pd.DataFrame
             Returns a formatted dataframe
         """
-        input_formatter_config = InputDataFrameFormattingConfig()
-        input_formatter_config.config_info = self.sensor_config
-        input_formatter_config.build_from_config()
+        input_formatter_config = self._create_input_formatter_config()
 
         data_formatter = FormatDataForCRNSDataHub(
             data_frame=raw_data_parsed,
@@ -275,6 +403,21 @@ class DataHubFromConfig:
         df = data_formatter.format_data_and_return_data_frame()
         return df
 
+    def _create_input_formatter_config(self):
+        """
+        Creates the InputDataFrameFormattingConfig from the sensor
+        config.
+
+        Returns
+        -------
+        InputDataFrameFormattingConfig
+            The formatting config
+        """
+        input_formatter_config = InputDataFrameFormattingConfig()
+        input_formatter_config.config_info = self.sensor_config
+        input_formatter_config.build_from_config()
+        return input_formatter_config
+
     def create_data_hub(self):
         """
         Creates a CRNSDataHub using the supplied configuration
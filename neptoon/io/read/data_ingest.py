@@ -1,12 +1,21 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.compute as pa_compute
+from pandas.tseries.api import guess_datetime_format
 import tarfile
-import tempfile
-import atexit
-from dataclasses import dataclass
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
 from enum import Enum, auto
 import zipfile
+import functools
 import io
+import os
+import re
 from pathlib import Path
 from typing import Union, Literal, List, Optional
 
@@ -15,6 +24,18 @@ from neptoon.utils.general_utils import (
     validate_and_convert_file_path,
 )
 from neptoon.columns import ColumnInfo
+from neptoon.io.read.file_dates import (
+    FileDateIndex,
+    dates_from_file_names,
+    file_ranges_from_start_dates,
+    is_range_in_window,
+)
+from neptoon.io.read.file_scan import DirectoryScanner
+from neptoon.io.read.ingest_manifest import (
+    SOURCE_FILE_COLUMN,
+    IngestManifest,
+    default_ingest_cache_directory,
+)
 from neptoon.config.configuration_input import (
     ConfigurationManager,
 )
@@ -22,6 +43,27 @@ from neptoon.utils import find_temporal_resolution_seconds
 
 core_logger = get_logger()
 
+# Rough ratio of memory used by parsed (string) data to the raw text
+_PARSED_TO_RAW_MEMORY_RATIO = 10
+# Number of files given to each worker at a time when parsing in parallel
+_FILES_PER_WORKER_BATCH = 16
+# Padding of the time window when filtering files by date
+_FILE_DATE_WINDOW_PADDING = pd.Timedelta(days=1)
+# Bytes read from the end of a file to find its last data line
+_TAIL_BLOCK_SIZE = 64 * 1024
+# Number of values used to detect a date time format
+_DATE_TIME_FORMAT_SAMPLE_SIZE = 1000
+# strptime directives which are not supported by pyarrow
+_ARROW_UNSUPPORTED_DATE_TIME_DIRECTIVES = ("%f", "%z", "%Z")
+
+
+def _to_naive_timestamp(date) -> pd.Timestamp | None:
+    """Converts a date to a time zone naive pd.Timestamp (or None)."""
+    if date is None:
+        return None
+    date = pd.Timestamp(date)
+    return date.tz_localize(None) if date.tzinfo is not None else date
+
 
 class FileCollectionConfig:
     """
@@ -50,6 +92,19 @@ class FileCollectionConfig:
         multi_header: bool = False,
         strip_names: bool = True,
         remove_prefix: str = "//",
+        memory_limit_mb: float | None = None,
+        parse_workers: int = 1,
+        incremental_ingest: bool = False,
+        ingest_cache_location: Union[str, Path] = None,
+        parse_engine: Literal["pandas", "arrow"] = "pandas",
+        start_date: str | datetime | None = None,
+        end_date: str | datetime | None = None,
+        file_date_pattern: str | None = None,
+        file_date_format: str | None = None,
+        date_time_columns: str | List[str] | None = None,
+        date_time_format: str | None = None,
+        file_pattern: str | None = None,
+        cache_file_listing: bool = False,
     ):
         """
         Initial parameters for data collection and merging
@@ -94,6 +149,55 @@ class FileCollectionConfig:
             True
         remove_prefix : str, optional
             Prefix to remove from column names, by default "//"
+        memory_limit_mb : float | None, optional
+            Approximate memory (MB) used to parse one chunk of the
+            files. When given, files are parsed in chunks which are
+            converted to numbers and date times (when column types are
+            known) and combined at the end, by default None (parse all
+            files at once)
+        parse_workers : int, optional
+            Number of worker processes used to read the files in
+            parallel, by default 1
+        incremental_ingest : bool, optional
+            Whether to only parse new or changed files, re-using the
+            parsed data of other files from the ingest cache, by default
+            False
+        ingest_cache_location : Union[str, Path], optional
+            Folder for the ingest cache. If None a folder in the neptoon
+            cache directory is used, by default None
+        parse_engine : Literal["pandas", "arrow"], optional
+            Engine used to parse the data lines. "pandas" reads all
+            columns as strings. "arrow" reads the columns with the types
+            given to ParseFilesIntoDataFrame (see
+            InputDataFrameFormattingConfig.get_arrow_column_types) and
+            only reads those columns, by default "pandas"
+        start_date : str | datetime | None, optional
+            Start of the time window to parse. Files which only hold
+            data before this date are not parsed, by default None
+        end_date : str | datetime | None, optional
+            End of the time window to parse. Files which only hold data
+            after this date are not parsed, by default None
+        file_date_pattern : str | None, optional
+            Regular expression finding the start date of a file in its
+            name (the group named "date", or the first group). If None,
+            the dates of the first and last data lines of each file are
+            read instead, by default None
+        file_date_format : str | None, optional
+            Format of the date in the file names, e.g., "%y%m%d%H", by
+            default None (inferred)
+        date_time_columns : str | List[str] | None, optional
+            Names of the date time columns, used to read the dates of
+            the first and last data lines, by default None
+        date_time_format : str | None, optional
+            Format of the date time columns, by default None (inferred)
+        file_pattern : str | None, optional
+            Regular expression which must be found in the file names
+            (relative to data_location) for file filtering, by default
+            None
+        cache_file_listing : bool, optional
+            Whether to cache the listing of each folder in
+            data_location, so that unchanged folders are not listed
+            again, by default False
         """
         self._path_to_config = validate_and_convert_file_path(
             file_path=path_to_config
@@ -107,6 +211,8 @@ class FileCollectionConfig:
             # ),
         )
         self._data_source = None
+        self._archive_files = []
+        self._archive_root = ""
         self.column_names = column_names
         self.prefix = prefix
         self.suffix = suffix
@@ -121,6 +227,19 @@ class FileCollectionConfig:
         self.multi_header = multi_header
         self.strip_names = strip_names
         self._remove_prefix = remove_prefix
+        self.memory_limit_mb = memory_limit_mb
+        self.parse_workers = parse_workers
+        self.incremental_ingest = incremental_ingest
+        self.ingest_cache_location = ingest_cache_location
+        self.parse_engine = parse_engine
+        self.start_date = start_date
+        self.end_date = end_date
+        self.file_date_pattern = file_date_pattern
+        self.file_date_format = file_date_format
+        self.date_time_columns = date_time_columns
+        self.date_time_format = date_time_format
+        self.file_pattern = file_pattern
+        self.cache_file_listing = cache_file_listing
 
         self._determine_source_type()
 
@@ -147,6 +266,21 @@ class FileCollectionConfig:
     def data_source(self):
         return self._data_source
 
+    @property
+    def archive_files(self):
+        """
+        Files in the archive, relative to the archive_root.
+        """
+        return self._archive_files
+
+    @property
+    def archive_root(self):
+        """
+        Folder inside the archive holding all files (e.g., "data/"), or
+        an empty string.
+        """
+        return self._archive_root
+
     @property
     def separator(self):
         return self._separator
@@ -189,8 +323,11 @@ class FileCollectionConfig:
     def _determine_source_type(self):
         """
         Checks if the folder is a normal folder or an archive and sets
-        the internal attribute reflecting this.
+        the internal attribute reflecting this. The files in an archive
+        are listed, they are not extracted.
         """
+        self._archive_files = []
+        self._archive_root = ""
         if self._data_location is None:
             self._data_source = None
             return
@@ -203,12 +340,12 @@ class FileCollectionConfig:
             if tarfile.is_tarfile(self._data_location):
                 self._data_source = "tarfile"
                 core_logger.info("Extracting data from a tarfile")
-                self.dump_tar()
+                self.index_archive()
 
             elif zipfile.is_zipfile(self._data_location):
                 self._data_source = "zipfile"
                 core_logger.info("Extracting data from a zipfile")
-                self.dump_zip()
+                self.index_archive()
 
             else:
                 self._data_source = None
@@ -216,58 +353,38 @@ class FileCollectionConfig:
 
         except (tarfile.TarError, zipfile.BadZipFile) as e:
             self._data_source = None
-            core_logger.error(f"Failed to extract archive: {str(e)}")
+            core_logger.error(f"Failed to read archive: {str(e)}")
             raise
 
-        else:
-            self._data_source = None
-            core_logger.info("Cannot determine data source type")
-
-    def dump_tar(self):
-        """Create temporary directory and extract"""
-        self._temp_dir_obj = tempfile.TemporaryDirectory()
-        temp_dir = Path(self._temp_dir_obj.name)
-        zip_dirname = Path(self._data_location).stem
-        with tarfile.open(self._data_location) as tar:
-            tar.extractall(path=temp_dir)
-        extracted_items = list(temp_dir.iterdir())
-        if extracted_items and extracted_items[0].is_dir():
-            self._data_location = temp_dir / zip_dirname
-        else:
-            self._data_location = temp_dir
-        self._temp_dir = temp_dir
-        self._original_location = self._data_location
-        atexit.register(self._cleanup_temp)
-
-    def dump_zip(self):
-        """Create temporary directory and extract"""
-        self._temp_dir_obj = tempfile.TemporaryDirectory()
-        temp_dir = Path(self._temp_dir_obj.name)
-
-        with zipfile.ZipFile(self._data_location) as zip_ref:
-            zip_ref.extractall(temp_dir)
-
-        extracted_items = list(temp_dir.iterdir())
-        if extracted_items and extracted_items[0].is_dir():
-            self._data_location = extracted_items[0]
-        else:
-            self._data_location = temp_dir
-
-        self._original_location = self._data_location
-        atexit.register(self._cleanup_temp)
-
-    def _cleanup_temp(self):
+    def index_archive(self):
         """
-        Cleanup temporary directory. Registered with atexit for
-        automatic cleanup.
+        Lists the files in the archive. When all files are inside a
+        single folder, file names are given relative to this folder (as
+        when the archive is extracted).
         """
-        try:
-            if hasattr(self, "_temp_dir_obj"):
-                self._temp_dir_obj.cleanup()
-                delattr(self, "_temp_dir_obj")
-        except Exception as e:
-            # Just log any cleanup errors during exit
-            core_logger.warning(f"Failed to cleanup temporary directory: {e}")
+        if self._data_source == "tarfile":
+            with tarfile.open(self._data_location) as tar:
+                members = [
+                    member.name
+                    for member in tar.getmembers()
+                    if member.isfile()
+                ]
+        else:
+            with zipfile.ZipFile(self._data_location) as zip_ref:
+                members = [
+                    info.filename
+                    for info in zip_ref.infolist()
+                    if not info.is_dir()
+                ]
+
+        top_level_names = {member.split("/", 1)[0] for member in members}
+        if len(top_level_names) == 1 and all("/" in m for m in members):
+            self._archive_root = top_level_names.pop() + "/"
+        else:
+            self._archive_root = ""
+        self._archive_files = [
+            member.removeprefix(self._archive_root) for member in members
+        ]
 
     def build_from_config(
         self,
@@ -326,6 +443,36 @@ class FileCollectionConfig:
         self.multi_header = sensor_config.raw_data_parse_options.multi_header
         self.strip_names = sensor_config.raw_data_parse_options.strip_names
         self.remove_prefix = sensor_config.raw_data_parse_options.remove_prefix
+        self.memory_limit_mb = (
+            sensor_config.raw_data_parse_options.memory_limit_mb
+        )
+        self.parse_workers = sensor_config.raw_data_parse_options.parse_workers
+        self.incremental_ingest = (
+            sensor_config.raw_data_parse_options.incremental_ingest
+        )
+        self.ingest_cache_location = (
+            sensor_config.raw_data_parse_options.ingest_cache_location
+        )
+        self.parse_engine = sensor_config.raw_data_parse_options.parse_engine
+        self.start_date = sensor_config.raw_data_parse_options.start_date
+        self.end_date = sensor_config.raw_data_parse_options.end_date
+        self.file_date_pattern = (
+            sensor_config.raw_data_parse_options.file_date_pattern
+        )
+        self.file_date_format = (
+            sensor_config.raw_data_parse_options.file_date_format
+        )
+        self.file_pattern = sensor_config.raw_data_parse_options.file_pattern
+        self.cache_file_listing = (
+            sensor_config.raw_data_parse_options.cache_file_listing
+        )
+        if (
+            sensor_config.time_series_data is not None
+            and sensor_config.time_series_data.key_column_info is not None
+        ):
+            key_column_info = sensor_config.time_series_data.key_column_info
+            self.date_time_columns = key_column_info.date_time_columns
+            self.date_time_format = key_column_info.date_time_format
 
 
 class ManageFileCollection:
@@ -359,23 +506,37 @@ class ManageFileCollection:
         """
         self.config = config
         self.files = files
+        self.scan_report = None
 
     def get_list_of_files(self):
         """
         Lists the files found at the data_location and assigns these to
-        the file attribute.
+        the file attribute. For archives, the names of the files in the
+        archive are used.
+
+        Folders are scanned with a DirectoryScanner, which applies the
+        prefix, suffix and file_pattern filters while walking the
+        folder. The number of files scanned (per second) is stored in
+        `scan_report`.
         """
         files = []
-        if self.config.data_location.is_dir():
+        if self.config.data_source in ["tarfile", "zipfile"]:
+            files = list(self.config.archive_files)
+        elif self.config.data_location.is_dir():
             try:
-                item_list = self.config.data_location.glob("**/*")
-                # files = [x.name for x in item_list if x.is_file()] #only gets file names, path of subdirs missing
-
-                files = [
-                    str(x.relative_to(self.config.data_location))
-                    for x in item_list
-                    if x.is_file()
-                ]  # retrieve the filenames with path
+                scanner = DirectoryScanner(
+                    folder=self.config.data_location,
+                    prefix=self.config.prefix,
+                    suffix=self.config.suffix,
+                    file_pattern=self.config.file_pattern,
+                    cache_directory=(
+                        self._get_cache_directory()
+                        if self.config.cache_file_listing
+                        else None
+                    ),
+                )
+                files = scanner.scan()
+                self.scan_report = scanner.scan_report
 
             except FileNotFoundError as fnf_error:
                 message = (
@@ -389,133 +550,1502 @@ class ManageFileCollection:
                     f"! Error accessing folder {self.config.data_location}."
                     f" Error: {err}"
                 )
-                core_logger.error(message)
-                raise
-
-        self.files = files
+                core_logger.error(message)
+                raise
+
+        self.files = files
+
+    def _get_cache_directory(self) -> Path:
+        """The ingest cache directory of the data location."""
+        if self.config.ingest_cache_location is not None:
+            return Path(self.config.ingest_cache_location)
+        return default_ingest_cache_directory(self.config.data_location)
+
+    def filter_files(
+        self,
+    ):
+        """
+        Filters the files found in the data location using the prefix,
+        suffix and file_pattern given during initialisation. These
+        default to no filtering.
+
+        This method updates the `files` attribute of the class with the
+        filtered list.
+        """
+
+        files_filtered = [
+            filename
+            for filename in self.files
+            if filename.startswith(self.config.prefix)
+        ]
+
+        # End with ...
+        files_filtered = [
+            filename
+            for filename in files_filtered
+            if filename.endswith(self.config.suffix)
+        ]
+
+        if self.config.file_pattern is not None:
+            file_pattern = re.compile(self.config.file_pattern)
+            files_filtered = [
+                filename
+                for filename in files_filtered
+                if file_pattern.search(filename)
+            ]
+
+        # raise error when no files are found
+        if len(files_filtered) == 0:
+            message = (
+                f"No files found in {self.config.data_location} "
+                f"with prefix '{self.config.prefix}' and suffix '{self.config.suffix}'."
+            )
+            core_logger.error(message)
+            raise FileNotFoundError(message)
+
+        self.files = files_filtered
+
+    def filter_files_by_date(self):
+        """
+        Removes files which only hold data outside of the time window
+        (start_date to end_date) of the config, so that they are not
+        parsed. The dates of each file are taken from the file name
+        when file_date_pattern is given, otherwise the dates of the
+        first and last data lines are read (and cached).
+
+        Files for which the dates are unknown are kept.
+
+        Raises
+        ------
+        ValueError
+            If start_date is after end_date
+        FileNotFoundError
+            If no files are in the time window
+        """
+        if self.config.start_date is None and self.config.end_date is None:
+            return
+        start_date = _to_naive_timestamp(self.config.start_date)
+        end_date = _to_naive_timestamp(self.config.end_date)
+        if (
+            start_date is not None
+            and end_date is not None
+            and start_date > end_date
+        ):
+            message = (
+                f"start_date ({start_date}) must be before end_date "
+                f"({end_date})"
+            )
+            core_logger.error(message)
+            raise ValueError(message)
+
+        if self.config.file_date_pattern is not None:
+            file_ranges = file_ranges_from_start_dates(
+                dates_from_file_names(
+                    files=self.files,
+                    file_date_pattern=self.config.file_date_pattern,
+                    file_date_format=self.config.file_date_format,
+                )
+            )
+        else:
+            file_ranges = self._get_file_ranges_from_data()
+            if file_ranges is None:
+                return
+
+        # the window is padded as file dates are in the time zone of
+        # the data, the window may be in another time zone
+        files_in_window = [
+            filename
+            for i, filename in enumerate(self.files)
+            # column names are inferred from the first file
+            if (i == 0 and self.config.column_names is None)
+            or is_range_in_window(
+                file_ranges.get(filename, (None, None)),
+                start_date=(
+                    start_date - _FILE_DATE_WINDOW_PADDING
+                    if start_date is not None
+                    else None
+                ),
+                end_date=(
+                    end_date + _FILE_DATE_WINDOW_PADDING
+                    if end_date is not None
+                    else None
+                ),
+            )
+        ]
+        core_logger.info(
+            f"{len(files_in_window)} of {len(self.files)} files hold data "
+            f"between {start_date} and {end_date}."
+        )
+        if not files_in_window:
+            message = (
+                f"No files found in {self.config.data_location} with data "
+                f"between {start_date} and {end_date}."
+            )
+            core_logger.error(message)
+            raise FileNotFoundError(message)
+        self.files = files_in_window
+
+    def _get_file_ranges_from_data(self) -> dict | None:
+        """
+        Reads the dates of the first and last data line of each file.
+        Dates are cached in a FileDateIndex (next to the ingest cache),
+        so unchanged files are only read once.
+
+        Returns
+        -------
+        dict | None
+            file name: (first, last) or None when the dates cannot be
+            read (e.g., date_time_columns is not given)
+        """
+        date_time_columns = self.config.date_time_columns
+        if isinstance(date_time_columns, str):
+            date_time_columns = [date_time_columns]
+        if not date_time_columns:
+            core_logger.warning(
+                "Files cannot be filtered by date: give file_date_pattern "
+                "or date_time_columns."
+            )
+            return None
+        column_names = self.config.column_names
+        if column_names is None:
+            column_names = ParseFilesIntoDataFrame(
+                file_manager=self, config=self.config
+            )._infer_column_names()
+        try:
+            column_indices = [
+                column_names.index(name) for name in date_time_columns
+            ]
+        except ValueError:
+            core_logger.warning(
+                f"Files cannot be filtered by date: {date_time_columns} "
+                f"not found in the column names."
+            )
+            return None
+
+        index = FileDateIndex(
+            cache_directory=self._get_cache_directory(),
+            settings={
+                "column_indices": column_indices,
+                "date_time_format": self.config.date_time_format,
+                "encoding": self.config.encoding,
+                "skip_lines": self.config.skip_lines,
+                "separator": self.config.separator,
+                "strip_left": self.config.parser_kw_strip_left,
+                "digit_first": self.config.parser_kw_digit_first,
+            },
+        )
+        index.load()
+        file_ranges = {}
+        reader = ParseFilesIntoDataFrame(
+            file_manager=self, config=self.config
+        )._create_file_reader()
+        with reader:
+            for filename in self.files:
+                size, mtime_ns = reader.file_stat(filename)
+                file_range = index.get(filename, size, mtime_ns)
+                if file_range is None:
+                    file_range = tuple(
+                        self._date_from_line(line, column_indices)
+                        for line in reader.peek_data_lines(filename)
+                    )
+                    index.set(filename, size, mtime_ns, *file_range)
+                file_ranges[filename] = file_range
+        try:
+            index.write()
+        except OSError as err:
+            core_logger.warning(f"Could not write file date index: {err}")
+        return file_ranges
+
+    def _date_from_line(
+        self,
+        line: str | None,
+        column_indices: list,
+    ) -> pd.Timestamp | None:
+        """
+        Reads the date of a data line.
+
+        Parameters
+        ----------
+        line : str | None
+            The data line
+        column_indices : list
+            Indices of the date time columns
+
+        Returns
+        -------
+        pd.Timestamp | None
+            The date, or None if it cannot be read
+        """
+        if line is None:
+            return None
+        fields = line.rstrip("\r\n").split(self.config.separator)
+        if max(column_indices) >= len(fields):
+            return None
+        value = " ".join(fields[i].strip() for i in column_indices)
+        date = pd.to_datetime(
+            value, format=self.config.date_time_format, errors="coerce"
+        )
+        return None if pd.isna(date) else date
+
+    def create_file_list(self):
+        """
+        Create clean file list
+        """
+        self.get_list_of_files()
+        self.filter_files()
+        self.filter_files_by_date()
+
+
+def _skip_invalid_row(row) -> str:
+    """Invalid row handler of the arrow parse engine."""
+    return "skip"
+
+
+@dataclass
+class RawFileReader:
+    """
+    Reads and line-filters individual raw data files.
+
+    Holds only the settings needed to read a file, so that it can be
+    sent to worker processes when files are parsed in parallel. Files in
+    tar and zip archives are read directly from the archive, which is
+    opened once and kept open until `close` is called (or the reader is
+    used as a context manager).
+    """
+
+    data_location: Path
+    encoding: str
+    skip_lines: int = 0
+    strip_left: bool = True
+    digit_first: bool = True
+    separator: str = ","
+    number_of_columns: int | None = None
+    data_source: str | None = "folder"
+    archive_root: str = ""
+    pad_short_lines: bool = False
+    _archive: object = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _archive_members: dict = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __getstate__(self):
+        # open archives are not sent to worker processes
+        state = self.__dict__.copy()
+        state["_archive"] = None
+        state["_archive_members"] = {}
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def is_archive(self) -> bool:
+        return self.data_source in ["tarfile", "zipfile"]
+
+    def close(self):
+        """
+        Closes the archive, if open.
+        """
+        if self._archive is not None:
+            self._archive.close()
+        self._archive = None
+        self._archive_members = {}
+
+    def _get_archive_member(self, filename: str):
+        """
+        Returns the archive member (TarInfo or ZipInfo) of a file,
+        opening the archive on first use.
+
+        Parameters
+        ----------
+        filename : str
+            The file name, relative to the archive_root
+
+        Returns
+        -------
+        TarInfo | ZipInfo
+            The archive member
+        """
+        if self._archive is None:
+            if self.data_source == "tarfile":
+                self._archive = tarfile.open(self.data_location)
+                self._archive_members = {
+                    member.name: member
+                    for member in self._archive.getmembers()
+                }
+            else:
+                self._archive = zipfile.ZipFile(self.data_location)
+                self._archive_members = {
+                    info.filename: info for info in self._archive.infolist()
+                }
+        return self._archive_members[self.archive_root + filename]
+
+    def _open_binary(self, filename: str):
+        """
+        Opens a file, or a file in the archive, in binary mode.
+        """
+        if not self.is_archive:
+            return open(self.data_location / filename, "rb")
+        member = self._get_archive_member(filename)
+        if self.data_source == "tarfile":
+            return self._archive.extractfile(member)
+        return self._archive.open(member)
+
+    def open_file(self, filename: str):
+        """
+        Opens an individual file from either a folder, zipfile, or
+        tarfile. Files in archives are decoded as they are read.
+
+        Parameters
+        ----------
+        filename : str
+            The filename to be opened
+
+        Returns
+        -------
+        file
+            returns the open file
+        """
+        try:
+            if not self.is_archive:
+                return open(
+                    self.data_location / filename,
+                    encoding=self.encoding,
+                )
+            return io.TextIOWrapper(
+                self._open_binary(filename),
+                encoding=self.encoding,
+            )
+        except Exception as e:
+            raise IOError(f"Error opening file {filename}: {str(e)}")
+
+    def file_stat(self, filename: str) -> tuple[int, int]:
+        """
+        Returns the size (bytes) and modification time (nanoseconds) of
+        a file. For files in an archive, the values stored in the
+        archive are used.
+
+        Parameters
+        ----------
+        filename : str
+            The file
+
+        Returns
+        -------
+        tuple[int, int]
+            size and modification time
+        """
+        if not self.is_archive:
+            stat = (self.data_location / filename).stat()
+            return stat.st_size, stat.st_mtime_ns
+        member = self._get_archive_member(filename)
+        if self.data_source == "tarfile":
+            return member.size, int(member.mtime * 1e9)
+        mtime = datetime(*member.date_time).timestamp()
+        return member.file_size, int(mtime * 1e9)
+
+    def file_exists(self, filename: str) -> bool:
+        """
+        Whether a file is in the folder, or in the archive.
+
+        Parameters
+        ----------
+        filename : str
+            The file
+
+        Returns
+        -------
+        bool
+            True if the file exists
+        """
+        if not self.is_archive:
+            return (self.data_location / filename).is_file()
+        try:
+            self._get_archive_member(filename)
+        except KeyError:
+            return False
+        return True
+
+    def file_hash(self, filename: str) -> str:
+        """
+        Returns the SHA-256 hash of the content of a file.
+
+        Parameters
+        ----------
+        filename : str
+            The file
+
+        Returns
+        -------
+        str
+            The hex digest
+        """
+        sha256 = hashlib.sha256()
+        with self._open_binary(filename) as file:
+            for block in iter(lambda: file.read(1024**2), b""):
+                sha256.update(block)
+        return sha256.hexdigest()
+
+    def parse_line(self, line: str) -> str:
+        """
+        Parses a single line
+
+        Parameters
+        ----------
+        line : str
+            line of potential data
+
+        Returns
+        -------
+        str
+            a valid line or an empty string
+        """
+        if isinstance(line, bytes) and self.encoding != "":
+            line = line.decode(self.encoding, errors="ignore")
+
+        if self.strip_left:
+            line = line.lstrip()
+
+        # If the line starts with a number, it likely is actual data
+        if self.digit_first and not line[:1].isdigit():
+            return ""
+
+        return line
+
+    def is_bad_line(self, line: str) -> bool:
+        """
+        Whether a data line has more fields than there are columns.
+        These lines are skipped when creating the DataFrame.
+
+        Parameters
+        ----------
+        line : str
+            A parsed data line
+
+        Returns
+        -------
+        bool
+            True if the line has too many fields
+        """
+        if self.number_of_columns is None:
+            return False
+        return line.count(self.separator) >= self.number_of_columns
+
+    def peek_data_lines(self, filename: str) -> tuple:
+        """
+        Returns the first and last data line of a file. For files in a
+        folder, the last line is read from the end of the file.
+
+        Parameters
+        ----------
+        filename : str
+            The file
+
+        Returns
+        -------
+        tuple
+            (first, last) data line, None if the file has no data
+        """
+        lines = self.iter_lines(filename)
+        first = next(lines, None)
+        lines.close()
+        if first is None:
+            return None, None
+        last = None
+        if not self.is_archive:
+            last = self._last_data_line(filename)
+        if last is None:
+            for last in self.iter_lines(filename):
+                pass
+        return first, last
+
+    def _last_data_line(self, filename: str) -> str | None:
+        """
+        Finds the last data line in the last block of a file, or None
+        if the block has no data line.
+        """
+        with open(self.data_location / filename, "rb") as file:
+            size = file.seek(0, os.SEEK_END)
+            file.seek(max(0, size - _TAIL_BLOCK_SIZE))
+            lines = file.read().decode(self.encoding, errors="ignore")
+        lines = lines.splitlines()
+        if size > _TAIL_BLOCK_SIZE:
+            # the first line of the block may be incomplete
+            lines = lines[1:]
+        else:
+            lines = lines[self.skip_lines :]
+        for line in reversed(lines):
+            line = self.parse_line(line)
+            if line:
+                return line
+        return None
+
+    def pad_line(self, line: str) -> str:
+        """
+        Adds empty fields to a data line with fewer fields than there
+        are columns (pandas fills these with NaN, the arrow parser would
+        skip the line).
+
+        Parameters
+        ----------
+        line : str
+            A parsed data line
+
+        Returns
+        -------
+        str
+            The line with at least number_of_columns fields
+        """
+        missing_fields = (
+            self.number_of_columns - 1 - line.count(self.separator)
+        )
+        if missing_fields <= 0:
+            return line
+        data = line.rstrip("\r\n")
+        return data + self.separator * missing_fields + line[len(data) :]
+
+    def iter_lines(self, filename: str):
+        """
+        Yields the data lines of a file.
+
+        Parameters
+        ----------
+        filename : str
+            The file to read
+
+        Yields
+        ------
+        str
+            A data line
+        """
+        with self.open_file(filename) as file:
+            for _ in range(self.skip_lines):
+                next(file)
+            pad = self.pad_short_lines and self.number_of_columns is not None
+            for line in file:
+                line = self.parse_line(line)
+                if line:
+                    yield self.pad_line(line) if pad else line
+
+    def __call__(self, filename: str) -> tuple[str, int, int]:
+        """
+        Reads a file into a string of data lines.
+
+        Parameters
+        ----------
+        filename : str
+            The file to read
+
+        Returns
+        -------
+        tuple[str, int, int]
+            The data lines, the number of data lines and the number of
+            lines with too many fields
+        """
+        lines = list(self.iter_lines(filename))
+        bad_lines = sum(self.is_bad_line(line) for line in lines)
+        return "".join(lines), len(lines), bad_lines
+
+
+class ParseFilesIntoDataFrame:
+    """
+    Parses raw files into a single pandas DataFrame.
+
+    This class takes instances of ManageFileCollection and
+    FileCollectionConfig to process and combine multiple data files into
+    a single DataFrame, handling various file formats and parsing
+    configurations.
+
+    Files can be read in parallel by setting `parse_workers` in the
+    FileCollectionConfig. The order of the data is the same as the
+    order of the files. After parsing, `parse_report` holds the number
+    of data lines and skipped (malformed) lines of each file.
+
+    With `parse_engine="arrow"` in the FileCollectionConfig, only the
+    columns given in `column_types` are read, directly as numbers or
+    date times (see InputDataFrameFormattingConfig.get_arrow_column_types).
+
+    Example
+    -------
+    >>> config = FileCollectionConfig(data_location='/path/to/data/folder/')
+    >>> file_manager = ManageFileCollection(config=config)
+    >>> file_parser = ParseFilesIntoDataFrame(file_manager, config)
+    >>> df = file_parser.make_dataframe()
+    >>> file_parser.parse_report
+    """
+
+    def __init__(
+        self,
+        file_manager: ManageFileCollection,
+        config: FileCollectionConfig,
+        column_types: dict | None = None,
+        timestamp_format: str | None = None,
+    ):
+        """
+        Initialisation files.
+
+        Parameters
+        ----------
+        file_manager : ManageFileCollection
+            An instance fo the ManageFileCollection class
+        config : FileCollectionConfig
+            The config file containing information to support
+            processing.
+        column_types : dict | None, optional
+            The pyarrow data type of each column to read, used by the
+            arrow parse engine. Other columns are not read. If None all
+            columns are read as strings, by default None
+        timestamp_format : str | None, optional
+            Format of timestamp columns in column_types, by default None
+            (ISO 8601)
+        """
+        self.file_manager = file_manager
+        self.config = config
+        self.column_types = column_types
+        self.timestamp_format = timestamp_format
+        self.parse_report = None
+        self._number_of_columns = None
+        self._file_reports = []
+        self._line_reader = None
+
+    def make_dataframe(
+        self,
+        column_names=None,
+    ) -> pd.DataFrame:
+        """
+        Merges, parses and converts data it to a single DataFrame.
+
+        Parameters
+        ----------
+        column_names : list, optional
+            Can supply custom column_names for saving file, by default
+            None
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with all data
+        """
+        if column_names is None:
+            column_names = self.config.column_names
+
+        if column_names is None:
+            column_names = self._infer_column_names()
+
+        self._number_of_columns = len(column_names)
+        self._file_reports = []
+
+        if self.config.incremental_ingest:
+            data = self._make_dataframe_incrementally(
+                column_names=column_names
+            )
+        elif self.config.memory_limit_mb is not None:
+            data = self._make_dataframe_in_chunks(column_names=column_names)
+        else:
+            data_str = self._merge_files()
+            data = self._read_data_string(
+                data_str=data_str,
+                column_names=column_names,
+                skip_rows=self.config.skip_lines,
+            )
+        self._create_parse_report()
+        return data
+
+    def _create_parse_report(self):
+        """
+        Creates the parse_report DataFrame from the reports of each file
+        and logs a warning when lines were skipped.
+        """
+        self.parse_report = pd.DataFrame(
+            self._file_reports,
+            columns=["file", "data_lines", "bad_lines"],
+        )
+        files_with_bad_lines = self.parse_report[
+            self.parse_report["bad_lines"] > 0
+        ]
+        if not files_with_bad_lines.empty:
+            message = (
+                f"{files_with_bad_lines['bad_lines'].sum()} lines with too "
+                f"many fields were skipped in {len(files_with_bad_lines)}"
+                " files: "
+                + ", ".join(
+                    f"{row.file} ({row.bad_lines})"
+                    for row in files_with_bad_lines.itertuples()
+                )
+            )
+            core_logger.warning(message)
+
+    def _read_data_string(
+        self,
+        data_str: str,
+        column_names: list,
+        skip_rows: int,
+    ) -> pd.DataFrame:
+        """
+        Reads a string of data lines into a DataFrame.
+
+        Parameters
+        ----------
+        data_str : str
+            The data lines
+        column_names : list
+            The column names
+        skip_rows : int
+            Number of lines to skip at the start of the string
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with the data (as strings, or with the types of
+            column_types for the arrow parse engine)
+        """
+        if self.config.parse_engine == "arrow":
+            return self._read_data_string_with_arrow(
+                data_str=data_str,
+                column_names=column_names,
+                skip_rows=skip_rows,
+            )
+        return pd.read_csv(
+            io.StringIO(data_str),
+            names=column_names,
+            encoding=self.config.encoding,
+            skiprows=skip_rows,
+            skipinitialspace=self.config.skip_initial_space,
+            sep=self.config.separator,
+            decimal=self.config.decimal,
+            on_bad_lines="skip",  # reported in parse_report
+            dtype=object,  # Allows for reading strings
+            index_col=False,
+        )
+
+    def _read_data_lines(
+        self,
+        data_str: str,
+        column_names: list,
+    ) -> pd.DataFrame:
+        """
+        Reads data lines which do not start at the beginning of the
+        merged data (e.g., a later chunk or a single file), without
+        skipping lines.
+
+        Parameters
+        ----------
+        data_str : str
+            The data lines
+        column_names : list
+            The column names
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with the data
+        """
+        if self.config.parse_engine == "arrow":
+            return self._read_data_string(
+                data_str=data_str,
+                column_names=column_names,
+                skip_rows=0,
+            )
+        # pandas treats a first line with too many fields differently to
+        # later lines, so the lines are started with a placeholder line
+        # which is removed after parsing.
+        placeholder_line = (
+            self.config.separator.join(["0"] * len(column_names)) + "\n"
+        )
+        return self._read_data_string(
+            data_str=placeholder_line + data_str,
+            column_names=column_names,
+            skip_rows=0,
+        ).iloc[1:]
+
+    def _get_arrow_column_types(self, column_names: list) -> dict:
+        """
+        Returns the pyarrow type of each column to read, in the order of
+        the columns in the files. Columns in column_types which are not
+        in column_names are skipped with a warning.
+
+        Parameters
+        ----------
+        column_names : list
+            The column names of the files
+
+        Returns
+        -------
+        dict
+            column name: pyarrow data type
+        """
+        if self.column_types is None:
+            return {name: pa.string() for name in column_names}
+        missing_columns = [
+            name for name in self.column_types if name not in column_names
+        ]
+        if missing_columns:
+            core_logger.warning(
+                f"Columns {missing_columns} were not found in the raw data "
+                f"columns and are not read."
+            )
+        return {
+            name: self.column_types[name]
+            for name in column_names
+            if name in self.column_types
+        }
+
+    def _read_arrow_table(
+        self,
+        data_str: str,
+        column_names: list,
+        skip_rows: int,
+        column_types: dict,
+    ) -> pa.Table:
+        """
+        Reads a string of data lines with the pyarrow CSV reader.
+        Lines with too many fields are skipped (as with pandas), only
+        the columns in column_types are read.
+        """
+        number_of_lines = data_str.count("\n") + (
+            not data_str.endswith("\n") and data_str != ""
+        )
+        if number_of_lines <= skip_rows:
+            return pa.schema(list(column_types.items())).empty_table()
+        return pa_csv.read_csv(
+            io.BytesIO(data_str.encode("utf-8")),
+            read_options=pa_csv.ReadOptions(
+                column_names=column_names,
+                skip_rows=skip_rows,
+            ),
+            parse_options=pa_csv.ParseOptions(
+                delimiter=self.config.separator,
+                invalid_row_handler=_skip_invalid_row,  # in parse_report
+            ),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=column_types,
+                include_columns=list(column_types),
+                decimal_point=self.config.decimal,
+                strings_can_be_null=True,
+                timestamp_parsers=(
+                    [self.timestamp_format]
+                    if self.timestamp_format is not None
+                    else None
+                ),
+            ),
+        )
+
+    def _read_data_string_with_arrow(
+        self,
+        data_str: str,
+        column_names: list,
+        skip_rows: int,
+    ) -> pd.DataFrame:
+        """
+        Reads a string of data lines into a DataFrame with the pyarrow
+        CSV reader, so that values are converted to their column type
+        while parsing and no column is held as Python strings.
+
+        If some values cannot be converted (e.g., corrupted lines), the
+        columns are read as strings and converted with pandas, so that
+        these values become NaN (or NaT), as in
+        FormatDataForCRNSDataHub.data_frame_to_numeric.
+
+        Parameters
+        ----------
+        data_str : str
+            The data lines
+        column_names : list
+            The column names
+        skip_rows : int
+            Number of lines to skip at the start of the string
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with the data
+        """
+        column_types = self._get_arrow_column_types(column_names)
+        try:
+            table = self._read_arrow_table(
+                data_str=data_str,
+                column_names=column_names,
+                skip_rows=skip_rows,
+                column_types=column_types,
+            )
+            return self._arrow_table_to_pandas(table)
+        except pa.ArrowInvalid as err:
+            core_logger.info(
+                f"Not all values could be converted while parsing ({err}). "
+                "Converting the columns with pandas instead."
+            )
+        table = self._read_arrow_table(
+            data_str=data_str,
+            column_names=column_names,
+            skip_rows=skip_rows,
+            column_types={name: pa.string() for name in column_types},
+        )
+        data = self._arrow_table_to_pandas(table)
+        decimal = self.config.decimal.strip()
+        for name, data_type in column_types.items():
+            if pa.types.is_timestamp(data_type):
+                data[name] = pd.to_datetime(
+                    data[name], format=self.timestamp_format, errors="coerce"
+                )
+            elif pa.types.is_floating(data_type) or pa.types.is_integer(
+                data_type
+            ):
+                # Cases when decimal is not '.', replace them by '.'
+                if decimal != ".":
+                    data[name] = data[name].str.replace(decimal, ".")
+                data[name] = pd.to_numeric(data[name], errors="coerce").astype(
+                    "float64"
+                )
+        return data
+
+    def _arrow_table_to_pandas(self, table: pa.Table) -> pd.DataFrame:
+        """
+        Converts a pyarrow Table to a DataFrame, with arrow-backed
+        strings.
+        """
+        if self.config.skip_initial_space:
+            for i, name in enumerate(table.column_names):
+                if pa.types.is_string(table.schema.field(i).type):
+                    table = table.set_column(
+                        i,
+                        name,
+                        pa_compute.utf8_ltrim_whitespace(table.column(i)),
+                    )
+        return table.to_pandas(
+            types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get
+        )
+
+    def _make_dataframe_in_chunks(
+        self,
+        column_names: list,
+    ) -> pd.DataFrame:
+        """
+        Parses the files into a DataFrame chunk by chunk, so that only
+        one chunk of raw text is held in memory at a time. The chunks
+        are combined at the end.
+
+        When column_types is given, each chunk parsed with the pandas
+        engine is converted to numbers and date times (see
+        _convert_chunk_types) before it is kept, so that the chunks are
+        held in their compact typed form instead of as Python strings.
+        Otherwise the result is the same as parsing all files at once.
+
+        Parameters
+        ----------
+        column_names : list
+            The column names
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with all data
+        """
+        chunk_size = int(
+            self.config.memory_limit_mb * 1024**2 / _PARSED_TO_RAW_MEMORY_RATIO
+        )
+        chunks = []
+        for data_str in self._iter_data_chunks(chunk_size=chunk_size):
+            if not chunks:
+                # skip_lines is applied to the start of the merged data
+                # as well as to each file, as when parsing all at once
+                chunk = self._read_data_string(
+                    data_str=data_str,
+                    column_names=column_names,
+                    skip_rows=self.config.skip_lines,
+                )
+            else:
+                chunk = self._read_data_lines(
+                    data_str=data_str,
+                    column_names=column_names,
+                )
+            if (
+                self.config.parse_engine != "arrow"
+                and self.column_types is not None
+            ):
+                chunk = self._convert_chunk_types(chunk)
+            chunks.append(chunk)
+        if len(chunks) == 1:
+            return chunks[0]
+        return pd.concat(chunks, ignore_index=True)
+
+    def _convert_chunk_types(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Converts the string columns of a chunk parsed with the pandas
+        engine as FormatDataForCRNSDataHub converts them: timestamp
+        columns in column_types with parse_date_time_strings, string
+        columns in column_types (e.g., separate date and time columns)
+        are kept, and all other columns become numeric, with values
+        which cannot be converted as NaN.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The chunk, with string columns
+
+        Returns
+        -------
+        pd.DataFrame
+            The chunk with typed columns
+        """
+        decimal = self.config.decimal.strip()
+        for name in data.columns:
+            data_type = self.column_types.get(name)
+            if data_type is not None and pa.types.is_timestamp(data_type):
+                if self.timestamp_format is None:
+                    # the format is detected when formatting
+                    continue
+                data[name] = parse_date_time_strings(
+                    date_time_values=data[name],
+                    date_time_format=self.timestamp_format,
+                )
+                continue
+            if data_type is not None and pa.types.is_string(data_type):
+                continue
+            # Cases when decimal is not '.', replace them by '.'
+            if decimal != ".":
+                data[name] = data[name].str.replace(decimal, ".")
+            data[name] = pd.to_numeric(data[name], errors="coerce")
+        return data
 
-    def filter_files(
+    def _make_dataframe_incrementally(
         self,
-    ):
+        column_names: list,
+    ) -> pd.DataFrame:
         """
-        Filters the files found in the data location using the prefix or
-        suffix given during initialisation. Both of these default to
-        None.
+        Creates the DataFrame using the ingest cache. Only files which
+        are new or changed since the last run are parsed. The parsed
+        data of the other files is read from the cache, and the cache is
+        updated afterwards. Cached files which are not in the file list
+        (e.g., outside of the time window) are kept in the cache, only
+        files which are no longer on disk are removed.
 
-        This method updates the `files` attribute of the class with the
-        filtered list.
+        Each file is parsed on its own, so a last line without a
+        newline character is not joined to the first line of the next
+        file (as happens when parsing all files at once).
 
-        TODO maybe add regexp or * functionality
-        """
+        skip_lines is applied to the first file by dropping its leading
+        cached rows. The number of rows to drop is recorded in the
+        manifest entry of the file (see _count_skipped_rows), so an
+        unchanged run parses no files.
 
-        files_filtered = [
-            filename
-            for filename in self.files
-            if filename.startswith(self.config.prefix)
-        ]
+        Parameters
+        ----------
+        column_names : list
+            The column names
 
-        # End with ...
-        files_filtered = [
-            filename
-            for filename in files_filtered
-            if filename.endswith(self.config.suffix)
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with all data
+        """
+        files = list(self.file_manager.files)
+        manifest = IngestManifest(
+            cache_directory=(
+                self.config.ingest_cache_location
+                if self.config.ingest_cache_location is not None
+                else default_ingest_cache_directory(self.config.data_location)
+            ),
+            parse_settings=self._get_parse_settings(column_names),
+        )
+        manifest.load()
+
+        entries = {}
+        cached_files = []
+        files_to_parse = []
+        with self._create_file_reader() as reader:
+            # a changed file is hashed once, in is_unchanged or below
+            file_hash = functools.cache(reader.file_hash)
+            for filename in files:
+                size, mtime_ns = reader.file_stat(filename)
+                if manifest.is_unchanged(filename, size, mtime_ns, file_hash):
+                    cached_files.append(filename)
+                    entries[filename] = manifest.entries[filename]
+                else:
+                    files_to_parse.append(filename)
+                    entries[filename] = {
+                        "size": size,
+                        "mtime_ns": mtime_ns,
+                        "sha256": file_hash(filename),
+                    }
+            removed_files = [
+                filename
+                for filename in manifest.entries
+                if filename not in entries and not reader.file_exists(filename)
+            ]
+        core_logger.info(
+            f"Ingest cache: {len(cached_files)} files unchanged, "
+            f"{len(files_to_parse)} new or changed files to parse."
+        )
+
+        data_str_by_file = dict(
+            zip(
+                files_to_parse,
+                self._iter_file_contents(files=files_to_parse),
+            )
+        )
+        for filename, data_lines, bad_lines in self._file_reports:
+            entries[filename].update(
+                {"data_lines": data_lines, "bad_lines": bad_lines}
+            )
+        self._file_reports = [
+            (
+                filename,
+                entries[filename]["data_lines"],
+                entries[filename]["bad_lines"],
+            )
+            for filename in files
         ]
+        first_file_str = data_str_by_file.get(files[0])
+
+        data = manifest.load_data(cached_files)
+        parsed_data = None
+        if files_to_parse:
+            parsed_data = self._parse_files_separately(
+                data_str_by_file=data_str_by_file,
+                entries=entries,
+                column_names=column_names,
+            )
+            data = pd.concat([data, parsed_data], ignore_index=True)
+        # Order the rows by file, keeping the order within each file
+        file_position = (
+            data[SOURCE_FILE_COLUMN]
+            .map({filename: i for i, filename in enumerate(files)})
+            .to_numpy()
+        )
+        data = data.iloc[np.argsort(file_position, kind="stable")]
+        data = data.reset_index(drop=True)
+
+        first_file_entry = entries[files[0]]
+        skipped_rows = first_file_entry.get("skipped_rows")
+        first_file_data = None
+        skipped_rows_recorded = False
+        if skipped_rows is None:
+            # The first file is parsed as when parsing all files at once
+            if first_file_str is None:
+                with self._create_file_reader() as reader:
+                    first_file_str, _, _ = reader(files[0])
+            first_file_data = self._read_data_string(
+                data_str=first_file_str,
+                column_names=column_names,
+                skip_rows=self.config.skip_lines,
+            )
+            skipped_rows = self._count_skipped_rows(
+                data_str=first_file_str,
+                column_names=column_names,
+                first_file_data=first_file_data,
+            )
+            if skipped_rows is not None:
+                first_file_entry["skipped_rows"] = skipped_rows
+                skipped_rows_recorded = True
 
-        # raise error when no files are found
-        if len(files_filtered) == 0:
-            message = (
-                f"No files found in {self.config.data_location} "
-                f"with prefix '{self.config.prefix}' and suffix '{self.config.suffix}'."
+        if files_to_parse or removed_files or skipped_rows_recorded:
+            updated_files = files_to_parse + (
+                [files[0]] if skipped_rows_recorded else []
             )
-            core_logger.error(message)
-            raise FileNotFoundError(message)
+            try:
+                manifest.update(
+                    entries={
+                        filename: entries[filename]
+                        for filename in updated_files
+                    },
+                    data=parsed_data,
+                    remove=removed_files,
+                )
+            except Exception as err:
+                core_logger.warning(
+                    f"Could not update the ingest cache: {err}"
+                )
 
-        self.files = files_filtered
+        data = data.drop(columns=SOURCE_FILE_COLUMN)
+        if skipped_rows is not None:
+            return data.iloc[skipped_rows:].reset_index(drop=True)
+        number_of_first_file_rows = int((file_position == 0).sum())
+        return pd.concat(
+            [
+                first_file_data,
+                data.iloc[number_of_first_file_rows:],
+            ],
+            ignore_index=True,
+        )
 
-    def create_file_list(self):
-        """
-        Create clean file list
+    def _count_skipped_rows(
+        self,
+        data_str: str,
+        column_names: list,
+        first_file_data: pd.DataFrame,
+    ) -> int | None:
+        """
+        Counts the rows which skip_lines removes from the start of a
+        file, when the file is parsed as the first file. The rows parsed
+        with skip_lines must be the same as the last rows of the file
+        parsed on its own (as stored in the ingest cache), otherwise
+        (e.g., the first line after the skipped lines has too many
+        fields) None is returned and the first file is parsed on every
+        run.
+
+        Parameters
+        ----------
+        data_str : str
+            The data lines of the file
+        column_names : list
+            The column names
+        first_file_data : pd.DataFrame
+            The file parsed with skip_lines
+
+        Returns
+        -------
+        int | None
+            The number of leading rows to drop from the cached rows of
+            the file, or None
+        """
+        file_data = self._read_data_lines(
+            data_str=data_str,
+            column_names=column_names,
+        ).reset_index(drop=True)
+        skipped_rows = len(file_data) - len(first_file_data)
+        if skipped_rows < 0:
+            return None
+        if (
+            file_data.iloc[skipped_rows:]
+            .reset_index(drop=True)
+            .equals(first_file_data.reset_index(drop=True))
+        ):
+            return skipped_rows
+        return None
+
+    def _parse_files_separately(
+        self,
+        data_str_by_file: dict,
+        entries: dict,
+        column_names: list,
+    ) -> pd.DataFrame:
         """
-        self.get_list_of_files()
-        self.filter_files()
+        Parses the data lines of each file as if each file was parsed on
+        its own, and records the file of each row in the
+        SOURCE_FILE_COLUMN.
 
+        The files are parsed together when the number of rows of each
+        file is known from the number of data lines and bad lines. If
+        the total number of rows does not match, each file is parsed on
+        its own.
 
-class ParseFilesIntoDataFrame:
-    """
-    Parses raw files into a single pandas DataFrame.
+        Parameters
+        ----------
+        data_str_by_file : dict
+            The data lines of each file
+        entries : dict
+            The manifest entries (with data_lines and bad_lines)
+        column_names : list
+            The column names
 
-    This class takes instances of ManageFileCollection and
-    FileCollectionConfig to process and combine multiple data files into
-    a single DataFrame, handling various file formats and parsing
-    configurations.
+        Returns
+        -------
+        pd.DataFrame
+            The parsed data of all files
+        """
+        filenames = list(data_str_by_file)
+        rows_per_file = [
+            entries[filename]["data_lines"] - entries[filename]["bad_lines"]
+            for filename in filenames
+        ]
+        if all(
+            data_str == "" or data_str.endswith("\n")
+            for data_str in data_str_by_file.values()
+        ):
+            data = self._read_data_lines(
+                data_str="".join(data_str_by_file.values()),
+                column_names=column_names,
+            )
+            if len(data) == sum(rows_per_file):
+                return data.assign(
+                    **{
+                        SOURCE_FILE_COLUMN: np.repeat(
+                            np.array(filenames, dtype=object), rows_per_file
+                        )
+                    }
+                )
 
-    Example
-    -------
-    >>> config = FileCollectionConfig(data_location='/path/to/data/folder/')
-    >>> file_manager = ManageFileCollection(config=config)
-    >>> file_parser = ParseFilesIntoDataFrame(file_manager, config)
-    >>> df = file_parser.make_dataframe()
-    """
+        frames = [
+            self._read_data_lines(
+                data_str=data_str,
+                column_names=column_names,
+            ).assign(**{SOURCE_FILE_COLUMN: filename})
+            for filename, data_str in data_str_by_file.items()
+        ]
+        if not frames:
+            frames = [
+                self._read_data_lines(
+                    data_str="", column_names=column_names
+                ).assign(**{SOURCE_FILE_COLUMN: None})
+            ]
+        return pd.concat(frames, ignore_index=True)
+
+    def _get_parse_settings(self, column_names: list) -> dict:
+        """
+        Returns the settings which affect how a file is parsed. Used to
+        invalidate the ingest cache when these change.
+        """
+        return {
+            "column_names": list(column_names),
+            "encoding": self.config.encoding,
+            "skip_lines": self.config.skip_lines,
+            "separator": self.config.separator,
+            "decimal": self.config.decimal,
+            "skip_initial_space": self.config.skip_initial_space,
+            "strip_left": self.config.parser_kw_strip_left,
+            "digit_first": self.config.parser_kw_digit_first,
+            "parse_engine": self.config.parse_engine,
+            "column_types": (
+                {name: str(t) for name, t in self.column_types.items()}
+                if self.column_types is not None
+                else None
+            ),
+            "timestamp_format": self.timestamp_format,
+        }
 
-    def __init__(
+    def _iter_data_chunks(
         self,
-        file_manager: ManageFileCollection,
-        config: FileCollectionConfig,
+        chunk_size: int,
     ):
         """
-        Initialisation files.
+        Yields strings of data lines of approximately chunk_size
+        characters. Chunks always end at the end of a line and the first
+        chunk contains more than skip_lines lines.
 
         Parameters
         ----------
-        file_manager : ManageFileCollection
-            An instance fo the ManageFileCollection class
-        config : FileCollectionConfig
-            The config file containing information to support
-            processing.
+        chunk_size : int
+            Approximate number of characters in each chunk
 
+        Yields
+        ------
+        str
+            A string of data lines
+        """
+        buffer = []
+        buffer_size = 0
+        lines_read = 0
+        chunks_yielded = 0
+        for line in self._iter_data_lines():
+            buffer.append(line)
+            buffer_size += len(line)
+            if not line.endswith("\n"):
+                continue
+            lines_read += 1
+            if (
+                buffer_size >= chunk_size
+                and lines_read > self.config.skip_lines
+            ):
+                yield "".join(buffer)
+                chunks_yielded += 1
+                buffer = []
+                buffer_size = 0
+        if buffer or chunks_yielded == 0:
+            yield "".join(buffer)
+
+    def _iter_data_lines(self):
+        """
+        Yields the data lines of all files in order. Without parallel
+        workers, files are read line by line.
+
+        Yields
+        ------
+        str
+            A data line
         """
-        self.file_manager = file_manager
-        self.config = config
+        if self._get_number_of_workers() > 1:
+            for data_str in self._iter_file_contents():
+                yield from io.StringIO(data_str)
+            return
 
-    def make_dataframe(
-        self,
-        column_names=None,
-    ) -> pd.DataFrame:
+        with self._create_file_reader() as reader:
+            for filename in self.file_manager.files:
+                data_lines = 0
+                bad_lines = 0
+                for line in reader.iter_lines(filename):
+                    data_lines += 1
+                    bad_lines += reader.is_bad_line(line)
+                    yield line
+                self._file_reports.append((filename, data_lines, bad_lines))
+
+    def _iter_file_contents(self, files: list | None = None):
         """
-        Merges, parses and converts data it to a single DataFrame.
+        Reads the files and yields the data lines of each file as a
+        string, in the order of the files. When more than one worker is
+        set, files are read in parallel using a process pool.
 
         Parameters
         ----------
-        column_names : list, optional
-            Can supply custom column_names for saving file, by default
-            None
+        files : list | None, optional
+            The files to read, by default None (all files of the
+            file_manager)
 
-        Returns
-        -------
-        pd.DataFrame
-            DataFrame with all data
-        """
-        if column_names is None:
-            column_names = self.config.column_names
+        Yields
+        ------
+        str
+            The data lines of a file
+        """
+        reader = self._create_file_reader()
+        if files is None:
+            files = self.file_manager.files
+        workers = min(self._get_number_of_workers(), max(len(files), 1))
+        if workers <= 1:
+            with reader:
+                for filename in files:
+                    data_str, data_lines, bad_lines = reader(filename)
+                    self._file_reports.append(
+                        (filename, data_lines, bad_lines)
+                    )
+                    yield data_str
+            return
 
-        if column_names is None:
-            column_names = self._infer_column_names()
+        # submit files in batches to limit the results held in memory
+        batch_size = workers * _FILES_PER_WORKER_BATCH
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for start in range(0, len(files), batch_size):
+                batch = files[start : start + batch_size]
+                # chunks share one reader, so archives are opened once
+                # per chunk
+                results = executor.map(
+                    reader, batch, chunksize=-(-len(batch) // workers)
+                )
+                for filename, (data_str, data_lines, bad_lines) in zip(
+                    batch, results
+                ):
+                    self._file_reports.append(
+                        (filename, data_lines, bad_lines)
+                    )
+                    yield data_str
 
-        data_str = self._merge_files()
+    def _get_number_of_workers(self) -> int:
+        """
+        Returns the number of workers used to read files, which is never
+        more than the number of files.
+        """
+        workers = self.config.parse_workers or 1
+        return max(1, min(workers, len(self.file_manager.files)))
 
-        data = pd.read_csv(
-            io.StringIO(data_str),
-            names=column_names,
+    def _create_file_reader(self) -> RawFileReader:
+        """
+        Creates a RawFileReader from the config.
+        """
+        return RawFileReader(
+            data_location=self.config.data_location,
             encoding=self.config.encoding,
-            skiprows=self.config.skip_lines,
-            skipinitialspace=self.config.skip_initial_space,
-            sep=self.config.separator,
-            decimal=self.config.decimal,
-            on_bad_lines="skip",  # ignore all lines with bad columns
-            dtype=object,  # Allows for reading strings
-            index_col=False,
+            skip_lines=self.config.skip_lines,
+            strip_left=self.config.parser_kw_strip_left,
+            digit_first=self.config.parser_kw_digit_first,
+            separator=self.config.separator,
+            number_of_columns=self._number_of_columns,
+            pad_short_lines=self.config.parse_engine == "arrow",
+            data_source=self.config.data_source,
+            archive_root=self.config.archive_root,
         )
-        return data
 
     def _merge_files(
         self,
@@ -524,40 +2054,12 @@ class ParseFilesIntoDataFrame:
         Reads all selected files and merges them into a single large
         data string.
 
-        This method processes each file using the `_process_file` method
-        and combines the results.
-
         Returns
         -------
         str
             A single large string containing all data lines
         """
-        return "".join(
-            self._process_file(filename)
-            for filename in self.file_manager.files
-        )
-
-    def _read_file_content(
-        self,
-        file,
-    ) -> str:
-        """
-        Reads the file content by parsing each line. Skips lines based
-        on config file selection.
-
-        Parameters
-        ----------
-        file : *
-            The file to parse.
-
-        Returns
-        -------
-        str
-            string representation of file
-        """
-        for _ in range(self.config.skip_lines):
-            next(file)
-        return "".join(self._parse_file_line(line) for line in file)
+        return "".join(self._iter_file_contents())
 
     def _process_file(
         self,
@@ -576,9 +2078,11 @@ class ParseFilesIntoDataFrame:
         str
             A string containing the processed data from the file
         """
-        with self._open_file(filename, self.config.encoding) as file:
-            return self._read_file_content(file)
+        with self._create_file_reader() as reader:
+            data_str, _, _ = reader(filename)
+        return data_str
 
+    @contextmanager
     def _open_file(
         self,
         filename: str,
@@ -586,7 +2090,8 @@ class ParseFilesIntoDataFrame:
     ):
         """
         Opens an individual file from either a folder, zipfile, or
-        tarfile.
+        tarfile. Used as a context manager, which closes the file and
+        the archive it was read from.
 
         Parameters
         ----------
@@ -595,18 +2100,15 @@ class ParseFilesIntoDataFrame:
         encoding : str
             Encoding of the file
 
-        Returns
-        -------
+        Yields
+        ------
         file
-            returns the open file
+            the open file
         """
-        try:
-            return open(
-                self.config.data_location / filename,
-                encoding=encoding,
-            )
-        except Exception as e:
-            raise IOError(f"Error opening file {filename}: {str(e)}")
+        with self._create_file_reader() as reader:
+            reader.encoding = encoding
+            with reader.open_file(filename) as file:
+                yield file
 
     def _parse_file_line(
         self,
@@ -625,20 +2127,10 @@ class ParseFilesIntoDataFrame:
         str
             a valid line or an empty string
         """
-
-        ###
-
-        if isinstance(line, bytes) and self.config.encoding != "":
-            line = line.decode(self.config.encoding, errors="ignore")
-
-        if self.config.parser_kw_strip_left:
-            line = line.lstrip()
-
-        # If the line starts with a number, it likely is actual data
-        if self.config.parser_kw_digit_first and not line[:1].isdigit():
-            return ""
-
-        return line
+        if self._line_reader is None:
+            # parse_line does not open files, the reader is kept
+            self._line_reader = self._create_file_reader()
+        return self._line_reader.parse_line(line)
 
     def _infer_column_names(
         self,
@@ -752,6 +2244,7 @@ class InputDataFrameFormattingConfig:
         is_timestamp: bool = False,
         decimal: str = ".",
         start_date_of_data: str | pd.DatetimeIndex = None,
+        end_date_of_data: str | pd.DatetimeIndex = None,
     ):
         """
         A class storing information supporting automated processing of
@@ -803,8 +2296,8 @@ class InputDataFrameFormattingConfig:
             Names of date time columns, if more than one expects DATE +
             TIME, by default None
         date_time_format : str, optional
-            Format of the date time column, by default "%Y/%m/%d
-            %H:%M:%S"
+            Format of the date time column. If None, the format is
+            detected from the data, by default "%Y/%m/%d %H:%M:%S"
         initial_time_zone : str, optional
             Initial time zone, by default "utc"
         convert_time_zone_to : str, optional
@@ -817,6 +2310,9 @@ class InputDataFrameFormattingConfig:
             The beginning date from which data should be processed. All
             data before this date is removed during parsing. Should
             always be in format: "%Y-%m-%d" e.g., 2024-04-22
+        end_date_of_data : str | pd.DateTime, optional
+            The last date (and time, UTC) of data to process. All data
+            after this is removed during parsing, by default None
 
         Notes
         -----
@@ -850,6 +2346,7 @@ class InputDataFrameFormattingConfig:
         self.is_timestamp = is_timestamp
         self.decimal = decimal
         self.start_date_of_data = start_date_of_data
+        self.end_date_of_data = end_date_of_data
         self.column_data: List[InputColumnMetaData] = []
 
     def add_column_meta_data(
@@ -888,6 +2385,64 @@ class InputDataFrameFormattingConfig:
             )
         )
 
+    def store_date_time_format(self, date_time_format: str):
+        """
+        Stores a (detected) date time format. When the config was built
+        from a sensor config, the format is also stored there, so that
+        it is saved with the updated sensor config and detection is not
+        needed again.
+
+        Parameters
+        ----------
+        date_time_format : str
+            The date time format
+        """
+        self.date_time_format = date_time_format
+        config_info = getattr(self, "config_info", None)
+        if config_info is None or config_info.time_series_data is None:
+            return
+        key_column_info = config_info.time_series_data.key_column_info
+        if (
+            key_column_info is not None
+            and key_column_info.date_time_format is None
+        ):
+            key_column_info.date_time_format = date_time_format
+
+    def get_arrow_column_types(self) -> dict:
+        """
+        Returns the pyarrow data type of each column needed for
+        formatting, for parsing raw files with the arrow parse engine
+        (see ParseFilesIntoDataFrame). Neutron and meteo columns are
+        numeric. A single date time column is a timestamp (parsed with
+        date_time_format) or numeric when is_timestamp is True. Separate
+        date and time columns are strings, which are joined when
+        formatting.
+
+        Returns
+        -------
+        dict
+            column name: pyarrow data type
+        """
+        column_types = {
+            column.initial_name: pa.float64() for column in self.column_data
+        }
+        date_time_columns = (
+            [self.date_time_columns]
+            if isinstance(self.date_time_columns, str)
+            else list(self.date_time_columns)
+        )
+        for column_name in date_time_columns:
+            if self.is_timestamp:
+                column_types[column_name] = pa.float64()
+            elif (
+                len(date_time_columns) == 1
+                and self.date_time_format is not None
+            ):
+                column_types[column_name] = pa.timestamp("ns")
+            else:
+                column_types[column_name] = pa.string()
+        return column_types
+
     def import_config(
         self,
         path_to_config: str = None,
@@ -937,6 +2492,17 @@ class InputDataFrameFormattingConfig:
         self.start_date_of_data = pd.to_datetime(
             tmp.sensor_info.install_date, format="%Y-%m-%d"
         )
+        if tmp.raw_data_parse_options is not None:
+            start_date = _to_naive_timestamp(
+                tmp.raw_data_parse_options.start_date
+            )
+            if start_date is not None:
+                self.start_date_of_data = max(
+                    _to_naive_timestamp(self.start_date_of_data), start_date
+                )
+            self.end_date_of_data = _to_naive_timestamp(
+                tmp.raw_data_parse_options.end_date
+            )
 
         self.add_meteo_columns(
             meteo_columns=tmp.time_series_data.key_column_info.epithermal_neutron_columns,
@@ -1067,18 +2633,146 @@ class InputDataFrameFormattingConfig:
         date_time_columns : List
             Names of date time columns
         date_time_format : str
-            The expected format of the date time values.
+            The expected format of the date time values. If None, the
+            format is detected from the data.
         initial_time_zone : str
             The intial time zone of the data
         convert_time_zone_to : str
             The desired time zone, by default "UTC"
         """
         self.date_time_columns = [col for col in date_time_columns]
-        self.date_time_format = date_time_format.replace('"', "")
+        self.date_time_format = (
+            date_time_format.replace('"', "")
+            if date_time_format is not None
+            else None
+        )
         self.initial_time_zone = initial_time_zone
         self.convert_time_zone_to = convert_time_zone_to
 
 
+def detect_date_time_format(
+    date_time_values: pd.Series,
+    sample_size: int = _DATE_TIME_FORMAT_SAMPLE_SIZE,
+) -> str | None:
+    """
+    Detects the format of date time strings from a sample of the values,
+    so that the whole series can be parsed with a known format (instead
+    of pandas inferring it).
+
+    Candidate formats are guessed from the first values (month first
+    and day first). The first candidate that parses every value in an
+    evenly spaced sample is returned.
+
+    Parameters
+    ----------
+    date_time_values : pd.Series
+        The date time strings
+    sample_size : int, optional
+        Number of values used to check the candidate formats, by
+        default 1000
+
+    Returns
+    -------
+    str | None
+        The format, or None if no format could be detected
+    """
+    values = date_time_values.dropna().astype(str)
+    values = values[values.str.strip() != ""]
+    if values.empty:
+        return None
+    step = max(1, len(values) // sample_size)
+    sample = values.iloc[::step].iloc[:sample_size]
+
+    candidates = []
+    for value in sample.iloc[:10]:
+        for dayfirst in (False, True):
+            date_time_format = guess_datetime_format(value, dayfirst=dayfirst)
+            if date_time_format is not None and (
+                date_time_format not in candidates
+            ):
+                candidates.append(date_time_format)
+
+    for date_time_format in candidates:
+        parsed = pd.to_datetime(
+            sample, format=date_time_format, errors="coerce"
+        )
+        if parsed.notna().all():
+            core_logger.info(
+                f"Detected date_time_format '{date_time_format}'. Set "
+                "date_time_format in the sensor config to skip detection."
+            )
+            return date_time_format
+
+    core_logger.warning(
+        "Could not detect the date_time_format from the data. Please set "
+        "date_time_format in the sensor config."
+    )
+    return None
+
+
+def parse_date_time_strings(
+    date_time_values: pd.Series,
+    date_time_format: str,
+) -> pd.Series:
+    """
+    Parses date time strings with a known format. The values are parsed
+    with the (vectorised) pyarrow strptime kernel where possible, and
+    with pd.to_datetime otherwise. Values which cannot be parsed become
+    NaT.
+
+    Parameters
+    ----------
+    date_time_values : pd.Series
+        The date time strings
+    date_time_format : str
+        The format of the values
+
+    Returns
+    -------
+    pd.Series
+        The date times (datetime64[ns])
+    """
+    if any(
+        directive in date_time_format
+        for directive in _ARROW_UNSUPPORTED_DATE_TIME_DIRECTIVES
+    ):
+        return pd.to_datetime(
+            date_time_values, format=date_time_format, errors="coerce"
+        )
+    try:
+        values = pa.array(date_time_values, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pd.to_datetime(
+            date_time_values, format=date_time_format, errors="coerce"
+        )
+    parsed = pa_compute.strptime(
+        values, format=date_time_format, unit="ns", error_is_null=True
+    )
+    # pandas does not accept leading whitespace, keep the same result
+    leading_space = pa_compute.or_(
+        pa_compute.starts_with(values, " "),
+        pa_compute.starts_with(values, "\t"),
+    )
+    parsed = pa_compute.if_else(leading_space, None, parsed)
+    date_times = pd.Series(
+        parsed.to_numpy(zero_copy_only=False).astype("datetime64[ns]"),
+        index=date_time_values.index,
+        name=date_time_values.name,
+    )
+
+    # values the arrow kernel could not parse are parsed with pandas
+    not_parsed = (
+        date_times.isna().to_numpy() & date_time_values.notna().to_numpy()
+    )
+    if not_parsed.any():
+        date_times[not_parsed] = pd.to_datetime(
+            date_time_values[not_parsed],
+            format=date_time_format,
+            errors="coerce",
+        )
+    return date_times
+
+
 class FormatDataForCRNSDataHub:
     """
     Formats a DataFrame into the required format to work in neptoon.
@@ -1145,40 +2839,66 @@ class FormatDataForCRNSDataHub:
         Create a Datetime column, merge columns if necessary (e.g., when
         columns are split into date and time)
 
+        When no date_time_format is given, the format is detected once
+        from a sample of the values (see detect_date_time_format) and
+        stored in the config, so that all values are parsed with a
+        known format.
+
         Returns:
             pd.Series: the Datetime column.
         """
         if isinstance(self.config.date_time_columns, str):
             dt_series = self.data_frame[self.config.date_time_columns]
         elif isinstance(self.config.date_time_columns, list):
-            # Select Columns
-            for col_name in self.config.date_time_columns:
-                if isinstance(col_name, str):
-                    dt_series = pd.concat(
-                        [
-                            self.data_frame[col].astype(str)
-                            for col in self.config.date_time_columns
-                        ],
-                        axis=1,
-                    ).apply(lambda x: " ".join(x.values), axis=1)
-                else:
-                    message = (
-                        "date_time_columns must contain only string "
-                        "type column names"
-                    )
-                    core_logger.error(message)
-                    raise ValueError(message)
+            if not all(
+                isinstance(col_name, str)
+                for col_name in self.config.date_time_columns
+            ):
+                message = (
+                    "date_time_columns must contain only string "
+                    "type column names"
+                )
+                core_logger.error(message)
+                raise ValueError(message)
+            if len(self.config.date_time_columns) == 1:
+                # a single column may already be parsed as date time
+                dt_series = self.data_frame[self.config.date_time_columns[0]]
+            else:
+                columns = [
+                    self.data_frame[col].astype(str)
+                    for col in self.config.date_time_columns
+                ]
+                dt_series = columns[0].str.cat(columns[1:], sep=" ")
         else:
             message = "date_time_columns must be either a string or a list of strings"
             core_logger.error(message)
             raise ValueError(message)
 
-        dt_series = pd.to_datetime(
-            dt_series,
-            errors="coerce",
-            unit="s" if self.config.is_timestamp else None,
-            format=self.config.date_time_format,
-        )
+        if (
+            self.config.date_time_format is None
+            and not self.config.is_timestamp
+            and not pd.api.types.is_datetime64_any_dtype(dt_series)
+        ):
+            detected_format = detect_date_time_format(dt_series)
+            if detected_format is not None:
+                self.config.store_date_time_format(detected_format)
+
+        if (
+            self.config.is_timestamp
+            or self.config.date_time_format is None
+            or pd.api.types.is_datetime64_any_dtype(dt_series)
+        ):
+            dt_series = pd.to_datetime(
+                dt_series,
+                errors="coerce",
+                unit="s" if self.config.is_timestamp else None,
+                format=self.config.date_time_format,
+            )
+        else:
+            dt_series = parse_date_time_strings(
+                date_time_values=dt_series,
+                date_time_format=self.config.date_time_format,
+            )
 
         return dt_series
 
@@ -1238,16 +2958,39 @@ class FormatDataForCRNSDataHub:
         """
         Convert DataFrame columns to numeric values.
         """
+        # Columns parsed with a numeric type are already converted
+        string_columns = [
+            column
+            for column in self.data_frame.columns
+            if not pd.api.types.is_numeric_dtype(self.data_frame[column])
+        ]
+        if not string_columns:
+            return
+
         # Cases when decimal is not '.', replace them by '.'
         decimal = self.config.decimal
         decimal = decimal.strip()
         if decimal != ".":
-            self.data_frame = self.data_frame.apply(
-                lambda x: x.str.replace(decimal, ".")
-            )
+            self.data_frame[string_columns] = self.data_frame[
+                string_columns
+            ].apply(lambda x: x.str.replace(decimal, "."))
 
         # Convert all the regular columns to numeric and drop any failures
-        self.data_frame = self.data_frame.apply(pd.to_numeric, errors="coerce")
+        numeric_data = self.data_frame[string_columns].apply(
+            pd.to_numeric, errors="coerce"
+        )
+        # arrow-backed strings give nullable dtypes, use NaN instead
+        numeric_data = numeric_data.astype(
+            {
+                column: "float64"
+                for column in string_columns
+                if isinstance(
+                    numeric_data[column].dtype,
+                    pd.api.extensions.ExtensionDtype,
+                )
+            }
+        )
+        self.data_frame[string_columns] = numeric_data
 
     def get_conversion_factor_to_cph(
         self,
@@ -1616,15 +3359,23 @@ class FormatDataForCRNSDataHub:
 
     def snip_data_frame(self):
         """
-        Removes data from before the defined install date.
+        Removes data from before the defined install date (or start
+        date) and after the end date.
         """
         if self.config.start_date_of_data is not None:
-            start_date = pd.to_datetime(
-                self.config.start_date_of_data, format="%Y-%m-%d"
+            start_date = _to_naive_timestamp(
+                self.config.start_date_of_data
             ).tz_localize("UTC")
             self.data_frame = self.data_frame[
                 ~(self.data_frame.index < start_date)
             ]
+        if self.config.end_date_of_data is not None:
+            end_date = _to_naive_timestamp(
+                self.config.end_date_of_data
+            ).tz_localize("UTC")
+            self.data_frame = self.data_frame[
+                ~(self.data_frame.index > end_date)
+            ]
 
     def format_data_and_return_data_frame(
         self,
@@ -1696,18 +3447,22 @@ class CollectAndParseRawData:
             path_to_config=self.path_to_config
         )
         self.file_collection_config.build_from_config()
+        self.input_formatter_config = InputDataFrameFormattingConfig(
+            path_to_config=self.path_to_config
+        )
+        self.input_formatter_config.import_config()
+        self.input_formatter_config.build_from_config()
+
         file_manager = ManageFileCollection(config=self.file_collection_config)
         file_manager.create_file_list()
         file_parser = ParseFilesIntoDataFrame(
-            file_manager=file_manager, config=self.file_collection_config
+            file_manager=file_manager,
+            config=self.file_collection_config,
+            column_types=self.input_formatter_config.get_arrow_column_types(),
+            timestamp_format=self.input_formatter_config.date_time_format,
         )
         parsed_data = file_parser.make_dataframe()
 
-        self.input_formatter_config = InputDataFrameFormattingConfig(
-            path_to_config=self.path_to_config
-        )
-        self.input_formatter_config.import_config()
-        self.input_formatter_config.build_from_config()
         data_formatter = FormatDataForCRNSDataHub(
             data_frame=parsed_data,
             config=self.input_formatter_config,
@@ -0,0 +1,258 @@
+"""
+Dates covered by raw data files.
+
+Used to skip raw files outside of a time window before they are parsed.
+The start date of a file can be taken from its name (with a regular
+expression), or the dates of its first and last data lines can be read.
+Dates read from the data are cached (with the size and modification
+time of each file), so that each file is only read once.
+"""
+
+import hashlib
+import json
+import os
+import re
+import pandas as pd
+from pathlib import Path
+
+from neptoon.logging import get_logger
+
+core_logger = get_logger()
+
+
+def dates_from_file_names(
+    files: list,
+    file_date_pattern: str,
+    file_date_format: str | None = None,
+) -> dict:
+    """
+    Finds the date in each file name with a regular expression. The
+    group named "date" is used if available, otherwise the first group
+    (or the whole match when the pattern has no groups).
+
+    Parameters
+    ----------
+    files : list
+        The file names
+    file_date_pattern : str
+        The regular expression, e.g., r"_(\\d{8})\\.txt"
+    file_date_format : str | None, optional
+        Format of the date in the file name, e.g., "%Y%m%d". If None,
+        the format is inferred, by default None
+
+    Returns
+    -------
+    dict
+        file name: pd.Timestamp or None if no date was found
+    """
+    pattern = re.compile(file_date_pattern)
+    dates = {}
+    for filename in files:
+        match = pattern.search(filename)
+        if match is None:
+            dates[filename] = None
+            continue
+        if "date" in pattern.groupindex:
+            value = match.group("date")
+        elif pattern.groups:
+            value = match.group(1)
+        else:
+            value = match.group(0)
+        date = pd.to_datetime(value, format=file_date_format, errors="coerce")
+        dates[filename] = None if pd.isna(date) else date
+    return dates
+
+
+def file_ranges_from_start_dates(start_dates: dict) -> dict:
+    """
+    Converts the start date of each file into the range of dates it
+    holds. Each file is presumed to end when the next file starts, the
+    last file has no end. Files without a start date get no range.
+
+    Parameters
+    ----------
+    start_dates : dict
+        file name: start date (pd.Timestamp or None)
+
+    Returns
+    -------
+    dict
+        file name: (start, end), where start and end may be None
+    """
+    dated_files = sorted(
+        (date, filename)
+        for filename, date in start_dates.items()
+        if date is not None
+    )
+    file_ranges = {
+        filename: (None, None)
+        for filename, date in start_dates.items()
+        if date is None
+    }
+    for i, (date, filename) in enumerate(dated_files):
+        end = dated_files[i + 1][0] if i + 1 < len(dated_files) else None
+        file_ranges[filename] = (date, end)
+    return file_ranges
+
+
+def is_range_in_window(
+    file_range: tuple,
+    start_date: pd.Timestamp | None,
+    end_date: pd.Timestamp | None,
+) -> bool:
+    """
+    Whether the range of dates of a file overlaps the time window.
+    Unknown (None) bounds are presumed to overlap.
+
+    Parameters
+    ----------
+    file_range : tuple
+        (start, end) of the file
+    start_date : pd.Timestamp | None
+        Start of the window
+    end_date : pd.Timestamp | None
+        End of the window
+
+    Returns
+    -------
+    bool
+        True if the file may hold data in the window
+    """
+    first, last = file_range
+    if start_date is not None and last is not None and last < start_date:
+        return False
+    if end_date is not None and first is not None and first > end_date:
+        return False
+    return True
+
+
+class FileDateIndex:
+    """
+    Cache of the dates of the first and last data line of raw files.
+
+    Example
+    -------
+    >>> index = FileDateIndex(
+    ...     cache_directory="/path/to/cache",
+    ...     settings={"separator": ",", "date_time_format": "%Y/%m/%d"},
+    ... )
+    >>> index.load()
+    >>> index.get("file.txt", size, mtime_ns)
+    """
+
+    FILE_NAME = "file_dates.json"
+
+    def __init__(
+        self,
+        cache_directory: str | Path,
+        settings: dict,
+    ):
+        """
+        Parameters
+        ----------
+        cache_directory : str | Path
+            Folder where the index is stored
+        settings : dict
+            The settings which affect how dates are read from the
+            files. A change in these settings invalidates the index.
+        """
+        self.cache_directory = Path(cache_directory)
+        self.settings = settings
+        self.entries = {}
+        self._changed = False
+
+    @property
+    def path(self) -> Path:
+        return self.cache_directory / self.FILE_NAME
+
+    @property
+    def settings_hash(self) -> str:
+        settings = json.dumps(self.settings, sort_keys=True, default=str)
+        return hashlib.sha256(settings.encode()).hexdigest()
+
+    def load(self):
+        """
+        Loads the index from the cache directory. Entries are discarded
+        when the index was written with different settings.
+        """
+        self.entries = {}
+        self._changed = False
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path) as file:
+                index = json.load(file)
+        except (OSError, json.JSONDecodeError) as err:
+            core_logger.warning(
+                f"Could not read file date index {self.path}: {err}"
+            )
+            return
+        if index.get("settings_hash") == self.settings_hash:
+            self.entries = index.get("files", {})
+
+    def get(self, filename: str, size: int, mtime_ns: int) -> tuple | None:
+        """
+        Returns the cached (first, last) dates of a file, or None if the
+        file is not in the index or has changed.
+
+        Parameters
+        ----------
+        filename : str
+            The file name
+        size : int
+            Current size of the file in bytes
+        mtime_ns : int
+            Current modification time of the file in nanoseconds
+
+        Returns
+        -------
+        tuple | None
+            (first, last) as pd.Timestamp or None
+        """
+        entry = self.entries.get(filename)
+        if (
+            entry is None
+            or entry["size"] != size
+            or entry["mtime_ns"] != mtime_ns
+        ):
+            return None
+        return tuple(
+            pd.Timestamp(date) if date is not None else None
+            for date in (entry["first"], entry["last"])
+        )
+
+    def set(
+        self,
+        filename: str,
+        size: int,
+        mtime_ns: int,
+        first: pd.Timestamp | None,
+        last: pd.Timestamp | None,
+    ):
+        """
+        Stores the dates of a file in the index.
+        """
+        self.entries[filename] = {
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "first": first.isoformat() if first is not None else None,
+            "last": last.isoformat() if last is not None else None,
+        }
+        self._changed = True
+
+    def write(self):
+        """
+        Writes the index to the cache directory, if it has changed.
+        """
+        if not self._changed:
+            return
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w") as file:
+            json.dump(
+                {"settings_hash": self.settings_hash, "files": self.entries},
+                file,
+                indent=1,
+            )
+        os.replace(temp_path, self.path)
+        self._changed = False
@@ -0,0 +1,252 @@
+"""
+Fast listing of raw data files in very large folders.
+
+Folders are walked with os.scandir, and the prefix, suffix and regular
+expression filters are applied during the walk: sub folders which
+cannot hold matching files are not entered. Optionally the listing of
+each folder is cached together with the modification time of the
+folder, so that unchanged folders are not listed again on later scans
+(one stat per folder instead of one listing).
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from neptoon.logging import get_logger
+
+core_logger = get_logger()
+
+# Folders modified less than this before a scan are not cached, as
+# files added in the same interval may not change the modification time
+_MTIME_RESOLUTION_NS = 2_000_000_000
+
+
+class DirectoryScanner:
+    """
+    Lists the files in a folder (and its sub folders) which match a
+    prefix, suffix and regular expression. The paths are relative to the
+    folder.
+
+    Example
+    -------
+    >>> scanner = DirectoryScanner(
+    ...     folder="/path/to/raw_data",
+    ...     prefix="CRS",
+    ...     suffix=".txt",
+    ...     cache_directory="/path/to/cache",
+    ... )
+    >>> files = scanner.scan()
+    >>> scanner.scan_report
+    """
+
+    CACHE_VERSION = 1
+    CACHE_FILE_NAME = "file_listing.json"
+
+    def __init__(
+        self,
+        folder: str | Path,
+        prefix: str = "",
+        suffix: str = "",
+        file_pattern: str | None = None,
+        cache_directory: str | Path | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        folder : str | Path
+            The folder to scan
+        prefix : str, optional
+            Start of the (relative) file paths, by default ""
+        suffix : str, optional
+            End of the file paths, by default ""
+        file_pattern : str | None, optional
+            Regular expression which must be found in the file paths, by
+            default None
+        cache_directory : str | Path | None, optional
+            Folder where the listing is cached. If None the listing is
+            not cached, by default None
+        """
+        self.folder = Path(folder)
+        self.prefix = prefix or ""
+        self.suffix = suffix or ""
+        self.file_pattern = (
+            re.compile(file_pattern) if file_pattern is not None else None
+        )
+        self.cache_directory = (
+            Path(cache_directory) if cache_directory is not None else None
+        )
+        self.scan_report = None
+        self._cached_listing = {}
+        self._listing = {}
+        self._scan_start_ns = None
+
+    @property
+    def cache_path(self) -> Path | None:
+        if self.cache_directory is None:
+            return None
+        return self.cache_directory / self.CACHE_FILE_NAME
+
+    def scan(self) -> list:
+        """
+        Walks the folder and returns the matching files. The number of
+        entries scanned (and per second) is stored in `scan_report`.
+
+        Returns
+        -------
+        list
+            Paths of the matching files, relative to the folder
+        """
+        start_time = time.perf_counter()
+        self._scan_start_ns = time.time_ns()
+        self._load_cache()
+        self._listing = {}
+        report = {
+            "directories": 0,
+            "cached_directories": 0,
+            "entries": 0,
+            "files": 0,
+        }
+        files = []
+        directories = [""]
+        while directories:
+            relative_directory = directories.pop()
+            file_names, directory_names, from_cache = self._list_directory(
+                relative_directory
+            )
+            report["directories"] += 1
+            report["cached_directories"] += from_cache
+            report["entries"] += len(file_names) + len(directory_names)
+            for name in file_names:
+                path = os.path.join(relative_directory, name)
+                if self._is_match(path):
+                    files.append(path)
+            directories.extend(
+                path
+                for path in (
+                    os.path.join(relative_directory, name)
+                    for name in reversed(directory_names)
+                )
+                if self._may_hold_matches(path)
+            )
+        self._write_cache()
+
+        seconds = time.perf_counter() - start_time
+        report["files"] = len(files)
+        report["seconds"] = seconds
+        report["entries_per_second"] = (
+            report["entries"] / seconds if seconds > 0 else float("inf")
+        )
+        self.scan_report = report
+        core_logger.info(
+            f"Scanned {report['entries']} entries in "
+            f"{report['directories']} folders "
+            f"({report['cached_directories']} from cache) in "
+            f"{seconds:.2f} s "
+            f"({report['entries_per_second']:.0f} entries/s). "
+            f"{len(files)} files match the filters."
+        )
+        return files
+
+    def _is_match(self, path: str) -> bool:
+        """Whether a file path matches the filters."""
+        return (
+            path.startswith(self.prefix)
+            and path.endswith(self.suffix)
+            and (self.file_pattern is None or self.file_pattern.search(path))
+        )
+
+    def _may_hold_matches(self, path: str) -> bool:
+        """Whether a sub folder may hold files starting with prefix."""
+        path = path + os.sep
+        return path.startswith(self.prefix) or self.prefix.startswith(path)
+
+    def _list_directory(self, relative_directory: str) -> tuple:
+        """
+        Lists the file and folder names in a folder, using the cached
+        listing if the folder has not been modified since.
+
+        Returns
+        -------
+        tuple
+            (file names, folder names, whether the cache was used)
+        """
+        directory = self.folder / relative_directory
+        cached = self._cached_listing.get(relative_directory)
+        if cached is not None:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            if cached["mtime_ns"] == mtime_ns:
+                self._listing[relative_directory] = cached
+                return cached["files"], cached["directories"], True
+
+        file_names = []
+        directory_names = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    directory_names.append(entry.name)
+                elif entry.is_file():
+                    file_names.append(entry.name)
+        if self.cache_directory is not None:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            if self._scan_start_ns - mtime_ns > _MTIME_RESOLUTION_NS:
+                self._listing[relative_directory] = {
+                    "mtime_ns": mtime_ns,
+                    "files": file_names,
+                    "directories": directory_names,
+                }
+            else:
+                # too recent to be trusted, removed from the cache
+                self._listing[relative_directory] = None
+        return file_names, directory_names, False
+
+    def _load_cache(self):
+        """Loads the cached listing, if it is for the same folder."""
+        self._cached_listing = {}
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path) as file:
+                cache = json.load(file)
+        except (OSError, json.JSONDecodeError) as err:
+            core_logger.warning(
+                f"Could not read file listing {self.cache_path}: {err}"
+            )
+            return
+        if cache.get("version") == self.CACHE_VERSION and cache.get(
+            "folder"
+        ) == str(self.folder.resolve()):
+            self._cached_listing = cache.get("directories", {})
+
+    def _write_cache(self):
+        """
+        Writes the listing of the scanned folders. Folders which were
+        not scanned this time (e.g., excluded by the prefix) keep their
+        cached listing.
+        """
+        if self.cache_path is None:
+            return
+        listing = {
+            directory: entry
+            for directory, entry in {
+                **self._cached_listing,
+                **self._listing,
+            }.items()
+            if entry is not None
+        }
+        if listing == self._cached_listing:
+            return
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_path.with_suffix(".tmp")
+        with open(temp_path, "w") as file:
+            json.dump(
+                {
+                    "version": self.CACHE_VERSION,
+                    "folder": str(self.folder.resolve()),
+                    "directories": listing,
+                },
+                file,
+            )
+        os.replace(temp_path, self.cache_path)
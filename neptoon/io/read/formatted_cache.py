@@ -0,0 +1,195 @@
+"""
+Cache of the formatted time series data.
+
+The output of FormatDataForCRNSDataHub depends only on the raw files and
+the configuration used to parse and format them. The FormattedDataCache
+stores it as Parquet, keyed by a hash of a manifest of the raw files
+(size and modification time of each file) and of those configuration
+sections, so it can be loaded directly when nothing upstream changed.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from neptoon.logging import get_logger
+
+core_logger = get_logger()
+
+
+def create_file_manifest(data_location: str | Path, files: list) -> dict:
+    """
+    Lists the size and modification time of each file.
+
+    Parameters
+    ----------
+    data_location : str | Path
+        Folder holding the files, or a single file (e.g., an archive or
+        a csv file), in which case only this file is listed
+    files : list
+        Names of the files, relative to data_location
+
+    Returns
+    -------
+    dict
+        file name: [size, mtime_ns]
+    """
+    data_location = Path(data_location)
+    if data_location.is_file():
+        stat = os.stat(data_location)
+        return {data_location.name: [stat.st_size, stat.st_mtime_ns]}
+    manifest = {}
+    for filename in files:
+        stat = os.stat(data_location / filename)
+        manifest[filename] = [stat.st_size, stat.st_mtime_ns]
+    return manifest
+
+
+class FormattedDataCache:
+    """
+    Parquet cache of the formatted time series data.
+
+    Example
+    -------
+    >>> cache = FormattedDataCache(
+    ...     cache_directory="/path/to/cache",
+    ...     key=FormattedDataCache.create_key(
+    ...         config_sections={"time_series_data": {...}},
+    ...         file_manifest=create_file_manifest(folder, files),
+    ...     ),
+    ... )
+    >>> data = cache.load()  # None when the key has changed
+    >>> cache.write(data)
+    """
+
+    CACHE_VERSION = 1
+    DATA_FILE_NAME = "formatted_data.parquet"
+    KEY_FILE_NAME = "formatted_data.json"
+
+    def __init__(
+        self,
+        cache_directory: str | Path,
+        key: str,
+    ):
+        """
+        Parameters
+        ----------
+        cache_directory : str | Path
+            Folder where the formatted data is stored
+        key : str
+            Hash of everything the formatted data depends on (see
+            create_key)
+        """
+        self.cache_directory = Path(cache_directory)
+        self.key = key
+
+    @property
+    def data_path(self) -> Path:
+        return self.cache_directory / self.DATA_FILE_NAME
+
+    @property
+    def key_path(self) -> Path:
+        return self.cache_directory / self.KEY_FILE_NAME
+
+    @classmethod
+    def create_key(
+        cls,
+        config_sections: dict,
+        file_manifest: dict,
+    ) -> str:
+        """
+        Creates the cache key from the configuration and the raw files.
+
+        Parameters
+        ----------
+        config_sections : dict
+            The (JSON serialisable) configuration used to parse and
+            format the data
+        file_manifest : dict
+            The raw files (see create_file_manifest)
+
+        Returns
+        -------
+        str
+            The key
+        """
+        from neptoon import __version__
+
+        key = json.dumps(
+            {
+                "version": cls.CACHE_VERSION,
+                "neptoon_version": __version__,
+                "config": config_sections,
+                "files": file_manifest,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def load(self) -> pd.DataFrame | None:
+        """
+        Loads the formatted data, if it was stored with the same key.
+
+        Returns
+        -------
+        pd.DataFrame | None
+            The formatted data, or None if there is no valid cache
+        """
+        if not (self.key_path.exists() and self.data_path.exists()):
+            return None
+        try:
+            with open(self.key_path) as file:
+                stored = json.load(file)
+        except (OSError, json.JSONDecodeError) as err:
+            core_logger.warning(
+                f"Could not read formatted data cache {self.key_path}: {err}"
+            )
+            return None
+        if stored.get("key") != self.key:
+            core_logger.info(
+                "Raw files or configuration changed since the formatted "
+                "data was cached. The data will be formatted again."
+            )
+            return None
+        data = pd.read_parquet(self.data_path)
+        # Parquet returns None for missing strings, formatting gives NaN
+        object_columns = data.columns[data.dtypes == object]
+        data[object_columns] = data[object_columns].where(
+            data[object_columns].notna(), np.nan
+        )
+        # Parquet does not keep the frequency of the index
+        if stored.get("index_freq") is not None:
+            data.index.freq = stored["index_freq"]
+        core_logger.info(f"Formatted data loaded from {self.data_path}")
+        return data
+
+    def write(self, data: pd.DataFrame):
+        """
+        Writes the formatted data and its key, replacing the existing
+        cache.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The formatted data
+        """
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        # the old key must not be left next to new data
+        self.key_path.unlink(missing_ok=True)
+        temp_data_path = self.data_path.with_suffix(".tmp")
+        data.to_parquet(temp_data_path)
+        os.replace(temp_data_path, self.data_path)
+        temp_key_path = self.key_path.with_suffix(".tmp")
+        with open(temp_key_path, "w") as file:
+            json.dump(
+                {
+                    "key": self.key,
+                    "index_freq": getattr(data.index, "freqstr", None),
+                },
+                file,
+            )
+        os.replace(temp_key_path, self.key_path)
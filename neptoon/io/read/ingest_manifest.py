@@ -0,0 +1,283 @@
+"""
+Incremental ingest of raw data files.
+
+The IngestManifest records which raw files have been parsed (with their
+size, modification time and content hash) and stores the parsed data of
+each file in a columnar (Parquet) cache. On later runs only new or
+changed files need to be parsed. The manifest is invalidated when the
+parse settings change.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from neptoon.config.global_configuration import GlobalConfig
+from neptoon.logging import get_logger
+
+core_logger = get_logger()
+
+SOURCE_FILE_COLUMN = "_source_file"
+
+
+def default_ingest_cache_directory(data_location: str | Path) -> Path:
+    """
+    The default ingest cache directory for a data location, inside the
+    neptoon cache directory.
+
+    Parameters
+    ----------
+    data_location : str | Path
+        The location of the raw data (folder or archive)
+
+    Returns
+    -------
+    Path
+        The cache directory
+    """
+    location_id = hashlib.sha256(
+        str(Path(data_location).resolve()).encode()
+    ).hexdigest()[:16]
+    return GlobalConfig.get_cache_dir() / "ingest" / location_id
+
+
+class IngestManifest:
+    """
+    Persistent record of parsed raw files and their parsed data.
+
+    The parsed data is stored in Parquet parts. Each update writes the
+    rows of the newly parsed files to a new part, and the manifest entry
+    of each file names the part which holds its rows. Parts which are no
+    longer referenced are deleted, and the parts are combined when there
+    are more than MAX_DATA_PARTS.
+
+    Example
+    -------
+    >>> manifest = IngestManifest(
+    ...     cache_directory="/path/to/cache",
+    ...     parse_settings={"separator": ",", "skip_lines": 0},
+    ... )
+    >>> manifest.load()
+    >>> manifest.is_unchanged("file.txt", size, mtime_ns, hash_function)
+    """
+
+    MANIFEST_VERSION = 2
+    MANIFEST_FILE_NAME = "ingest_manifest.json"
+    DATA_FILE_PREFIX = "parsed_files_"
+    MAX_DATA_PARTS = 16
+
+    def __init__(
+        self,
+        cache_directory: str | Path,
+        parse_settings: dict,
+    ):
+        """
+        Parameters
+        ----------
+        cache_directory : str | Path
+            Folder where the manifest and parsed data are stored
+        parse_settings : dict
+            The settings which affect how files are parsed. A change in
+            these settings invalidates the manifest.
+        """
+        self.cache_directory = Path(cache_directory)
+        self.parse_settings = parse_settings
+        self.entries = {}
+        self._next_part = 0
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.cache_directory / self.MANIFEST_FILE_NAME
+
+    @property
+    def settings_hash(self) -> str:
+        settings = json.dumps(self.parse_settings, sort_keys=True, default=str)
+        return hashlib.sha256(settings.encode()).hexdigest()
+
+    def load(self):
+        """
+        Loads the manifest from the cache directory. Entries are
+        discarded when the manifest was written with different parse
+        settings, or when a data part is missing.
+        """
+        self.entries = {}
+        if not self.manifest_path.exists():
+            return
+        try:
+            with open(self.manifest_path) as file:
+                manifest = json.load(file)
+        except (OSError, json.JSONDecodeError) as err:
+            core_logger.warning(
+                f"Could not read ingest manifest {self.manifest_path}: {err}"
+            )
+            return
+        self._next_part = manifest.get("next_part", 0)
+        if (
+            manifest.get("version") != self.MANIFEST_VERSION
+            or manifest.get("settings_hash") != self.settings_hash
+        ):
+            core_logger.info(
+                "Parse settings changed since the last ingest. "
+                "All files will be parsed again."
+            )
+            return
+        entries = manifest.get("files", {})
+        parts = {entry["part"] for entry in entries.values()}
+        if not all((self.cache_directory / part).exists() for part in parts):
+            return
+        self.entries = entries
+
+    def is_unchanged(
+        self,
+        filename: str,
+        size: int,
+        mtime_ns: int,
+        hash_function,
+    ) -> bool:
+        """
+        Checks whether a file is unchanged since it was parsed. The
+        content hash is only calculated if the size or modification
+        time differ from the manifest.
+
+        Parameters
+        ----------
+        filename : str
+            The file name
+        size : int
+            Current size of the file in bytes
+        mtime_ns : int
+            Current modification time of the file in nanoseconds
+        hash_function : Callable[[str], str]
+            Returns the content hash of the file
+
+        Returns
+        -------
+        bool
+            True if the file is unchanged
+        """
+        entry = self.entries.get(filename)
+        if entry is None:
+            return False
+        if entry["size"] == size and entry["mtime_ns"] == mtime_ns:
+            return True
+        if entry["size"] != size or entry["sha256"] != hash_function(filename):
+            return False
+        # Content is the same (e.g., file was touched or copied)
+        entry["mtime_ns"] = mtime_ns
+        return True
+
+    def load_data(self, filenames: list) -> pd.DataFrame:
+        """
+        Loads the cached parsed data of the given files. Only the parts
+        which hold these files are read. The file of each row is given
+        in the SOURCE_FILE_COLUMN.
+
+        Parameters
+        ----------
+        filenames : list
+            Files to load
+
+        Returns
+        -------
+        pd.DataFrame
+            The parsed data of the files
+        """
+        if not filenames:
+            return None
+        files_by_part = {}
+        for filename in filenames:
+            files_by_part.setdefault(
+                self.entries[filename]["part"], []
+            ).append(filename)
+        frames = [
+            pd.read_parquet(
+                self.cache_directory / part,
+                filters=[(SOURCE_FILE_COLUMN, "in", part_files)],
+            )
+            for part, part_files in files_by_part.items()
+        ]
+        data = (
+            frames[0]
+            if len(frames) == 1
+            else pd.concat(frames, ignore_index=True)
+        )
+        # Parquet returns None for missing strings, parsing gives NaN
+        object_columns = data.columns[data.dtypes == object]
+        data[object_columns] = data[object_columns].where(
+            data[object_columns].notna(), np.nan
+        )
+        return data
+
+    def update(
+        self,
+        entries: dict,
+        data: pd.DataFrame | None = None,
+        remove: list = (),
+    ):
+        """
+        Adds or replaces manifest entries and writes the parsed data of
+        new or changed files to a new part. Entries of other files are
+        kept, except for the files in remove (e.g., files which are no
+        longer on disk).
+
+        Parameters
+        ----------
+        entries : dict
+            Manifest entry (size, mtime_ns, sha256, data_lines and
+            bad_lines) for each new, changed or updated file. Entries
+            without a part are stored with the part written from data.
+        data : pd.DataFrame | None, optional
+            The parsed data of the new or changed files, with the file
+            of each row in the SOURCE_FILE_COLUMN, by default None
+        remove : list, optional
+            Files to remove from the manifest, by default ()
+        """
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        if data is not None:
+            part = self._write_part(data)
+            for entry in entries.values():
+                entry.setdefault("part", part)
+        self.entries.update(entries)
+        for filename in remove:
+            self.entries.pop(filename, None)
+
+        if len({entry["part"] for entry in self.entries.values()}) > (
+            self.MAX_DATA_PARTS
+        ):
+            part = self._write_part(self.load_data(list(self.entries)))
+            for entry in self.entries.values():
+                entry["part"] = part
+
+        manifest = {
+            "version": self.MANIFEST_VERSION,
+            "settings_hash": self.settings_hash,
+            "parse_settings": self.parse_settings,
+            "next_part": self._next_part,
+            "files": self.entries,
+        }
+        temp_manifest_path = self.manifest_path.with_suffix(".tmp")
+        with open(temp_manifest_path, "w") as file:
+            json.dump(manifest, file, indent=1, default=str)
+        os.replace(temp_manifest_path, self.manifest_path)
+        self._delete_unused_parts()
+
+    def _write_part(self, data: pd.DataFrame) -> str:
+        """Writes a new data part and returns its file name."""
+        part = f"{self.DATA_FILE_PREFIX}{self._next_part:06d}.parquet"
+        self._next_part += 1
+        temp_data_path = (self.cache_directory / part).with_suffix(".tmp")
+        data.to_parquet(temp_data_path, index=False)
+        os.replace(temp_data_path, self.cache_directory / part)
+        return part
+
+    def _delete_unused_parts(self):
+        """Deletes the data parts which no entry refers to."""
+        parts = {entry["part"] for entry in self.entries.values()}
+        for path in self.cache_directory.glob(
+            f"{self.DATA_FILE_PREFIX}*.parquet"
+        ):
+            if path.name not in parts:
+                path.unlink(missing_ok=True)
@@ -43,6 +43,7 @@ class SaveAndArchiveOutputs:
         figure_handler: FigureHandler | None = None,
         calib_df=None,
         magazine_active: bool = False,
+        static_values: dict | None = None,
     ):
         """
         Attributes
@@ -67,6 +68,9 @@ class SaveAndArchiveOutputs:
         append_timestamp: bool, optional, by default True
             Whether to append a timestamp to the folder name when
             saving.
+        static_values : dict, optional
+            Site constants used (or calculated) during processing that
+            were not stored as columns, by default None
         """
         self.folder_name = folder_name
         self.processed_data_frame = processed_data_frame
@@ -82,6 +86,7 @@ class SaveAndArchiveOutputs:
         self.figure_handler = figure_handler
         self.calib_df = calib_df
         self.magazine_active = magazine_active
+        self.static_values = static_values if static_values is not None else {}
 
     def _validate_save_folder(
         self,
@@ -321,18 +326,33 @@ class SaveAndArchiveOutputs:
             for field in fields_to_check
             if getattr(self.sensor_info, field) is None
         ]
-        if (
-            beta_col in self.processed_data_frame.columns
-            and "beta_coefficient" in missing_fields
-        ):
-            beta_coeff = self.processed_data_frame[beta_col].iloc[0]
-            self.sensor_info.beta_coefficient = round(beta_coeff, 4)
-        if (
-            mean_press_col in self.processed_data_frame.columns
-            and "mean_pressure" in missing_fields
-        ):
-            mean_pressure = self.processed_data_frame[mean_press_col].iloc[0]
-            self.sensor_info.mean_pressure = round(mean_pressure, 2)
+        if "beta_coefficient" in missing_fields:
+            beta_coeff = self._get_processed_value(beta_col)
+            if beta_coeff is not None:
+                self.sensor_info.beta_coefficient = round(beta_coeff, 4)
+        if "mean_pressure" in missing_fields:
+            mean_pressure = self._get_processed_value(mean_press_col)
+            if mean_pressure is not None:
+                self.sensor_info.mean_pressure = round(mean_pressure, 2)
+
+    def _get_processed_value(self, name: str):
+        """
+        Returns a single value calculated during processing, either from
+        the column in the processed_data_frame or from static_values.
+
+        Parameters
+        ----------
+        name : str
+            Name of the column or static value
+
+        Returns
+        -------
+        float | None
+            The value, or None if not found
+        """
+        if name in self.processed_data_frame.columns:
+            return self.processed_data_frame[name].iloc[0]
+        return self.static_values.get(name)
 
     def _save_pdf(self, location: Path | str):
         """
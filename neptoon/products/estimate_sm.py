@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 from typing import Literal, Optional
 import pandera.pandas as pa
 
@@ -6,7 +7,8 @@ import pandera.pandas as pa
 from neptoon.columns import ColumnInfo
 from neptoon.corrections import (
     neutrons_to_grav_soil_moisture_desilets_etal_2010,
-    neutrons_to_grav_soil_moisture_koehli_etal_2021,
+    neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized,
+    KoehliLookupTable,
     Schroen2017,
 )
 from neptoon.data_prep.conversions import AbsoluteHumidityCreator
@@ -194,6 +196,7 @@ class NeutronsToSM:
             "Aug13_uranos_atmprof",
             "Aug13_uranos_atmprof2",
         ] = "Mar21_mcnp_drf",
+        koehli_inversion: Literal["bisection", "lookup_table"] = "bisection",
         abs_air_humidity_col_name=str(ColumnInfo.Name.ABSOLUTE_HUMIDITY),
         air_pressure_col_name=str(ColumnInfo.Name.AIR_PRESSURE),
     ):
@@ -227,6 +230,11 @@ class NeutronsToSM:
         radius_column_name : str, optional
             column name where radius estimates are written, by default
             str( ColumnInfo.Name.SOIL_MOISTURE_MEASUREMENT_RADIUS )
+        koehli_inversion : str, optional
+            How the UTS function is inverted when using
+            koehli_etal_2021: "bisection" (exact) or "lookup_table"
+            (precomputed table, see KoehliLookupTable), by default
+            "bisection"
         """
         self._crns_data_frame = validate_df(
             crns_data_frame, schema=build_base_input_schema()
@@ -281,6 +289,9 @@ class NeutronsToSM:
         )
         self.conversion_theory = conversion_theory
         self.koehli_parameters = koehli_parameters
+        self.koehli_inversion = (
+            koehli_inversion if koehli_inversion is not None else "bisection"
+        )
         self.abs_air_humidity_col_name = abs_air_humidity_col_name
         self.air_pressure_col_name = air_pressure_col_name
         self.air_humidity_uncorrected = False
@@ -353,6 +364,76 @@ class NeutronsToSM:
             abs_hum_creator.check_and_return_abs_hum_column()
         )
 
+    def _prepare_for_conversion(self):
+        """
+        Makes sure the data needed by the conversion theory is
+        available. For koehli_etal_2021 this removes a previous humidity
+        correction and adds absolute humidity when missing.
+        """
+        if self.conversion_theory == "koehli_etal_2021":
+            self._check_if_humidity_correction_applied(auto_uncorrect=True)
+            self._ensure_abs_humidity_available()
+
+            self.crns_data_frame = validate_df(
+                self.crns_data_frame, schema=build_input_schema_koehli()
+            )
+
+    def _convert_neutrons_to_grav_sm(self, neutron_counts):
+        """
+        Converts neutron counts to gravimetric soil moisture (incl. LW
+        and WESOC) with the selected conversion theory.
+
+        Parameters
+        ----------
+        neutron_counts : pd.Series | np.ndarray
+            Neutron counts aligned with the rows of the DataFrame. A 2D
+            array of shape (k, len(crns_data_frame)) converts k count
+            series in one call.
+
+        Returns
+        -------
+        pd.Series | np.ndarray
+            Gravimetric soil moisture of the same shape
+        """
+        if self.conversion_theory == "desilets_etal_2010":
+            return neutrons_to_grav_soil_moisture_desilets_etal_2010(
+                neutron_count=neutron_counts,
+                n0=self.n0,
+                additional_gravimetric_water=self.additional_gravimetric_water,
+            )
+
+        elif self.conversion_theory == "koehli_etal_2021":
+            abs_air_humidity = self.crns_data_frame[
+                self.abs_air_humidity_col_name
+            ].to_numpy(dtype=float)
+            if isinstance(neutron_counts, pd.Series):
+                abs_air_humidity = pd.Series(
+                    abs_air_humidity, index=neutron_counts.index
+                )
+
+            if self.koehli_inversion == "lookup_table":
+                lookup_table = KoehliLookupTable.load_or_build(
+                    koehli_parameters=self.koehli_parameters
+                )
+                return lookup_table.neutrons_to_grav_soil_moisture(
+                    neutron_count=neutron_counts,
+                    n0=self.n0,
+                    abs_air_humidity=abs_air_humidity,
+                    additional_gravimetric_water=self.additional_gravimetric_water,
+                )
+            return neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized(
+                neutron_count=neutron_counts,
+                n0=self.n0,
+                abs_air_humidity=abs_air_humidity,
+                additional_gravimetric_water=self.additional_gravimetric_water,
+                koehli_parameters=self.koehli_parameters,
+            )
+
+        else:
+            message = f"Unknown conversion theory: {self.conversion_theory}"
+            core_logger.error(message)
+            raise ValueError(message)
+
     def calculate_sm_estimates(
         self,
         neutron_data_column_name: str,
@@ -363,9 +444,9 @@ class NeutronsToSM:
         Calculates soil moisture estimates and adds them to the
         dataframe.
 
-        This method applies the neutron-to-soil-moisture conversion for
-        each row in the dataframe and stores the results in a new
-        column.
+        This method applies the neutron-to-soil-moisture conversion to
+        the whole neutron column at once and stores the results in a
+        new column.
 
         Parameters
         ----------
@@ -389,48 +470,10 @@ class NeutronsToSM:
         corrected and that all necessary parameters (n0, bulk density,
         etc.) have been set.
         """
-        # Create a series of grav soil moisture (incl. LW and WESOC)
-        if self.conversion_theory == "desilets_etal_2010":
-            grav_sm = self.crns_data_frame.apply(
-                lambda row: neutrons_to_grav_soil_moisture_desilets_etal_2010(
-                    neutron_count=row[neutron_data_column_name],
-                    n0=self.n0,
-                    additional_gravimetric_water=self.additional_gravimetric_water,
-                ),
-                axis=1,
-            )
-
-        elif self.conversion_theory == "koehli_etal_2021":
-            # print(
-            #     "Using Koehli et al., 2021 method for converting neutrons to soil moisture"
-            # )
-            # print("This takes a little longer... please stand by....")
-
-            self._check_if_humidity_correction_applied(auto_uncorrect=True)
-            self._ensure_abs_humidity_available()
-
-            self.crns_data_frame = validate_df(
-                self.crns_data_frame, schema=build_input_schema_koehli()
-            )
-            grav_sm = self.crns_data_frame.apply(
-                lambda row: neutrons_to_grav_soil_moisture_koehli_etal_2021(
-                    neutron_count=row[neutron_data_column_name],
-                    n0=self.n0,
-                    abs_air_humidity=row[self.abs_air_humidity_col_name],
-                    # lattice_water=self.lattice_water,
-                    # water_equiv_soil_organic_carbon=self.water_equiv_soil_organic_carbon,
-                    additional_gravimetric_water=self.additional_gravimetric_water,
-                    koehli_parameters=self.koehli_parameters,
-                ),
-                axis=1,
-            )
-
-        # already took all hydrogen pools into account
-        # grav_sm = (
-        #     raw_grav
-        #     - self.lattice_water
-        #     - self.water_equiv_soil_organic_carbon
-        # )
+        self._prepare_for_conversion()
+        grav_sm = self._convert_neutrons_to_grav_sm(
+            self.crns_data_frame[neutron_data_column_name]
+        )
 
         if soil_moisture_column_write_name_grav:
             self.crns_data_frame[soil_moisture_column_write_name_grav] = (
@@ -487,27 +530,84 @@ class NeutronsToSM:
             ]
         )
 
-    def calculate_uncertainty_of_sm_estimates(self):
+    def calculate_uncertainty_of_sm_estimates(
+        self, create_count_bounds: bool = False
+    ):
         """
         Produces uncertainty estimates of soil mositure.
+
+        Parameters
+        ----------
+        create_count_bounds : bool, optional
+            Whether to also write the upper and lower neutron count
+            columns, by default False
         """
-        self.create_uncertainty_bounds()
-        self.calculate_sm_estimates(
-            neutron_data_column_name=str(
-                ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_LOWER
-            ),
-            soil_moisture_column_write_name_vol=str(
-                ColumnInfo.Name.SOIL_MOISTURE_UNCERTAINTY_VOL_UPPER
-            ),
+        self.calculate_sm_estimates_with_uncertainty(
+            write_central_estimate=False,
+            create_count_bounds=create_count_bounds,
         )
-        self.calculate_sm_estimates(
-            neutron_data_column_name=str(
-                ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UPPER
-            ),
-            soil_moisture_column_write_name_vol=str(
-                ColumnInfo.Name.SOIL_MOISTURE_UNCERTAINTY_VOL_LOWER
-            ),
+
+    def calculate_sm_estimates_with_uncertainty(
+        self,
+        write_central_estimate: bool = True,
+        create_count_bounds: bool = False,
+    ):
+        """
+        Calculates the soil moisture estimates and their uncertainty
+        bounds in a single conversion.
+
+        The corrected neutrons N and their uncertainty σ are stacked to
+        (N, N-σ, N+σ) and converted together. Lower counts give the
+        upper soil moisture bound and vice versa.
+
+        Parameters
+        ----------
+        write_central_estimate : bool, optional
+            Whether to write the gravimetric and volumetric soil
+            moisture columns, by default True
+        create_count_bounds : bool, optional
+            Whether to also write the upper and lower neutron count
+            columns, by default False
+        """
+        self._prepare_for_conversion()
+
+        neutrons = self.crns_data_frame[
+            str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_FINAL)
+        ].to_numpy(dtype=float)
+        uncertainty = self.crns_data_frame[
+            str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UNCERTAINTY)
+        ].to_numpy(dtype=float)
+        central_neutrons = self.crns_data_frame[
+            self.corrected_neutrons_col_name
+        ].to_numpy(dtype=float)
+
+        if create_count_bounds:
+            self.create_uncertainty_bounds()
+
+        stacked_neutrons = np.stack(
+            [
+                central_neutrons,
+                neutrons - uncertainty,
+                neutrons + uncertainty,
+            ]
         )
+        central_grav_sm, upper_grav_sm, lower_grav_sm = (
+            self._convert_neutrons_to_grav_sm(stacked_neutrons)
+        )
+
+        if write_central_estimate:
+            self.crns_data_frame[self.soil_moisture_grav_col_name] = (
+                central_grav_sm
+            )
+            self.crns_data_frame[self.soil_moisture_vol_col_name] = (
+                central_grav_sm * self.dry_soil_bulk_density
+            )
+        self.crns_data_frame[
+            str(ColumnInfo.Name.SOIL_MOISTURE_UNCERTAINTY_VOL_UPPER)
+        ] = (upper_grav_sm * self.dry_soil_bulk_density)
+        self.crns_data_frame[
+            str(ColumnInfo.Name.SOIL_MOISTURE_UNCERTAINTY_VOL_LOWER)
+        ] = (lower_grav_sm * self.dry_soil_bulk_density)
 
     def calculate_depth_of_measurement(
         self,
@@ -552,18 +652,23 @@ class NeutronsToSM:
             )
         )
 
-    def calculate_all_soil_moisture_data(self):
+    def calculate_all_soil_moisture_data(
+        self, create_count_bounds: bool = False
+    ):
         """
-        TODO: Overall process method which will chain together the other
-        methods to produce a fully developed DataFrame.
+        Overall process method which chains together the other methods
+        to produce a fully developed DataFrame.
+
+        Parameters
+        ----------
+        create_count_bounds : bool, optional
+            Whether to also write the upper and lower neutron count
+            columns, by default False
         """
 
-        self.calculate_sm_estimates(
-            neutron_data_column_name=self.corrected_neutrons_col_name,
-            soil_moisture_column_write_name_grav=self.soil_moisture_grav_col_name,
-            soil_moisture_column_write_name_vol=self.soil_moisture_vol_col_name,
+        self.calculate_sm_estimates_with_uncertainty(
+            create_count_bounds=create_count_bounds
         )
-        self.calculate_uncertainty_of_sm_estimates()
         self.calculate_depth_of_measurement()
         self.calculate_horizontal_footprint()
         self.crns_data_frame = validate_df(
@@ -0,0 +1,170 @@
+"""
+Advisory file locks to coordinate processes sharing a cache directory.
+
+On POSIX systems the locks use flock, so several readers can hold a
+shared lock at the same time while a writer holds an exclusive lock.
+On Windows msvcrt is used, where every lock is exclusive. Locks are
+advisory: they only protect against other code which takes the same
+lock.
+"""
+
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from neptoon.logging import get_logger
+
+core_logger = get_logger()
+
+
+class FileLock:
+    """
+    Context manager holding an advisory lock on a lock file. The lock
+    file is created if needed and never deleted, so that all processes
+    lock the same file.
+
+    Example
+    -------
+    >>> with FileLock("/path/to/cache/data.lock"):
+    ...     write_data()
+    >>> with FileLock("/path/to/cache/data.lock", shared=True):
+    ...     read_data()
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        shared: bool = False,
+        timeout: float | None = None,
+        poll_interval: float = 0.05,
+    ):
+        """
+        Parameters
+        ----------
+        path : str | Path
+            The lock file
+        shared : bool, optional
+            Take a shared (read) lock instead of an exclusive (write)
+            lock, by default False
+        timeout : float | None, optional
+            Seconds to wait for the lock before raising TimeoutError,
+            by default None (wait forever)
+        poll_interval : float, optional
+            Seconds between attempts while waiting, by default 0.05
+        """
+        self.path = Path(path)
+        self.shared = shared
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._file = None
+
+    def _try_lock(self) -> bool:
+        """Tries to take the lock once, without waiting."""
+        if fcntl is not None:
+            mode = fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX
+            try:
+                fcntl.flock(self._file.fileno(), mode | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            return True
+        try:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def acquire(self):
+        """
+        Waits until the lock is taken.
+
+        Raises
+        ------
+        TimeoutError
+            When the lock could not be taken within timeout
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a+")
+        start = time.monotonic()
+        while not self._try_lock():
+            if (
+                self.timeout is not None
+                and time.monotonic() - start > self.timeout
+            ):
+                self._file.close()
+                self._file = None
+                message = f"Could not lock {self.path} within {self.timeout} s"
+                core_logger.error(message)
+                raise TimeoutError(message)
+            time.sleep(self.poll_interval)
+
+    def release(self):
+        """Releases the lock."""
+        if self._file is None:
+            return
+        try:
+            self._unlock()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+def call_with_retries(
+    function,
+    retries: int = 5,
+    delay: float = 0.05,
+    exceptions: tuple = (OSError, ValueError),
+):
+    """
+    Calls a function, retrying with exponential backoff when it raises
+    one of exceptions (e.g., a file replaced or deleted by another
+    process while it was read).
+
+    Parameters
+    ----------
+    function : callable
+        The function, without arguments
+    retries : int, optional
+        Number of retries, by default 5
+    delay : float, optional
+        Seconds before the first retry, doubled after each retry, by
+        default 0.05
+    exceptions : tuple, optional
+        The exceptions to retry on, by default (OSError, ValueError).
+        Truncated JSON and Parquet files raise a ValueError.
+
+    Returns
+    -------
+    Any
+        The result of function
+    """
+    for attempt in range(retries + 1):
+        try:
+            return function()
+        except exceptions as err:
+            if attempt == retries:
+                raise
+            core_logger.info(
+                f"Retrying after {type(err).__name__}: {err} "
+                f"({attempt + 1}/{retries})"
+            )
+            time.sleep(delay * 2**attempt)
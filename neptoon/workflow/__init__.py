@@ -1 +1,2 @@
 from .process_with_config import ProcessWithConfig, DataHubFromConfig
+from .prefetch_nmdb import prefetch_nmdb_for_sensors
@@ -0,0 +1,213 @@
+import pandas as pd
+from pathlib import Path
+
+from neptoon.config.configuration_input import BaseConfig
+from neptoon.external.nmdb_data_collection import prefetch_nmdb_data
+from neptoon.io.read.config import DataHubFromConfig, _return_config
+from neptoon.logging import get_logger
+
+core_logger = get_logger()
+
+
+# File dates are in the time zone of the data, which may not be UTC
+_FILE_DATE_PADDING = pd.Timedelta(days=1)
+
+
+def _date_range_from_raw_files(sensor_config: BaseConfig) -> tuple | None:
+    """
+    Reads the dates of the first and last data line of each raw file
+    (cached in a FileDateIndex, see
+    ManageFileCollection._get_file_ranges_from_data).
+
+    Parameters
+    ----------
+    sensor_config : BaseConfig
+        The sensor config
+
+    Returns
+    -------
+    tuple | None
+        (first date, last date), padded by a day, or None when no
+        dates can be read
+    """
+    if not sensor_config.raw_data_parse_options.parse_raw_data:
+        return None
+    file_manager = DataHubFromConfig(
+        sensor_config=sensor_config
+    )._create_file_manager()
+    file_manager.filter_files_by_date()
+    file_ranges = file_manager._get_file_ranges_from_data()
+    if file_ranges is None:
+        return None
+    # files without data lines (e.g., empty files) have no dates
+    dates = [
+        date
+        for filename in file_manager.files
+        for date in file_ranges.get(filename, (None, None))
+        if date is not None
+    ]
+    if not dates:
+        return None
+    return min(dates) - _FILE_DATE_PADDING, max(dates) + _FILE_DATE_PADDING
+
+
+def sensor_date_range(sensor_config: BaseConfig) -> tuple:
+    """
+    Finds the period of a sensor's time series, parsing it only when
+    there is no cheaper way. In order:
+
+    1. start_date and end_date of raw_data_parse_options, if given
+    2. the dates of the first and last data line of the raw files
+    3. the time series, imported as when processing the sensor (use
+       `cache_formatted_data` in the sensor config to make this fast)
+
+    Parameters
+    ----------
+    sensor_config : BaseConfig
+        The sensor config
+
+    Returns
+    -------
+    tuple
+        (start date, end date)
+    """
+    options = sensor_config.raw_data_parse_options
+    start_date = options.start_date if options is not None else None
+    end_date = options.end_date if options is not None else None
+    if start_date is not None and end_date is not None:
+        return start_date, end_date
+
+    file_date_range = (
+        _date_range_from_raw_files(sensor_config)
+        if options is not None
+        else None
+    )
+    if file_date_range is None:
+        core_logger.info(
+            f"Dates of the raw files of {sensor_config.sensor_info.name} "
+            "cannot be read, the time series is imported."
+        )
+        data_hub = DataHubFromConfig(
+            sensor_config=sensor_config
+        ).create_data_hub()
+        index = data_hub.crns_data_frame.index
+        file_date_range = (index.min(), index.max())
+    return (
+        start_date if start_date is not None else file_date_range[0],
+        end_date if end_date is not None else file_date_range[1],
+    )
+
+
+def nmdb_request_from_config(
+    sensor_config: BaseConfig,
+    process_config: BaseConfig,
+) -> dict:
+    """
+    Finds the NMDB data a sensor needs: the reference monitor of the
+    process config over the period of the sensor's time series (see
+    sensor_date_range).
+
+    Parameters
+    ----------
+    sensor_config : BaseConfig
+        The sensor config
+    process_config : BaseConfig
+        The process config
+
+    Returns
+    -------
+    dict
+        The request for prefetch_nmdb_data
+    """
+    monitor = (
+        process_config.correction_steps.incoming_radiation.reference_neutron_monitor
+    )
+    start_date, end_date = sensor_date_range(sensor_config)
+    return {
+        "station": monitor.station,
+        "resolution": monitor.resolution,
+        "nmdb_table": monitor.nmdb_table,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+
+
+def prefetch_nmdb_for_sensors(
+    sensor_configs: list,
+    process_configs: list | BaseConfig | str | Path,
+    cache_dir: str | Path | None = None,
+    base_url: str | None = None,
+    download_workers: int = 4,
+) -> list:
+    """
+    Fills the NMDB cache with the data needed by many sensors, so that
+    processing each sensor afterwards only reads from the cache.
+
+    The date ranges of all sensors are combined per reference monitor,
+    resolution and table, and each combination is downloaded once.
+
+    Example
+    -------
+    >>> report = prefetch_nmdb_for_sensors(
+    ...     sensor_configs=["/path/to/A101.yaml", "/path/to/A102.yaml"],
+    ...     process_configs="/path/to/process.yaml",
+    ... )
+
+    Parameters
+    ----------
+    sensor_configs : list
+        Sensor configs, or paths to sensor config files
+    process_configs : list | BaseConfig | str | Path
+        A process config (or path) used for all sensors, or a list with
+        one per sensor
+    cache_dir : str | Path | None, optional
+        The NMDB cache directory, by default None (the neptoon cache)
+    base_url : str | None, optional
+        URL of the NMDB.eu data service, by default None
+    download_workers : int, optional
+        Number of chunks downloaded at the same time, by default 4
+
+    Returns
+    -------
+    list
+        The report of prefetch_nmdb_data, one entry per monitor,
+        resolution and table
+    """
+    if not isinstance(process_configs, list):
+        process_configs = [process_configs] * len(sensor_configs)
+    if len(process_configs) != len(sensor_configs):
+        message = (
+            f"Got {len(process_configs)} process configs for "
+            f"{len(sensor_configs)} sensor configs. Give one process "
+            "config, or one per sensor config."
+        )
+        core_logger.error(message)
+        raise ValueError(message)
+
+    nmdb_requests = []
+    for sensor_config, process_config in zip(sensor_configs, process_configs):
+        if isinstance(sensor_config, (str, Path)):
+            sensor_config = _return_config(
+                path_to_config=sensor_config,
+                config_to_return="sensor",
+            )
+        if isinstance(process_config, (str, Path)):
+            process_config = _return_config(
+                path_to_config=process_config,
+                config_to_return="process",
+            )
+        nmdb_request = nmdb_request_from_config(
+            sensor_config=sensor_config,
+            process_config=process_config,
+        )
+        core_logger.info(
+            f"{sensor_config.sensor_info.name} needs {nmdb_request}"
+        )
+        nmdb_requests.append(nmdb_request)
+
+    return prefetch_nmdb_data(
+        nmdb_requests,
+        cache_dir=cache_dir,
+        base_url=base_url,
+        download_workers=download_workers,
+    )
@@ -150,11 +150,16 @@ class ProcessWithConfig:
             _description_
         """
         tmp = self.process_config.correction_steps.incoming_radiation
+        monitor = tmp.reference_neutron_monitor
         data_hub.attach_nmdb_data(
-            station=tmp.reference_neutron_monitor.station,
+            station=monitor.station,
             new_column_name=str(ColumnInfo.Name.INCOMING_NEUTRON_INTENSITY),
-            resolution=tmp.reference_neutron_monitor.resolution,
-            nmdb_table=tmp.reference_neutron_monitor.nmdb_table,
+            resolution=monitor.resolution,
+            nmdb_table=monitor.nmdb_table,
+            interpolation=monitor.interpolation or "nearest",
+            offline=bool(monitor.offline),
+            max_staleness=monitor.max_staleness,
+            missing_data_policy=monitor.missing_data_policy or "error",
         )
         return data_hub
 
@@ -163,8 +168,8 @@ class ProcessWithConfig:
         data_hub: CRNSDataHub,
     ):
         """
-        Prepares the SiteInformation values by converting them into
-        column in the data frame.
+        Prepares the SiteInformation values by storing them as static
+        values on the data hub.
 
         Parameters
         ----------
@@ -308,12 +313,16 @@ class ProcessWithConfig:
             koehli_parameters = (
                 self.process_config.correction_steps.soil_moisture_estimation.koehli_etal_2021_parameterset
             )
+            koehli_inversion = (
+                self.process_config.correction_steps.soil_moisture_estimation.koehli_etal_2021_inversion
+            )
             data_hub.produce_soil_moisture_estimates(
                 conversion_theory=conversion_theory,
                 dry_soil_bulk_density=self.sensor_config.sensor_info.avg_dry_soil_bulk_density,
                 lattice_water=self.sensor_config.sensor_info.avg_lattice_water,
                 soil_organic_carbon=self.sensor_config.sensor_info.avg_soil_organic_carbon,
                 koehli_parameters=koehli_parameters,
+                koehli_inversion=koehli_inversion,
             )
         # else:
         #     raise ValueError(f"Unknown conversion method: {conversion_theory}")
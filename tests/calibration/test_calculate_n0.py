@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from neptoon.calibration.station_calibration import CalculateN0
+from neptoon.corrections import (
+    neutrons_to_grav_soil_moisture_desilets_etal_2010,
+    neutrons_to_grav_soil_moisture_koehli_etal_2021,
+)
+
+
+def test_single_day_desilets_matches_candidate_by_candidate():
+    n0_range = pd.Series(range(800, 2800))
+    results = CalculateN0()._find_optimal_n0_single_day_desilets_etal_2010(
+        gravimetric_sm_on_day=0.2,
+        neutron_mean=800.0,
+        n0_range=n0_range,
+    )
+    assert list(results.columns) == [
+        "N0",
+        "soil_moisture_prediction",
+        "relative_error",
+    ]
+    for n0 in [800, 1000, 1412, 2799]:
+        sm = neutrons_to_grav_soil_moisture_desilets_etal_2010(
+            neutron_count=800.0, n0=n0
+        )
+        row = results.loc[n0 - 800]
+        assert row["N0"] == n0
+        assert row["soil_moisture_prediction"] == sm
+        assert row["relative_error"] == abs(sm - 0.2) / 0.2
+
+
+def test_single_day_koehli_matches_candidate_by_candidate():
+    n0_range = pd.Series(range(800, 2800))
+    results = CalculateN0()._find_optimal_n0_single_day_koehli_etal_2021(
+        gravimetric_sm_on_day=0.2,
+        neutron_mean=800.0,
+        n0_range=n0_range,
+        abs_air_humidity=6.0,
+        lattice_water=0.02,
+        water_equiv_soil_organic_carbon=0.01,
+        koehli_parameters="Mar21_mcnp_drf",
+    )
+    for n0 in [800, 1500, 2379, 2799]:
+        sm = neutrons_to_grav_soil_moisture_koehli_etal_2021(
+            neutron_count=800.0,
+            n0=n0,
+            abs_air_humidity=6.0,
+            additional_gravimetric_water=0.03,
+            koehli_parameters="Mar21_mcnp_drf",
+        )
+        row = results.loc[n0 - 800]
+        assert row["N0"] == n0
+        np.testing.assert_equal(row["soil_moisture_prediction"], sm)
+
+
+@pytest.mark.parametrize(
+    "conversion_method", ["desilets_etal_2010", "koehli_etal_2021"]
+)
+def test_coarse_to_fine_search_finds_same_n0(conversion_method):
+    calculator = CalculateN0()
+    calculator.set_values(
+        soil_moisture=[0.2, 0.3],
+        corrected_neutron_counts=[900, 800],
+        conversion_method=conversion_method,
+        lattice_water=0.02,
+        absolute_humidity=[5, 6],
+    )
+    n0 = calculator.find_optimal_N0_old()
+    assert calculator.find_optimal_N0_old(coarse_step=25) == n0
+    assert calculator.find_optimal_N0_old(coarse_step=200) == n0
+    assert calculator.find_optimal_N0_old(coarse_step=1) == n0
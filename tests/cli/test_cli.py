@@ -0,0 +1,128 @@
+from types import SimpleNamespace
+
+from typer.testing import CliRunner
+
+from neptoon.cli import cli
+from neptoon.config.configuration_input import (
+    ConfigurationManager,
+    CorrectionSteps,
+    IncomingRadiationCorrection,
+    ProcessConfig,
+)
+from neptoon.workflow import ProcessWithConfig
+
+
+def test_workers_option_overrides_sensor_config(monkeypatch, tmp_path):
+    """The --workers option sets parse_workers in the sensor config."""
+    processing_config = tmp_path / "process.yaml"
+    sensor_config = tmp_path / "sensor.yaml"
+    processing_config.touch()
+    sensor_config.touch()
+
+    class MockRawDataParseOptions:
+        parse_workers = 1
+
+    class MockSensorConfig:
+        raw_data_parse_options = MockRawDataParseOptions()
+
+    sensor = MockSensorConfig()
+    monkeypatch.setattr(
+        ConfigurationManager, "load_configuration", lambda *a, **k: None
+    )
+    monkeypatch.setattr(
+        ConfigurationManager, "get_config", lambda self, name: sensor
+    )
+    monkeypatch.setattr(
+        ProcessWithConfig, "__init__", lambda self, **kwargs: None
+    )
+    monkeypatch.setattr(
+        ProcessWithConfig, "run_full_process", lambda self: None
+    )
+
+    result = CliRunner().invoke(
+        cli.app,
+        ["-p", str(processing_config), "-s", str(sensor_config), "-w", "4"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert sensor.raw_data_parse_options.parse_workers == 4
+
+
+def test_prefetch_nmdb_command(monkeypatch, tmp_path):
+    """prefetch-nmdb passes all sensor configs in one call."""
+    processing_config = tmp_path / "process.yaml"
+    processing_config.touch()
+    sensor_configs = [tmp_path / "A101.yaml", tmp_path / "A102.yaml"]
+    for sensor_config in sensor_configs:
+        sensor_config.touch()
+    calls = []
+
+    def mock_prefetch(sensor_configs, process_configs, download_workers):
+        calls.append((sensor_configs, process_configs, download_workers))
+        return [
+            {
+                "station": "JUNG",
+                "resolution": "60",
+                "nmdb_table": "revori",
+                "date_ranges": [["2016-01-01", "2016-12-31"]],
+                "downloaded": [("2016-01-01", "2016-12-31")],
+                "error": None,
+            }
+        ]
+
+    monkeypatch.setattr(cli, "prefetch_nmdb_for_sensors", mock_prefetch)
+    result = CliRunner().invoke(
+        cli.app,
+        [
+            "prefetch-nmdb",
+            "-p",
+            str(processing_config),
+            "-s",
+            str(sensor_configs[0]),
+            "-s",
+            str(sensor_configs[1]),
+            "--download-workers",
+            "2",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert calls == [(sensor_configs, processing_config, 2)]
+    assert "JUNG (60 min, revori)" in result.output
+
+
+def test_offline_option_sets_process_config(monkeypatch, tmp_path):
+    """The --offline option turns on the offline NMDB mode."""
+    processing_config = tmp_path / "process.yaml"
+    sensor_config = tmp_path / "sensor.yaml"
+    processing_config.touch()
+    sensor_config.touch()
+    process = ProcessConfig.model_construct(
+        correction_steps=CorrectionSteps.model_construct(
+            incoming_radiation=IncomingRadiationCorrection()
+        )
+    )
+    sensor = SimpleNamespace(raw_data_parse_options=None)
+    monkeypatch.setattr(
+        ConfigurationManager, "load_configuration", lambda *a, **k: None
+    )
+    monkeypatch.setattr(
+        ConfigurationManager,
+        "get_config",
+        lambda self, name: process if name == "process" else sensor,
+    )
+    monkeypatch.setattr(
+        ProcessWithConfig, "__init__", lambda self, **kwargs: None
+    )
+    monkeypatch.setattr(
+        ProcessWithConfig, "run_full_process", lambda self: None
+    )
+
+    result = CliRunner().invoke(
+        cli.app,
+        ["-p", str(processing_config), "-s", str(sensor_config), "--offline"],
+    )
+
+    assert result.exit_code == 0, result.output
+    incoming_radiation = process.correction_steps.incoming_radiation
+    assert incoming_radiation.reference_neutron_monitor.offline is True
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+from scipy.optimize import minimize_scalar
+
+from neptoon.corrections import find_n0
+from neptoon.corrections.theory.neutrons_to_soil_moisture import (
+    N0_METRICS,
+    grav_soil_moisture_to_neutrons_desilets_etal_2010,
+    grav_soil_moisture_to_neutrons_koehli_etal_2021,
+)
+
+GRAVIMETRIC_SM = np.array([0.08, 0.15, 0.21, 0.3])
+ABS_AIR_HUMIDITY = np.array([4.0, 6.0, 9.0, 11.0])
+NOISE = np.array([1.02, 0.97, 1.01, 0.99])
+
+
+def neutrons(conversion_theory, n0):
+    if conversion_theory == "desilets_etal_2010":
+        return grav_soil_moisture_to_neutrons_desilets_etal_2010(
+            gravimetric_sm=GRAVIMETRIC_SM,
+            n0=n0,
+            additional_gravimetric_water=0.03,
+        )
+    return grav_soil_moisture_to_neutrons_koehli_etal_2021(
+        gravimetric_sm=GRAVIMETRIC_SM,
+        abs_air_humidity=ABS_AIR_HUMIDITY,
+        n0=n0,
+        additional_gravimetric_water=0.03,
+    )
+
+
+@pytest.mark.parametrize(
+    "conversion_theory", ["desilets_etal_2010", "koehli_etal_2021"]
+)
+def test_find_n0_recovers_n0(conversion_theory):
+    n0 = find_n0(
+        gravimetric_sm=GRAVIMETRIC_SM,
+        neutron_count=neutrons(conversion_theory, 2500),
+        abs_air_humidity=ABS_AIR_HUMIDITY,
+        additional_gravimetric_water=0.03,
+        conversion_theory=conversion_theory,
+    )
+    assert n0 == pytest.approx(2500)
+
+
+@pytest.mark.parametrize("metric", N0_METRICS)
+@pytest.mark.parametrize(
+    "conversion_theory", ["desilets_etal_2010", "koehli_etal_2021"]
+)
+def test_find_n0_minimises_metric(conversion_theory, metric):
+    """The closed form and the numerical search give the minimum."""
+    neutron_count = neutrons(conversion_theory, 2500) * NOISE
+    n0, error = find_n0(
+        gravimetric_sm=GRAVIMETRIC_SM,
+        neutron_count=neutron_count,
+        abs_air_humidity=ABS_AIR_HUMIDITY,
+        additional_gravimetric_water=0.03,
+        conversion_theory=conversion_theory,
+        metric=metric,
+        return_error=True,
+    )
+
+    def error_of(n0_try):
+        return _error(n0_try, neutron_count, conversion_theory, metric)
+
+    expected = minimize_scalar(error_of).x
+    assert n0 == pytest.approx(expected, rel=1e-6)
+    assert error == pytest.approx(error_of(n0))
+
+
+def _error(n0, neutron_count, conversion_theory, metric):
+    errors = neutron_count - neutrons(conversion_theory, n0)
+    relative_errors = errors / neutron_count
+    return {
+        "rmse": np.sqrt(np.mean(errors**2)),
+        "mae": np.mean(np.abs(errors)),
+        "mse": np.mean(errors**2),
+        "mape": np.mean(np.abs(relative_errors)) * 100,
+        "rmspe": np.sqrt(np.mean(relative_errors**2)) * 100,
+        "log_mse": np.mean(
+            (
+                np.log(neutron_count)
+                - np.log(np.maximum(neutrons(conversion_theory, n0), 1e-10))
+            )
+            ** 2
+        ),
+        "relative_rmse": np.sqrt(np.mean(relative_errors**2)),
+    }[metric]
+
+
+@pytest.mark.parametrize("metric", ["rmse", "mae"])
+def test_find_n0_stacked_sites(metric):
+    """Each row is calibrated on its own, NaN padding is ignored."""
+    neutron_count = neutrons("desilets_etal_2010", 2500) * NOISE
+    stacked_n0, stacked_error = find_n0(
+        gravimetric_sm=[GRAVIMETRIC_SM, [0.1, 0.2, np.nan, np.nan]],
+        neutron_count=[neutron_count, [1400.0, 1150.0, np.nan, np.nan]],
+        additional_gravimetric_water=0.03,
+        metric=metric,
+        return_error=True,
+    )
+    assert stacked_n0.shape == (2,)
+    for site, (sm, counts) in enumerate(
+        [(GRAVIMETRIC_SM, neutron_count), ([0.1, 0.2], [1400.0, 1150.0])]
+    ):
+        n0, error = find_n0(
+            gravimetric_sm=sm,
+            neutron_count=counts,
+            additional_gravimetric_water=0.03,
+            metric=metric,
+            return_error=True,
+        )
+        assert stacked_n0[site] == pytest.approx(n0, rel=1e-6)
+        assert stacked_error[site] == pytest.approx(error, rel=1e-6)
+
+
+def test_find_n0_invalid_metric():
+    with pytest.raises(ValueError):
+        find_n0(gravimetric_sm=0.2, neutron_count=1000, metric="r2")
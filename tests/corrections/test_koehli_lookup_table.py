@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from neptoon.corrections.theory import koehli_lookup_table
+from neptoon.corrections.theory.koehli_lookup_table import KoehliLookupTable
+from neptoon.corrections.theory.neutrons_to_soil_moisture import (
+    neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized,
+)
+from neptoon.products.estimate_sm import NeutronsToSM
+from neptoon.columns import ColumnInfo
+
+
+@pytest.fixture
+def small_table(tmp_path):
+    """A coarse table that is quick to build."""
+    return KoehliLookupTable.load_or_build(
+        koehli_parameters="Mar21_mcnp_drf",
+        directory=tmp_path,
+        n_neutron_steps=200,
+        n_humidity_steps=21,
+    )
+
+
+def test_lookup_within_error_bound(small_table):
+    """Lookup results stay within the error bound of the exact inversion"""
+    rng = np.random.default_rng(42)
+    neutrons = rng.uniform(500, 3500, 5000)
+    humidity = rng.uniform(0, 60, 5000)
+
+    lookup = small_table.neutrons_to_grav_soil_moisture(
+        neutron_count=neutrons,
+        n0=3000,
+        abs_air_humidity=humidity,
+        additional_gravimetric_water=0.05,
+    )
+    exact = neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized(
+        neutron_count=neutrons,
+        n0=3000,
+        abs_air_humidity=humidity,
+        additional_gravimetric_water=0.05,
+        tolerance=1e-10,
+    )
+    assert np.max(np.abs(lookup - exact)) <= small_table.max_abs_error
+
+
+def test_lookup_within_error_bound_on_cell_edges(small_table):
+    """Values on the humidity nodes (cell edges) are checked as well"""
+    rng = np.random.default_rng(7)
+    neutrons = rng.uniform(500, 3500, 2000)
+    humidity = rng.integers(0, small_table.n_humidity_steps, 2000) * (
+        small_table.max_abs_air_humidity / (small_table.n_humidity_steps - 1)
+    )
+
+    lookup = small_table.neutrons_to_grav_soil_moisture(
+        neutron_count=neutrons,
+        n0=3000,
+        abs_air_humidity=humidity,
+    )
+    exact = neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized(
+        neutron_count=neutrons,
+        n0=3000,
+        abs_air_humidity=humidity,
+        tolerance=1e-10,
+    )
+    assert np.max(np.abs(lookup - exact)) <= small_table.max_abs_error
+
+
+def test_lookup_nan_and_types(small_table):
+    """NaN stays NaN, scalars stay scalars and Series keep their index"""
+    assert np.isnan(
+        small_table.neutrons_to_grav_soil_moisture(np.nan, 3000, 5.0)
+    )
+    assert isinstance(
+        small_table.neutrons_to_grav_soil_moisture(1000, 3000, 5.0), float
+    )
+    result = small_table.neutrons_to_grav_soil_moisture(
+        neutron_count=pd.Series([1500, 1200], index=[7, 8]),
+        n0=3000,
+        abs_air_humidity=pd.Series([np.nan, 5.0], index=[7, 8]),
+    )
+    assert list(result.index) == [7, 8]
+    assert pd.isna(result.loc[7])
+
+
+def test_table_saved_and_reloaded(small_table, tmp_path):
+    """A stored table is reused when the settings match"""
+    assert (tmp_path / small_table.file_name).exists()
+
+    reloaded = KoehliLookupTable(
+        koehli_parameters="Mar21_mcnp_drf",
+        n_neutron_steps=200,
+        n_humidity_steps=21,
+    )
+    assert reloaded.load(tmp_path)
+    np.testing.assert_array_equal(
+        reloaded.soil_moisture_grid, small_table.soil_moisture_grid
+    )
+
+    other_settings = KoehliLookupTable(
+        koehli_parameters="Mar21_mcnp_drf",
+        n_neutron_steps=100,
+        n_humidity_steps=21,
+    )
+    assert not other_settings.load(tmp_path)
+
+
+def test_unknown_parameter_set():
+    with pytest.raises(ValueError):
+        KoehliLookupTable(koehli_parameters="not_a_parameter_set")
+
+
+def test_neutrons_to_sm_with_lookup_table(tmp_path, monkeypatch):
+    """NeutronsToSM gives (almost) the same results with the table"""
+    monkeypatch.setattr(
+        koehli_lookup_table,
+        "_default_table_directories",
+        lambda: [tmp_path],
+    )
+    np.random.seed(42)
+    df = pd.DataFrame(
+        {
+            str(
+                ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_FINAL
+            ): np.random.uniform(1000, 2500, 50),
+            str(
+                ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UNCERTAINTY
+            ): np.random.uniform(10, 50, 50),
+            str(ColumnInfo.Name.ABSOLUTE_HUMIDITY): np.random.uniform(
+                2, 20, 50
+            ),
+        },
+        index=pd.date_range("2024-01-01", periods=50, freq="h", tz="UTC"),
+    )
+    results = {}
+    for inversion in ["bisection", "lookup_table"]:
+        converter = NeutronsToSM(
+            crns_data_frame=df.copy(),
+            n0=3000,
+            conversion_theory="koehli_etal_2021",
+            koehli_inversion=inversion,
+        )
+        converter.calculate_sm_estimates(
+            neutron_data_column_name=str(
+                ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_FINAL
+            ),
+            soil_moisture_column_write_name_grav=str(
+                ColumnInfo.Name.SOIL_MOISTURE_GRAV
+            ),
+        )
+        results[inversion] = converter.crns_data_frame[
+            str(ColumnInfo.Name.SOIL_MOISTURE_GRAV)
+        ]
+    np.testing.assert_allclose(
+        results["lookup_table"], results["bisection"], atol=2e-4
+    )
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 from neptoon.corrections.factory.build_corrections import (
@@ -11,10 +12,19 @@ from neptoon.corrections import (
     IncomingIntensityCorrectionZreda2012,
     IncomingIntensityCorrectionHawdon2014,
     HumidityCorrectionRosolem2013,
+    PressureCorrectionDesiletsZreda2003,
+    PressureCorrectionDesilets2021,
+    PressureCorrectionTiradoBueno2021,
+    calc_pressure_correction_factor,
+)
+from neptoon.corrections.factory.correction_classes import (
+    AboveGroundBiomassCorrectionMorris2024,
+    IncomingIntensityCorrectionMcJannetDesilets2023,
 )
 from neptoon.config.configuration_input import SensorInfo
 from neptoon.columns.column_information import ColumnInfo
 from neptoon.corrections.factory.build_corrections import Correction
+from neptoon.products.estimate_sm import NeutronsToSM
 
 
 ### Test Correction class
@@ -577,8 +587,9 @@ def test_direct_humidity_correction_with_existing_abs_humidity(monkeypatch):
     """
     If a DataFrame already has 'absolute_humidity', then apply(…) should
     skip recomputing absolute humidity and just run humidity_correction_rosolem2013
-    once per row. Monkey patching the internal humidity_correction_rosolem2013
-    function will confirm it is called with exactly (abs_hum, reference_val).
+    once on the whole column. Monkey patching the internal
+    humidity_correction_rosolem2013 function will confirm it is called with
+    exactly (abs_hum, reference_val).
     """
     df = pd.DataFrame(
         {
@@ -614,11 +625,273 @@ def test_direct_humidity_correction_with_existing_abs_humidity(monkeypatch):
 
     corr_col = str(ColumnInfo.Name.HUMIDITY_CORRECTION)
     assert corr_col in df_out.columns
-    assert calls == [
-        (5.0, reference_val),
-        (10.0, reference_val),
-        (20.0, reference_val),
-    ], print(calls)
+    assert len(calls) == 1
+    assert list(calls[0][0]) == [5.0, 10.0, 20.0]
+    assert calls[0][1] == reference_val
 
     expected = [5.0 * 0.1, 10.0 * 0.1, 20.0 * 0.1]
     assert list(df_out[corr_col]) == expected
+
+
+@pytest.mark.parametrize(
+    "correction_class",
+    [
+        PressureCorrectionDesiletsZreda2003,
+        PressureCorrectionDesilets2021,
+        PressureCorrectionTiradoBueno2021,
+    ],
+)
+def test_pressure_corrections_column_wise_match_row_wise(correction_class):
+    """
+    Column-wise corrections give the same factors as evaluating the
+    theory functions row by row.
+    """
+    df = pd.DataFrame(
+        {
+            str(ColumnInfo.Name.AIR_PRESSURE): [950.0, 990.0, np.nan, 1010],
+            str(ColumnInfo.Name.LATITUDE): [51.0, 51.0, 51.0, 10.0],
+            str(ColumnInfo.Name.ELEVATION): [100.0, 100.0, 100.0, 1500.0],
+            str(ColumnInfo.Name.SITE_CUTOFF_RIGIDITY): [3.0, 3.0, 3.0, 12.0],
+        }
+    )
+    df_out = correction_class().apply(df.copy())
+
+    beta = df_out[str(ColumnInfo.Name.BETA_COEFFICIENT)]
+    for i, row in df.iterrows():
+        expected = calc_pressure_correction_factor(
+            row[str(ColumnInfo.Name.AIR_PRESSURE)], 1013.25, beta[i]
+        )
+        assert df_out[str(ColumnInfo.Name.PRESSURE_CORRECTION)][
+            i
+        ] == pytest.approx(expected, nan_ok=True)
+
+
+def test_biomass_correction_morris2024_column_wise():
+    df = pd.DataFrame({"bwe": [0.0, 5.0, 10.0]})
+    correction = AboveGroundBiomassCorrectionMorris2024(
+        correction_type=CorrectionType.ABOVE_GROUND_BIOMASS,
+        correction_factor_column_name="biomass_correction",
+        above_ground_biomass_column_name="bwe",
+    )
+    df_out = correction.apply(df)
+    assert list(df_out["biomass_correction"]) == pytest.approx(
+        [1.0, 1 / 0.95, 1 / 0.9]
+    )
+
+
+@pytest.mark.parametrize(
+    "correction_class",
+    [
+        PressureCorrectionDesiletsZreda2003,
+        PressureCorrectionDesilets2021,
+        PressureCorrectionTiradoBueno2021,
+    ],
+)
+def test_pressure_corrections_static_values_match_columns(correction_class):
+    """
+    Site constants given as static values give the same correction as
+    when they are given as full columns, and the calculated beta
+    coefficient is stored as a static value.
+    """
+    site_constants = {
+        str(ColumnInfo.Name.LATITUDE): 51.0,
+        str(ColumnInfo.Name.ELEVATION): 100.0,
+        str(ColumnInfo.Name.SITE_CUTOFF_RIGIDITY): 3.0,
+    }
+    df = pd.DataFrame({str(ColumnInfo.Name.AIR_PRESSURE): [950.0, 990.0]})
+    df_columns = df.assign(**site_constants)
+    df_columns = correction_class().apply(df_columns)
+
+    correction = correction_class()
+    correction.static_values = dict(site_constants)
+    df_static = correction.apply(df.copy())
+
+    assert str(ColumnInfo.Name.BETA_COEFFICIENT) not in df_static.columns
+    assert correction.static_values[
+        str(ColumnInfo.Name.BETA_COEFFICIENT)
+    ] == pytest.approx(df_columns[str(ColumnInfo.Name.BETA_COEFFICIENT)][0])
+    pd.testing.assert_series_equal(
+        df_static[str(ColumnInfo.Name.PRESSURE_CORRECTION)],
+        df_columns[str(ColumnInfo.Name.PRESSURE_CORRECTION)],
+    )
+
+
+def test_intensity_correction_mcjannet_desilets_static_values(
+    df_lat_and_elevation,
+):
+    """
+    tau is evaluated once when the site constants are static values.
+    """
+    site_columns = [
+        str(ColumnInfo.Name.LATITUDE),
+        str(ColumnInfo.Name.ELEVATION),
+        str(ColumnInfo.Name.SITE_CUTOFF_RIGIDITY),
+    ]
+    correction = IncomingIntensityCorrectionMcJannetDesilets2023()
+    correction.static_values = {
+        col: df_lat_and_elevation[col].iloc[0] for col in site_columns
+    }
+    df_static = correction.apply(
+        df_lat_and_elevation.drop(columns=site_columns)
+    )
+    df_columns = IncomingIntensityCorrectionMcJannetDesilets2023().apply(
+        df_lat_and_elevation.copy()
+    )
+
+    assert str(ColumnInfo.Name.RC_CORRECTION_FACTOR) not in df_static.columns
+    assert (
+        np.ndim(
+            correction.static_values[str(ColumnInfo.Name.RC_CORRECTION_FACTOR)]
+        )
+        == 0
+    )
+    pd.testing.assert_series_equal(
+        df_static[str(ColumnInfo.Name.INTENSITY_CORRECTION)],
+        df_columns[str(ColumnInfo.Name.INTENSITY_CORRECTION)],
+    )
+
+
+def test_correct_neutrons_shares_static_values(df_without_ref_monitor):
+    """
+    CorrectNeutrons passes static values to the corrections and collects
+    values calculated during correction.
+    """
+    site_cutoff_rigidity = str(ColumnInfo.Name.SITE_CUTOFF_RIGIDITY)
+    static_values = {
+        site_cutoff_rigidity: 4.2,
+        str(ColumnInfo.Name.REFERENCE_MONITOR_CUTOFF_RIGIDITY): 2.4,
+    }
+    df = df_without_ref_monitor.drop(columns=[site_cutoff_rigidity])
+    df[str(ColumnInfo.Name.EPI_NEUTRON_COUNT_FINAL)] = 100.0
+    df[str(ColumnInfo.Name.RAW_EPI_NEUTRON_COUNT_UNCERTAINTY)] = 10.0
+    correction_builder = CorrectionBuilder()
+    correction_builder.add_correction(IncomingIntensityCorrectionHawdon2014())
+    corrector = CorrectNeutrons(
+        crns_data_frame=df,
+        correction_builder=correction_builder,
+        static_values=static_values,
+    )
+    df_out = corrector.correct_neutrons()
+
+    assert site_cutoff_rigidity not in df_out.columns
+    assert static_values[
+        str(ColumnInfo.Name.RC_CORRECTION_FACTOR)
+    ] == pytest.approx(-0.075 * (4.2 - 2.4) + 1)
+    assert str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT) in df_out.columns
+
+
+def test_correct_neutrons_fused_matches_sequential(sample_df):
+    """
+    The fused kernel gives the same corrected counts and uncertainty as
+    multiplying each correction factor in turn.
+    """
+    sample_df[str(ColumnInfo.Name.RAW_EPI_NEUTRON_COUNT_UNCERTAINTY)] = [
+        10.0,
+        np.nan,
+        12.0,
+    ]
+    builder = CorrectionBuilder()
+    builder.add_correction(MockCorrection2("test1", 1.013, "correction_1"))
+    builder.add_correction(MockCorrection2("test2", 0.987, "correction_2"))
+    builder.add_correction(MockCorrection2("test3", 1.101, "correction_3"))
+    corrector = CorrectNeutrons(sample_df.copy(), builder)
+    result_df = corrector.correct_neutrons()
+
+    expected_counts = sample_df[str(ColumnInfo.Name.EPI_NEUTRON_COUNT_FINAL)]
+    expected_uncertainty = sample_df[
+        str(ColumnInfo.Name.RAW_EPI_NEUTRON_COUNT_UNCERTAINTY)
+    ]
+    for col in corrector.correction_columns:
+        expected_counts = expected_counts * result_df[col]
+        expected_uncertainty = expected_uncertainty * result_df[col]
+    np.testing.assert_allclose(
+        result_df[str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT)],
+        expected_counts,
+    )
+    np.testing.assert_allclose(
+        result_df[
+            str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UNCERTAINTY)
+        ],
+        expected_uncertainty,
+    )
+
+
+def test_correct_neutrons_without_factor_columns(
+    sample_df, correction_builder
+):
+    """Correction factor columns are dropped when not kept."""
+    corrector = CorrectNeutrons(
+        sample_df, correction_builder, keep_factor_columns=False
+    )
+    result_df = corrector.correct_neutrons()
+    assert "correction_1" not in result_df.columns
+    assert "correction_2" not in result_df.columns
+    assert (
+        result_df[str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT)]
+        == sample_df[str(ColumnInfo.Name.EPI_NEUTRON_COUNT_FINAL)] * 3.0
+    ).all()
+
+
+def test_corrected_column_without_factor_columns(
+    sample_df, correction_builder
+):
+    """Single corrected columns use the held factors when not kept."""
+    corrector = CorrectNeutrons(
+        sample_df, correction_builder, keep_factor_columns=False
+    )
+    result_df = corrector.correct_neutrons()
+    result_df = result_df.drop(
+        columns=str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT)
+    )
+    result_df = corrector.create_corrected_neutron_column(result_df)
+    np.testing.assert_allclose(
+        corrector.calculate_total_correction_factor(result_df), 3.0
+    )
+    assert (
+        result_df[str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT)]
+        == sample_df[str(ColumnInfo.Name.EPI_NEUTRON_COUNT_FINAL)] * 3.0
+    ).all()
+
+
+def test_koehli_soil_moisture_without_factor_columns():
+    """
+    The humidity correction is removed again for the koehli_etal_2021
+    conversion whether or not the factor columns are kept.
+    """
+    df = pd.DataFrame(
+        {
+            str(ColumnInfo.Name.EPI_NEUTRON_COUNT_FINAL): [900.0, 1000.0],
+            str(ColumnInfo.Name.RAW_EPI_NEUTRON_COUNT_UNCERTAINTY): [
+                30.0,
+                32.0,
+            ],
+            str(ColumnInfo.Name.ABSOLUTE_HUMIDITY): [5.0, 12.0],
+        },
+        index=pd.date_range("2024-01-01", periods=2, freq="h", tz="UTC"),
+    )
+    soil_moisture = []
+    for keep_factor_columns in [True, False]:
+        builder = CorrectionBuilder()
+        builder.add_correction(HumidityCorrectionRosolem2013())
+        builder.add_correction(MockCorrection2("test1", 1.5, "correction_1"))
+        corrected = CorrectNeutrons(
+            df.copy(), builder, keep_factor_columns=keep_factor_columns
+        ).correct_neutrons()
+        assert str(ColumnInfo.Name.HUMIDITY_CORRECTION) in corrected.columns
+        corrected[str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_FINAL)] = (
+            corrected[str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT)]
+        )
+        corrected[
+            str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UNCERTAINTY)
+        ] = corrected[str(ColumnInfo.Name.RAW_EPI_NEUTRON_COUNT_UNCERTAINTY)]
+        converter = NeutronsToSM(
+            crns_data_frame=corrected,
+            n0=3000,
+            conversion_theory="koehli_etal_2021",
+        )
+        converter.calculate_sm_estimates_with_uncertainty()
+        assert converter.air_humidity_uncorrected
+        soil_moisture.append(
+            converter.crns_data_frame[str(ColumnInfo.Name.SOIL_MOISTURE_VOL)]
+        )
+    pd.testing.assert_series_equal(soil_moisture[0], soil_moisture[1])
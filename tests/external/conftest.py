@@ -0,0 +1,96 @@
+import threading
+import pandas as pd
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+MOCK_DATA = Path(__file__).parent / "mock_data" / "mock_http_2015_2016.txt"
+
+
+class NMDBStandInServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the NMDB.eu data service. Serves the lines of
+    mock_http_2015_2016.txt in the requested date range, in the same
+    format as NMDB.eu.
+
+    Attributes
+    ----------
+    requests : list
+        (start, end) of each request received
+    fail_requests : int
+        Number of following requests answered with a 503 error
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), NMDBStandInHandler)
+        lines = MOCK_DATA.read_text().splitlines(keepends=True)
+        self.header = [line for line in lines if not line[:1].isdigit()]
+        self.data_lines = [line for line in lines if line[:1].isdigit()]
+        self.requests = []
+        self.fail_requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/draw_graph.php"
+
+    def respond(self, query):
+        start = pd.Timestamp(
+            int(query["start_year"][0]),
+            int(query["start_month"][0]),
+            int(query["start_day"][0]),
+        )
+        end = pd.Timestamp(
+            int(query["end_year"][0]),
+            int(query["end_month"][0]),
+            int(query["end_day"][0]),
+            23,
+            59,
+        )
+        with self._lock:
+            self.requests.append((start, end))
+            if self.fail_requests > 0:
+                self.fail_requests -= 1
+                return 503, ""
+        start_line = start.strftime("%Y-%m-%d %H:%M:%S")
+        end_line = end.strftime("%Y-%m-%d %H:%M:%S")
+        data_lines = [
+            line
+            for line in self.data_lines
+            if start_line <= line[:19] <= end_line
+        ]
+        if not data_lines:
+            return 200, "<br>Sorry, no data available for this period"
+        return 200, "".join(self.header + data_lines)
+
+
+class NMDBStandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status, text = self.server.respond(parse_qs(urlparse(self.path).query))
+        body = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def nmdb_server():
+    """Local NMDB.eu stand-in, use its base_url in the NMDBConfig."""
+    server = NMDBStandInServer()
+    thread = threading.Thread(
+        target=server.serve_forever,
+        kwargs={"poll_interval": 0.01},
+        daemon=True,
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
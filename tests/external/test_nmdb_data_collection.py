@@ -1,15 +1,29 @@
+import numpy as np
 import pandas as pd
+import pytest
 import requests
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 import pandas.testing as pdt
 from pathlib import Path
 from neptoon.external.nmdb_data_collection import (
     DateTimeHandler,
     NMDBConfig,
     NMDBDataHandler,
+    NMDBDataAttacher,
+    align_series_to_index,
     DataFetcher,
     CacheHandler,
     DataManager,
+    NMDBFrameCache,
+    date_ranges_from_index,
+    find_missing_date_ranges,
+    merge_date_ranges,
+    prefetch_nmdb_data,
 )
+from neptoon.io.read.config import DataHubFromConfig, _return_config
+from neptoon.workflow.prefetch_nmdb import sensor_date_range
 
 """
 DateTimeHandler Tests
@@ -37,19 +51,28 @@ CacheHandler Tests
 """
 
 
-def test_read_cache():
-    """Test the read cache and make sure the format is as expected"""
+mock_cache_path = (
+    Path(__file__).parent / "mock_data" / "example_cache_1516.csv"
+)
+
+
+@pytest.fixture
+def csv_cache_handler(tmp_path):
+    """CacheHandler with a CSV cache, as written by older versions"""
     config = NMDBConfig(
         start_date_wanted="2015-10-10",
         end_date_wanted="2016-10-10",
+        cache_dir=tmp_path,
     )
     cache_handler = CacheHandler(config)
-    mock_file_path = (
-        Path(__file__).parent / "mock_data" / "example_cache_1516.csv"
-    )
-    # monkeypatch.setattr(config, "cache_exists", True)
-    config.cache_exists = True
-    cache_handler.cache_file_path = mock_file_path
+    shutil.copy(mock_cache_path, cache_handler.cache_file_path)
+    return cache_handler
+
+
+def test_read_cache(csv_cache_handler):
+    """Test the read cache and make sure the format is as expected"""
+    cache_handler = csv_cache_handler
+    cache_handler.check_cache_file_exists()
     df = cache_handler.read_cache()
 
     assert isinstance(df, pd.DataFrame)
@@ -58,26 +81,258 @@ def test_read_cache():
     assert isinstance(df.index, pd.DatetimeIndex)
 
 
-def test_check_cache_range():
+def test_check_cache_range(csv_cache_handler):
     """Test on logic to collect cache range"""
-    config = NMDBConfig(
-        start_date_wanted="2015-10-10",
-        end_date_wanted="2016-10-10",
-    )
-    cache_handler = CacheHandler(config)
-    mock_file_path = (
-        Path(__file__).parent / "mock_data" / "example_cache_1516.csv"
-    )
-    config.cache_exists = True
-    cache_handler.cache_file_path = mock_file_path
+    cache_handler = csv_cache_handler
+    config = cache_handler.config
     cache_handler.check_cache_range()
-    df = pd.read_csv(mock_file_path)
+    df = pd.read_csv(mock_cache_path)
     df["datetime"] = pd.to_datetime(df["datetime"])
 
     assert config.cache_start_date == df["datetime"].min().date()
     assert config.cache_end_date == df["datetime"].max().date()
 
 
+def test_csv_cache_is_migrated(csv_cache_handler):
+    """A CSV cache is converted into yearly Parquet files"""
+    cache_handler = csv_cache_handler
+    cache_handler.check_cache_file_exists()
+
+    assert not cache_handler.cache_file_path.exists()
+    assert cache_handler.partition_path(2015).exists()
+    assert cache_handler.partition_path(2016).exists()
+    assert cache_handler.read_sidecar()["ranges"] == [
+        ["2015-10-10", "2016-10-10"]
+    ]
+
+    expected = pd.read_csv(mock_cache_path, index_col="datetime")
+    expected.index = pd.to_datetime(expected.index).tz_localize("UTC")
+    pdt.assert_frame_equal(cache_handler.read_cache(), expected)
+    pdt.assert_frame_equal(
+        cache_handler.read_cache("2016-01-01", "2016-01-31"),
+        expected.loc["2016-01"],
+    )
+
+
+def test_range_check_reads_only_sidecar(csv_cache_handler, monkeypatch):
+    cache_handler = csv_cache_handler
+    cache_handler.check_cache_file_exists()
+    monkeypatch.setattr(pd, "read_parquet", None)
+    cache_handler.check_cache_range()
+    assert (
+        cache_handler.config.cache_end_date
+        == pd.Timestamp("2016-10-10").date()
+    )
+
+
+def test_append_cache_rewrites_only_affected_years(csv_cache_handler):
+    cache_handler = csv_cache_handler
+    cache_handler.check_cache_file_exists()
+    mtime_2015 = cache_handler.partition_path(2015).stat().st_mtime_ns
+    new_data = pd.DataFrame(
+        {"count": [170.0, 171.0]},
+        index=pd.DatetimeIndex(
+            ["2016-10-11 00:00", "2017-01-01 00:00"], tz="UTC", name="datetime"
+        ),
+    )
+    cache_handler.append_cache(new_data)
+
+    assert cache_handler.partition_path(2015).stat().st_mtime_ns == mtime_2015
+    assert cache_handler.read_sidecar()["ranges"] == [
+        ["2015-10-10", "2016-10-11"],
+        ["2017-01-01", "2017-01-01"],
+    ]
+    assert cache_handler.read_sidecar()["years"] == [2015, 2016, 2017]
+    df = cache_handler.read_cache("2016-10-10", "2017-01-01")
+    assert df.index[-2:].equals(new_data.index)
+    assert len(df) == 24 + 2
+
+
+def test_memory_cache_serves_repeated_reads(csv_cache_handler, monkeypatch):
+    cache_handler = csv_cache_handler
+    cache_handler.check_cache_file_exists()
+    monkeypatch.setattr(CacheHandler, "memory_cache", NMDBFrameCache())
+    first = cache_handler.read_cache("2016-01-01", "2016-01-31")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the cache on disk should not be read")
+
+    monkeypatch.setattr(CacheHandler, "_read_partition", fail)
+    second = cache_handler.read_cache("2016-01-01", "2016-01-31")
+    pdt.assert_frame_equal(first, second)
+    assert len(second) == 31 * 24
+    stats = CacheHandler.memory_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_memory_cache_invalidated_on_write(csv_cache_handler, monkeypatch):
+    cache_handler = csv_cache_handler
+    cache_handler.check_cache_file_exists()
+    monkeypatch.setattr(CacheHandler, "memory_cache", NMDBFrameCache())
+    assert len(cache_handler.read_cache("2015-12-31", "2016-10-11")) == 6831
+    assert CacheHandler.memory_cache.stats()["entries"] == 2
+
+    cache_handler.append_cache(
+        pd.DataFrame(
+            {"count": [171.0]},
+            index=pd.DatetimeIndex(["2016-10-11"], tz="UTC"),
+        )
+    )
+    # only the year written is dropped
+    assert CacheHandler.memory_cache.stats()["entries"] == 1
+    assert len(cache_handler.read_cache("2015-12-31", "2016-10-11")) == 6832
+    assert CacheHandler.memory_cache.stats()["misses"] == 3
+
+    # a write by another process (which replaces the sidecar) is
+    # detected as well
+    path = cache_handler.partition_path(2016)
+    mtime = path.stat().st_mtime_ns
+    os.utime(path, ns=(mtime, mtime + 10**9))
+    cache_handler._write_sidecar(**cache_handler.read_sidecar())
+    cache_handler.read_cache("2015-12-31", "2016-10-11")
+    stats = CacheHandler.memory_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 4)
+
+
+def test_memory_cache_hit_does_not_touch_disk(csv_cache_handler, monkeypatch):
+    """An unchanged cache is served without lock, sidecar or file reads"""
+    cache_handler = csv_cache_handler
+    cache_handler.check_cache_file_exists()
+    monkeypatch.setattr(CacheHandler, "memory_cache", NMDBFrameCache())
+    expected = cache_handler.read_cache("2015-12-31", "2016-10-11")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("disk accessed")
+
+    for name in ("locked", "read_sidecar", "_partition_signature"):
+        monkeypatch.setattr(CacheHandler, name, fail)
+    monkeypatch.setattr(CacheHandler, "_read_partition", fail)
+    df = cache_handler.read_cache("2016-01-01", "2016-10-11")
+    pd.testing.assert_frame_equal(df, expected.loc["2016-01-01":])
+
+
+def test_memory_cache_reads_only_wanted_years(csv_cache_handler, monkeypatch):
+    """Years too large for the memory cache are read on their own"""
+    cache_handler = csv_cache_handler
+    cache_handler.check_cache_file_exists()
+    monkeypatch.setattr(CacheHandler, "memory_cache", NMDBFrameCache(1))
+    read_years = []
+    read_partition = CacheHandler._read_partition
+
+    def record_read(self, year):
+        read_years.append(year)
+        return read_partition(self, year)
+
+    monkeypatch.setattr(CacheHandler, "_read_partition", record_read)
+    for _ in range(2):
+        df = cache_handler.read_cache("2016-03-01", "2016-03-01")
+        assert len(df) == 24
+    assert read_years == [2016, 2016]
+    assert CacheHandler.memory_cache.stats()["entries"] == 0
+
+
+def test_memory_cache_eviction():
+    frame = pd.DataFrame(
+        {"count": [1.0] * 100},
+        index=pd.date_range("2016-01-01", periods=100, freq="h", tz="UTC"),
+    )
+    nbytes = frame.memory_usage(index=True, deep=True).sum()
+    memory_cache = NMDBFrameCache(max_bytes=2 * nbytes)
+    memory_cache.put("a", None, frame)
+    memory_cache.put("b", None, frame)
+    memory_cache.get("a", None)
+    memory_cache.put("c", None, frame)
+    assert memory_cache.get("b", None) is None
+    assert memory_cache.get("a", None) is frame
+    assert memory_cache.stats()["evictions"] == 1
+    assert memory_cache.stats()["bytes"] <= 2 * nbytes
+
+
+def _append_month(cache_dir, month):
+    """Appends one month of hourly data, in a separate process"""
+    config = NMDBConfig(
+        start_date_wanted="2016-01-01",
+        end_date_wanted="2016-12-31",
+        cache_dir=cache_dir,
+    )
+    index = pd.date_range(
+        f"2016-{month:02d}-01",
+        periods=pd.Period(f"2016-{month:02d}").days_in_month * 24,
+        freq="h",
+        tz="UTC",
+    )
+    for day, day_index in pd.Series(index, index=index).groupby(index.day):
+        CacheHandler(config).append_cache(
+            pd.DataFrame({"count": float(month)}, index=day_index.index)
+        )
+
+
+def _read_cache_repeatedly(cache_dir, repeats):
+    """Reads the cache while it is written, in a separate process"""
+    config = NMDBConfig(
+        start_date_wanted="2016-01-01",
+        end_date_wanted="2016-12-31",
+        cache_dir=cache_dir,
+        use_memory_cache=False,
+    )
+    lengths = []
+    for _ in range(repeats):
+        cache_handler = CacheHandler(config)
+        cache_handler.check_cache_file_exists()
+        df = cache_handler.read_cache()
+        lengths.append(0 if df is None else len(df))
+    return lengths
+
+
+def test_concurrent_processes_share_cache(tmp_path):
+    """Writes from several processes are all kept, readers never fail"""
+    months = [1, 2, 3, 4]
+    with ProcessPoolExecutor(max_workers=len(months) + 1) as executor:
+        reader = executor.submit(_read_cache_repeatedly, tmp_path, 50)
+        writers = [
+            executor.submit(_append_month, tmp_path, month) for month in months
+        ]
+        for writer in writers:
+            writer.result()
+        lengths = reader.result()
+    assert lengths == sorted(lengths)
+
+    config = NMDBConfig(
+        start_date_wanted="2016-01-01",
+        end_date_wanted="2016-12-31",
+        cache_dir=tmp_path,
+    )
+    cache_handler = CacheHandler(config)
+    assert cache_handler.read_sidecar()["ranges"] == [
+        ["2016-01-01", "2016-04-30"]
+    ]
+    cache_handler.check_cache_file_exists()
+    df = cache_handler.read_cache()
+    assert len(df) == (31 + 29 + 31 + 30) * 24
+    assert df.index.is_monotonic_increasing
+    assert list(tmp_path.glob("**/*.tmp")) == []
+
+
+def test_reads_are_retried(csv_cache_handler, monkeypatch):
+    """A partition replaced while it is read is read again"""
+    cache_handler = csv_cache_handler
+    cache_handler.check_cache_file_exists()
+    read_parquet = pd.read_parquet
+    failures = []
+
+    def flaky_read_parquet(*args, **kwargs):
+        if not failures:
+            failures.append(1)
+            raise FileNotFoundError("partition replaced")
+        return read_parquet(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_parquet", flaky_read_parquet)
+    cache_handler.config.use_memory_cache = False
+    df = cache_handler.read_cache("2016-01-01", "2016-01-31")
+    assert failures == [1]
+    assert len(df) == 31 * 24
+
+
 """
 DataFetcher Tests
 """
@@ -133,20 +388,8 @@ def test_create_nmdb_url_config1(monkeypatch):
     assert url == expected_url
 
 
-class MockHTTPResponse:
-    def __init__(self, text_data):
-        self.text = text_data
-
-    def raise_for_status(self):
-        pass
-
-
-def test_fetch_data_http(monkeypatch):
-    """Test fetching data from http server with mock http"""
-    file_location = (
-        Path(__file__).parent / "mock_data" / "mock_http_2015_2016.txt"
-    )
-
+def test_fetch_data_http(nmdb_server):
+    """Test fetching data from a local stand-in of the http server"""
     text_to_assert = """#        STATION: JUNG
 #     START TIME: 2015-10-10 00:00:00 UTC
 #       END TIME: 2016-10-10 23:00:00 UTC
@@ -157,22 +400,89 @@ def test_fetch_data_http(monkeypatch):
     config = NMDBConfig(
         start_date_wanted="2015-10-10",
         end_date_wanted="2016-10-10",
+        base_url=nmdb_server.base_url,
     )
 
-    def mock_get(*args, **kwargs):
-        with open(
-            file_location,
-            "r",
-        ) as file:
-            mock_text = file.read()
-        return MockHTTPResponse(mock_text)
-
-    monkeypatch.setattr(requests, "get", mock_get)
-
     handler = NMDBDataHandler(config)
 
     result = handler.data_fetcher.fetch_data_http()
     assert text_to_assert in result
+    assert "2016-10-10 23:00:00;166.396" in result
+
+
+def test_split_date_range():
+    assert DataFetcher.split_date_range("2015-10-10", "2016-01-05") == [
+        ("2015-10-10", "2015-10-31"),
+        ("2015-11-01", "2015-11-30"),
+        ("2015-12-01", "2015-12-31"),
+        ("2016-01-01", "2016-01-05"),
+    ]
+    assert DataFetcher.split_date_range(
+        "2015-10-10", "2016-01-05", chunk_months=2
+    ) == [
+        ("2015-10-10", "2015-10-31"),
+        ("2015-11-01", "2015-12-31"),
+        ("2016-01-01", "2016-01-05"),
+    ]
+    assert DataFetcher.split_date_range("2015-10-10", "2015-10-10") == [
+        ("2015-10-10", "2015-10-10")
+    ]
+
+
+def test_fetch_and_parse_in_chunks(nmdb_server):
+    """Chunks are downloaded concurrently and assembled in order"""
+    config = NMDBConfig(
+        start_date_wanted="2015-10-10",
+        end_date_wanted="2016-10-10",
+        base_url=nmdb_server.base_url,
+        download_workers=4,
+    )
+    data = DataFetcher(config).fetch_and_parse_http_data()
+
+    expected = pd.read_csv(
+        Path(__file__).parent / "mock_data" / "example_cache_1516.csv"
+    )
+    expected["datetime"] = pd.to_datetime(expected["datetime"])
+    expected.set_index("datetime", inplace=True)
+    expected.index = expected.index.tz_localize("UTC")
+    pdt.assert_frame_equal(data, expected)
+    assert len(nmdb_server.requests) == 13
+
+
+def test_fetch_retries_failed_requests(nmdb_server):
+    config = NMDBConfig(
+        start_date_wanted="2015-10-10",
+        end_date_wanted="2015-10-20",
+        base_url=nmdb_server.base_url,
+    )
+    nmdb_server.fail_requests = 1
+    data = DataFetcher(config).fetch_and_parse_http_data()
+    assert len(nmdb_server.requests) == 2
+    assert data.index[-1] == pd.Timestamp("2015-10-20 23:00", tz="UTC")
+
+    config.max_retries = 0
+    nmdb_server.fail_requests = 1
+    with pytest.raises(requests.exceptions.HTTPError):
+        DataFetcher(config).fetch_and_parse_http_data()
+
+
+def test_fetch_skips_unavailable_chunks(nmdb_server):
+    config = NMDBConfig(
+        start_date_wanted="2016-09-20",
+        end_date_wanted="2016-12-31",
+        base_url=nmdb_server.base_url,
+    )
+    data = DataFetcher(config).fetch_and_parse_http_data()
+    assert data.index[0] == pd.Timestamp("2016-09-20", tz="UTC")
+    assert data.index[-1] == pd.Timestamp("2016-10-10 23:00", tz="UTC")
+
+    config = NMDBConfig(
+        start_date_wanted="2020-01-01",
+        end_date_wanted="2020-02-01",
+        base_url=nmdb_server.base_url,
+    )
+    with pytest.raises(ValueError):
+        DataFetcher(config).fetch_and_parse_http_data()
 
 
 def test_parse_http_date():
@@ -297,3 +607,425 @@ def test_combine_cache_and_new_data(monkeypatch):
 
 # TODO:
 # NMDBDataHandler Tests - canary
+
+
+def test_collect_nmdb_data_uses_partitioned_cache(nmdb_server, tmp_path):
+    def collect(start_date, end_date):
+        config = NMDBConfig(
+            start_date_wanted=start_date,
+            end_date_wanted=end_date,
+            cache_dir=tmp_path,
+            base_url=nmdb_server.base_url,
+        )
+        return NMDBDataHandler(config).collect_nmdb_data()
+
+    df = collect("2015-12-01", "2016-01-31")
+    assert len(nmdb_server.requests) == 2
+    df_cached = collect("2015-12-10", "2016-01-10")
+    assert len(nmdb_server.requests) == 2
+    pdt.assert_frame_equal(df_cached, df.loc["2015-12-10":"2016-01-10"])
+
+    df_extended = collect("2015-12-01", "2016-02-15")
+    assert df_extended.index[-1] == pd.Timestamp("2016-02-15 23:00", tz="UTC")
+    assert df_extended.index.is_monotonic_increasing
+    assert not df_extended.index.has_duplicates
+
+
+def test_merge_date_ranges():
+    assert merge_date_ranges(
+        [
+            ["2016-01-10", "2016-01-20"],
+            ["2016-01-01", "2016-01-05"],
+            ["2016-01-06", "2016-01-08"],
+            ["2016-01-15", "2016-01-25"],
+        ]
+    ) == [["2016-01-01", "2016-01-08"], ["2016-01-10", "2016-01-25"]]
+
+
+def test_find_missing_date_ranges():
+    covered = [["2016-01-01", "2016-01-10"], ["2016-01-20", "2016-01-31"]]
+    assert find_missing_date_ranges("2016-01-02", "2016-01-09", covered) == []
+    assert find_missing_date_ranges("2015-12-25", "2016-02-05", covered) == [
+        ("2015-12-25", "2015-12-31"),
+        ("2016-01-11", "2016-01-19"),
+        ("2016-02-01", "2016-02-05"),
+    ]
+    assert find_missing_date_ranges("2016-01-05", "2016-01-25", []) == [
+        ("2016-01-05", "2016-01-25")
+    ]
+
+
+def test_date_ranges_from_index():
+    index = pd.DatetimeIndex(
+        ["2016-01-01 00:00", "2016-01-01 23:00", "2016-01-02", "2016-01-05"],
+        tz="UTC",
+    )
+    assert date_ranges_from_index(index) == [
+        ["2016-01-01", "2016-01-02"],
+        ["2016-01-05", "2016-01-05"],
+    ]
+
+
+def test_collect_nmdb_data_fills_gaps(csv_cache_handler, nmdb_server):
+    """Only the gaps inside and around the cached period are downloaded"""
+    # a CSV cache with a missing week, as left by a failed download
+    df = pd.read_csv(mock_cache_path, index_col="datetime")
+    df.index = pd.to_datetime(df.index)
+    gap = (df.index >= "2016-03-01") & (df.index < "2016-03-08")
+    df[~gap].to_csv(csv_cache_handler.cache_file_path)
+
+    config = NMDBConfig(
+        start_date_wanted="2016-02-01",
+        end_date_wanted="2016-10-20",
+        cache_dir=csv_cache_handler.config.cache_dir,
+        base_url=nmdb_server.base_url,
+    )
+    data = NMDBDataHandler(config).collect_nmdb_data()
+    assert sorted(nmdb_server.requests) == [
+        (pd.Timestamp("2016-03-01"), pd.Timestamp("2016-03-07 23:59")),
+        (pd.Timestamp("2016-10-11"), pd.Timestamp("2016-10-20 23:59")),
+    ]
+    assert data.index[0] == pd.Timestamp("2016-02-01", tz="UTC")
+    assert data.loc["2016-03-01":"2016-03-07"].shape[0] == 7 * 24
+
+    # the missing days are now covered, no requests are sent
+    NMDBDataHandler(config).collect_nmdb_data()
+    assert len(nmdb_server.requests) == 2
+
+
+def test_failed_chunks_leave_gaps(nmdb_server, tmp_path):
+    """Downloaded chunks are stored when another chunk fails"""
+    config = NMDBConfig(
+        start_date_wanted="2016-01-01",
+        end_date_wanted="2016-03-31",
+        cache_dir=tmp_path,
+        base_url=nmdb_server.base_url,
+        download_workers=1,
+        max_retries=0,
+    )
+    nmdb_server.fail_requests = 1
+    with pytest.raises(requests.exceptions.HTTPError):
+        NMDBDataHandler(config).collect_nmdb_data()
+    cache_handler = CacheHandler(config)
+    assert cache_handler.read_sidecar()["ranges"] == [
+        ["2016-02-01", "2016-03-31"]
+    ]
+
+    data = NMDBDataHandler(config).collect_nmdb_data()
+    assert nmdb_server.requests[-1] == (
+        pd.Timestamp("2016-01-01"),
+        pd.Timestamp("2016-01-31 23:59"),
+    )
+    assert len(data) == 91 * 24
+
+
+def _hourly_lines(start, end):
+    return [
+        f"{time:%Y-%m-%d %H:%M:%S};150.0\n"
+        for time in pd.date_range(start, end, freq="h")
+    ]
+
+
+def test_recent_days_not_published_are_requested_again(nmdb_server, tmp_path):
+    """Recent days without data are not recorded as covered"""
+    today = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+    day = pd.Timedelta(days=1)
+    config = NMDBConfig(
+        start_date_wanted=(today - 10 * day).strftime("%Y-%m-%d"),
+        end_date_wanted=(today - day).strftime("%Y-%m-%d"),
+        cache_dir=tmp_path,
+        base_url=nmdb_server.base_url,
+    )
+    # published up to the middle of the fourth last day
+    nmdb_server.data_lines = _hourly_lines(
+        today - 10 * day, today - 4 * day + pd.Timedelta(hours=11)
+    )
+    NMDBDataHandler(config).collect_nmdb_data()
+    cache_handler = CacheHandler(config)
+    assert cache_handler.read_sidecar()["ranges"] == [
+        [config.start_date_wanted, (today - 5 * day).strftime("%Y-%m-%d")]
+    ]
+
+    # nothing new published, the missing days are requested again
+    NMDBDataHandler(config).collect_nmdb_data()
+    assert nmdb_server.requests[-1] == (
+        today - 4 * day,
+        today - day + pd.Timedelta(hours=23, minutes=59),
+    )
+    assert len(cache_handler.read_sidecar()["ranges"]) == 1
+
+    nmdb_server.data_lines = _hourly_lines(
+        today - 10 * day, today - pd.Timedelta(hours=1)
+    )
+    data = NMDBDataHandler(config).collect_nmdb_data()
+    assert len(nmdb_server.requests) == 3
+    assert len(data) == 10 * 24
+    assert cache_handler.read_sidecar()["ranges"] == [
+        [config.start_date_wanted, config.end_date_wanted]
+    ]
+
+
+def test_prefetch_nmdb_data(nmdb_server, tmp_path):
+    """Overlapping requests of many sites are downloaded once"""
+    nmdb_requests = [
+        {"start_date": "2016-01-10", "end_date": "2016-02-10"},
+        {
+            "station": "JUNG",
+            "resolution": 60,
+            "start_date": pd.Timestamp("2016-02-01 12:00", tz="UTC"),
+            "end_date": "2016-02-20",
+        },
+        {"start_date": "2016-05-01", "end_date": "2016-05-03"},
+    ]
+    report = prefetch_nmdb_data(
+        nmdb_requests,
+        cache_dir=tmp_path,
+        base_url=nmdb_server.base_url,
+    )
+    assert len(report) == 1
+    assert report[0]["date_ranges"] == [
+        ["2016-01-10", "2016-02-20"],
+        ["2016-05-01", "2016-05-03"],
+    ]
+    assert report[0]["error"] is None
+    assert sorted(nmdb_server.requests) == [
+        (pd.Timestamp("2016-01-10"), pd.Timestamp("2016-01-31 23:59")),
+        (pd.Timestamp("2016-02-01"), pd.Timestamp("2016-02-20 23:59")),
+        (pd.Timestamp("2016-05-01"), pd.Timestamp("2016-05-03 23:59")),
+    ]
+
+    # the sites are now served from the cache
+    for nmdb_request in nmdb_requests:
+        config = NMDBConfig(
+            start_date_wanted=nmdb_request["start_date"],
+            end_date_wanted=nmdb_request["end_date"],
+            cache_dir=tmp_path,
+            base_url=nmdb_server.base_url,
+        )
+        NMDBDataHandler(config).collect_nmdb_data()
+    assert len(nmdb_server.requests) == 3
+
+    # a second prefetch downloads nothing
+    report = prefetch_nmdb_data(
+        nmdb_requests,
+        cache_dir=tmp_path,
+        base_url=nmdb_server.base_url,
+    )
+    assert report[0]["downloaded"] == []
+    assert len(nmdb_server.requests) == 3
+
+
+SENSOR_CONFIG = (
+    Path(__file__).parent.parent
+    / "test_data"
+    / "io"
+    / "A101_station_test.yaml"
+)
+
+
+def test_sensor_date_range_without_parsing(tmp_path, monkeypatch):
+    """The period of a sensor is found without parsing its data"""
+    sensor_config = _return_config(
+        path_to_config=SENSOR_CONFIG, config_to_return="sensor"
+    )
+    sensor_config.raw_data_parse_options.ingest_cache_location = tmp_path
+
+    def create_data_hub(self):
+        raise AssertionError("The time series was parsed")
+
+    monkeypatch.setattr(DataHubFromConfig, "create_data_hub", create_data_hub)
+
+    # first and last data lines of the raw files, padded by a day
+    assert sensor_date_range(sensor_config) == (
+        pd.Timestamp("2016-12-30 22:33"),
+        pd.Timestamp("2018-01-13 17:48"),
+    )
+
+    sensor_config.raw_data_parse_options.start_date = pd.Timestamp(
+        "2017-03-01"
+    )
+    sensor_config.raw_data_parse_options.end_date = pd.Timestamp("2017-04-01")
+    assert sensor_date_range(sensor_config) == (
+        pd.Timestamp("2017-03-01"),
+        pd.Timestamp("2017-04-01"),
+    )
+
+
+"""
+NMDBDataAttacher Tests
+"""
+
+
+@pytest.fixture
+def hourly_counts():
+    return pd.Series(
+        [100.0, 110.0, np.nan, 130.0],
+        index=pd.date_range("2016-01-01", periods=4, freq="h", tz="UTC"),
+    )
+
+
+def test_align_series_to_index(hourly_counts):
+    index = pd.DatetimeIndex(
+        [
+            "2015-12-31 23:00",
+            "2016-01-01 00:20",
+            "2016-01-01 00:30",
+            "2016-01-01 01:45",
+            "2016-01-01 05:00",
+        ],
+        tz="UTC",
+    )
+    np.testing.assert_array_equal(
+        align_series_to_index(hourly_counts, index, "nearest"),
+        hourly_counts.reindex(index, method="nearest").to_numpy(),
+    )
+    np.testing.assert_array_equal(
+        align_series_to_index(hourly_counts, index, "previous"),
+        [np.nan, 100.0, 100.0, 110.0, 130.0],
+    )
+    np.testing.assert_allclose(
+        align_series_to_index(hourly_counts, index, "linear"),
+        [100.0, 100.0 + 10 / 3, 105.0, 110.0 + 20 * 45 / 120, 130.0],
+    )
+    np.testing.assert_array_equal(
+        align_series_to_index(
+            hourly_counts, index, "nearest", tolerance="30min"
+        ),
+        [np.nan, 100.0, 110.0, np.nan, np.nan],
+    )
+    with pytest.raises(ValueError):
+        align_series_to_index(hourly_counts, index, "cubic")
+
+
+def test_attach_data_in_place(hourly_counts):
+    """The counts are added to the data frame without copying it"""
+    data_frame = pd.DataFrame(
+        {"epithermal_neutrons_raw": np.arange(12.0)},
+        index=pd.date_range("2016-01-01", periods=12, freq="15min", tz="UTC"),
+    )
+    attacher = NMDBDataAttacher(data_frame)
+    attacher.configure(station="JUNG", interpolation="previous")
+    attacher.tmp_data = hourly_counts.to_frame("count")
+    attacher.attach_data()
+    assert attacher.return_data_frame() is data_frame
+    np.testing.assert_array_equal(
+        data_frame[attacher.new_column_name],
+        np.repeat([100.0, 110.0, np.nan], 4),
+    )
+
+
+"""
+Offline mode Tests
+"""
+
+
+def offline_config(csv_cache_handler, base_url, **kwargs):
+    return NMDBConfig(
+        cache_dir=csv_cache_handler.config.cache_dir,
+        base_url=base_url,
+        **kwargs,
+    )
+
+
+def test_offline_serves_cache(csv_cache_handler, nmdb_server):
+    config = offline_config(
+        csv_cache_handler,
+        nmdb_server.base_url,
+        start_date_wanted="2016-01-01",
+        end_date_wanted="2016-01-31",
+        offline=True,
+    )
+    data = NMDBDataHandler(config).collect_nmdb_data()
+    assert len(data) == 31 * 24
+    assert nmdb_server.requests == []
+
+
+def test_offline_fails_fast_on_missing_data(csv_cache_handler, nmdb_server):
+    config = offline_config(
+        csv_cache_handler,
+        nmdb_server.base_url,
+        start_date_wanted="2016-10-01",
+        end_date_wanted="2016-10-20",
+        offline=True,
+    )
+    with pytest.raises(ValueError, match="2016-10-11"):
+        NMDBDataHandler(config).collect_nmdb_data()
+    assert nmdb_server.requests == []
+
+
+def test_offline_fill_edges(csv_cache_handler, nmdb_server):
+    config = offline_config(
+        csv_cache_handler,
+        nmdb_server.base_url,
+        start_date_wanted="2015-10-01",
+        end_date_wanted="2016-10-20",
+        offline=True,
+        missing_data_policy="fill_edges",
+    )
+    data = NMDBDataHandler(config).collect_nmdb_data()
+    assert nmdb_server.requests == []
+    assert data.index[0] == pd.Timestamp("2015-10-01", tz="UTC")
+    assert data.index[-1] == pd.Timestamp("2016-10-20 23:59", tz="UTC")
+    assert data["count"].iloc[0] == data["count"].iloc[1]
+    assert data["count"].iloc[-1] == data["count"].iloc[-2]
+
+    config.start_date_wanted = "2017-01-01"
+    config.end_date_wanted = "2017-01-31"
+    with pytest.raises(ValueError, match="No NMDB data"):
+        NMDBDataHandler(config).collect_nmdb_data()
+
+
+def test_max_staleness(csv_cache_handler, nmdb_server):
+    """Recent days are only downloaded when the cache is too old"""
+    config = offline_config(
+        csv_cache_handler,
+        nmdb_server.base_url,
+        start_date_wanted="2016-10-01",
+        end_date_wanted="2016-10-20",
+        max_staleness=pd.Timestamp.now() - pd.Timestamp("2016-01-01"),
+    )
+    data = NMDBDataHandler(config).collect_nmdb_data()
+    assert nmdb_server.requests == []
+    assert data.index[-1] == pd.Timestamp("2016-10-20 23:59", tz="UTC")
+
+    config.max_staleness = pd.Timedelta("7D")
+    data = NMDBDataHandler(config).collect_nmdb_data()
+    assert nmdb_server.requests == [
+        (pd.Timestamp("2016-10-11"), pd.Timestamp("2016-10-20 23:59"))
+    ]
+    # the stand-in server has no data after 2016-10-10
+    assert data.index[-1] == pd.Timestamp("2016-10-10 23:00", tz="UTC")
+
+
+def test_max_staleness_wanted_range_after_cache(
+    csv_cache_handler, nmdb_server
+):
+    """The last cached value is used when no wanted day is cached"""
+    config = offline_config(
+        csv_cache_handler,
+        nmdb_server.base_url,
+        start_date_wanted="2016-10-14",
+        end_date_wanted="2016-10-15",
+        max_staleness=pd.Timestamp.now() - pd.Timestamp("2016-01-01"),
+    )
+    handler = NMDBDataHandler(config)
+    data = handler.collect_nmdb_data()
+    cached = handler.cache_handler.read_cache(
+        start_date="2016-10-10", end_date="2016-10-10"
+    )
+
+    assert nmdb_server.requests == []
+    assert list(data.index) == [
+        pd.Timestamp("2016-10-14", tz="UTC"),
+        pd.Timestamp("2016-10-15 23:59", tz="UTC"),
+    ]
+    assert (data["count"] == cached["count"].iloc[-1]).all()
+
+
+def test_unknown_missing_data_policy():
+    with pytest.raises(ValueError):
+        NMDBConfig(
+            start_date_wanted="2016-01-01",
+            end_date_wanted="2016-01-31",
+            missing_data_policy="zeros",
+        )
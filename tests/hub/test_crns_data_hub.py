@@ -140,3 +140,21 @@ def test_produce_soil_moisture_estimates_default(sample_hub_corrected):
         in sample_hub_corrected.crns_data_frame.columns
     )
     print(sample_hub_corrected.crns_data_frame)
+
+
+def test_prepare_static_values(example_data_hub, example_sensor_information):
+    """
+    Static values are stored as scalars rather than as columns.
+    """
+    example_data_hub.sensor_info = example_sensor_information
+    columns_before = list(example_data_hub.crns_data_frame.columns)
+    example_data_hub.prepare_static_values()
+
+    assert list(example_data_hub.crns_data_frame.columns) == columns_before
+    assert example_data_hub.static_values["latitude"] == 51.37
+    assert example_data_hub.static_values["site_cutoff_rigidity"] == 2.94
+    assert "name" not in example_data_hub.static_values
+    assert "install_date" not in example_data_hub.static_values
+
+    example_data_hub.prepare_static_values(as_columns=True)
+    assert (example_data_hub.crns_data_frame["elevation"] == 140).all()
@@ -0,0 +1,803 @@
+import copy
+import json
+import os
+import pandas as pd
+import pyarrow as pa
+import pytest
+import re
+import tarfile
+import zipfile
+from pathlib import Path
+
+from neptoon.io.read.data_ingest import (
+    FileCollectionConfig,
+    FormatDataForCRNSDataHub,
+    InputDataFrameFormattingConfig,
+    ManageFileCollection,
+    ParseFilesIntoDataFrame,
+    RawFileReader,
+    parse_date_time_strings,
+)
+from neptoon.io.read.file_scan import DirectoryScanner
+from neptoon.io.read.ingest_manifest import IngestManifest, SOURCE_FILE_COLUMN
+from neptoon.io.read.file_dates import (
+    FileDateIndex,
+    dates_from_file_names,
+    file_ranges_from_start_dates,
+    is_range_in_window,
+)
+
+config_path = (
+    Path(__file__).parent.parent
+    / "test_data"
+    / "io"
+    / "A101_station_test.yaml"
+)
+
+
+@pytest.fixture
+def raw_data_folder(tmp_path):
+    """
+    Folder of small raw files, including header lines, a non data
+    line, a line with too many columns and a file without a trailing
+    newline.
+    """
+    files = {
+        "CRS_01.txt": (
+            "// header line\n"
+            "2024/01/01 00:00:00, 100, 1000.1\n"
+            "2024/01/01 01:00:00, 101, 1000.2\n"
+            "comment line\n"
+            "2024/01/01 02:00:00, 102, 1000.3\n"
+        ),
+        "CRS_02.txt": (
+            "// header line\n"
+            "2024/01/01 03:00:00, 103, 1000.4, extra\n"
+            "2024/01/01 04:00:00, 104\n"
+            "2024/01/01 05:00:00, 105, 1000.6"
+        ),
+        "CRS_03.txt": (
+            "// header line\n"
+            "2024/01/01 06:00:00, 106, 1000.7\n"
+            "2024/01/01 07:00:00, 107, 1000.8\n"
+        ),
+    }
+    for name, content in files.items():
+        (tmp_path / name).write_text(content, encoding="cp850")
+    return tmp_path
+
+
+def _parse(config, **kwargs):
+    file_manager = ManageFileCollection(config=config)
+    file_manager.create_file_list()
+    file_manager.files = sorted(file_manager.files)
+    file_parser = ParseFilesIntoDataFrame(
+        file_manager=file_manager, config=config, **kwargs
+    )
+    return file_parser.make_dataframe()
+
+
+@pytest.mark.parametrize("skip_lines", [0, 1])
+@pytest.mark.parametrize("memory_limit_mb", [1e-6, 1e-4, 10])
+def test_chunked_parsing_matches_parsing_at_once(
+    raw_data_folder, skip_lines, memory_limit_mb
+):
+    """Chunked parsing gives the same DataFrame as parsing at once."""
+    config = FileCollectionConfig(
+        data_location=raw_data_folder,
+        column_names=["date_time", "counts", "pressure"],
+        skip_lines=skip_lines,
+    )
+    expected = _parse(config)
+    config.memory_limit_mb = memory_limit_mb
+    result = _parse(config)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert not result.empty
+
+
+@pytest.mark.parametrize("skip_lines", [0, 1])
+@pytest.mark.parametrize("memory_limit_mb", [1e-6, 1e-4, 10])
+def test_chunked_parsing_keeps_typed_chunks(
+    raw_data_folder, skip_lines, memory_limit_mb
+):
+    """With column types, chunks are converted as when formatting."""
+    config = FileCollectionConfig(
+        data_location=raw_data_folder,
+        column_names=["date_time", "counts", "pressure"],
+        skip_lines=skip_lines,
+    )
+    kwargs = dict(
+        column_types=arrow_column_types,
+        timestamp_format="%Y/%m/%d %H:%M:%S",
+    )
+    expected = _parse(config, **kwargs)
+    expected["date_time"] = parse_date_time_strings(
+        expected["date_time"], "%Y/%m/%d %H:%M:%S"
+    )
+    expected[["counts", "pressure"]] = expected[["counts", "pressure"]].apply(
+        pd.to_numeric, errors="coerce"
+    )
+    config.memory_limit_mb = memory_limit_mb
+    result = _parse(config, **kwargs)
+
+    assert result["date_time"].dtype == "datetime64[ns]"
+    assert result["counts"].dtype == "int64"
+    assert result["pressure"].dtype == "float64"
+    pd.testing.assert_frame_equal(
+        result.reset_index(drop=True), expected.astype(result.dtypes)
+    )
+
+
+def test_chunked_parsing_of_archive():
+    """Chunked parsing of the test archive gives the same DataFrame."""
+    config = FileCollectionConfig(path_to_config=config_path)
+    config.build_from_config()
+    expected = _parse(config)
+    config.memory_limit_mb = 0.5
+    result = _parse(config)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("memory_limit_mb", [None, 1e-4])
+def test_parallel_parsing_matches_sequential(raw_data_folder, memory_limit_mb):
+    """Parallel parsing keeps the file order and gives the same data."""
+    config = FileCollectionConfig(
+        data_location=raw_data_folder,
+        column_names=["date_time", "counts", "pressure"],
+        memory_limit_mb=memory_limit_mb,
+    )
+    expected = _parse(config)
+    config.parse_workers = 2
+    result = _parse(config)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("parse_workers", [1, 2])
+def test_parse_report(raw_data_folder, parse_workers):
+    """Lines with too many fields are reported for each file."""
+    config = FileCollectionConfig(
+        data_location=raw_data_folder,
+        column_names=["date_time", "counts", "pressure"],
+        parse_workers=parse_workers,
+    )
+    file_manager = ManageFileCollection(config=config)
+    file_manager.create_file_list()
+    file_manager.files = sorted(file_manager.files)
+    file_parser = ParseFilesIntoDataFrame(
+        file_manager=file_manager, config=config
+    )
+    file_parser.make_dataframe()
+    report = file_parser.parse_report.set_index("file")
+
+    assert list(report.index) == ["CRS_01.txt", "CRS_02.txt", "CRS_03.txt"]
+    assert list(report["data_lines"]) == [3, 3, 2]
+    assert list(report["bad_lines"]) == [0, 1, 0]
+
+
+@pytest.fixture
+def complete_raw_data_folder(raw_data_folder):
+    """Raw files which all end with a newline."""
+    path = raw_data_folder / "CRS_02.txt"
+    path.write_text(path.read_text(encoding="cp850") + "\n", encoding="cp850")
+    return raw_data_folder
+
+
+@pytest.mark.parametrize("skip_lines", [0, 1])
+def test_incremental_ingest_matches_full_parse(
+    complete_raw_data_folder, tmp_path_factory, skip_lines
+):
+    """Cold and warm incremental runs give the same data as a full parse."""
+    config = FileCollectionConfig(
+        data_location=complete_raw_data_folder,
+        column_names=["date_time", "counts", "pressure"],
+        skip_lines=skip_lines,
+    )
+    expected = _parse(config)
+    config.incremental_ingest = True
+    config.ingest_cache_location = tmp_path_factory.mktemp("ingest_cache")
+
+    pd.testing.assert_frame_equal(_parse(config), expected)
+    pd.testing.assert_frame_equal(_parse(config), expected)
+
+
+def test_incremental_ingest_parses_only_changed_files(
+    complete_raw_data_folder, tmp_path_factory, monkeypatch
+):
+    """Only new or changed files are parsed, unless the settings change."""
+    config = FileCollectionConfig(
+        data_location=complete_raw_data_folder,
+        column_names=["date_time", "counts", "pressure"],
+        incremental_ingest=True,
+        ingest_cache_location=tmp_path_factory.mktemp("ingest_cache"),
+    )
+    parsed_files = []
+    original_iter_file_contents = ParseFilesIntoDataFrame._iter_file_contents
+
+    def spy_iter_file_contents(self, files=None):
+        parsed_files.extend(files or [])
+        return original_iter_file_contents(self, files=files)
+
+    monkeypatch.setattr(
+        ParseFilesIntoDataFrame, "_iter_file_contents", spy_iter_file_contents
+    )
+    _parse(config)
+    assert parsed_files == ["CRS_01.txt", "CRS_02.txt", "CRS_03.txt"]
+
+    parsed_files.clear()
+    (complete_raw_data_folder / "CRS_03.txt").write_text(
+        "2024/01/01 06:00:00, 106, 1000.7\n", encoding="cp850"
+    )
+    (complete_raw_data_folder / "CRS_04.txt").write_text(
+        "2024/01/01 08:00:00, 108, 1000.9\n", encoding="cp850"
+    )
+    result = _parse(config)
+    assert parsed_files == ["CRS_03.txt", "CRS_04.txt"]
+    assert list(result["counts"].iloc[-2:]) == ["106", "108"]
+    config.incremental_ingest = False
+    pd.testing.assert_frame_equal(result, _parse(config))
+
+    parsed_files.clear()
+    config.incremental_ingest = True
+    config.skip_initial_space = False
+    _parse(config)
+    assert len(parsed_files) == 4
+
+
+@pytest.mark.parametrize("skip_lines", [0, 1])
+def test_incremental_ingest_unchanged_run_parses_nothing(
+    complete_raw_data_folder, tmp_path_factory, monkeypatch, skip_lines
+):
+    """skip_lines is applied to the cached rows of the first file."""
+    config = FileCollectionConfig(
+        data_location=complete_raw_data_folder,
+        column_names=["date_time", "counts", "pressure"],
+        skip_lines=skip_lines,
+    )
+    expected = _parse(config)
+    config.incremental_ingest = True
+    config.ingest_cache_location = tmp_path_factory.mktemp("ingest_cache")
+    _parse(config)
+
+    parsed_strings = []
+    original_read_data_string = ParseFilesIntoDataFrame._read_data_string
+
+    def spy_read_data_string(self, data_str, column_names, skip_rows):
+        parsed_strings.append(data_str)
+        return original_read_data_string(
+            self, data_str, column_names, skip_rows
+        )
+
+    monkeypatch.setattr(
+        ParseFilesIntoDataFrame, "_read_data_string", spy_read_data_string
+    )
+    pd.testing.assert_frame_equal(_parse(config), expected)
+    assert parsed_strings == []
+
+
+@pytest.fixture
+def raw_data_archives(raw_data_folder, tmp_path_factory):
+    """Zip and tar.gz archives of the raw files, inside a folder."""
+    archive_folder = tmp_path_factory.mktemp("archives")
+    zip_path = archive_folder / "raw_data.zip"
+    tar_path = archive_folder / "raw_data.tar.gz"
+    with (
+        zipfile.ZipFile(zip_path, "w") as zip_ref,
+        tarfile.open(tar_path, "w:gz") as tar,
+    ):
+        for path in sorted(raw_data_folder.glob("*.txt")):
+            zip_ref.write(path, arcname=f"raw_data/{path.name}")
+            tar.add(path, arcname=f"raw_data/{path.name}")
+    return {"zipfile": zip_path, "tarfile": tar_path}
+
+
+@pytest.mark.parametrize("data_source", ["zipfile", "tarfile"])
+@pytest.mark.parametrize("parse_workers", [1, 2])
+def test_archive_parsed_without_extracting(
+    raw_data_folder, raw_data_archives, monkeypatch, data_source, parse_workers
+):
+    """Archives are read member by member and give the folder's data."""
+    config = FileCollectionConfig(
+        data_location=raw_data_folder,
+        column_names=["date_time", "counts", "pressure"],
+        prefix="CRS_0",
+        suffix=".txt",
+    )
+    expected = _parse(config)
+
+    def no_extraction(*args, **kwargs):
+        raise AssertionError("archive was extracted")
+
+    monkeypatch.setattr(tarfile.TarFile, "extractall", no_extraction)
+    monkeypatch.setattr(zipfile.ZipFile, "extractall", no_extraction)
+    config.data_location = raw_data_archives[data_source]
+    config.parse_workers = parse_workers
+
+    assert config.data_source == data_source
+    assert config.archive_root == "raw_data/"
+    pd.testing.assert_frame_equal(_parse(config), expected)
+
+
+@pytest.mark.parametrize("data_source", ["zipfile", "tarfile"])
+def test_archive_member_names_filtered(raw_data_archives, data_source):
+    """Prefix and suffix filtering is applied to archive member names."""
+    config = FileCollectionConfig(
+        data_location=raw_data_archives[data_source],
+        prefix="CRS_02",
+        suffix=".txt",
+    )
+    file_manager = ManageFileCollection(config=config)
+    file_manager.create_file_list()
+
+    assert file_manager.files == ["CRS_02.txt"]
+
+
+@pytest.mark.parametrize("data_source", ["zipfile", "tarfile"])
+def test_archive_closed_after_inferring_column_names(
+    raw_data_archives, data_source, monkeypatch
+):
+    """Archives opened to infer the column names are closed again."""
+    readers = []
+    original_get_archive_member = RawFileReader._get_archive_member
+
+    def spy_get_archive_member(self, filename):
+        readers.append(self)
+        return original_get_archive_member(self, filename)
+
+    monkeypatch.setattr(
+        RawFileReader, "_get_archive_member", spy_get_archive_member
+    )
+    config = FileCollectionConfig(
+        data_location=raw_data_archives[data_source],
+    )
+    file_manager = ManageFileCollection(config=config)
+    file_manager.create_file_list()
+    file_manager.files = sorted(file_manager.files)
+    file_parser = ParseFilesIntoDataFrame(
+        file_manager=file_manager, config=config
+    )
+    assert len(file_parser._infer_column_names()) == 3
+    assert readers
+    assert all(reader._archive is None for reader in readers)
+
+
+arrow_column_types = {
+    "date_time": pa.timestamp("ns"),
+    "pressure": pa.float64(),
+}
+
+
+def _to_arrow_types(data, decimal="."):
+    """Converts the pandas engine output as done when formatting."""
+    return pd.DataFrame(
+        {
+            "date_time": pd.to_datetime(
+                data["date_time"], format="%Y/%m/%d %H:%M:%S", errors="coerce"
+            ),
+            "pressure": pd.to_numeric(
+                data["pressure"].str.replace(decimal, "."), errors="coerce"
+            ),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"skip_lines": 1},
+        {"memory_limit_mb": 1e-4},
+        {"parse_workers": 2},
+    ],
+)
+def test_arrow_engine_reads_typed_columns(raw_data_folder, options):
+    """Only the typed columns are read, with the values of pandas."""
+    config = FileCollectionConfig(
+        data_location=raw_data_folder,
+        column_names=["date_time", "counts", "pressure"],
+        **options,
+    )
+    expected = _to_arrow_types(_parse(config))
+    config.parse_engine = "arrow"
+    result = _parse(
+        config,
+        column_types=arrow_column_types,
+        timestamp_format="%Y/%m/%d %H:%M:%S",
+    )
+
+    assert list(result.columns) == ["date_time", "pressure"]
+    assert not (result.dtypes == object).any()
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("separator, decimal", [(",", "."), (";", ",")])
+def test_arrow_engine_with_invalid_values(raw_data_folder, separator, decimal):
+    """Values which cannot be converted become NaN/NaT."""
+    (raw_data_folder / "CRS_04.txt").write_text(
+        "2024/01/01 08:00:00, 108, 1000.9x\n"
+        "2024/13/01 09:00:00, 109, 1001.0\n",
+        encoding="cp850",
+    )
+    if decimal != ".":
+        for path in raw_data_folder.iterdir():
+            content = path.read_text(encoding="cp850")
+            path.write_text(
+                content.replace(",", separator).replace(".", decimal),
+                encoding="cp850",
+            )
+    config = FileCollectionConfig(
+        data_location=raw_data_folder,
+        column_names=["date_time", "counts", "pressure"],
+        separator=separator,
+        decimal=decimal,
+    )
+    expected = _to_arrow_types(_parse(config), decimal=decimal)
+    config.parse_engine = "arrow"
+    result = _parse(
+        config,
+        column_types=arrow_column_types,
+        timestamp_format="%Y/%m/%d %H:%M:%S",
+    )
+
+    assert result["pressure"].isna().sum() == 2
+    assert result["date_time"].isna().sum() == 1
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_arrow_engine_with_incremental_ingest(
+    complete_raw_data_folder, tmp_path_factory
+):
+    """Typed columns are cached and re-used by the incremental ingest."""
+    config = FileCollectionConfig(
+        data_location=complete_raw_data_folder,
+        column_names=["date_time", "counts", "pressure"],
+        parse_engine="arrow",
+    )
+    kwargs = dict(
+        column_types=arrow_column_types,
+        timestamp_format="%Y/%m/%d %H:%M:%S",
+    )
+    expected = _parse(config, **kwargs)
+    config.incremental_ingest = True
+    config.ingest_cache_location = tmp_path_factory.mktemp("ingest_cache")
+
+    pd.testing.assert_frame_equal(_parse(config, **kwargs), expected)
+    pd.testing.assert_frame_equal(_parse(config, **kwargs), expected)
+
+
+def test_arrow_engine_formatted_archive():
+    """The formatted test archive has the same values with both engines."""
+    formatter_config = InputDataFrameFormattingConfig(
+        path_to_config=config_path
+    )
+    formatter_config.import_config()
+    formatter_config.build_from_config()
+    config = FileCollectionConfig(path_to_config=config_path)
+    config.build_from_config()
+
+    data = {}
+    for parse_engine in ["pandas", "arrow"]:
+        config.parse_engine = parse_engine
+        parsed_data = _parse(
+            config,
+            column_types=formatter_config.get_arrow_column_types(),
+            timestamp_format=formatter_config.date_time_format,
+        )
+        data[parse_engine] = FormatDataForCRNSDataHub(
+            data_frame=parsed_data,
+            config=copy.deepcopy(formatter_config),
+        ).format_data_and_return_data_frame()
+
+    assert len(data["arrow"].columns) < len(data["pandas"].columns)
+    pd.testing.assert_frame_equal(
+        data["arrow"],
+        data["pandas"][data["arrow"].columns],
+        check_dtype=False,
+    )
+
+
+@pytest.fixture
+def daily_raw_data_folder(tmp_path):
+    """Folder of one raw file per day, named by date."""
+    tmp_path = tmp_path / "raw_data"
+    tmp_path.mkdir()
+    for day in range(1, 11):
+        lines = "".join(
+            f"2024/01/{day:02d} {hour:02d}:00:00, {day}, 1000.{hour}\n"
+            for hour in range(0, 24, 6)
+        )
+        (tmp_path / f"CRS_202401{day:02d}.txt").write_text(
+            "// header line\n" + lines, encoding="cp850"
+        )
+    return tmp_path
+
+
+def _daily_config(folder, **kwargs):
+    kwargs.setdefault("ingest_cache_location", folder.parent / "cache")
+    return FileCollectionConfig(
+        data_location=folder,
+        column_names=["date_time", "counts", "pressure"],
+        date_time_columns=["date_time"],
+        date_time_format="%Y/%m/%d %H:%M:%S",
+        **kwargs,
+    )
+
+
+def _files_in_window(config):
+    file_manager = ManageFileCollection(config=config)
+    file_manager.create_file_list()
+    return sorted(file_manager.files)
+
+
+def test_dates_from_file_names():
+    dates = dates_from_file_names(
+        files=["CRS_20240101.txt", "CRS_2024-01-02.txt", "notes.txt"],
+        file_date_pattern=r"_(?P<date>\d{4}-?\d{2}-?\d{2})\.txt",
+    )
+    assert dates["CRS_20240101.txt"] == pd.Timestamp("2024-01-01")
+    assert dates["CRS_2024-01-02.txt"] == pd.Timestamp("2024-01-02")
+    assert dates["notes.txt"] is None
+
+
+def test_file_ranges_from_start_dates():
+    file_ranges = file_ranges_from_start_dates(
+        {
+            "b": pd.Timestamp("2024-01-02"),
+            "a": pd.Timestamp("2024-01-01"),
+            "c": None,
+        }
+    )
+    assert file_ranges == {
+        "a": (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-02")),
+        "b": (pd.Timestamp("2024-01-02"), None),
+        "c": (None, None),
+    }
+    window = (pd.Timestamp("2024-01-03"), pd.Timestamp("2024-01-04"))
+    assert not is_range_in_window(file_ranges["a"], *window)
+    assert is_range_in_window(file_ranges["b"], *window)
+    assert is_range_in_window(file_ranges["c"], *window)
+
+
+def test_filter_files_by_file_name_dates(daily_raw_data_folder):
+    config = _daily_config(
+        daily_raw_data_folder,
+        start_date="2024-01-05",
+        end_date="2024-01-06",
+        file_date_pattern=r"CRS_(\d{8})",
+        file_date_format="%Y%m%d",
+    )
+    # the window is padded by a day on each side
+    assert _files_in_window(config) == [
+        f"CRS_202401{day:02d}.txt" for day in range(3, 8)
+    ]
+
+
+def test_filter_files_by_peeked_dates_is_cached(
+    daily_raw_data_folder, monkeypatch
+):
+    config = _daily_config(
+        daily_raw_data_folder, start_date="2024-01-05", end_date="2024-01-06"
+    )
+    expected = [f"CRS_202401{day:02d}.txt" for day in range(4, 8)]
+    assert _files_in_window(config) == expected
+    assert (config.ingest_cache_location / FileDateIndex.FILE_NAME).exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("File dates should come from the cache")
+
+    monkeypatch.setattr(RawFileReader, "peek_data_lines", fail)
+    assert _files_in_window(config) == expected
+
+
+def test_filter_files_outside_window_raises(daily_raw_data_folder):
+    config = _daily_config(daily_raw_data_folder, start_date="2025-01-01")
+    with pytest.raises(FileNotFoundError):
+        _files_in_window(config)
+
+
+def test_time_window_matches_snipped_full_parse(daily_raw_data_folder):
+    window = {"start_date": "2024-01-05", "end_date": "2024-01-06 12:00"}
+    full_data = _parse(_daily_config(daily_raw_data_folder))
+    data = _parse(_daily_config(daily_raw_data_folder, **window))
+    assert len(data) < len(full_data)
+
+    def format_data(data):
+        config = InputDataFrameFormattingConfig()
+        config.column_data = []
+        config.date_time_columns = ["date_time"]
+        config.date_time_format = "%Y/%m/%d %H:%M:%S"
+        config.start_date_of_data = pd.Timestamp(window["start_date"])
+        config.end_date_of_data = pd.Timestamp(window["end_date"])
+        formatter = FormatDataForCRNSDataHub(data_frame=data, config=config)
+        formatter.date_time_as_index()
+        formatter.snip_data_frame()
+        return formatter.data_frame
+
+    result = format_data(data)
+    pd.testing.assert_frame_equal(result, format_data(full_data))
+    assert result.index.min() == pd.Timestamp("2024-01-05", tz="UTC")
+    assert result.index.max() == pd.Timestamp("2024-01-06 12:00", tz="UTC")
+
+
+def test_incremental_ingest_keeps_files_outside_window(
+    daily_raw_data_folder, monkeypatch
+):
+    """
+    Files outside of the time window stay in the ingest cache, files
+    removed from disk are dropped from it.
+    """
+    config = _daily_config(daily_raw_data_folder, incremental_ingest=True)
+    _parse(config)
+
+    parsed_files = []
+    original_iter_file_contents = ParseFilesIntoDataFrame._iter_file_contents
+
+    def spy_iter_file_contents(self, files=None):
+        parsed_files.extend(files or [])
+        return original_iter_file_contents(self, files=files)
+
+    monkeypatch.setattr(
+        ParseFilesIntoDataFrame, "_iter_file_contents", spy_iter_file_contents
+    )
+    window = {"start_date": "2024-01-05", "end_date": "2024-01-06 12:00"}
+    _parse(
+        _daily_config(daily_raw_data_folder, incremental_ingest=True, **window)
+    )
+    full_data = _parse(config)
+    assert parsed_files == []
+
+    (daily_raw_data_folder / "CRS_20240110.txt").unlink()
+    data = _parse(config)
+    assert parsed_files == []
+    pd.testing.assert_frame_equal(data, full_data.iloc[:-4])
+    manifest = json.loads(
+        (config.ingest_cache_location / "ingest_manifest.json").read_text()
+    )
+    assert len(manifest["files"]) == 9
+
+
+def test_incremental_ingest_hashes_changed_file_once(
+    daily_raw_data_folder, monkeypatch
+):
+    """A file with a new modification time and content is hashed once."""
+    config = _daily_config(daily_raw_data_folder, incremental_ingest=True)
+    _parse(config)
+
+    hashed_files = []
+    original_file_hash = RawFileReader.file_hash
+
+    def spy_file_hash(self, filename):
+        hashed_files.append(filename)
+        return original_file_hash(self, filename)
+
+    monkeypatch.setattr(RawFileReader, "file_hash", spy_file_hash)
+    path = daily_raw_data_folder / "CRS_20240103.txt"
+    path.write_text(path.read_text().replace("1000.", "1001."))
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1))
+    data = _parse(config)
+    assert hashed_files == ["CRS_20240103.txt"]
+    assert list(data["pressure"].iloc[8:12]) == [
+        "1001.0",
+        "1001.6",
+        "1001.12",
+        "1001.18",
+    ]
+
+
+def test_ingest_manifest_parts_are_combined(tmp_path, monkeypatch):
+    """Each update writes a part, parts are combined above the maximum."""
+    monkeypatch.setattr(IngestManifest, "MAX_DATA_PARTS", 2)
+    manifest = IngestManifest(cache_directory=tmp_path, parse_settings={})
+    for i in range(3):
+        manifest.update(
+            entries={f"file_{i}.txt": {"size": i}},
+            data=pd.DataFrame(
+                {"counts": [str(i)], SOURCE_FILE_COLUMN: f"file_{i}.txt"}
+            ),
+        )
+    assert len(list(tmp_path.glob("*.parquet"))) == 1
+    manifest.update(entries={}, remove=["file_1.txt"])
+
+    manifest = IngestManifest(cache_directory=tmp_path, parse_settings={})
+    manifest.load()
+    assert list(manifest.entries) == ["file_0.txt", "file_2.txt"]
+    data = manifest.load_data(["file_2.txt", "file_0.txt"])
+    assert sorted(data["counts"]) == ["0", "2"]
+
+
+@pytest.fixture
+def nested_raw_data_folder(tmp_path):
+    """Raw files in sub folders, with folder times in the past."""
+    folder = tmp_path / "raw_data"
+    for sub_folder in ["2023", "2024", "2024/01", "logs"]:
+        (folder / sub_folder).mkdir(parents=True)
+    for name in [
+        "CRS_a.txt",
+        "CRS_b.dat",
+        "notes.txt",
+        "2023/CRS_c.txt",
+        "2024/CRS_d.txt",
+        "2024/01/CRS_e.txt",
+        "logs/CRS_f.txt",
+    ]:
+        (folder / name).write_text("2024/01/01 00:00:00, 100, 1000.1\n")
+    for directory in [folder, *folder.rglob("*")]:
+        if directory.is_dir():
+            os.utime(directory, ns=(0, 10**18))
+    return folder
+
+
+def _glob_files(folder):
+    return sorted(
+        str(path.relative_to(folder))
+        for path in folder.glob("**/*")
+        if path.is_file()
+    )
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"suffix": ".txt"},
+        {"prefix": "2024"},
+        {"prefix": "2024" + os.sep + "01"},
+        {"file_pattern": r"CRS_[a-d]\.txt$"},
+    ],
+)
+def test_directory_scanner_matches_glob(nested_raw_data_folder, filters):
+    pattern = re.compile(filters.get("file_pattern", ""))
+    expected = [
+        path
+        for path in _glob_files(nested_raw_data_folder)
+        if path.startswith(filters.get("prefix", ""))
+        and path.endswith(filters.get("suffix", ""))
+        and pattern.search(path)
+    ]
+    scanner = DirectoryScanner(folder=nested_raw_data_folder, **filters)
+    assert sorted(scanner.scan()) == expected
+    assert scanner.scan_report["files"] == len(expected)
+
+
+def test_directory_scanner_prunes_folders(nested_raw_data_folder):
+    scanner = DirectoryScanner(folder=nested_raw_data_folder, prefix="2023")
+    assert scanner.scan() == [os.path.join("2023", "CRS_c.txt")]
+    # the root folder and "2023"
+    assert scanner.scan_report["directories"] == 2
+
+
+def test_directory_scanner_cache(nested_raw_data_folder, tmp_path):
+    def scan():
+        scanner = DirectoryScanner(
+            folder=nested_raw_data_folder,
+            cache_directory=tmp_path / "cache",
+        )
+        return sorted(scanner.scan()), scanner.scan_report
+
+    files, report = scan()
+    assert report["cached_directories"] == 0
+    cached_files, cached_report = scan()
+    assert cached_files == files
+    assert cached_report["cached_directories"] == report["directories"]
+
+    # a new file changes the modification time of its folder
+    (nested_raw_data_folder / "2024" / "CRS_g.txt").write_text("")
+    new_files, new_report = scan()
+    assert new_files == sorted(files + [os.path.join("2024", "CRS_g.txt")])
+    assert new_report["cached_directories"] == report["directories"] - 1
+
+
+def test_file_list_with_file_pattern(nested_raw_data_folder):
+    config = FileCollectionConfig(
+        data_location=nested_raw_data_folder,
+        suffix=".txt",
+        file_pattern=r"CRS_[ab]",
+        cache_file_listing=True,
+        ingest_cache_location=nested_raw_data_folder.parent / "cache",
+    )
+    file_manager = ManageFileCollection(config=config)
+    file_manager.create_file_list()
+    assert file_manager.files == ["CRS_a.txt"]
+    assert file_manager.scan_report["entries_per_second"] > 0
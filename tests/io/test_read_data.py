@@ -9,6 +9,8 @@ from neptoon.io.read.data_ingest import (
     InputColumnMetaData,
     InputColumnDataType,
     PressureUnits,
+    detect_date_time_format,
+    parse_date_time_strings,
 )
 from neptoon.columns import ColumnInfo
 
@@ -59,6 +61,47 @@ def test_extract_date_time_column_list(df_formatter, base_df):
     assert isinstance(series[0], datetime.datetime)
 
 
+def test_extract_split_date_time_columns_detects_format(base_config):
+    date_times = pd.date_range("2022-01-01", periods=50, freq="7h")
+    df = pd.DataFrame(
+        {
+            "date": date_times.strftime("%d.%m.%Y"),
+            "time": date_times.strftime("%H:%M"),
+        }
+    )
+    base_config.date_time_columns = ["date", "time"]
+    base_config.date_time_format = None
+    formatter = FormatDataForCRNSDataHub(data_frame=df, config=base_config)
+    series = formatter.extract_date_time_column()
+
+    assert base_config.date_time_format == "%d.%m.%Y %H:%M"
+    np.testing.assert_array_equal(series.to_numpy(), date_times.to_numpy())
+
+
+def test_detect_date_time_format_not_possible():
+    values = pd.Series(["not a date", "also not a date"])
+    assert detect_date_time_format(values) is None
+
+
+@pytest.mark.parametrize(
+    "date_time_format",
+    ["%Y/%m/%d %H:%M:%S", "%d.%m.%Y %H:%M", "%Y-%m-%d %H:%M:%S.%f"],
+)
+def test_parse_date_time_strings_matches_pandas(date_time_format):
+    values = pd.Series(
+        pd.date_range("2022-01-01", periods=5, freq="37min").strftime(
+            date_time_format
+        ),
+        dtype=object,
+    )
+    values[1] = np.nan
+    values[2] = "garbage"
+    values[3] = " " + values[3]
+    expected = pd.to_datetime(values, format=date_time_format, errors="coerce")
+    result = parse_date_time_strings(values, date_time_format)
+    pd.testing.assert_series_equal(result, expected)
+
+
 def test_pascals_to_hectopascals(base_config):
     df = pd.DataFrame({"P_raw": [101325, 100000, 98000]})
 
@@ -1,7 +1,14 @@
+import numpy as np
+import pandas as pd
 import pytest
+from pathlib import Path
 from unittest import mock
 
-from neptoon.io.read.config import _get_config_section
+from neptoon.io.read.config import DataHubFromConfig, _get_config_section
+from neptoon.io.read.formatted_cache import (
+    FormattedDataCache,
+    create_file_manifest,
+)
 from neptoon.config.configuration_input import ConfigurationManager, BaseConfig
 
 
@@ -39,3 +46,63 @@ def test_get_config_section(monkeypatch):
     config_process = _get_config_section(config, wanted_config="process")
     assert config_process == "process"
     assert config_sensor == "sensor"
+
+
+config_path = (
+    Path(__file__).parent.parent
+    / "test_data"
+    / "io"
+    / "A101_station_test.yaml"
+)
+
+
+def test_formatted_data_cache_key(tmp_path):
+    """The key changes with the raw files and the configuration."""
+    (tmp_path / "file.txt").write_text("data")
+
+    def create_key(config_sections):
+        return FormattedDataCache.create_key(
+            config_sections=config_sections,
+            file_manifest=create_file_manifest(tmp_path, ["file.txt"]),
+        )
+
+    key = create_key({"skip_lines": 0})
+    assert create_key({"skip_lines": 0}) == key
+    assert create_key({"skip_lines": 1}) != key
+    (tmp_path / "file.txt").write_text("more data")
+    assert create_key({"skip_lines": 0}) != key
+
+
+def test_formatted_data_cache_round_trip(tmp_path):
+    data = pd.DataFrame(
+        {"counts": [1.0, np.nan], "flag": ["a", np.nan]},
+        index=pd.date_range("2024-01-01", periods=2, freq="h", tz="UTC"),
+    )
+    cache = FormattedDataCache(cache_directory=tmp_path, key="a")
+    assert cache.load() is None
+    cache.write(data)
+    pd.testing.assert_frame_equal(cache.load(), data)
+    assert FormattedDataCache(cache_directory=tmp_path, key="b").load() is None
+
+
+def test_create_data_hub_uses_formatted_data_cache(tmp_path, monkeypatch):
+    data_hub_creator = DataHubFromConfig(path_to_sensor_config=config_path)
+    parse_options = data_hub_creator.sensor_config.raw_data_parse_options
+    parse_options.cache_formatted_data = True
+    parse_options.ingest_cache_location = tmp_path
+    data = data_hub_creator.create_data_hub().crns_data_frame
+    assert (tmp_path / FormattedDataCache.DATA_FILE_NAME).exists()
+
+    with monkeypatch.context() as patch:
+        patch.setattr(
+            DataHubFromConfig,
+            "_parse_raw_data",
+            mock.Mock(side_effect=AssertionError("data should be cached")),
+        )
+        cached_data = data_hub_creator.create_data_hub().crns_data_frame
+    pd.testing.assert_frame_equal(cached_data, data)
+
+    # a change of the configuration formats the data again
+    data_hub_creator.sensor_config.sensor_info.install_date = "2017-06-01"
+    new_data = data_hub_creator.create_data_hub().crns_data_frame
+    assert new_data.index.min() >= pd.Timestamp("2017-06-01", tz="UTC")
@@ -7,6 +7,8 @@ from neptoon.products.estimate_sm import (
 from neptoon.columns import ColumnInfo
 from neptoon.corrections.theory.neutrons_to_soil_moisture import (
     neutrons_to_grav_soil_moisture_koehli_etal_2021,
+    neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized,
+    KOEHLI_PARAMETERS,
 )
 from pandera.errors import SchemaError
 
@@ -126,6 +128,90 @@ def test_calculate_sm_estimates(neutrons_to_sm_instance):
     )
 
 
+@pytest.mark.parametrize(
+    "conversion_theory", ["desilets_etal_2010", "koehli_etal_2021"]
+)
+def test_sm_estimates_with_uncertainty_single_pass(
+    sample_crns_data, conversion_theory
+):
+    """
+    The fused routine gives the same results as converting the central
+    and bound counts one after another.
+    """
+    fused = NeutronsToSM(
+        crns_data_frame=sample_crns_data.copy(),
+        n0=3000,
+        conversion_theory=conversion_theory,
+    )
+    fused.calculate_sm_estimates_with_uncertainty()
+
+    separate = NeutronsToSM(
+        crns_data_frame=sample_crns_data.copy(),
+        n0=3000,
+        conversion_theory=conversion_theory,
+    )
+    separate.calculate_sm_estimates(
+        neutron_data_column_name=str(
+            ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_FINAL
+        ),
+        soil_moisture_column_write_name_vol=str(
+            ColumnInfo.Name.SOIL_MOISTURE_VOL
+        ),
+    )
+    separate.create_uncertainty_bounds()
+    separate.calculate_sm_estimates(
+        neutron_data_column_name=str(
+            ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_LOWER
+        ),
+        soil_moisture_column_write_name_vol=str(
+            ColumnInfo.Name.SOIL_MOISTURE_UNCERTAINTY_VOL_UPPER
+        ),
+    )
+    separate.calculate_sm_estimates(
+        neutron_data_column_name=str(
+            ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UPPER
+        ),
+        soil_moisture_column_write_name_vol=str(
+            ColumnInfo.Name.SOIL_MOISTURE_UNCERTAINTY_VOL_LOWER
+        ),
+    )
+
+    for column in [
+        ColumnInfo.Name.SOIL_MOISTURE_VOL,
+        ColumnInfo.Name.SOIL_MOISTURE_UNCERTAINTY_VOL_UPPER,
+        ColumnInfo.Name.SOIL_MOISTURE_UNCERTAINTY_VOL_LOWER,
+    ]:
+        pd.testing.assert_series_equal(
+            fused.crns_data_frame[str(column)],
+            separate.crns_data_frame[str(column)],
+        )
+
+
+def test_count_bounds_only_created_when_asked(sample_crns_data):
+    neutrons_to_sm = NeutronsToSM(
+        crns_data_frame=sample_crns_data.drop(
+            columns=[
+                str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UPPER),
+                str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_LOWER),
+            ]
+        ),
+        n0=3000,
+    )
+    neutrons_to_sm.calculate_uncertainty_of_sm_estimates()
+    columns = neutrons_to_sm.crns_data_frame.columns
+    assert str(ColumnInfo.Name.SOIL_MOISTURE_UNCERTAINTY_VOL_UPPER) in columns
+    assert (
+        str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UPPER) not in columns
+    )
+
+    neutrons_to_sm.calculate_uncertainty_of_sm_estimates(
+        create_count_bounds=True
+    )
+    columns = neutrons_to_sm.crns_data_frame.columns
+    assert str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_UPPER) in columns
+    assert str(ColumnInfo.Name.CORRECTED_EPI_NEUTRON_COUNT_LOWER) in columns
+
+
 ####### TEST KOEHLI
 
 
@@ -196,6 +282,88 @@ def test_koehli_method_nans_not_processed():
     assert pd.isna(nan_hum)
 
 
+@pytest.mark.parametrize("koehli_parameters", list(KOEHLI_PARAMETERS))
+def test_koehli_vectorized_matches_scalar(koehli_parameters):
+    """
+    The vectorized inversion gives the same results as the scalar one
+    """
+    rng = np.random.default_rng(42)
+    neutrons = rng.uniform(300, 3500, 200)
+    humidity = rng.uniform(0, 25, 200)
+    neutrons[::17] = np.nan
+    humidity[::23] = np.nan
+
+    scalar = np.array(
+        [
+            neutrons_to_grav_soil_moisture_koehli_etal_2021(
+                neutron_count=n,
+                n0=3000,
+                abs_air_humidity=h,
+                additional_gravimetric_water=0.05,
+                koehli_parameters=koehli_parameters,
+            )
+            for n, h in zip(neutrons, humidity)
+        ]
+    )
+    vectorized = neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized(
+        neutron_count=neutrons,
+        n0=3000,
+        abs_air_humidity=humidity,
+        additional_gravimetric_water=0.05,
+        koehli_parameters=koehli_parameters,
+    )
+    np.testing.assert_array_equal(vectorized, scalar)
+
+
+def test_koehli_vectorized_input_types():
+    """
+    Scalars stay scalars and pd.Series keep their index
+    """
+    scalar = neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized(
+        neutron_count=1000,
+        n0=3000,
+        abs_air_humidity=5.0,
+        additional_gravimetric_water=0.05,
+    )
+    assert isinstance(scalar, float)
+    assert scalar == neutrons_to_grav_soil_moisture_koehli_etal_2021(
+        neutron_count=1000,
+        n0=3000,
+        abs_air_humidity=5.0,
+        additional_gravimetric_water=0.05,
+    )
+
+    neutrons = pd.Series([1600, np.nan, 1200], index=[3, 4, 5])
+    result = neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized(
+        neutron_count=neutrons,
+        n0=3000,
+        abs_air_humidity=pd.Series([2, 3, 4], index=[3, 4, 5]),
+    )
+    assert isinstance(result, pd.Series)
+    assert list(result.index) == [3, 4, 5]
+    assert pd.isna(result.loc[4])
+
+
+def test_koehli_vectorized_tolerance():
+    """
+    A looser tolerance converges earlier but stays within its bound
+    """
+    neutrons = np.array([900.0, 1300.0, 1800.0])
+    fine = neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized(
+        neutron_count=neutrons,
+        n0=3000,
+        abs_air_humidity=5.0,
+        tolerance=1e-8,
+    )
+    coarse = neutrons_to_grav_soil_moisture_koehli_etal_2021_vectorized(
+        neutron_count=neutrons,
+        n0=3000,
+        abs_air_humidity=5.0,
+        tolerance=[1e-2, 1e-4, 1e-6],
+    )
+    assert np.all(np.abs(coarse - fine) <= [1e-2, 1e-4, 1e-6])
+
+
 def test_koehli_method_no_abs_hum(
     neutrons_to_sm_instance_koehli_no_hum,
 ):
@@ -0,0 +1,54 @@
+import threading
+import pytest
+
+from neptoon.utils.file_lock import FileLock, call_with_retries
+
+
+def test_exclusive_lock_blocks(tmp_path):
+    lock_path = tmp_path / "cache.lock"
+    with FileLock(lock_path):
+        with pytest.raises(TimeoutError):
+            FileLock(lock_path, timeout=0.1).acquire()
+        with pytest.raises(TimeoutError):
+            FileLock(lock_path, shared=True, timeout=0.1).acquire()
+    with FileLock(lock_path, timeout=0.1):
+        pass
+
+
+def test_shared_locks(tmp_path):
+    lock_path = tmp_path / "cache.lock"
+    with FileLock(lock_path, shared=True):
+        with FileLock(lock_path, shared=True, timeout=0.1):
+            pass
+        with pytest.raises(TimeoutError):
+            FileLock(lock_path, timeout=0.1).acquire()
+
+
+def test_lock_waits_for_release(tmp_path):
+    lock_path = tmp_path / "cache.lock"
+    lock = FileLock(lock_path)
+    lock.acquire()
+    timer = threading.Timer(0.2, lock.release)
+    timer.start()
+    with FileLock(lock_path, timeout=5):
+        assert lock._file is None
+    timer.join()
+
+
+def test_call_with_retries():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise FileNotFoundError("replaced")
+        return "data"
+
+    assert call_with_retries(flaky, delay=0) == "data"
+    assert len(calls) == 3
+
+    calls.clear()
+    with pytest.raises(FileNotFoundError):
+        call_with_retries(flaky, retries=1, delay=0)
+    with pytest.raises(KeyError):
+        call_with_retries(lambda: {}["missing"], delay=0)